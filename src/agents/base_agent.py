@@ -12,7 +12,6 @@ from dataclasses import dataclass, field
 from datetime import datetime
 import asyncio
 from pathlib import Path
-import json
 
 # Import the new abstraction layer
 from src.tools.abstraction.model_interface import (
@@ -24,6 +23,7 @@ from src.tools.abstraction.model_interface import (
 )
 from src.tools.registry import ToolRegistry
 from src.tools.ai_adapter import ToolAIAdapter
+from src.agents.context_log import ContextLog
 
 logger = logging.getLogger(__name__)
 
@@ -85,6 +85,7 @@ class BaseAgent(ABC):
         self.model = model
         self._is_initialized = False
         self._context = AgentContext()
+        self._context_log: Optional[ContextLog] = None
         
         # Initialize tool support if enabled
         if config.enable_tools:
@@ -338,6 +339,9 @@ class BaseAgent(ABC):
             
         # Clear context
         self.clear_context()
+        if self._context_log:
+            self._context_log.close()
+            self._context_log = None
         
         self._is_initialized = False
         logger.info(f"Agent '{self.config.name}' shutdown complete")
@@ -393,28 +397,50 @@ class BaseAgent(ABC):
             
         return info
     
-    async def save_context(self, filepath: Union[str, Path]):
-        """Save context to file"""
+    def _get_context_log(self, filepath: Union[str, Path]) -> ContextLog:
+        """Get the context log for a file, keeping one open at a time"""
         filepath = Path(filepath)
+        if self._context_log is None or self._context_log.path != filepath:
+            if self._context_log:
+                self._context_log.close()
+            self._context_log = ContextLog(filepath)
+        return self._context_log
+    
+    async def save_context(self, filepath: Union[str, Path]):
+        """
+        Save context to file
         
-        # Convert context to serializable format
-        context_data = {
+        The file is an append-only log: saving again to the same file
+        only appends the messages and tool events added since.
+        """
+        state = {
             "user_id": self._context.user_id,
             "session_id": self._context.session_id,
-            "conversation_history": self._context.conversation_history,
-            "tool_history": self._context.tool_history,
             "metadata": self._context.metadata,
             "timestamp": self._context.timestamp.isoformat()
         }
         
-        # Save to file
-        with open(filepath, 'w') as f:
-            json.dump(context_data, f, indent=2)
+        self._get_context_log(filepath).save(
+            state,
+            self._context.conversation_history,
+            self._context.tool_history
+        )
             
-        logger.info(f"Context saved to {filepath}")
+        logger.debug(f"Context saved to {filepath}")
         
-    async def load_context(self, filepath: Union[str, Path]):
-        """Load context from file"""
+    async def load_context(
+        self,
+        filepath: Union[str, Path],
+        recent_turns: Optional[int] = None
+    ):
+        """
+        Load context from file
+        
+        Args:
+            filepath: Context file
+            recent_turns: Load only this many of the latest messages and
+                tool events; load_older_context() pages in the rest
+        """
         filepath = Path(filepath)
         
         if not filepath.exists():
@@ -422,22 +448,40 @@ class BaseAgent(ABC):
             return
             
         # Load from file
-        with open(filepath, 'r') as f:
-            context_data = json.load(f)
+        context_log = self._get_context_log(filepath)
+        state, conversation_history, tool_history = context_log.load(
+            recent_turns
+        )
             
         # Restore context
         self._context = AgentContext(
-            user_id=context_data.get("user_id"),
-            session_id=context_data.get("session_id"),
-            conversation_history=context_data.get("conversation_history", []),
-            tool_history=context_data.get("tool_history", []),
-            metadata=context_data.get("metadata", {}),
+            user_id=state.get("user_id"),
+            session_id=state.get("session_id"),
+            conversation_history=conversation_history,
+            tool_history=tool_history,
+            metadata=state.get("metadata") or {},
             timestamp=datetime.fromisoformat(
-                context_data.get("timestamp", datetime.now().isoformat())
+                state.get("timestamp") or datetime.now().isoformat()
             )
         )
         
         logger.info(f"Context loaded from {filepath}")
+    
+    async def load_older_context(self, count: int) -> int:
+        """
+        Page older history of a partly loaded context in front of it
+        
+        Args:
+            count: Most messages, and most tool events, to load
+            
+        Returns:
+            Number of messages loaded; 0 once the whole history is loaded
+        """
+        if self._context_log is None:
+            return 0
+        return self._context_log.load_older(
+            count, self._context.conversation_history
+        )
 
 
 class SimpleAgent(BaseAgent):
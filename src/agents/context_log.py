@@ -0,0 +1,551 @@
+"""
+Context Log Module
+
+Append-only persistence for agent contexts. Each save appends only the
+messages and tool events added since the previous save, so saving costs
+the same however long the conversation is. Loading can stop after the
+most recent turns and page older history in on demand.
+
+File format, one compact JSON record per line:
+    {"k":"h","v":1}                 header, first line
+    {"k":"m","d":{...}}             conversation message
+    {"k":"t","d":{...}}             tool event
+    {"k":"c","m":2,"t":1,"s":{...}} commit: totals and context state
+
+Every save ends with a commit record. Records after the last complete
+commit belong to a save that was cut short by a crash and are ignored,
+then cut off by the next save.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+LOG_VERSION = 1
+_HEADER = {"k": "h", "v": LOG_VERSION}
+
+# Block size for reading the log from its end
+_READ_BLOCK = 64 * 1024
+
+
+def _encode(record: Dict[str, Any]) -> bytes:
+    return (json.dumps(record, separators=(',', ':'), default=str)
+            + '\n').encode('utf-8')
+
+
+def _decode(line: bytes) -> Optional[Dict[str, Any]]:
+    """Parse a record; None for a torn or foreign line"""
+    try:
+        record = json.loads(line)
+    except (ValueError, UnicodeDecodeError):
+        return None
+    return record if isinstance(record, dict) else None
+
+
+def _fsync_directory(path: Path):
+    """Make a rename in a directory durable, where the OS supports it"""
+    try:
+        fd = os.open(str(path), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _lines_backwards(f, end: int) -> Iterator[Tuple[int, bytes]]:
+    """Yield (offset, line) for the complete lines before end, last first.
+    Text after the last newline before end is a torn line and skipped."""
+    position = end
+    tail = b''
+    torn = True
+    while position > 0:
+        size = min(_READ_BLOCK, position)
+        position -= size
+        f.seek(position)
+        lines = (f.read(size) + tail).split(b'\n')
+        # The first piece may continue in the previous block
+        tail = lines.pop(0)
+        if torn:
+            if not lines:
+                continue
+            lines.pop()
+            torn = False
+        start = position + len(tail) + 1
+        found = []
+        for line in lines:
+            found.append((start, line))
+            start += len(line) + 1
+        for start, line in reversed(found):
+            if line:
+                yield start, line
+    if tail and not torn:
+        yield 0, tail
+
+
+class ContextLog:
+    """
+    Append-only log of one agent context.
+
+    save() compares the lists it is given with the ones it saved or
+    loaded last. If they are the same lists, grown at the end, only the
+    new entries are appended. Any other change rewrites the whole log:
+    replaced or shortened lists, or a log first opened by saving. Entries
+    that were already saved must not be edited in place.
+
+    Appends are flushed right away and fsynced at most every
+    fsync_interval seconds, by a timer for the last one. A crash loses
+    at most that much; the log itself stays readable. When commit records
+    outweigh the history, the log is compacted by rewriting it to a
+    temporary file and renaming that over it.
+    """
+
+    # Compact once commit records take this many bytes and more than the
+    # history itself
+    COMPACT_MIN_BYTES = 256 * 1024
+
+    def __init__(self, path: Union[str, Path], fsync_interval: float = 1.0):
+        """
+        Args:
+            path: Log file
+            fsync_interval: Most seconds between saving and syncing to
+                disk; 0 syncs on every save
+        """
+        self.path = Path(path)
+        self.fsync_interval = fsync_interval
+        self._lock = threading.RLock()
+        self._file = None
+        self._sync_timer: Optional[threading.Timer] = None
+        self._last_sync = 0.0
+        self._dirty = False
+        self._forget()
+
+    def _forget(self):
+        """Drop what is known about the file; the next save rewrites it"""
+        self._valid = False
+        self._messages: Optional[List[Any]] = None
+        self._tools: Optional[List[Any]] = None
+        self._saved_messages = 0  # Totals in the file
+        self._saved_tools = 0
+        self._skipped_messages = 0  # In the file but not loaded
+        self._skipped_tools = 0
+        self._messages_from = 0  # Offset of the oldest loaded record
+        self._tools_from = 0
+        self._state_line = b''
+        self._end = 0  # End of the last commit
+        self._history_bytes = 0
+        self._commit_bytes = 0
+
+    # --- Saving -----------------------------------------------------------
+
+    def save(self, state: Dict[str, Any], messages: List[Any],
+             tools: List[Any]):
+        """
+        Persist a context
+
+        Args:
+            state: Small context fields, stored with every commit
+            messages: Conversation history
+            tools: Tool history
+        """
+        with self._lock:
+            loaded_messages = self._saved_messages - self._skipped_messages
+            loaded_tools = self._saved_tools - self._skipped_tools
+            if (not self._valid or messages is not self._messages or
+                    tools is not self._tools or
+                    len(messages) < loaded_messages or
+                    len(tools) < loaded_tools):
+                self._rewrite(state, messages, tools)
+                return
+
+            state_line = _encode({"k": "s", "d": state})
+            new_messages = messages[loaded_messages:]
+            new_tools = tools[loaded_tools:]
+            if (not new_messages and not new_tools and
+                    state_line == self._state_line):
+                return
+
+            records = [_encode({"k": "m", "d": message})
+                       for message in new_messages]
+            records += [_encode({"k": "t", "d": event}) for event in new_tools]
+            history = sum(len(record) for record in records)
+            self._saved_messages += len(new_messages)
+            self._saved_tools += len(new_tools)
+            commit = self._commit(state)
+            self._state_line = state_line
+
+            f = self._open_for_append()
+            f.write(b''.join(records) + commit)
+            f.flush()
+            self._end += history + len(commit)
+            self._history_bytes += history
+            self._commit_bytes += len(commit)
+            self._dirty = True
+
+            if self._commit_bytes > max(self.COMPACT_MIN_BYTES,
+                                        self._history_bytes):
+                self.compact()
+            else:
+                self._schedule_sync()
+
+    def _commit(self, state: Dict[str, Any]) -> bytes:
+        return _encode({"k": "c", "m": self._saved_messages,
+                        "t": self._saved_tools, "s": state})
+
+    def _open_for_append(self):
+        if self._file is None:
+            self._file = open(self.path, 'r+b')
+            # Cut off a save that a crash left unfinished
+            self._file.truncate(self._end)
+            self._file.seek(self._end)
+        return self._file
+
+    def _rewrite(self, state: Dict[str, Any], messages: List[Any],
+                 tools: List[Any]):
+        """Write the whole context as a new log"""
+        self._close_file()
+        self._forget()
+        header = _encode(_HEADER)
+        records = [_encode({"k": "m", "d": message}) for message in messages]
+        tool_records = [_encode({"k": "t", "d": event}) for event in tools]
+        self._saved_messages = len(messages)
+        self._saved_tools = len(tools)
+        commit = self._commit(state)
+
+        def write(f):
+            f.write(header)
+            f.writelines(records)
+            f.writelines(tool_records)
+            f.write(commit)
+
+        self._replace(write)
+        self._messages_from = len(header)
+        self._tools_from = len(header) + sum(len(r) for r in records)
+        self._history_bytes = self._tools_from + sum(
+            len(r) for r in tool_records)
+        self._commit_bytes = len(commit)
+        self._end = self._history_bytes + len(commit)
+        self._messages, self._tools = messages, tools
+        self._state_line = _encode({"k": "s", "d": state})
+        self._valid = True
+
+    def compact(self):
+        """Rewrite the log without the commit records of earlier saves"""
+        with self._lock:
+            if not self._valid:
+                return
+            self._close_file()
+            commit = self._commit(json.loads(self._state_line)["d"])
+            offsets = {}
+
+            def write(f):
+                size = 0
+                read = 0
+                with open(self.path, 'rb') as source:
+                    for line in source:
+                        read += len(line)
+                        if read > self._end:
+                            break
+                        record = _decode(line)
+                        if record is None or record.get("k") == "c":
+                            continue
+                        kind = record.get("k")
+                        if kind in ("m", "t"):
+                            offsets.setdefault(kind, [])
+                            offsets[kind].append(size)
+                        f.write(line)
+                        size += len(line)
+                f.write(commit)
+                offsets["size"] = size
+
+            self._replace(write)
+            # Loaded records keep their order, so their offsets follow
+            message_offsets = offsets.get("m", [])
+            tool_offsets = offsets.get("t", [])
+            self._messages_from = (
+                message_offsets[self._skipped_messages]
+                if self._skipped_messages < len(message_offsets)
+                else offsets["size"])
+            self._tools_from = (
+                tool_offsets[self._skipped_tools]
+                if self._skipped_tools < len(tool_offsets)
+                else offsets["size"])
+            self._history_bytes = offsets["size"]
+            self._commit_bytes = len(commit)
+            self._end = offsets["size"] + len(commit)
+            logger.debug(f"Compacted context log {self.path} "
+                         f"to {self._end} bytes")
+
+    def _replace(self, write):
+        """Write a new version of the log next to it and rename it over"""
+        self._cancel_sync()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_name(self.path.name + '.tmp')
+        with open(temporary, 'wb') as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, self.path)
+        _fsync_directory(self.path.parent)
+        self._dirty = False
+        self._last_sync = time.monotonic()
+
+    # --- Syncing ----------------------------------------------------------
+
+    def _schedule_sync(self):
+        elapsed = time.monotonic() - self._last_sync
+        if elapsed >= self.fsync_interval:
+            self.sync()
+        elif self._sync_timer is None:
+            self._sync_timer = threading.Timer(
+                self.fsync_interval - elapsed, self.sync)
+            self._sync_timer.daemon = True
+            self._sync_timer.start()
+
+    def _cancel_sync(self):
+        if self._sync_timer is not None:
+            self._sync_timer.cancel()
+            self._sync_timer = None
+
+    @property
+    def sync_pending(self) -> bool:
+        """True while saved records may not have reached the disk"""
+        return self._dirty
+
+    def sync(self):
+        """Sync appended records to disk now"""
+        with self._lock:
+            self._cancel_sync()
+            if self._dirty and self._file is not None:
+                os.fsync(self._file.fileno())
+            self._dirty = False
+            self._last_sync = time.monotonic()
+
+    def _close_file(self):
+        self.sync()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def close(self):
+        """Sync and close the log"""
+        with self._lock:
+            self._close_file()
+
+    # --- Loading ----------------------------------------------------------
+
+    def load(self, recent_turns: Optional[int] = None
+             ) -> Optional[Tuple[Dict[str, Any], List[Any], List[Any]]]:
+        """
+        Load a context
+
+        Args:
+            recent_turns: Load only this many of the latest messages and
+                tool events; load_older() pages in the rest
+
+        Returns:
+            (state, messages, tools), or None if there is no log file
+        """
+        with self._lock:
+            self._close_file()
+            self._forget()
+            if not self.path.exists():
+                return None
+            with open(self.path, 'rb') as f:
+                first = f.readline()
+                header = _decode(first)
+                if header is None or header.get("k") != "h":
+                    # Not a log; saving rewrites it as one
+                    return self._load_legacy(f)
+                if recent_turns is None:
+                    loaded = self._load_all(f, len(first))
+                else:
+                    loaded = self._load_recent(f, len(first), recent_turns)
+            state, messages, tools = loaded
+            self._messages, self._tools = messages, tools
+            self._state_line = _encode({"k": "s", "d": state})
+            self._valid = True
+            return loaded
+
+    def _load_legacy(self, f):
+        """Read a whole-context JSON file; the next save converts it"""
+        f.seek(0)
+        data = json.load(f)
+        state = {key: data.get(key)
+                 for key in ("user_id", "session_id", "metadata", "timestamp")}
+        return (state, data.get("conversation_history", []),
+                data.get("tool_history", []))
+
+    def _load_all(self, f, start: int):
+        last = self._find_last_commit(f)
+        if last is None:
+            self._end = self._messages_from = self._tools_from = start
+            self._history_bytes = start
+            return {}, [], []
+        commit, end = last
+        f.seek(start)
+        body = f.read(end - start)
+        try:
+            # json.dumps never writes a raw newline, so the committed
+            # lines parse in one go as an array
+            records = json.loads(
+                b'[' + body.rstrip(b'\n').replace(b'\n', b',') + b']')
+            messages = [r["d"] for r in records if r["k"] == "m"]
+            tools = [r["d"] for r in records if r["k"] == "t"]
+        except (ValueError, KeyError, TypeError):
+            # A damaged line; keep what comes before it
+            f.seek(start)
+            return self._load_lines(f, start)
+        commits = len(records) - len(messages) - len(tools)
+        self._saved_messages = len(messages)
+        self._saved_tools = len(tools)
+        self._messages_from = self._tools_from = start
+        self._end = end
+        # Commits all have about the size of the last one
+        self._commit_bytes = commits * len(self._commit(commit.get("s")))
+        self._history_bytes = end - self._commit_bytes
+        return commit.get("s") or {}, messages, tools
+
+    def _load_lines(self, f, start: int):
+        """Read the log record by record, up to the first damaged line"""
+        state: Dict[str, Any] = {}
+        messages: List[Any] = []
+        tools: List[Any] = []
+        pending_messages: List[Any] = []
+        pending_tools: List[Any] = []
+        offset = end = start
+        history = commits = 0
+        pending_history = 0
+        for line in f:
+            offset += len(line)
+            if not line.endswith(b'\n'):
+                break
+            record = _decode(line)
+            if record is None:
+                break
+            kind = record.get("k")
+            if kind == "m":
+                pending_messages.append(record.get("d"))
+                pending_history += len(line)
+            elif kind == "t":
+                pending_tools.append(record.get("d"))
+                pending_history += len(line)
+            elif kind == "c":
+                messages.extend(pending_messages)
+                tools.extend(pending_tools)
+                pending_messages, pending_tools = [], []
+                history += pending_history
+                pending_history = 0
+                commits += len(line)
+                state = record.get("s") or {}
+                end = offset
+        self._saved_messages = len(messages)
+        self._saved_tools = len(tools)
+        self._messages_from = self._tools_from = start
+        self._end = end
+        self._history_bytes = start + history
+        self._commit_bytes = commits
+        return state, messages, tools
+
+    def _find_last_commit(self, f) -> Optional[Tuple[Dict[str, Any], int]]:
+        """Find the last complete commit record and the offset after it"""
+        f.seek(0, os.SEEK_END)
+        for offset, line in _lines_backwards(f, f.tell()):
+            if not line.startswith(b'{"k":"c"'):
+                continue
+            record = _decode(line)
+            if record is not None:
+                return record, offset + len(line) + 1
+        return None
+
+    def _load_recent(self, f, start: int, count: int):
+        last = self._find_last_commit(f)
+        if last is None:
+            self._end = self._messages_from = self._tools_from = start
+            self._history_bytes = start
+            return {}, [], []
+        commit, self._end = last
+
+        self._saved_messages = commit.get("m", 0)
+        self._saved_tools = commit.get("t", 0)
+        self._messages_from = self._tools_from = self._end
+        # Capped by what was saved, or a short history is searched for
+        # all the way back to the header
+        messages = self._read_back(
+            f, "m", self._end, min(count, self._saved_messages))
+        tools = self._read_back(
+            f, "t", self._end, min(count, self._saved_tools))
+        self._skipped_messages = self._saved_messages - len(messages)
+        self._skipped_tools = self._saved_tools - len(tools)
+        # Unknown without reading it all; compaction waits for the
+        # commits appended from now on to outweigh the whole file
+        self._history_bytes = self._end
+        return commit.get("s") or {}, messages, tools
+
+    def _read_back(self, f, kind: str, end: int, count: int) -> List[Any]:
+        """Read up to count records of a kind before an offset, oldest
+        first, and remember where the oldest one starts"""
+        found = []
+        if count <= 0:
+            return found
+        prefix = b'{"k":"%s"' % kind.encode()
+        for offset, line in _lines_backwards(f, end):
+            # Records are written compactly, so the kind is a prefix
+            if not line.startswith(prefix):
+                continue
+            record = _decode(line)
+            if record is None:
+                continue
+            found.append(record.get("d"))
+            if kind == "m":
+                self._messages_from = offset
+            else:
+                self._tools_from = offset
+            if len(found) >= count:
+                break
+        found.reverse()
+        return found
+
+    def load_older(self, count: int,
+                   messages: Optional[List[Any]] = None) -> int:
+        """
+        Page older history into the loaded lists, in front of what is there
+
+        Args:
+            count: Most messages, and most tool events, to add
+            messages: If given, only page in when these are the loaded
+                messages rather than a context that replaced them
+
+        Returns:
+            Number of messages added
+        """
+        with self._lock:
+            if (not self._valid or self._messages is None or
+                    (messages is not None and messages is not self._messages)):
+                return 0
+            with open(self.path, 'rb') as f:
+                messages = self._read_back(
+                    f, "m", self._messages_from,
+                    min(count, self._skipped_messages))
+                tools = self._read_back(
+                    f, "t", self._tools_from,
+                    min(count, self._skipped_tools))
+            self._messages[:0] = messages
+            self._tools[:0] = tools
+            self._skipped_messages -= len(messages)
+            self._skipped_tools -= len(tools)
+            return len(messages)
+
+    @property
+    def unloaded_messages(self) -> int:
+        """Messages in the log that have not been loaded yet"""
+        return self._skipped_messages
@@ -213,26 +213,60 @@ class OllamaAgent(BaseAgent):
                 messages=self._get_conversation_messages(effective_system_prompt)
             )
             
+            # Limit tool calls to prevent runaway execution
+            max_tool_calls = 5  # Limit to 5 tool calls per message
+            
+            # Tools started while the model is still streaming
+            early_tool_tasks = []
+            
+            async def handle_after(previous, tool_calls):
+                # Calls of one reply run in order, as they did all at once
+                if previous is not None:
+                    await asyncio.wait([previous])
+                return await self._handle_tool_calls(tool_calls)
+            
+            def dispatch_tool_call(tool_call: Dict[str, Any]):
+                if use_tools and len(early_tool_tasks) < max_tool_calls:
+                    logger.info(f"[OllamaAgent] Dispatching {tool_call.get('name')} while streaming")
+                    previous = early_tool_tasks[-1] if early_tool_tasks else None
+                    early_tool_tasks.append(asyncio.ensure_future(
+                        handle_after(previous, [tool_call])
+                    ))
+            
             # Generate response
             logger.info(f"[OllamaAgent] Generating response with stream: {bool(stream_callback)}")
-            if stream_callback:
-                response = await self.model.stream_generate(request, stream_callback)
-            else:
-                response = await self.model.generate(request)
+            try:
+                if stream_callback:
+                    response = await self.model.stream_generate(
+                        request, stream_callback, dispatch_tool_call
+                    )
+                else:
+                    response = await self.model.generate(request)
+            except BaseException:
+                for task in early_tool_tasks:
+                    task.cancel()
+                raise
             logger.info(f"[OllamaAgent] Response generated successfully")
             
             # Handle tool calls if present
             final_response = response.content
             tool_results = []
             
-            if response.tool_calls and use_tools:
-                # Limit tool calls to prevent runaway execution
-                max_tool_calls = 5  # Limit to 5 tool calls per message
+            if (response.tool_calls or early_tool_tasks) and use_tools:
+                response.tool_calls = response.tool_calls or []
                 if len(response.tool_calls) > max_tool_calls:
                     logger.warning(f"Too many tool calls ({len(response.tool_calls)}), limiting to {max_tool_calls}")
                     response.tool_calls = response.tool_calls[:max_tool_calls]
                 
-                tool_results = await self._handle_tool_calls(response.tool_calls)
+                # Tools dispatched early are only waited for; the rest run now
+                results = await asyncio.gather(
+                    *early_tool_tasks,
+                    handle_after(
+                        early_tool_tasks[-1] if early_tool_tasks else None,
+                        response.tool_calls[len(early_tool_tasks):]
+                    )
+                )
+                tool_results = [result for batch in results for result in batch]
                 
                 # If tools were executed, generate a follow-up response
                 if tool_results:
@@ -82,10 +82,13 @@ class OllamaModelAdapterCompat(ModelInterface):
     async def stream_generate(
         self, 
         request: ModelRequest,
-        callback: Callable[[str], None]
+        callback: Callable[[str], None],
+        on_tool_call: Optional[Callable[[Dict[str, Any]], None]] = None
     ) -> ModelResponse:
         """Generate a streaming response using Ollama"""
-        return await self._unified_interface.stream_generate(request, callback)
+        return await self._unified_interface.stream_generate(
+            request, callback, on_tool_call
+        )
 
     def get_capabilities(self) -> List[ModelCapabilities]:
         """Get model capabilities"""
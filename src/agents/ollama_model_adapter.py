@@ -19,6 +19,8 @@ from ..tools.abstraction.model_interface import (
     StandardModelAdapter
 )
 from .ollama_wrapper import OllamaWrapper, OllamaStatus, GenerationResponse
+from .tool_call_parser import ToolCallStreamParser, parse_tool_calls
+from ..utils.async_bridge import iterate_in_thread
 
 logger = logging.getLogger(__name__)
 
@@ -196,9 +198,15 @@ class OllamaModelAdapter(ModelInterface):
     async def stream_generate(
         self, 
         request: ModelRequest,
-        callback: Callable[[str], None]
+        callback: Callable[[str], None],
+        on_tool_call: Optional[Callable[[Dict[str, Any]], None]] = None
     ) -> ModelResponse:
-        """Generate a streaming response using Ollama"""
+        """
+        Generate a streaming response using Ollama
+        
+        Tool calls are parsed as the chunks arrive; on_tool_call is called
+        with each one as soon as its JSON object is complete.
+        """
         if not self._is_initialized:
             return ModelResponse(
                 content="",
@@ -217,88 +225,67 @@ class OllamaModelAdapter(ModelInterface):
             
             # Stream generation
             full_content = []
+            tool_parser = ToolCallStreamParser()
             start_time = datetime.now()
             
             # Check if this is chat mode (has messages) or generate mode (has prompt)
             if 'messages' in ollama_request:
                 # Chat mode - use stream_chat
                 if hasattr(self.ollama, 'stream_chat_async'):
-                    async for chunk in self.ollama.stream_chat_async(**ollama_request):
-                        content = self._extract_chunk_content(chunk)
-                        if content:
-                            full_content.append(content)
-                            callback(content)
+                    chunks = self.ollama.stream_chat_async(**ollama_request)
                 else:
-                    # Fallback to sync chat streaming - run in thread but call callback directly
-                    import threading
-                    
-                    def sync_stream():
-                        try:
-                            messages = ollama_request.pop('messages')
-                            logger.info(f"[OllamaModelAdapter] Starting sync chat streaming with {len(messages)} messages")
-                            for i, chunk in enumerate(self.ollama.stream_chat(messages, **ollama_request)):
-                                content = self._extract_chunk_content(chunk)
-                                if content:
-                                    full_content.append(content)
-                                    logger.debug(f"[OllamaModelAdapter] Streaming chunk {i}: '{content[:20]}...'")
-                                    # Call callback immediately during streaming
-                                    try:
-                                        callback(content)
-                                    except Exception as e:
-                                        logger.warning(f"Stream callback failed: {e}")
-                            logger.info(f"[OllamaModelAdapter] Sync chat streaming complete, {len(full_content)} chunks")
-                        except Exception as e:
-                            logger.error(f"Sync streaming failed: {e}")
-                    
-                    # Run in thread and wait for completion
-                    thread = threading.Thread(target=sync_stream, daemon=True)
-                    thread.start()
-                    thread.join()  # Wait for streaming to complete
+                    # Fallback to sync chat streaming on a worker thread,
+                    # handing chunks over without blocking the event loop
+                    messages = ollama_request.pop('messages')
+                    logger.info(f"[OllamaModelAdapter] Starting sync chat streaming with {len(messages)} messages")
+                    chunks = iterate_in_thread(
+                        lambda: self.ollama.stream_chat(messages, **ollama_request),
+                        name="ollama-stream-chat"
+                    )
             else:
                 # Generate mode - use stream_generate
+                # Extract prompt as positional argument
+                prompt = ollama_request.pop('prompt', '')
                 if hasattr(self.ollama, 'stream_generate_async'):
-                    # Extract prompt as positional argument
-                    prompt = ollama_request.pop('prompt', '')
-                    async for chunk in self.ollama.stream_generate_async(prompt, **ollama_request):
-                        content = self._extract_chunk_content(chunk)
-                        if content:
-                            full_content.append(content)
-                            callback(content)
+                    chunks = self.ollama.stream_generate_async(prompt, **ollama_request)
                 else:
-                    # Fallback to sync streaming - run in thread but call callback directly
-                    import threading
-                    
-                    def sync_stream():
+                    # Fallback to sync streaming on a worker thread
+                    logger.info(f"[OllamaModelAdapter] Starting sync generate streaming with prompt: '{prompt[:50]}...'")
+                    chunks = iterate_in_thread(
+                        lambda: self.ollama.stream_generate(prompt, **ollama_request),
+                        name="ollama-stream-generate"
+                    )
+            
+            try:
+                async for chunk in chunks:
+                    content = self._extract_chunk_content(chunk)
+                    if content:
+                        full_content.append(content)
+                        # Call callback immediately during streaming
                         try:
-                            # Extract prompt as positional argument
-                            prompt = ollama_request.pop('prompt', '')
-                            logger.info(f"[OllamaModelAdapter] Starting sync generate streaming with prompt: '{prompt[:50]}...'")
-                            for i, chunk in enumerate(self.ollama.stream_generate(prompt, **ollama_request)):
-                                content = self._extract_chunk_content(chunk)
-                                if content:
-                                    full_content.append(content)
-                                    logger.debug(f"[OllamaModelAdapter] Streaming chunk {i}: '{content[:20]}...'")
-                                    # Call callback immediately during streaming
-                                    try:
-                                        callback(content)
-                                    except Exception as e:
-                                        logger.warning(f"Stream callback failed: {e}")
-                            logger.info(f"[OllamaModelAdapter] Sync generate streaming complete, {len(full_content)} chunks")
+                            callback(content)
                         except Exception as e:
-                            logger.error(f"Sync streaming failed: {e}")
-                
-                    # Run in thread and wait for completion
-                    thread = threading.Thread(target=sync_stream, daemon=True)
-                    thread.start()
-                    thread.join()  # Wait for streaming to complete
+                            logger.warning(f"Stream callback failed: {e}")
+                        for tool_call in tool_parser.feed(content):
+                            if on_tool_call is not None:
+                                try:
+                                    on_tool_call(tool_call)
+                                except Exception as e:
+                                    logger.warning(f"Tool call callback failed: {e}")
+            finally:
+                # Stops a bridged stream when this coroutine is cancelled
+                aclose = getattr(chunks, 'aclose', None)
+                if aclose is not None:
+                    await aclose()
+            logger.debug(f"[OllamaModelAdapter] Streaming complete, {len(full_content)} chunks")
             
             end_time = datetime.now()
             generation_time = (end_time - start_time).total_seconds()
             
             final_content = "".join(full_content)
             
-            # Check for tool calls in the response
-            tool_calls = self._extract_tool_calls(final_content)
+            # Tool calls found while streaming
+            tool_calls = tool_parser.tool_calls or None
             
             return ModelResponse(
                 content=final_content,
@@ -562,56 +549,7 @@ Always explain what you're doing and provide helpful responses based on tool res
     
     def _extract_tool_calls(self, content: str) -> Optional[List[Dict[str, Any]]]:
         """Extract tool calls from model response"""
-        if not content:
-            return None
-        
-        tool_calls = []
-        
-        # Look for JSON tool call patterns - use simpler, safer approach
-        import re
-        
-        try:
-            # Look for any JSON-like structure containing "tool_call"
-            # Use a more robust approach to find JSON blocks
-            json_blocks = []
-            
-            # Find potential JSON blocks (balanced braces)
-            brace_count = 0
-            start_pos = -1
-            
-            for i, char in enumerate(content):
-                if char == '{':
-                    if brace_count == 0:
-                        start_pos = i
-                    brace_count += 1
-                elif char == '}':
-                    brace_count -= 1
-                    if brace_count == 0 and start_pos != -1:
-                        json_candidate = content[start_pos:i+1]
-                        if '"tool_call"' in json_candidate:
-                            json_blocks.append(json_candidate)
-            
-            # Parse each JSON block
-            for json_str in json_blocks:
-                try:
-                    parsed = json.loads(json_str)
-                    if isinstance(parsed, dict) and "tool_call" in parsed:
-                        tool_call = parsed["tool_call"]
-                        if isinstance(tool_call, dict) and "name" in tool_call:
-                            tool_calls.append({
-                                "name": tool_call["name"],
-                                "parameters": tool_call.get("parameters", {})
-                            })
-                except json.JSONDecodeError:
-                    continue
-                except Exception as e:
-                    logger.warning(f"Error parsing tool call JSON: {e}")
-                    continue
-            
-        except Exception as e:
-            logger.warning(f"Error in tool call extraction: {e}")
-        
-        return tool_calls if tool_calls else None
+        return parse_tool_calls(content)
     
     async def shutdown(self):
         """Shutdown the adapter"""
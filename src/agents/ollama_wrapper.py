@@ -19,6 +19,7 @@ import json
 import logging
 import subprocess
 import platform
+import threading
 from typing import Optional, Dict, Any, List, Iterator, Union, Callable
 from pathlib import Path
 from enum import Enum
@@ -87,6 +88,16 @@ class ModelInfo:
     details: Optional[Dict[str, Any]] = None
 
 
+class _ModelListFetch:
+    """One /api/tags request in flight, shared by everyone who asks
+    for the model list while it runs"""
+
+    def __init__(self, generation: int):
+        self.generation = generation
+        self.done = threading.Event()
+        self.models: List[ModelInfo] = []
+
+
 class OllamaWrapper:
     """
     Main Ollama wrapper class for DinoAir integration
@@ -113,7 +124,17 @@ class OllamaWrapper:
         self._client: Optional[Any] = None  # Use Any to avoid type issues
         self._service_status = OllamaStatus.CHECKING
         self._current_model: Optional[str] = None
+        # Model list cache, with lookups by "name:tag" and by bare name
+        self._models: Optional[List[ModelInfo]] = None
+        self._models_fetched_at = 0.0
+        self._models_generation = 0
+        self._models_fetch: Optional[_ModelListFetch] = None
+        self._models_lock = threading.Lock()
         self._model_cache: Dict[str, ModelInfo] = {}
+        self._model_names: Dict[str, ModelInfo] = {}
+        self._models_changed_callbacks: List[
+            Callable[[List[str], List[str]], None]
+        ] = []
         self._chat_context: List[ChatMessage] = []
         self._is_initialized = False
         
@@ -137,7 +158,8 @@ class OllamaWrapper:
             'top_k': 40,
             'repeat_penalty': 1.1,
             'stream': True,
-            'verbose': False
+            'verbose': False,
+            'model_list_ttl': 30.0
         }
         
         # Try to load from app_config.json
@@ -228,6 +250,10 @@ class OllamaWrapper:
             logger.debug(f"_check_service: Attempting to connect to {self._host}")
             response = self._client.list()
             logger.info(f"_check_service: Successfully connected, found {len(response.get('models', []))} models")
+            # The health check already fetched the model list
+            with self._models_lock:
+                generation = self._models_generation
+            self._store_models(self._parse_models(response), generation)
             return True
         except Exception as e:
             logger.warning(f"_check_service: Service check failed - {type(e).__name__}: {e}")
@@ -388,74 +414,166 @@ class OllamaWrapper:
             logger.error(f"start_service: Failed to start Ollama service - {type(e).__name__}: {e}")
             return False
     
-    def list_models(self) -> List[ModelInfo]:
+    def list_models(self, refresh: bool = False) -> List[ModelInfo]:
         """
         List all available models
         
+        The list is cached for model_list_ttl seconds. Concurrent callers
+        share a single request, and pulling or removing a model through
+        this wrapper refreshes it.
+        
+        Args:
+            refresh: Fetch the list even if the cached one is fresh
+        
         Returns:
             List of ModelInfo objects
         """
         if not self.is_ready:
             logger.warning("Ollama not ready, cannot list models")
             return []
+        
+        with self._models_lock:
+            if refresh:
+                self._models_generation += 1
+            elif (self._models is not None and
+                    time.monotonic() - self._models_fetched_at
+                    < self._config.get('model_list_ttl', 30.0)):
+                return list(self._models)
             
+            fetch = self._models_fetch
+            leader = (fetch is None or
+                      fetch.generation != self._models_generation)
+            if leader:
+                fetch = _ModelListFetch(self._models_generation)
+                self._models_fetch = fetch
+        
+        if not leader:
+            # Another caller is fetching the list; wait for its result
+            fetch.done.wait()
+            return list(fetch.models)
+        
         try:
             logger.debug("list_models: Calling API to list models")
-            response = self._client.list()
-            logger.info(f"list_models: Raw API response: {response}")
-            
-            models = []
-            model_list = response.get('models', [])
-            logger.info(f"list_models: Found {len(model_list)} models in response")
-            
-            for idx, model_data in enumerate(model_list):
-                logger.debug(f"list_models: Processing model {idx}: {model_data}")
-                # Handle both dict and Model object formats
-                if hasattr(model_data, 'model'):
-                    # It's a Model object from the Ollama library
-                    name = model_data.model
-                    size = model_data.size if hasattr(model_data, 'size') else 0
-                    digest = model_data.digest if hasattr(model_data, 'digest') else ''
-                    modified = str(model_data.modified_at) if hasattr(model_data, 'modified_at') else ''
-                    details = model_data.details.__dict__ if hasattr(model_data, 'details') else {}
-                else:
-                    # It's a dictionary (fallback for compatibility)
-                    name = model_data.get('name', '')
-                    size = model_data.get('size', 0)
-                    digest = model_data.get('digest', '')
-                    modified = model_data.get('modified_at', '')
-                    details = model_data.get('details', {})
-                
-                # Parse model name and tag
-                if ':' in name:
-                    model_name = name.split(':')[0]
-                    model_tag = name.split(':')[1]
-                else:
-                    model_name = name
-                    model_tag = 'latest'
-                
-                logger.debug(f"list_models: Parsed name='{model_name}', tag='{model_tag}' from '{name}'")
-                
-                model_info = ModelInfo(
-                    name=model_name,
-                    tag=model_tag,
-                    size=size,
-                    digest=digest,
-                    modified=modified,
-                    details=details
-                )
-                models.append(model_info)
-                # Cache model info
-                self._model_cache[name] = model_info
-                
-            logger.info(f"list_models: Returning {len(models)} parsed models")
-            return models
-            
+            fetch.models = self._parse_models(self._client.list())
+            self._store_models(fetch.models, fetch.generation)
+            logger.debug(f"list_models: Returning {len(fetch.models)} parsed models")
         except Exception as e:
             logger.error(f"list_models: Failed with exception - {type(e).__name__}: {e}")
             import traceback
             logger.error(f"list_models: Traceback:\n{traceback.format_exc()}")
-            return []
+        finally:
+            with self._models_lock:
+                if self._models_fetch is fetch:
+                    self._models_fetch = None
+            fetch.done.set()
+        return list(fetch.models)
+    
+    def _parse_models(self, response: Any) -> List[ModelInfo]:
+        """Convert an /api/tags response into ModelInfo objects"""
+        models = []
+        model_list = response.get('models', [])
+        logger.debug(f"list_models: Found {len(model_list)} models in response")
+        
+        for idx, model_data in enumerate(model_list):
+            logger.debug(f"list_models: Processing model {idx}: {model_data}")
+            # Handle both dict and Model object formats
+            if hasattr(model_data, 'model'):
+                # It's a Model object from the Ollama library
+                name = model_data.model
+                size = model_data.size if hasattr(model_data, 'size') else 0
+                digest = model_data.digest if hasattr(model_data, 'digest') else ''
+                modified = str(model_data.modified_at) if hasattr(model_data, 'modified_at') else ''
+                details = model_data.details.__dict__ if hasattr(model_data, 'details') else {}
+            else:
+                # It's a dictionary (fallback for compatibility)
+                name = model_data.get('name', '')
+                size = model_data.get('size', 0)
+                digest = model_data.get('digest', '')
+                modified = model_data.get('modified_at', '')
+                details = model_data.get('details', {})
+            
+            # Parse model name and tag
+            if ':' in name:
+                model_name = name.split(':')[0]
+                model_tag = name.split(':')[1]
+            else:
+                model_name = name
+                model_tag = 'latest'
+            
+            logger.debug(f"list_models: Parsed name='{model_name}', tag='{model_tag}' from '{name}'")
+            
+            models.append(ModelInfo(
+                name=model_name,
+                tag=model_tag,
+                size=size,
+                digest=digest,
+                modified=modified,
+                details=details
+            ))
+        return models
+    
+    def _store_models(self, models: List[ModelInfo], generation: int):
+        """Cache a fetched model list and report what changed"""
+        by_full_name = {}
+        by_name = {}
+        for model in models:
+            by_full_name[f"{model.name}:{model.tag}"] = model
+            by_name.setdefault(model.name, model)
+        
+        with self._models_lock:
+            if generation != self._models_generation:
+                # A refresh was asked for while this list was fetched
+                return
+            previous = self._model_cache if self._models is not None else None
+            self._models = models
+            self._models_fetched_at = time.monotonic()
+            self._model_cache = by_full_name
+            self._model_names = by_name
+            callbacks = list(self._models_changed_callbacks)
+        
+        if previous is None:
+            return
+        added = [name for name in by_full_name if name not in previous]
+        removed = [name for name in previous if name not in by_full_name]
+        if not (added or removed):
+            return
+        logger.info(f"Models changed: added {added}, removed {removed}")
+        for callback in callbacks:
+            try:
+                callback(added, removed)
+            except Exception as e:
+                logger.error(f"Models changed callback failed: {e}")
+    
+    def invalidate_models(self):
+        """Forget the cached model list; the next list_models fetches it"""
+        with self._models_lock:
+            self._models_generation += 1
+            self._models_fetched_at = 0.0
+    
+    def add_models_changed_callback(
+            self, callback: Callable[[List[str], List[str]], None]):
+        """
+        Add a callback for changes to the model list
+        
+        Args:
+            callback: Called with the "name:tag" of the models that were
+                      added and removed, whenever a fetched list differs
+                      from the cached one
+        """
+        self._models_changed_callbacks.append(callback)
+    
+    def remove_models_changed_callback(
+            self, callback: Callable[[List[str], List[str]], None]):
+        """Remove a callback added with add_models_changed_callback"""
+        if callback in self._models_changed_callbacks:
+            self._models_changed_callbacks.remove(callback)
+    
+    def _find_model(self, model_name: str) -> Optional[ModelInfo]:
+        """Look a model up by "name:tag" or bare name in the model list"""
+        self.list_models()
+        return (self._model_cache.get(model_name) or
+                self._model_names.get(model_name) or
+                self._model_names.get(model_name.split(':')[0]))
     
     def model_exists(self, model_name: str) -> bool:
         """
@@ -467,12 +585,7 @@ class OllamaWrapper:
         Returns:
             True if model exists
         """
-        models = self.list_models()
-        model_names = [m.name for m in models] + [
-            f"{m.name}:{m.tag}" for m in models
-        ]
-        return (model_name in model_names or
-                model_name.split(':')[0] in model_names)
+        return self._find_model(model_name) is not None
     
     def download_model(
             self,
@@ -522,6 +635,8 @@ class OllamaWrapper:
                     )
             
             logger.info(f"Model {model_name} downloaded successfully")
+            # Pick the new model up and tell listeners about it
+            self.list_models(refresh=True)
             return True
             
         except Exception as e:
@@ -574,9 +689,8 @@ class OllamaWrapper:
             # Delete the model
             self._client.delete(model_name)
             
-            # Clear from cache
-            if model_name in self._model_cache:
-                del self._model_cache[model_name]
+            # Drop it from the cached list and tell listeners
+            self.list_models(refresh=True)
                 
             logger.info(f"Model {model_name} removed successfully")
             return True
@@ -1033,18 +1147,9 @@ class OllamaWrapper:
         Returns:
             ModelInfo object or None if not found
         """
-        # Check cache first
-        if model_name in self._model_cache:
-            return self._model_cache[model_name]
-            
-        # Refresh model list
-        models = self.list_models()
-        for model in models:
-            full_name = f"{model.name}:{model.tag}"
-            if model.name == model_name or full_name == model_name:
-                return model
-                
-        return None
+        self.list_models()
+        return (self._model_cache.get(model_name) or
+                self._model_names.get(model_name))
     
     def get_status(self) -> Dict[str, Any]:
         """
@@ -0,0 +1,169 @@
+"""
+Tool Call Parser
+
+Finds tool calls in model output while it streams. Text is fed chunk by
+chunk, and each tool call is returned as soon as its JSON object closes,
+so a tool can be dispatched while the model is still generating.
+"""
+
+import json
+import logging
+import re
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Characters that matter outside and inside JSON strings of an object
+_STRUCTURE = re.compile(r'[{}"]')
+_STRING_END = re.compile(r'["\\]')
+
+
+def tool_call_from_json(parsed: Any) -> Optional[Dict[str, Any]]:
+    """
+    Read a tool call from a parsed JSON object
+
+    Supports both formats models are prompted with:
+    - {"tool": "tool_name", "parameters": {...}}
+    - {"tool_call": {"name": "tool_name", "parameters": {...}}}
+
+    Returns:
+        {"name": ..., "parameters": {...}}, or None if it is not a tool call
+    """
+    if not isinstance(parsed, dict):
+        return None
+    if isinstance(parsed.get("tool"), str):
+        name, parameters = parsed["tool"], parsed.get("parameters", {})
+    elif isinstance(parsed.get("tool_call"), dict):
+        tool_call = parsed["tool_call"]
+        name, parameters = tool_call.get("name"), tool_call.get("parameters", {})
+    else:
+        return None
+    if not name:
+        return None
+    return {
+        "name": name,
+        "parameters": parameters if isinstance(parameters, dict) else {}
+    }
+
+
+class ToolCallStreamParser:
+    """
+    Incremental parser for tool calls embedded in model output
+
+    Tracks the nesting of top-level JSON objects across chunks. Braces
+    and escaped quotes inside JSON strings are skipped, so parameters
+    such as code snippets do not throw the nesting off. Text outside
+    objects is not kept; only the object being read is buffered.
+
+    Usage:
+        parser = ToolCallStreamParser()
+        for chunk in stream:
+            for tool_call in parser.feed(chunk):
+                dispatch(tool_call)
+        parser.tool_calls  # every call found
+    """
+
+    def __init__(self):
+        self.tool_calls: List[Dict[str, Any]] = []
+        self._parts: List[str] = []  # Pieces of the object being read
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Parse the next chunk of output
+
+        Args:
+            text: Next piece of the model output
+
+        Returns:
+            Tool calls whose objects were completed by this chunk
+        """
+        found = []
+        if not text:
+            return found
+        pos = 0
+        start = 0 if self._depth else -1
+        end = len(text)
+        while pos < end:
+            if self._depth == 0:
+                # Outside any object only an opening brace matters
+                pos = text.find('{', pos)
+                if pos == -1:
+                    break
+                start = pos
+                self._depth = 1
+                pos += 1
+            elif self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                    pos += 1
+                    continue
+                match = _STRING_END.search(text, pos)
+                if match is None:
+                    pos = end
+                    break
+                pos = match.end()
+                if match.group() == '\\':
+                    self._escaped = True
+                else:
+                    self._in_string = False
+            else:
+                match = _STRUCTURE.search(text, pos)
+                if match is None:
+                    pos = end
+                    break
+                pos = match.end()
+                char = match.group()
+                if char == '"':
+                    self._in_string = True
+                elif char == '{':
+                    self._depth += 1
+                else:
+                    self._depth -= 1
+                    if self._depth == 0:
+                        self._parts.append(text[start:pos])
+                        tool_call = self._close_object()
+                        if tool_call is not None:
+                            found.append(tool_call)
+                        start = -1
+        if self._depth and start != -1:
+            self._parts.append(text[start:])
+        self.tool_calls.extend(found)
+        return found
+
+    def _close_object(self) -> Optional[Dict[str, Any]]:
+        candidate = "".join(self._parts)
+        self._parts = []
+        if '"tool' not in candidate:
+            return None
+        try:
+            tool_call = tool_call_from_json(json.loads(candidate))
+        except json.JSONDecodeError as e:
+            logger.debug(f"Failed to parse JSON candidate: {candidate[:50]}... Error: {e}")
+            return None
+        if tool_call is not None:
+            logger.debug(f"Parsed tool call: {tool_call['name']}")
+        return tool_call
+
+    def reset(self):
+        """Forget all state, e.g. before parsing another response"""
+        self.__init__()
+
+
+def parse_tool_calls(content: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Extract all tool calls from a complete model response
+
+    Args:
+        content: Full model output
+
+    Returns:
+        The tool calls in order, or None if there are none
+    """
+    if not content:
+        return None
+    parser = ToolCallStreamParser()
+    parser.feed(content)
+    return parser.tool_calls or None
@@ -38,6 +38,7 @@ from ..tools.abstraction.model_interface import (
     ModelCapabilities
 )
 from .ollama_wrapper import OllamaWrapper, OllamaStatus, GenerationResponse
+from .tool_call_parser import ToolCallStreamParser, parse_tool_calls
 
 logger = logging.getLogger(__name__)
 
@@ -243,9 +244,16 @@ class UnifiedOllamaInterface(ModelInterface):
     async def stream_generate(
         self, 
         request: ModelRequest,
-        callback: Callable[[str], None]
+        callback: Callable[[str], None],
+        on_tool_call: Optional[Callable[[Dict[str, Any]], None]] = None
     ) -> ModelResponse:
-        """Generate a streaming response"""
+        """
+        Generate a streaming response
+        
+        Tool calls are parsed as the chunks arrive; on_tool_call is called
+        on the event loop with each one as soon as its JSON object is
+        complete, while the model is still generating.
+        """
         if not self._is_initialized:
             return ModelResponse(
                 content="",
@@ -256,6 +264,21 @@ class UnifiedOllamaInterface(ModelInterface):
         try:
             start_time = datetime.now()
             full_content = []
+            tool_parser = ToolCallStreamParser()
+            loop = asyncio.get_running_loop()
+            
+            def notify_tool_call(tool_call: Dict[str, Any]):
+                try:
+                    on_tool_call(tool_call)
+                except Exception as e:
+                    logger.warning(f"Tool call callback failed: {e}")
+            
+            def on_chunk(content: str):
+                # Runs on the streaming thread for wrapper streaming
+                callback(content)
+                for tool_call in tool_parser.feed(content):
+                    if on_tool_call is not None:
+                        loop.call_soon_threadsafe(notify_tool_call, tool_call)
             
             # Choose streaming method based on configuration and availability
             use_http = (
@@ -270,7 +293,7 @@ class UnifiedOllamaInterface(ModelInterface):
                     content = chunk.get('content', '')
                     if content:
                         full_content.append(content)
-                        callback(content)
+                        on_chunk(content)
             else:
                 # Use wrapper streaming with thread safety
                 wrapper_params = self._convert_request_to_wrapper(request)
@@ -282,14 +305,14 @@ class UnifiedOllamaInterface(ModelInterface):
                 
                 # Use thread-safe streaming
                 await self._stream_via_wrapper(
-                    wrapper_params, callback, full_content
+                    wrapper_params, on_chunk, full_content
                 )
             
             end_time = datetime.now()
             generation_time = (end_time - start_time).total_seconds()
             
             final_content = "".join(full_content)
-            tool_calls = self._extract_tool_calls(final_content)
+            tool_calls = tool_parser.tool_calls or None
             
             streaming_method = "http" if use_http else "wrapper"
             return ModelResponse(
@@ -810,96 +833,9 @@ I have real, actionable tools - not just the ability to provide information. I c
         - New format: {"tool": "tool_name", "parameters": {...}}
         - Legacy format: {"tool_call": {"name": "tool_name", "parameters": {...}}}
         """
-        if not content:
-            return None
-        
-        tool_calls = []
-        
-        try:
-            # Find JSON patterns in the content
-            brace_count = 0
-            start_pos = -1
-            
-            for i, char in enumerate(content):
-                if char == '{':
-                    if brace_count == 0:
-                        start_pos = i
-                    brace_count += 1
-                elif char == '}':
-                    brace_count -= 1
-                    if brace_count == 0 and start_pos != -1:
-                        json_candidate = content[start_pos:i+1]
-                        
-                        # Look for tool indicators
-                        has_tool_indicators = (
-                            '"tool"' in json_candidate or
-                            '"tool_call"' in json_candidate
-                        )
-                        
-                        if has_tool_indicators:
-                            try:
-                                parsed = json.loads(json_candidate)
-                                if not isinstance(parsed, dict):
-                                    continue
-                                
-                                # Handle new format: {"tool": "name", "parameters": {...}}
-                                if "tool" in parsed and isinstance(parsed["tool"], str):
-                                    tool_name = parsed["tool"]
-                                    parameters = parsed.get("parameters", {})
-                                    
-                                    if tool_name:  # Ensure tool name is not empty
-                                        tool_calls.append({
-                                            "name": tool_name,
-                                            "parameters": parameters if isinstance(parameters, dict) else {}
-                                        })
-                                        logger.debug(f"Parsed tool call: {tool_name} with parameters: {parameters}")
-                                
-                                # Handle legacy format: {"tool_call": {"name": "...", "parameters": {...}}}
-                                elif "tool_call" in parsed:
-                                    tool_call = parsed["tool_call"]
-                                    if isinstance(tool_call, dict) and "name" in tool_call:
-                                        tool_name = tool_call["name"]
-                                        parameters = tool_call.get("parameters", {})
-                                        
-                                        if tool_name:
-                                            tool_calls.append({
-                                                "name": tool_name,
-                                                "parameters": parameters if isinstance(parameters, dict) else {}
-                                            })
-                                            logger.debug(f"Parsed legacy tool call: {tool_name}")
-                                
-                            except json.JSONDecodeError as e:
-                                logger.debug(f"Failed to parse JSON candidate: {json_candidate[:50]}... Error: {e}")
-                                continue
-                        
-                        # Reset for next potential JSON
-                        start_pos = -1
-            
-            # Also try to parse the entire content as JSON (in case it's a pure JSON response)
-            if not tool_calls:
-                try:
-                    parsed = json.loads(content.strip())
-                    if isinstance(parsed, dict):
-                        # Check for direct tool format
-                        if "tool" in parsed and isinstance(parsed["tool"], str):
-                            tool_name = parsed["tool"]
-                            parameters = parsed.get("parameters", {})
-                            
-                            if tool_name:
-                                tool_calls.append({
-                                    "name": tool_name,
-                                    "parameters": parameters if isinstance(parameters, dict) else {}
-                                })
-                                logger.debug(f"Parsed full JSON tool call: {tool_name}")
-                
-                except json.JSONDecodeError:
-                    # Content is not pure JSON, that's fine
-                    pass
-            
-        except Exception as e:
-            logger.warning(f"Error extracting tool calls: {e}")
+        tool_calls = parse_tool_calls(content)
         
         if tool_calls:
             logger.info(f"Successfully extracted {len(tool_calls)} tool calls")
         
-        return tool_calls if tool_calls else None
\ No newline at end of file
+        return tool_calls
\ No newline at end of file
@@ -10,7 +10,7 @@ version control, and file storage integration.
 import json
 import hashlib
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 
 from ..models.artifact import (
     Artifact, ArtifactVersion, ArtifactCollection
@@ -458,6 +458,100 @@ class ArtifactsDatabase:
                 f"Failed to get artifacts by project: {str(e)}")
             return []
     
+    def get_artifact_tree_counts(
+            self,
+            project_id: Optional[str] = None) -> Dict[Optional[str], int]:
+        """Count non-deleted artifacts per collection id
+        
+        Artifacts outside any collection are counted under None.
+        Optionally limited to a project.
+        """
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                
+                sql = '''
+                    SELECT collection_id, COUNT(*)
+                    FROM artifacts
+                    WHERE status != 'deleted'
+                '''
+                params: List[Any] = []
+                if project_id:
+                    sql += ' AND project_id = ?'
+                    params.append(project_id)
+                
+                cursor.execute(sql + ' GROUP BY collection_id', params)
+                return dict(cursor.fetchall())
+                
+        except Exception as e:
+            self.logger.error(f"Failed to count artifacts: {str(e)}")
+            return {}
+    
+    def get_artifact_tree_rows(
+            self,
+            project_id: Optional[str] = None,
+            collection_id: Optional[str] = None,
+            after: Optional[Tuple[str, str]] = None,
+            limit: Optional[int] = None,
+            artifact_ids: Optional[List[str]] = None) -> List[tuple]:
+        """Get the light-weight rows the artifacts tree is built from
+        
+        Returns (id, name, content_type, collection_id, project_id,
+        is_encrypted, updated_at) for non-deleted artifacts, newest first,
+        without loading content or metadata. Optionally limited to a
+        project, a collection and/or the given artifact ids.
+        
+        Pages are fetched by passing the (updated_at, id) of the last row
+        of the previous page as after, so each page is an index seek
+        rather than an OFFSET scan.
+        """
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                
+                sql = '''
+                    SELECT id, name, content_type, collection_id,
+                           project_id, COALESCE(encrypted_fields, '') != '',
+                           updated_at
+                    FROM artifacts
+                    WHERE status != 'deleted'
+                '''
+                params: List[Any] = []
+                if project_id:
+                    sql += ' AND project_id = ?'
+                    params.append(project_id)
+                if collection_id:
+                    sql += ' AND collection_id = ?'
+                    params.append(collection_id)
+                if after is not None:
+                    sql += ' AND (updated_at, id) < (?, ?)'
+                    params.extend(after)
+                
+                if artifact_ids is None:
+                    sql += ' ORDER BY updated_at DESC, id DESC'
+                    if limit is not None:
+                        sql += ' LIMIT ?'
+                        params.append(limit)
+                    cursor.execute(sql, params)
+                    return cursor.fetchall()
+                
+                # Stay well inside SQLite's bound parameter limit
+                rows = []
+                ids = list(artifact_ids)
+                for start in range(0, len(ids), 500):
+                    batch = ids[start:start + 500]
+                    placeholders = ','.join('?' * len(batch))
+                    cursor.execute(
+                        sql + f' AND id IN ({placeholders})',
+                        params + batch
+                    )
+                    rows.extend(cursor.fetchall())
+                return rows
+                
+        except Exception as e:
+            self.logger.error(f"Failed to get artifact tree rows: {str(e)}")
+            return []
+    
     def create_collection(self,
                           collection: ArtifactCollection) -> Dict[str, Any]:
         """Create a new artifact collection"""
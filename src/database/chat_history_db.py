@@ -8,8 +8,8 @@ Manages all chat history database operations with resilient handling.
 
 import json
 import sqlite3
-from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from pathlib import Path
 
 from ..models.chat_session import ChatSession, ChatMessage, ChatSchedule
@@ -126,8 +126,10 @@ class ChatHistoryDatabase:
             self.logger.error(f"Failed to add message: {str(e)}")
             return {"success": False, "error": str(e)}
     
-    def get_session(self, session_id: str) -> Optional[ChatSession]:
-        """Get a specific chat session with all messages"""
+    def get_session(self, session_id: str,
+                    message_limit: Optional[int] = None) -> Optional[ChatSession]:
+        """Get a specific chat session with all messages, or only the
+        newest message_limit of them when a limit is given"""
         try:
             with self._get_connection() as conn:
                 cursor = conn.cursor()
@@ -144,7 +146,12 @@ class ChatHistoryDatabase:
                 session = self._row_to_session(row)
                 
                 # Load messages
-                session.messages = self.get_session_messages(session_id)
+                if message_limit is None:
+                    session.messages = self.get_session_messages(session_id)
+                else:
+                    session.messages = self.get_messages_page(
+                        session_id, limit=message_limit
+                    )
                 
                 return session
                 
@@ -175,6 +182,46 @@ class ChatHistoryDatabase:
             self.logger.error(f"Failed to get messages: {str(e)}")
             return []
     
+    def get_messages_page(self, session_id: str,
+                          before: Optional[ChatMessage] = None,
+                          limit: int = 50) -> List[ChatMessage]:
+        """Get up to limit messages older than before (newest page when
+        omitted), oldest first.
+        
+        Pages are keyed on (timestamp, id) rather than OFFSET, so each
+        page is a short range scan of the session/timestamp index no
+        matter how far back it is.
+        """
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                
+                if before is None:
+                    cursor.execute('''
+                        SELECT * FROM chat_messages
+                        WHERE session_id = ?
+                        ORDER BY timestamp DESC, id DESC
+                        LIMIT ?
+                    ''', (session_id, limit))
+                else:
+                    timestamp = before.to_dict()['timestamp']
+                    cursor.execute('''
+                        SELECT * FROM chat_messages
+                        WHERE session_id = ?
+                        AND (timestamp < ? OR (timestamp = ? AND id < ?))
+                        ORDER BY timestamp DESC, id DESC
+                        LIMIT ?
+                    ''', (session_id, timestamp, timestamp, before.id, limit))
+                
+                messages = [self._row_to_message(row)
+                            for row in cursor.fetchall()]
+                messages.reverse()
+                return messages
+                
+        except Exception as e:
+            self.logger.error(f"Failed to get message page: {str(e)}")
+            return []
+    
     def get_recent_sessions(
         self, 
         limit: int = 50,
@@ -189,30 +236,11 @@ class ChatHistoryDatabase:
             with self._get_connection() as conn:
                 cursor = conn.cursor()
                 
-                query = 'SELECT * FROM chat_sessions WHERE 1=1'
-                params = []
-                
-                if filter_date:
-                    query += ' AND DATE(created_at) = DATE(?)'
-                    params.append(filter_date.isoformat())
-                
-                if filter_project:
-                    query += ' AND project_id = ?'
-                    params.append(filter_project)
-                    
-                if filter_task:
-                    query += ' AND task_id = ?'
-                    params.append(filter_task)
-                    
-                if filter_status:
-                    query += ' AND status = ?'
-                    params.append(filter_status)
-                    
-                if search_query:
-                    query += ' AND (title LIKE ? OR summary LIKE ?)'
-                    search_pattern = f'%{search_query}%'
-                    params.extend([search_pattern, search_pattern])
-                
+                where, params = self._session_filters(
+                    filter_date, filter_project, filter_task,
+                    filter_status, search_query
+                )
+                query = f'SELECT * FROM chat_sessions WHERE {where}'
                 query += ' ORDER BY updated_at DESC LIMIT ?'
                 params.append(limit)
                 
@@ -229,6 +257,122 @@ class ChatHistoryDatabase:
             self.logger.error(f"Failed to get recent sessions: {str(e)}")
             return []
     
+    def get_sessions_page(
+        self,
+        limit: int = 50,
+        after: Optional[ChatSession] = None,
+        filter_date: Optional[datetime] = None,
+        filter_project: Optional[str] = None,
+        filter_task: Optional[str] = None,
+        filter_status: Optional[str] = None,
+        search_query: Optional[str] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None
+    ) -> List[Tuple[str, ChatSession]]:
+        """Get up to limit sessions updated before after (most recent
+        when omitted), most recent first, with their date bucket.
+        
+        Pages are keyed on (updated_at, id) rather than OFFSET, so any
+        page is a short range scan of the updated_at index. The bucket
+        is 'today', 'yesterday', 'week' (the five days before) or the
+        'YYYY-MM' month, computed by the query.
+        
+        is_cancelled is polled while the query runs; once it returns
+        True the query is abandoned and an empty page returned.
+        """
+        try:
+            with self._get_connection() as conn:
+                if is_cancelled is not None:
+                    conn.set_progress_handler(
+                        lambda: 1 if is_cancelled() else 0, 1000
+                    )
+                try:
+                    cursor = conn.cursor()
+                    
+                    where, params = self._session_filters(
+                        filter_date, filter_project, filter_task,
+                        filter_status, search_query
+                    )
+                    if after is not None:
+                        # The stored text, as update_session and
+                        # add_message store CURRENT_TIMESTAMP, which does
+                        # not compare like an isoformat string
+                        updated_at = getattr(
+                            after, '_stored_updated_at',
+                            after.to_dict()['updated_at']
+                        )
+                        # A row value comparison, so the index is
+                        # searched from the key rather than scanned to it
+                        where += ' AND (updated_at, id) < (?, ?)'
+                        params.extend([updated_at, after.id])
+                    
+                    today = date.today()
+                    cursor.execute(f'''
+                        SELECT *, CASE
+                            WHEN substr(updated_at, 1, 10) >= ? THEN 'today'
+                            WHEN substr(updated_at, 1, 10) >= ? THEN 'yesterday'
+                            WHEN substr(updated_at, 1, 10) >= ? THEN 'week'
+                            ELSE substr(updated_at, 1, 7)
+                        END
+                        FROM chat_sessions
+                        WHERE {where}
+                        ORDER BY updated_at DESC, id DESC
+                        LIMIT ?
+                    ''', [today.isoformat(),
+                          (today - timedelta(days=1)).isoformat(),
+                          (today - timedelta(days=6)).isoformat()]
+                        + params + [limit])
+                    
+                    page = []
+                    for row in cursor.fetchall():
+                        session = self._row_to_session(row)
+                        session._stored_updated_at = row[3]
+                        page.append((row[-1], session))
+                    return page
+                finally:
+                    if is_cancelled is not None:
+                        conn.set_progress_handler(None, 0)
+                        
+        except sqlite3.OperationalError as e:
+            if is_cancelled is not None and is_cancelled():
+                return []
+            self.logger.error(f"Failed to get session page: {str(e)}")
+            return []
+        except Exception as e:
+            self.logger.error(f"Failed to get session page: {str(e)}")
+            return []
+    
+    def _session_filters(self, filter_date: Optional[datetime],
+                         filter_project: Optional[str],
+                         filter_task: Optional[str],
+                         filter_status: Optional[str],
+                         search_query: Optional[str]) -> Tuple[str, list]:
+        """WHERE clause and parameters of the session list filters"""
+        where = '1=1'
+        params = []
+        
+        if filter_date:
+            where += ' AND DATE(created_at) = DATE(?)'
+            params.append(filter_date.isoformat())
+        
+        if filter_project:
+            where += ' AND project_id = ?'
+            params.append(filter_project)
+            
+        if filter_task:
+            where += ' AND task_id = ?'
+            params.append(filter_task)
+            
+        if filter_status:
+            where += ' AND status = ?'
+            params.append(filter_status)
+            
+        if search_query:
+            where += ' AND (title LIKE ? OR summary LIKE ?)'
+            search_pattern = f'%{search_query}%'
+            params.extend([search_pattern, search_pattern])
+            
+        return where, params
+    
     def search_messages(self, search_query: str, limit: int = 100) -> List[Dict[str, Any]]:
         """Search through all chat messages"""
         try:
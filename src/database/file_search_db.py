@@ -5,12 +5,19 @@ with vector storage and retrieval capabilities.
 """
 
 import json
+import time
+import sqlite3
 import hashlib
+import threading
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator, Tuple
 
 from ..utils.logger import Logger
-from .initialize_db import DatabaseManager
+from .initialize_db import (
+    DatabaseManager, FILE_SEARCH_GENERATION_SCHEMA, FILE_SEARCH_TEXT_SCHEMA,
+    INDEX_STATS_AGGREGATE_QUERY, setup_index_stats
+)
+from .text_frames import FrameCache, compress_frames, read_span
 
 
 class FileSearchDB:
@@ -19,6 +26,50 @@ class FileSearchDB:
     Manages indexed files, text chunks, vector embeddings, and search settings.
     """
     
+    # Orphan queries select (rowid, id) so batches can be deleted by rowid
+    _ORPHANED_CHUNKS_QUERY = '''
+        SELECT c.rowid, c.id FROM file_chunks c
+        WHERE NOT EXISTS (
+            SELECT 1 FROM indexed_files f WHERE f.id = c.file_id
+        )
+    '''
+    
+    _ORPHANED_EMBEDDINGS_QUERY = '''
+        SELECT e.rowid, e.id FROM file_embeddings e
+        WHERE NOT EXISTS (
+            SELECT 1 FROM file_chunks c WHERE c.id = e.chunk_id
+        )
+    '''
+    
+    # Rows sampled per index when planner statistics are refreshed
+    ANALYSIS_LIMIT = 1000
+    
+    # Pages released per incremental vacuum step
+    VACUUM_STEP_PAGES = 256
+    
+    # How long maintenance waits for a lock before yielding
+    MAINTENANCE_BUSY_MS = 50
+    
+    # Fragmentation that justifies a full rebuild: the free-page share of
+    # a database that cannot vacuum incrementally, and the minimum fill
+    # of in-use pages
+    REBUILD_FREE_RATIO = 0.2
+    REBUILD_MIN_FILL = 0.5
+    
+    _AUTO_VACUUM_MODES = {0: 'none', 1: 'full', 2: 'incremental'}
+    
+    # Chunk text as a SQL expression over file_chunks aliased as c: inline
+    # content when the chunk has a copy, otherwise its slice of the
+    # compressed file text
+    CHUNK_TEXT_SQL = (
+        "CASE WHEN c.content != '' THEN c.content "
+        "ELSE chunk_text(c.file_id, c.start_pos, c.end_pos) END"
+    )
+    
+    # Decompressed text frames kept in memory, shared by every instance
+    FRAME_CACHE_FRAMES = 256
+    _frame_cache = FrameCache(FRAME_CACHE_FRAMES)
+    
     def __init__(self, user_name: Optional[str] = None):
         """
         Initialize FileSearchDB with user-specific database connection.
@@ -31,6 +82,17 @@ class FileSearchDB:
         self.db_manager = DatabaseManager(user_name)
         self.user_name = user_name or "default_user"
         
+        # Background orphan collection state
+        self._gc_thread: Optional[threading.Thread] = None
+        self._gc_stop = threading.Event()
+        self._gc_last_result: Optional[Dict[str, Any]] = None
+        
+        # Background vacuum state; maintenance waits for a quiet period
+        self._maintenance_thread: Optional[threading.Thread] = None
+        self._maintenance_stop = threading.Event()
+        self._maintenance_last_result: Optional[Dict[str, Any]] = None
+        self._last_activity = time.monotonic()
+        
         # Ensure database is initialized
         self._ensure_database_ready()
     
@@ -48,7 +110,35 @@ class FileSearchDB:
     
     def _get_connection(self):
         """Get database connection for file search operations"""
-        return self.db_manager.get_file_search_connection()
+        self._last_activity = time.monotonic()
+        conn = self.db_manager.get_file_search_connection()
+        self._register_chunk_text(conn)
+        return conn
+    
+    def _register_chunk_text(self, conn) -> None:
+        """Register the chunk_text() SQL function used by CHUNK_TEXT_SQL"""
+        db_path = str(self.db_manager.file_search_db_path)
+        # Keyword queries evaluate the expression once per keyword and
+        # row, so the most recent slice is remembered
+        last: Dict[str, Any] = {}
+        
+        def chunk_text(file_id, start_pos, end_pos):
+            key = (file_id, start_pos, end_pos)
+            if last.get('key') != key:
+                def load_frames(first, last_index):
+                    return conn.execute(
+                        "SELECT frame_index, data FROM file_text_frames "
+                        "WHERE file_id = ? AND frame_index BETWEEN ? AND ?",
+                        (file_id, first, last_index)
+                    ).fetchall()
+                
+                text = read_span((db_path, file_id), start_pos, end_pos,
+                                 self._frame_cache, load_frames)
+                last['key'] = key
+                last['text'] = text or ''
+            return last['text']
+        
+        conn.create_function('chunk_text', 3, chunk_text)
     
     def create_tables(self) -> bool:
         """
@@ -117,6 +207,18 @@ class FileSearchDB:
                     )
                 ''')
                 
+                # Table for search history used by query suggestions
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS search_history (
+                        query_key TEXT PRIMARY KEY,
+                        query TEXT NOT NULL,
+                        weight REAL NOT NULL,
+                        use_count INTEGER NOT NULL DEFAULT 1,
+                        result_count INTEGER DEFAULT 0,
+                        last_used DATETIME NOT NULL
+                    )
+                ''')
+                
                 # Create indexes for performance
                 cursor.execute('''CREATE INDEX IF NOT EXISTS
                     idx_indexed_files_path ON indexed_files(file_path)''')
@@ -134,6 +236,15 @@ class FileSearchDB:
                 cursor.execute('''CREATE INDEX IF NOT EXISTS
                     idx_search_settings_name
                     ON search_settings(setting_name)''')
+                cursor.execute('''CREATE INDEX IF NOT EXISTS
+                    idx_search_history_last_used
+                    ON search_history(last_used)''')
+                
+                for statement in FILE_SEARCH_GENERATION_SCHEMA:
+                    cursor.execute(statement)
+                for statement in FILE_SEARCH_TEXT_SCHEMA:
+                    cursor.execute(statement)
+                setup_index_stats(cursor)
                 
                 conn.commit()
                 self.logger.info("File search tables created successfully")
@@ -252,7 +363,8 @@ class FileSearchDB:
     
     def add_chunk(self, file_id: str, chunk_index: int, 
                   content: str, start_pos: int, end_pos: int,
-                  metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+                  metadata: Optional[Dict[str, Any]] = None,
+                  stored_text: bool = False) -> Dict[str, Any]:
         """
         Add a text chunk for a file.
         
@@ -263,6 +375,9 @@ class FileSearchDB:
             start_pos: Starting position in the original file
             end_pos: Ending position in the original file
             metadata: Additional metadata as dictionary
+            stored_text: True when content is exactly
+                text[start_pos:end_pos] of the text saved with
+                add_file_text; only the offsets are stored
             
         Returns:
             Dict with success status and chunk_id or error message
@@ -286,7 +401,7 @@ class FileSearchDB:
                     chunk_id,
                     file_id,
                     chunk_index,
-                    content,
+                    '' if stored_text else content,
                     start_pos,
                     end_pos,
                     metadata_json
@@ -312,6 +427,86 @@ class FileSearchDB:
                 "error": f"Failed to add chunk: {str(e)}"
             }
     
+    def add_file_text(self, file_id: str, text: str) -> Dict[str, Any]:
+        """
+        Store a file's extracted text once, as compressed frames.
+        
+        Chunks added with stored_text=True read their content from this
+        text by offset, so overlapping chunks no longer duplicate it.
+        
+        Args:
+            file_id: ID of the indexed file
+            text: Full extracted text of the file
+            
+        Returns:
+            Dict with success status, frame count and compressed size
+        """
+        try:
+            frames = compress_frames(text)
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "DELETE FROM file_text_frames WHERE file_id = ?",
+                    (file_id,)
+                )
+                cursor.executemany('''
+                    INSERT INTO file_text_frames (file_id, frame_index, data)
+                    VALUES (?, ?, ?)
+                ''', [(file_id, index, sqlite3.Binary(data))
+                      for index, data in enumerate(frames)])
+                conn.commit()
+            
+            self._frame_cache.invalidate(
+                (str(self.db_manager.file_search_db_path), file_id)
+            )
+            compressed = sum(len(data) for data in frames)
+            self.logger.debug(
+                f"Stored {len(text)} characters for file {file_id} in "
+                f"{len(frames)} frames ({compressed} bytes)"
+            )
+            return {
+                "success": True,
+                "frames": len(frames),
+                "compressed_bytes": compressed
+            }
+            
+        except Exception as e:
+            self.logger.error(
+                f"Error storing text for file {file_id}: {str(e)}"
+            )
+            return {
+                "success": False,
+                "error": f"Failed to store file text: {str(e)}"
+            }
+    
+    def get_chunk_content(self, chunk_ids: List[str]) -> Dict[str, str]:
+        """
+        Fetch the text of specific chunks, e.g. for result snippets.
+        
+        Args:
+            chunk_ids: IDs of the chunks to fetch
+            
+        Returns:
+            Dict mapping each found chunk ID to its text
+        """
+        if not chunk_ids:
+            return {}
+        
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                placeholders = ','.join('?' for _ in chunk_ids)
+                cursor.execute(
+                    f"SELECT c.id, {self.CHUNK_TEXT_SQL} FROM file_chunks c "
+                    f"WHERE c.id IN ({placeholders})",
+                    list(chunk_ids)
+                )
+                return dict(cursor.fetchall())
+                
+        except Exception as e:
+            self.logger.error(f"Error fetching chunk content: {str(e)}")
+            return {}
+    
     def add_embedding(self, chunk_id: str, embedding_vector: List[float],
                       model_name: str) -> Dict[str, Any]:
         """
@@ -381,7 +576,7 @@ class FileSearchDB:
             with self._get_connection() as conn:
                 cursor = conn.cursor()
                 
-                query = '''
+                query = f'''
                     SELECT
                         e.id as embedding_id,
                         e.chunk_id,
@@ -390,7 +585,7 @@ class FileSearchDB:
                         e.created_date as embedding_created,
                         c.file_id,
                         c.chunk_index,
-                        c.content,
+                        {self.CHUNK_TEXT_SQL} as content,
                         c.start_pos,
                         c.end_pos,
                         c.metadata as chunk_metadata,
@@ -469,72 +664,17 @@ class FileSearchDB:
             if not keywords:
                 return []
             
+            query, params = self._build_keyword_query(
+                keywords, file_types, file_paths
+            )
+            query += '''
+                ORDER BY match_count DESC, c.chunk_index ASC
+                LIMIT ?
+            '''
+            params.append(limit)
+            
             with self._get_connection() as conn:
                 cursor = conn.cursor()
-                
-                # Build query with LIKE conditions
-                query = '''
-                    SELECT
-                        c.id as chunk_id,
-                        c.file_id,
-                        c.chunk_index,
-                        c.content,
-                        c.start_pos,
-                        c.end_pos,
-                        c.metadata as chunk_metadata,
-                        f.file_path,
-                        f.file_type,
-                        f.size as file_size,
-                        (
-                '''
-                
-                # Add relevance scoring
-                like_conditions = []
-                params = []
-                
-                for keyword in keywords:
-                    like_condition = (
-                        "CASE WHEN LOWER(c.content) LIKE ? "
-                        "THEN 1 ELSE 0 END"
-                    )
-                    like_conditions.append(like_condition)
-                    params.append(f'%{keyword.lower()}%')
-                
-                query += ' + '.join(like_conditions)
-                query += '''
-                        ) as match_count
-                    FROM file_chunks c
-                    JOIN indexed_files f ON c.file_id = f.id
-                    WHERE f.status = 'active'
-                    AND (
-                '''
-                
-                # Add WHERE conditions for keywords
-                where_conditions = []
-                for keyword in keywords:
-                    where_conditions.append("LOWER(c.content) LIKE ?")
-                    params.append(f'%{keyword.lower()}%')
-                
-                query += ' OR '.join(where_conditions)
-                query += ')'
-                
-                # Add optional filters
-                if file_types:
-                    placeholders = ','.join(['?' for _ in file_types])
-                    query += f' AND f.file_type IN ({placeholders})'
-                    params.extend(file_types)
-                
-                if file_paths:
-                    placeholders = ','.join(['?' for _ in file_paths])
-                    query += f' AND f.file_path IN ({placeholders})'
-                    params.extend(file_paths)
-                
-                query += '''
-                    ORDER BY match_count DESC, c.chunk_index ASC
-                    LIMIT ?
-                '''
-                params.append(limit)
-                
                 cursor.execute(query, params)
                 
                 columns = [desc[0] for desc in cursor.description]
@@ -543,25 +683,9 @@ class FileSearchDB:
                 max_match_count = len(keywords)
                 
                 for row in cursor.fetchall():
-                    result_dict = dict(zip(columns, row))
-                    
-                    # Calculate relevance score
-                    match_count = result_dict.pop('match_count', 0)
-                    result_dict['relevance_score'] = (
-                        match_count / max_match_count if max_match_count > 0
-                        else 0.0
-                    )
-                    
-                    # Parse JSON metadata
-                    if result_dict.get('chunk_metadata'):
-                        try:
-                            result_dict['chunk_metadata'] = json.loads(
-                                result_dict['chunk_metadata']
-                            )
-                        except json.JSONDecodeError:
-                            result_dict['chunk_metadata'] = None
-                    
-                    results.append(result_dict)
+                    results.append(self._keyword_row_to_dict(
+                        columns, row, max_match_count
+                    ))
                 
                 self.logger.info(
                     f"Keyword search for {keywords} returned "
@@ -573,6 +697,135 @@ class FileSearchDB:
             self.logger.error(f"Error in keyword search: {str(e)}")
             return []
     
+    def _build_keyword_query(self, keywords: List[str],
+                             file_types: Optional[List[str]] = None,
+                             file_paths: Optional[List[str]] = None
+                             ) -> Tuple[str, List[Any]]:
+        """Build the unordered LIKE query shared by the keyword searches"""
+        query = f'''
+            SELECT
+                c.id as chunk_id,
+                c.file_id,
+                c.chunk_index,
+                {self.CHUNK_TEXT_SQL} as content,
+                c.start_pos,
+                c.end_pos,
+                c.metadata as chunk_metadata,
+                f.file_path,
+                f.file_type,
+                f.size as file_size,
+                (
+        '''
+        
+        # Add relevance scoring
+        like_conditions = []
+        params: List[Any] = []
+        
+        for keyword in keywords:
+            like_condition = (
+                f"CASE WHEN LOWER({self.CHUNK_TEXT_SQL}) LIKE ? "
+                "THEN 1 ELSE 0 END"
+            )
+            like_conditions.append(like_condition)
+            params.append(f'%{keyword.lower()}%')
+        
+        query += ' + '.join(like_conditions)
+        query += '''
+                ) as match_count
+            FROM file_chunks c
+            JOIN indexed_files f ON c.file_id = f.id
+            WHERE f.status = 'active'
+            AND (
+        '''
+        
+        # Add WHERE conditions for keywords
+        where_conditions = []
+        for keyword in keywords:
+            where_conditions.append(f"LOWER({self.CHUNK_TEXT_SQL}) LIKE ?")
+            params.append(f'%{keyword.lower()}%')
+        
+        query += ' OR '.join(where_conditions)
+        query += ')'
+        
+        # Add optional filters
+        if file_types:
+            placeholders = ','.join(['?' for _ in file_types])
+            query += f' AND f.file_type IN ({placeholders})'
+            params.extend(file_types)
+        
+        if file_paths:
+            placeholders = ','.join(['?' for _ in file_paths])
+            query += f' AND f.file_path IN ({placeholders})'
+            params.extend(file_paths)
+        
+        return query, params
+    
+    @staticmethod
+    def _keyword_row_to_dict(columns: List[str], row: Tuple,
+                             max_match_count: int) -> Dict[str, Any]:
+        """Convert a keyword match row, scoring it and parsing metadata"""
+        result_dict = dict(zip(columns, row))
+        
+        # Calculate relevance score
+        match_count = result_dict.pop('match_count', 0)
+        result_dict['relevance_score'] = (
+            match_count / max_match_count if max_match_count > 0
+            else 0.0
+        )
+        
+        # Parse JSON metadata
+        if result_dict.get('chunk_metadata'):
+            try:
+                result_dict['chunk_metadata'] = json.loads(
+                    result_dict['chunk_metadata']
+                )
+            except json.JSONDecodeError:
+                result_dict['chunk_metadata'] = None
+        
+        return result_dict
+    
+    def iter_keyword_matches(self, keywords: List[str],
+                             file_types: Optional[List[str]] = None,
+                             file_paths: Optional[List[str]] = None,
+                             batch_size: int = 1000
+                             ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream every chunk matching any keyword from a database cursor.
+        
+        Unlike search_by_keywords there is no limit and no ranking: rows
+        arrive in storage order, batch_size at a time, so the full match
+        set is never held in memory.
+        
+        Args:
+            keywords: List of keywords to search for
+            file_types: Optional filter by file types
+            file_paths: Optional filter by specific file paths
+            batch_size: Rows fetched from the cursor per round trip
+            
+        Yields:
+            Chunk dicts in the same shape as search_by_keywords results
+        """
+        if not keywords:
+            return
+        
+        query, params = self._build_keyword_query(
+            keywords, file_types, file_paths
+        )
+        conn = self._get_connection()
+        try:
+            cursor = conn.execute(query, params)
+            columns = [desc[0] for desc in cursor.description]
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield self._keyword_row_to_dict(
+                        columns, row, len(keywords)
+                    )
+        finally:
+            conn.close()
+    
     def get_embeddings_by_file(self, file_path: str) -> List[Dict[str, Any]]:
         """
         Get all embeddings for a specific file.
@@ -587,14 +840,14 @@ class FileSearchDB:
             with self._get_connection() as conn:
                 cursor = conn.cursor()
                 
-                cursor.execute('''
+                cursor.execute(f'''
                     SELECT
                         e.id as embedding_id,
                         e.chunk_id,
                         e.embedding_vector,
                         e.model_name,
                         c.chunk_index,
-                        c.content,
+                        {self.CHUNK_TEXT_SQL} as content,
                         c.start_pos,
                         c.end_pos,
                         c.metadata as chunk_metadata
@@ -884,154 +1137,755 @@ class FileSearchDB:
                 "error": f"Failed to retrieve settings: {str(e)}"
             }
     
-    def get_indexed_files_stats(self) -> Dict[str, Any]:
+    def record_search_query(self, query_key: str, query: str,
+                            weight: float, last_used: str,
+                            result_count: int = 0) -> Dict[str, Any]:
         """
-        Get statistics about indexed files.
+        Insert or update an aggregated search history entry.
         
+        Args:
+            query_key: Normalized query text
+            query: Query as last typed
+            weight: Time-decayed popularity as of last_used
+            last_used: ISO timestamp of the latest use
+            result_count: Number of results of the latest use
+            
         Returns:
-            Dictionary with file indexing statistics
+            Dict with success status
         """
         try:
             with self._get_connection() as conn:
-                cursor = conn.cursor()
-                
-                stats = {}
-                
-                # Total indexed files
-                cursor.execute('''
-                    SELECT COUNT(*) FROM indexed_files WHERE status = 'active'
-                ''')
-                stats['total_files'] = cursor.fetchone()[0]
-                
-                # Files by type
-                cursor.execute('''
-                    SELECT file_type, COUNT(*) 
-                    FROM indexed_files 
-                    WHERE status = 'active'
-                    GROUP BY file_type
-                ''')
-                stats['files_by_type'] = {
-                    row[0] or 'unknown': row[1] for row in cursor.fetchall()
-                }
-                
-                # Total size
-                cursor.execute('''
-                    SELECT SUM(size) FROM indexed_files WHERE status = 'active'
-                ''')
-                total_size = cursor.fetchone()[0] or 0
-                stats['total_size_bytes'] = total_size
-                stats['total_size_mb'] = round(total_size / (1024 * 1024), 2)
-                
-                # Total chunks
-                cursor.execute('''
-                    SELECT COUNT(*) FROM file_chunks c
-                    JOIN indexed_files f ON c.file_id = f.id
-                    WHERE f.status = 'active'
-                ''')
-                stats['total_chunks'] = cursor.fetchone()[0]
-                
-                # Total embeddings
-                cursor.execute('''
-                    SELECT COUNT(*) FROM file_embeddings e
-                    JOIN file_chunks c ON e.chunk_id = c.id
-                    JOIN indexed_files f ON c.file_id = f.id
-                    WHERE f.status = 'active'
-                ''')
-                stats['total_embeddings'] = cursor.fetchone()[0]
-                
-                # Last indexed date
-                cursor.execute('''
-                    SELECT MAX(indexed_date) FROM indexed_files
-                ''')
-                stats['last_indexed_date'] = cursor.fetchone()[0]
-                
-                return stats
+                conn.execute('''
+                    INSERT INTO search_history
+                    (query_key, query, weight, use_count, result_count,
+                     last_used)
+                    VALUES (?, ?, ?, 1, ?, ?)
+                    ON CONFLICT(query_key) DO UPDATE SET
+                        query = excluded.query,
+                        weight = excluded.weight,
+                        use_count = use_count + 1,
+                        result_count = excluded.result_count,
+                        last_used = excluded.last_used
+                ''', (query_key, query, weight, result_count, last_used))
+                conn.commit()
+                return {"success": True}
                 
         except Exception as e:
-            self.logger.error(f"Error getting file stats: {str(e)}")
-            return {}
+            self.logger.error(f"Error recording search query: {str(e)}")
+            return {
+                "success": False,
+                "error": f"Failed to record search query: {str(e)}"
+            }
     
-    def remove_file_from_index(self, file_path: str) -> Dict[str, Any]:
+    def get_search_history(self,
+                           limit: Optional[int] = None) -> Dict[str, Any]:
         """
-        Remove a file and its associated data from the index.
+        Retrieve aggregated search history, most recent first.
         
         Args:
-            file_path: Path to the file to remove
+            limit: Maximum number of entries (optional)
             
         Returns:
-            Dict with success status and message
+            Dict with success status and list of entries
         """
         try:
             with self._get_connection() as conn:
                 cursor = conn.cursor()
+                query = '''
+                    SELECT query_key, query, weight, use_count,
+                           result_count, last_used
+                    FROM search_history
+                    ORDER BY last_used DESC
+                '''
+                params = []
+                if limit is not None:
+                    query += ' LIMIT ?'
+                    params.append(limit)
+                cursor.execute(query, params)
                 
-                # Get file ID
-                cursor.execute('''
-                    SELECT id FROM indexed_files WHERE file_path = ?
-                ''', (file_path,))
-                
-                row = cursor.fetchone()
-                if not row:
-                    return {
-                        "success": False,
-                        "error": "File not found in index"
-                    }
-                
-                file_id = row[0]
-                
-                # Due to CASCADE, deleting the file will also delete
-                # chunks and embeddings
-                cursor.execute('''
-                    DELETE FROM indexed_files WHERE id = ?
-                ''', (file_id,))
-                
-                conn.commit()
-                
-                self.logger.info(f"Removed file from index: {file_path}")
+                columns = [desc[0] for desc in cursor.description]
                 return {
                     "success": True,
-                    "message": "File removed from index successfully"
+                    "entries": [dict(zip(columns, row))
+                                for row in cursor.fetchall()]
                 }
                 
         except Exception as e:
-            self.logger.error(f"Error removing file {file_path}: {str(e)}")
+            self.logger.error(f"Error retrieving search history: {str(e)}")
             return {
                 "success": False,
-                "error": f"Failed to remove file: {str(e)}"
+                "error": f"Failed to retrieve search history: {str(e)}"
             }
     
-    def _generate_id(self, seed: str) -> str:
+    def clear_search_history(self) -> Dict[str, Any]:
         """
-        Generate a unique ID based on a seed string.
+        Delete all search history entries.
         
-        Args:
-            seed: Seed string for ID generation
-            
         Returns:
-            Unique ID string
+            Dict with success status
         """
-        timestamp = datetime.now().isoformat()
-        combined = f"{seed}_{timestamp}"
-        return hashlib.sha256(combined.encode()).hexdigest()[:16]
+        try:
+            with self._get_connection() as conn:
+                conn.execute("DELETE FROM search_history")
+                conn.commit()
+                return {"success": True}
+                
+        except Exception as e:
+            self.logger.error(f"Error clearing search history: {str(e)}")
+            return {
+                "success": False,
+                "error": f"Failed to clear search history: {str(e)}"
+            }
     
-    def add_allowed_directory(self, directory: str) -> Dict[str, Any]:
+    def get_index_generation(self) -> int:
         """
-        Add a directory to the allowed directories list.
+        Get the current index generation.
+        
+        The generation increases with every change to an indexed file or
+        its embeddings.
+        
+        Returns:
+            Current generation, or -1 if it cannot be read
+        """
+        try:
+            with self._get_connection() as conn:
+                row = conn.execute(
+                    "SELECT generation FROM index_generation WHERE id = 0"
+                ).fetchone()
+                return row[0] if row else 0
+                
+        except Exception as e:
+            self.logger.error(f"Error reading index generation: {str(e)}")
+            return -1
+    
+    def get_changed_files(self, since_generation: int) -> Dict[str, Any]:
+        """
+        List files changed after a given index generation.
         
         Args:
-            directory: Directory path to add
+            since_generation: Generation to compare against
             
         Returns:
-            Dict with success status and message
+            Dict with success status and a mapping of file path to the
+            generation of its latest change
         """
         try:
-            # Get current allowed directories
-            current_result = self.get_search_settings("allowed_directories")
-            if current_result.get("success"):
-                current_dirs = current_result.get("setting_value", [])
-            else:
-                current_dirs = []
-            
+            with self._get_connection() as conn:
+                cursor = conn.execute('''
+                    SELECT file_path, generation FROM index_file_generations
+                    WHERE generation > ?
+                ''', (since_generation,))
+                return {
+                    "success": True,
+                    "files": dict(cursor.fetchall())
+                }
+                
+        except Exception as e:
+            self.logger.error(f"Error reading changed files: {str(e)}")
+            return {
+                "success": False,
+                "error": f"Failed to read changed files: {str(e)}"
+            }
+    
+    def save_hot_query(self, cache_key: str, query: str,
+                       params: Dict[str, Any], hits: int, generation: int,
+                       results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Insert or replace a persisted hot-query result set.
+        
+        Args:
+            cache_key: Key of the query and its search parameters
+            query: Query text
+            params: Search parameters
+            hits: Number of times the query has been run
+            generation: Index generation the results were computed against
+            results: Serialized search results
+            
+        Returns:
+            Dict with success status
+        """
+        try:
+            with self._get_connection() as conn:
+                conn.execute('''
+                    INSERT OR REPLACE INTO hot_query_cache
+                    (cache_key, query, params, hits, generation, results,
+                     updated_date)
+                    VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ''', (cache_key, query, json.dumps(params), hits,
+                      generation, json.dumps(results)))
+                conn.commit()
+                return {"success": True}
+                
+        except Exception as e:
+            self.logger.error(f"Error saving hot query: {str(e)}")
+            return {
+                "success": False,
+                "error": f"Failed to save hot query: {str(e)}"
+            }
+    
+    def get_hot_queries(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Retrieve persisted hot-query result sets, most used first.
+        
+        Args:
+            limit: Maximum number of entries (optional)
+            
+        Returns:
+            Dict with success status and list of entries
+        """
+        try:
+            with self._get_connection() as conn:
+                query = '''
+                    SELECT cache_key, query, params, hits, generation, results
+                    FROM hot_query_cache
+                    ORDER BY hits DESC
+                '''
+                params = []
+                if limit is not None:
+                    query += ' LIMIT ?'
+                    params.append(limit)
+                
+                entries = []
+                for row in conn.execute(query, params).fetchall():
+                    entries.append({
+                        "cache_key": row[0],
+                        "query": row[1],
+                        "params": json.loads(row[2]),
+                        "hits": row[3],
+                        "generation": row[4],
+                        "results": json.loads(row[5])
+                    })
+                return {"success": True, "entries": entries}
+                
+        except Exception as e:
+            self.logger.error(f"Error retrieving hot queries: {str(e)}")
+            return {
+                "success": False,
+                "error": f"Failed to retrieve hot queries: {str(e)}"
+            }
+    
+    def update_hot_queries(self, hits: Optional[Dict[str, int]] = None,
+                           generations: Optional[Dict[str, int]] = None
+                           ) -> Dict[str, Any]:
+        """
+        Add hit counts to, and move generations of, persisted hot queries.
+        
+        Args:
+            hits: Mapping of cache key to hits to add
+            generations: Mapping of cache key to its new generation
+            
+        Returns:
+            Dict with success status
+        """
+        try:
+            with self._get_connection() as conn:
+                if hits:
+                    conn.executemany('''
+                        UPDATE hot_query_cache SET hits = hits + ?
+                        WHERE cache_key = ?
+                    ''', [(count, key) for key, count in hits.items()])
+                if generations:
+                    conn.executemany('''
+                        UPDATE hot_query_cache SET generation = ?
+                        WHERE cache_key = ?
+                    ''', [(gen, key) for key, gen in generations.items()])
+                conn.commit()
+                return {"success": True}
+                
+        except Exception as e:
+            self.logger.error(f"Error updating hot queries: {str(e)}")
+            return {
+                "success": False,
+                "error": f"Failed to update hot queries: {str(e)}"
+            }
+    
+    def delete_hot_queries(self, cache_keys: List[str]) -> Dict[str, Any]:
+        """
+        Delete persisted hot queries.
+        
+        Args:
+            cache_keys: Keys to delete
+            
+        Returns:
+            Dict with success status
+        """
+        try:
+            with self._get_connection() as conn:
+                conn.executemany(
+                    "DELETE FROM hot_query_cache WHERE cache_key = ?",
+                    [(key,) for key in cache_keys]
+                )
+                conn.commit()
+                return {"success": True}
+                
+        except Exception as e:
+            self.logger.error(f"Error deleting hot queries: {str(e)}")
+            return {
+                "success": False,
+                "error": f"Failed to delete hot queries: {str(e)}"
+            }
+    
+    def get_indexed_files_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about indexed files.
+        
+        Totals come from the trigger-maintained index_stats counters, so
+        the cost does not grow with the size of the index.
+        
+        Returns:
+            Dictionary with file indexing statistics, including a
+            per-file-type breakdown under 'by_type'
+        """
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                
+                cursor.execute('''
+                    SELECT file_type, files, size_bytes, chunks, embeddings
+                    FROM index_stats WHERE files > 0
+                ''')
+                by_type = {
+                    row[0] or 'unknown': {
+                        'files': row[1],
+                        'size_bytes': row[2],
+                        'chunks': row[3],
+                        'embeddings': row[4]
+                    }
+                    for row in cursor.fetchall()
+                }
+                
+                stats = {}
+                stats['total_files'] = sum(
+                    t['files'] for t in by_type.values()
+                )
+                stats['files_by_type'] = {
+                    file_type: t['files'] for file_type, t in by_type.items()
+                }
+                total_size = sum(t['size_bytes'] for t in by_type.values())
+                stats['total_size_bytes'] = total_size
+                stats['total_size_mb'] = round(total_size / (1024 * 1024), 2)
+                stats['total_chunks'] = sum(
+                    t['chunks'] for t in by_type.values()
+                )
+                stats['total_embeddings'] = sum(
+                    t['embeddings'] for t in by_type.values()
+                )
+                stats['by_type'] = by_type
+                
+                # Last indexed date (served by idx_indexed_files_indexed_date)
+                cursor.execute('''
+                    SELECT MAX(indexed_date) FROM indexed_files
+                ''')
+                stats['last_indexed_date'] = cursor.fetchone()[0]
+                
+                return stats
+                
+        except Exception as e:
+            self.logger.error(f"Error getting file stats: {str(e)}")
+            return {}
+    
+    def verify_index_stats(self, repair: bool = False) -> Dict[str, Any]:
+        """
+        Compare the index statistics counters against a full recount.
+        
+        The counters only drift if rows are written with triggers disabled
+        or by connections that skip the schema setup, so this is a
+        maintenance check rather than something to run on every read.
+        
+        Args:
+            repair: Replace the counters with the recounted values if
+                they disagree
+            
+        Returns:
+            Dict with success status, whether the counters were
+            consistent, any discrepancies per file type and whether a
+            repair was made
+        """
+        fields = ('files', 'size_bytes', 'chunks', 'embeddings')
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                
+                # Read both sides in one transaction so concurrent writes
+                # cannot show up as drift
+                cursor.execute("BEGIN IMMEDIATE")
+                cursor.execute(INDEX_STATS_AGGREGATE_QUERY)
+                actual = {row[0]: row[1:] for row in cursor.fetchall()}
+                cursor.execute('''
+                    SELECT file_type, files, size_bytes, chunks, embeddings
+                    FROM index_stats
+                ''')
+                stored = {
+                    row[0]: row[1:] for row in cursor.fetchall()
+                    if any(row[1:])
+                }
+                
+                discrepancies = {}
+                for file_type in set(actual) | set(stored):
+                    expected = actual.get(file_type, (0,) * len(fields))
+                    found = stored.get(file_type, (0,) * len(fields))
+                    diff = {
+                        field: {'stored': s, 'actual': a}
+                        for field, s, a in zip(fields, found, expected)
+                        if s != a
+                    }
+                    if diff:
+                        discrepancies[file_type or 'unknown'] = diff
+                
+                repaired = False
+                if discrepancies and repair:
+                    cursor.execute("DELETE FROM index_stats")
+                    cursor.execute(
+                        "INSERT INTO index_stats "
+                        "(file_type, files, size_bytes, chunks, embeddings) "
+                        + INDEX_STATS_AGGREGATE_QUERY
+                    )
+                    repaired = True
+                conn.commit()
+                
+                if discrepancies:
+                    self.logger.warning(
+                        f"Index statistics drifted for "
+                        f"{sorted(discrepancies)}"
+                        + (" (repaired)" if repaired else "")
+                    )
+                
+                return {
+                    "success": True,
+                    "consistent": not discrepancies,
+                    "discrepancies": discrepancies,
+                    "repaired": repaired
+                }
+                
+        except Exception as e:
+            self.logger.error(f"Error verifying index stats: {str(e)}")
+            return {
+                "success": False,
+                "error": f"Failed to verify index stats: {str(e)}"
+            }
+    
+    def remove_file_from_index(self, file_path: str) -> Dict[str, Any]:
+        """
+        Remove a file and its associated data from the index.
+        
+        Args:
+            file_path: Path to the file to remove
+            
+        Returns:
+            Dict with success status and message
+        """
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                
+                # Get file ID
+                cursor.execute('''
+                    SELECT id FROM indexed_files WHERE file_path = ?
+                ''', (file_path,))
+                
+                row = cursor.fetchone()
+                if not row:
+                    return {
+                        "success": False,
+                        "error": "File not found in index"
+                    }
+                
+                file_id = row[0]
+                
+                # Delete dependents explicitly rather than relying on
+                # ON DELETE CASCADE, which only fires on connections that
+                # have foreign key enforcement enabled
+                cursor.execute('''
+                    DELETE FROM file_embeddings
+                    WHERE chunk_id IN (
+                        SELECT id FROM file_chunks WHERE file_id = ?
+                    )
+                ''', (file_id,))
+                embeddings_removed = cursor.rowcount
+                
+                cursor.execute('''
+                    DELETE FROM file_chunks WHERE file_id = ?
+                ''', (file_id,))
+                chunks_removed = cursor.rowcount
+                
+                cursor.execute('''
+                    DELETE FROM file_text_frames WHERE file_id = ?
+                ''', (file_id,))
+                
+                cursor.execute('''
+                    DELETE FROM indexed_files WHERE id = ?
+                ''', (file_id,))
+                
+                conn.commit()
+                self._frame_cache.invalidate(
+                    (str(self.db_manager.file_search_db_path), file_id)
+                )
+                
+                self.logger.info(f"Removed file from index: {file_path}")
+                return {
+                    "success": True,
+                    "message": "File removed from index successfully",
+                    "chunks_removed": chunks_removed,
+                    "embeddings_removed": embeddings_removed
+                }
+                
+        except Exception as e:
+            self.logger.error(f"Error removing file {file_path}: {str(e)}")
+            return {
+                "success": False,
+                "error": f"Failed to remove file: {str(e)}"
+            }
+    
+    def find_dangling_references(self,
+                                 sample_size: int = 10) -> Dict[str, Any]:
+        """
+        Report chunks and embeddings whose parent rows no longer exist.
+        
+        Args:
+            sample_size: Maximum number of example IDs to include per kind
+            
+        Returns:
+            Dict with orphan counts and sample IDs
+        """
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                
+                report = {"success": True}
+                for kind, query in (
+                    ("orphaned_chunks", self._ORPHANED_CHUNKS_QUERY),
+                    ("orphaned_embeddings", self._ORPHANED_EMBEDDINGS_QUERY)
+                ):
+                    cursor.execute(f"SELECT COUNT(*) FROM ({query})")
+                    report[kind] = cursor.fetchone()[0]
+                    
+                    cursor.execute(f"{query} LIMIT ?", (sample_size,))
+                    report[f"{kind}_sample"] = [
+                        row[1] for row in cursor.fetchall()
+                    ]
+                
+                report["total_orphans"] = (
+                    report["orphaned_chunks"] + report["orphaned_embeddings"]
+                )
+                return report
+                
+        except Exception as e:
+            self.logger.error(f"Error checking dangling references: {str(e)}")
+            return {
+                "success": False,
+                "error": f"Failed to check references: {str(e)}"
+            }
+    
+    def collect_orphans(self, batch_size: int = 500,
+                        time_budget: Optional[float] = None
+                        ) -> Dict[str, Any]:
+        """
+        Delete orphaned chunks and embeddings in small batches.
+        
+        Each batch is committed separately so searches and indexing are
+        never blocked for long. With a time budget the collection stops
+        after the first batch that exceeds it and reports whether any
+        orphans may remain.
+        
+        Args:
+            batch_size: Number of rows deleted per transaction
+            time_budget: Optional time limit in seconds for this call
+            
+        Returns:
+            Dict with counts of removed rows and a 'complete' flag
+        """
+        start_time = time.perf_counter()
+        chunks_removed = 0
+        embeddings_removed = 0
+        batches = 0
+        
+        def out_of_time() -> bool:
+            return (time_budget is not None and
+                    time.perf_counter() - start_time >= time_budget)
+        
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                
+                # Chunks first: their embeddings go with them, and any
+                # embeddings left afterwards are caught by the next pass
+                complete = True
+                while True:
+                    cursor.execute(
+                        f"{self._ORPHANED_CHUNKS_QUERY} LIMIT ?",
+                        (batch_size,)
+                    )
+                    rows = cursor.fetchall()
+                    if not rows:
+                        break
+                    
+                    chunk_ids = [row[1] for row in rows]
+                    placeholders = ','.join('?' for _ in chunk_ids)
+                    cursor.execute(
+                        f"DELETE FROM file_embeddings "
+                        f"WHERE chunk_id IN ({placeholders})",
+                        chunk_ids
+                    )
+                    embeddings_removed += cursor.rowcount
+                    
+                    rowids = [row[0] for row in rows]
+                    placeholders = ','.join('?' for _ in rowids)
+                    cursor.execute(
+                        f"DELETE FROM file_chunks "
+                        f"WHERE rowid IN ({placeholders})",
+                        rowids
+                    )
+                    chunks_removed += cursor.rowcount
+                    conn.commit()
+                    batches += 1
+                    
+                    if out_of_time():
+                        complete = False
+                        break
+                
+                while complete:
+                    cursor.execute(
+                        f"{self._ORPHANED_EMBEDDINGS_QUERY} LIMIT ?",
+                        (batch_size,)
+                    )
+                    rowids = [row[0] for row in cursor.fetchall()]
+                    if not rowids:
+                        break
+                    
+                    placeholders = ','.join('?' for _ in rowids)
+                    cursor.execute(
+                        f"DELETE FROM file_embeddings "
+                        f"WHERE rowid IN ({placeholders})",
+                        rowids
+                    )
+                    embeddings_removed += cursor.rowcount
+                    conn.commit()
+                    batches += 1
+                    
+                    if out_of_time():
+                        complete = False
+            
+            elapsed = time.perf_counter() - start_time
+            if chunks_removed or embeddings_removed:
+                self.logger.info(
+                    f"Removed {chunks_removed} orphaned chunks and "
+                    f"{embeddings_removed} orphaned embeddings "
+                    f"in {elapsed:.2f}s"
+                )
+            
+            return {
+                "success": True,
+                "chunks_removed": chunks_removed,
+                "embeddings_removed": embeddings_removed,
+                "batches": batches,
+                "complete": complete,
+                "elapsed_seconds": elapsed
+            }
+            
+        except Exception as e:
+            self.logger.error(f"Error collecting orphans: {str(e)}")
+            return {
+                "success": False,
+                "error": f"Orphan collection failed: {str(e)}",
+                "chunks_removed": chunks_removed,
+                "embeddings_removed": embeddings_removed
+            }
+    
+    def start_background_gc(self, batch_size: int = 200,
+                            slice_seconds: float = 0.05,
+                            pause_seconds: float = 0.5) -> bool:
+        """
+        Collect orphans on a background thread in short time slices.
+        
+        The thread runs collect_orphans with a small time budget, sleeps
+        between slices so foreground queries get the database, and exits
+        once the index is clean or stop_background_gc is called.
+        
+        Args:
+            batch_size: Rows deleted per transaction
+            slice_seconds: Time budget for each slice
+            pause_seconds: Idle time between slices
+            
+        Returns:
+            True if a new collector thread was started
+        """
+        if self._gc_thread and self._gc_thread.is_alive():
+            return False
+        
+        self._gc_stop.clear()
+        self._gc_last_result = None
+        
+        def run():
+            totals = {"chunks_removed": 0, "embeddings_removed": 0}
+            while not self._gc_stop.is_set():
+                result = self.collect_orphans(
+                    batch_size=batch_size, time_budget=slice_seconds
+                )
+                totals["chunks_removed"] += result.get("chunks_removed", 0)
+                totals["embeddings_removed"] += result.get(
+                    "embeddings_removed", 0
+                )
+                self._gc_last_result = {**result, **totals}
+                if not result.get("success") or result.get("complete"):
+                    break
+                self._gc_stop.wait(pause_seconds)
+        
+        self._gc_thread = threading.Thread(
+            target=run, name="FileSearchOrphanGC", daemon=True
+        )
+        self._gc_thread.start()
+        return True
+    
+    def stop_background_gc(self, timeout: float = 5.0
+                           ) -> Optional[Dict[str, Any]]:
+        """
+        Stop the background collector and return its last result.
+        
+        Args:
+            timeout: Seconds to wait for the current slice to finish
+        """
+        self._gc_stop.set()
+        if self._gc_thread:
+            self._gc_thread.join(timeout)
+            self._gc_thread = None
+        return self._gc_last_result
+    
+    def is_background_gc_running(self) -> bool:
+        """Check whether the background collector is active"""
+        return bool(self._gc_thread and self._gc_thread.is_alive())
+    
+    def _generate_id(self, seed: str) -> str:
+        """
+        Generate a unique ID based on a seed string.
+        
+        Args:
+            seed: Seed string for ID generation
+            
+        Returns:
+            Unique ID string
+        """
+        timestamp = datetime.now().isoformat()
+        combined = f"{seed}_{timestamp}"
+        return hashlib.sha256(combined.encode()).hexdigest()[:16]
+    
+    def add_allowed_directory(self, directory: str) -> Dict[str, Any]:
+        """
+        Add a directory to the allowed directories list.
+        
+        Args:
+            directory: Directory path to add
+            
+        Returns:
+            Dict with success status and message
+        """
+        try:
+            # Get current allowed directories
+            current_result = self.get_search_settings("allowed_directories")
+            if current_result.get("success"):
+                current_dirs = current_result.get("setting_value", [])
+            else:
+                current_dirs = []
+            
             # Add new directory if not already present
             if directory not in current_dirs:
                 current_dirs.append(directory)
@@ -1211,10 +2065,106 @@ class FileSearchDB:
                 "error": f"Failed to get directory settings: {str(e)}"
             }
     
-    def optimize_database(self) -> Dict[str, Any]:
+    def get_fragmentation_stats(self, include_page_fill: bool = False
+                                ) -> Dict[str, Any]:
+        """
+        Measure how much of the database file is wasted space.
+        
+        Free-page counts come from the database header and are cheap.
+        Page fill (the share of each in-use page holding data) needs a
+        read of every page, so it is only measured on request.
+        
+        Args:
+            include_page_fill: Also measure page fill via dbstat
+            
+        Returns:
+            Dict with page counts, free and fill ratios, the auto-vacuum
+            mode and whether a full rebuild is recommended
+        """
+        try:
+            with self._get_connection() as conn:
+                return {
+                    "success": True,
+                    **self._fragmentation_metrics(conn, include_page_fill)
+                }
+        except Exception as e:
+            self.logger.error(f"Error measuring fragmentation: {str(e)}")
+            return {
+                "success": False,
+                "error": f"Failed to measure fragmentation: {str(e)}"
+            }
+    
+    def _fragmentation_metrics(self, conn,
+                               include_page_fill: bool = False
+                               ) -> Dict[str, Any]:
+        """Collect fragmentation metrics and the rebuild decision"""
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+        freelist_count = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        auto_vacuum = self._AUTO_VACUUM_MODES.get(
+            conn.execute("PRAGMA auto_vacuum").fetchone()[0], 'unknown'
+        )
+        free_ratio = freelist_count / page_count if page_count else 0.0
+        
+        page_fill = None
+        if include_page_fill:
+            try:
+                row = conn.execute(
+                    "SELECT SUM(pgsize - unused), SUM(pgsize) FROM dbstat "
+                    "WHERE aggregate = TRUE"
+                ).fetchone()
+                page_fill = row[0] / row[1] if row and row[1] else 1.0
+            except sqlite3.Error:
+                # dbstat is a compile-time option
+                page_fill = None
+        
+        reasons = []
+        if (auto_vacuum != 'incremental' and
+                free_ratio >= self.REBUILD_FREE_RATIO):
+            reasons.append(
+                f"{free_ratio:.0%} of pages are free and auto_vacuum is "
+                f"{auto_vacuum}, so they can only be released by a rebuild"
+            )
+        if page_fill is not None and page_fill < self.REBUILD_MIN_FILL:
+            reasons.append(f"in-use pages are only {page_fill:.0%} full")
+        
+        return {
+            "page_size": page_size,
+            "page_count": page_count,
+            "freelist_count": freelist_count,
+            "free_ratio": free_ratio,
+            "size_bytes": page_size * page_count,
+            "reclaimable_bytes": page_size * freelist_count,
+            "page_fill": page_fill,
+            "auto_vacuum": auto_vacuum,
+            "needs_rebuild": bool(reasons),
+            "rebuild_reasons": reasons
+        }
+    
+    def optimize_database(self, full_rebuild: Optional[bool] = None,
+                          check_page_fill: bool = False,
+                          vacuum_time_budget: float = 0.1
+                          ) -> Dict[str, Any]:
         """
         Optimize database for better search performance.
         
+        Planner statistics are refreshed with PRAGMA optimize, which only
+        re-analyzes tables whose statistics are missing or stale and reads
+        at most ANALYSIS_LIMIT rows per index. Free pages are released
+        with short incremental vacuum steps; whatever the time budget
+        leaves is handed to background maintenance. A full VACUUM, which
+        locks the database for its whole duration, only runs when the
+        fragmentation metrics call for it (typically once, to switch an
+        older database to incremental auto-vacuum).
+        
+        Args:
+            full_rebuild: Force (True) or forbid (False) a full VACUUM;
+                None decides from the fragmentation metrics
+            check_page_fill: Include page fill in the rebuild decision
+                (reads every page)
+            vacuum_time_budget: Seconds of incremental vacuum to run
+                before deferring the rest to background maintenance
+            
         Returns:
             Dict with optimization results
         """
@@ -1222,44 +2172,218 @@ class FileSearchDB:
             with self._get_connection() as conn:
                 cursor = conn.cursor()
                 
-                # Analyze tables to update query planner statistics
-                cursor.execute("ANALYZE indexed_files")
-                cursor.execute("ANALYZE file_chunks")
-                cursor.execute("ANALYZE file_embeddings")
-                
-                # Vacuum to reclaim space
-                conn.execute("VACUUM")
-                
-                # Get database statistics
-                cursor.execute('''
-                    SELECT
-                        name,
-                        COUNT(*) as row_count
-                    FROM sqlite_master
-                    WHERE type='table' AND name IN (
-                        'indexed_files', 'file_chunks',
-                        'file_embeddings', 'search_settings'
-                    )
-                    GROUP BY name
-                ''')
-                
-                stats = {}
-                for row in cursor.fetchall():
-                    table_name = row[0]
-                    cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-                    stats[table_name] = cursor.fetchone()[0]
-                
-                self.logger.info("Database optimization completed")
+                # Update query planner statistics where they are stale
+                has_stats = cursor.execute(
+                    "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+                ).fetchone() is not None
+                cursor.execute(f"PRAGMA analysis_limit = {self.ANALYSIS_LIMIT}")
+                # 0x10000 checks every table, not just those this
+                # connection has queried; 0x02 is the default analysis
+                cursor.execute("PRAGMA optimize = 0x10002")
+                if not has_stats:
+                    # optimize skips tables that have never been analyzed
+                    cursor.execute("ANALYZE")
+                
+                metrics = self._fragmentation_metrics(conn, check_page_fill)
+                rebuild = (metrics["needs_rebuild"] if full_rebuild is None
+                           else full_rebuild)
+                conn.commit()
                 
-                return {
-                    "success": True,
-                    "message": "Database optimized successfully",
-                    "table_stats": stats
-                }
+                if rebuild:
+                    # Takes effect with the rebuild, so later deletes can
+                    # be reclaimed incrementally
+                    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                    conn.execute("VACUUM")
                 
+                cursor.execute("SELECT COUNT(*) FROM search_settings")
+                search_settings = cursor.fetchone()[0]
+            
+            vacuum = {"pages_freed": 0, "complete": True}
+            if not rebuild and metrics["auto_vacuum"] == 'incremental':
+                vacuum = self.incremental_vacuum(time_budget=vacuum_time_budget)
+            maintenance_scheduled = (
+                not vacuum.get("complete", True) and
+                self.start_background_maintenance()
+            )
+            
+            # Row totals come from the index statistics counters
+            index_stats = self.get_indexed_files_stats()
+            stats = {
+                'indexed_files': index_stats.get('total_files', 0),
+                'file_chunks': index_stats.get('total_chunks', 0),
+                'file_embeddings': index_stats.get('total_embeddings', 0),
+                'search_settings': search_settings
+            }
+            
+            self.logger.info(
+                "Database optimization completed"
+                + (" with full rebuild" if rebuild else "")
+            )
+            
+            return {
+                "success": True,
+                "message": "Database optimized successfully",
+                "table_stats": stats,
+                "rebuilt": rebuild,
+                "pages_freed": vacuum.get("pages_freed", 0),
+                "maintenance_scheduled": maintenance_scheduled,
+                "fragmentation": metrics
+            }
+            
         except Exception as e:
             self.logger.error(f"Error optimizing database: {str(e)}")
             return {
                 "success": False,
                 "error": f"Optimization failed: {str(e)}"
-            }
\ No newline at end of file
+            }
+    
+    def incremental_vacuum(self, max_pages: Optional[int] = None,
+                           time_budget: Optional[float] = None,
+                           step_pages: Optional[int] = None
+                           ) -> Dict[str, Any]:
+        """
+        Release free pages in small steps.
+        
+        Each step is its own short write transaction, and the maintenance
+        connection gives up rather than wait if another writer holds the
+        database, so searches and indexing are never held up for long.
+        Requires auto_vacuum=INCREMENTAL (see optimize_database).
+        
+        Args:
+            max_pages: Stop after releasing this many pages
+            time_budget: Stop after this many seconds
+            step_pages: Pages released per step (default VACUUM_STEP_PAGES)
+            
+        Returns:
+            Dict with pages freed, pages still free and a 'complete' flag
+        """
+        step_pages = step_pages or self.VACUUM_STEP_PAGES
+        start_time = time.perf_counter()
+        pages_freed = 0
+        # Not _get_connection: maintenance must not count as activity
+        conn = self.db_manager.get_file_search_connection()
+        try:
+            conn.execute(f"PRAGMA busy_timeout = {self.MAINTENANCE_BUSY_MS}")
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                return {
+                    "success": False,
+                    "error": "Incremental vacuum requires "
+                             "auto_vacuum=INCREMENTAL; run "
+                             "optimize_database(full_rebuild=True) once",
+                    "pages_freed": 0
+                }
+            
+            free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            while free > 0:
+                if max_pages is not None and pages_freed >= max_pages:
+                    break
+                if (time_budget is not None and
+                        time.perf_counter() - start_time >= time_budget):
+                    break
+                step = step_pages
+                if max_pages is not None:
+                    step = min(step, max_pages - pages_freed)
+                conn.execute(f"PRAGMA incremental_vacuum({step})").fetchall()
+                remaining = conn.execute(
+                    "PRAGMA freelist_count"
+                ).fetchone()[0]
+                pages_freed += free - remaining
+                free = remaining
+            
+            return {
+                "success": True,
+                "pages_freed": pages_freed,
+                "freelist_count": free,
+                "complete": free == 0,
+                "elapsed_seconds": time.perf_counter() - start_time
+            }
+            
+        except sqlite3.OperationalError as e:
+            if "locked" not in str(e) and "busy" not in str(e):
+                raise
+            # Another connection is writing; try again later
+            return {
+                "success": True,
+                "pages_freed": pages_freed,
+                "complete": False,
+                "busy": True,
+                "elapsed_seconds": time.perf_counter() - start_time
+            }
+        except Exception as e:
+            self.logger.error(f"Error in incremental vacuum: {str(e)}")
+            return {
+                "success": False,
+                "error": f"Incremental vacuum failed: {str(e)}",
+                "pages_freed": pages_freed
+            }
+        finally:
+            conn.close()
+    
+    def start_background_maintenance(self, step_pages: int = 128,
+                                     pause_seconds: float = 0.5,
+                                     idle_seconds: float = 2.0) -> bool:
+        """
+        Release free pages on a background thread while the index is idle.
+        
+        The thread runs one incremental vacuum step at a time, only once
+        this instance has gone idle_seconds without opening a connection,
+        and exits once no free pages remain or stop_background_maintenance
+        is called.
+        
+        Args:
+            step_pages: Pages released per step
+            pause_seconds: Wait between steps and idle checks
+            idle_seconds: Quiet period required before each step
+            
+        Returns:
+            True if a new maintenance thread was started
+        """
+        if self._maintenance_thread and self._maintenance_thread.is_alive():
+            return False
+        
+        self._maintenance_stop.clear()
+        self._maintenance_last_result = None
+        
+        def run():
+            total = 0
+            while not self._maintenance_stop.is_set():
+                idle_for = time.monotonic() - self._last_activity
+                if idle_for < idle_seconds:
+                    self._maintenance_stop.wait(
+                        max(pause_seconds, idle_seconds - idle_for)
+                    )
+                    continue
+                result = self.incremental_vacuum(max_pages=step_pages)
+                total += result.get("pages_freed", 0)
+                self._maintenance_last_result = {
+                    **result, "total_pages_freed": total
+                }
+                if not result.get("success") or result.get("complete"):
+                    break
+                self._maintenance_stop.wait(pause_seconds)
+        
+        self._maintenance_thread = threading.Thread(
+            target=run, name="FileSearchMaintenance", daemon=True
+        )
+        self._maintenance_thread.start()
+        return True
+    
+    def stop_background_maintenance(self, timeout: float = 5.0
+                                    ) -> Optional[Dict[str, Any]]:
+        """
+        Stop background maintenance and return its last result.
+        
+        Args:
+            timeout: Seconds to wait for the current step to finish
+        """
+        self._maintenance_stop.set()
+        if self._maintenance_thread:
+            self._maintenance_thread.join(timeout)
+            self._maintenance_thread = None
+        return self._maintenance_last_result
+    
+    def is_background_maintenance_running(self) -> bool:
+        """Check whether background maintenance is active"""
+        return bool(
+            self._maintenance_thread and self._maintenance_thread.is_alive()
+        )
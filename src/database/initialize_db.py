@@ -14,13 +14,280 @@ except ImportError:
     from models.note import Note, NoteList
 from .resilient_db import ResilientDB
 
+
+# Every change to an indexed file or its embeddings bumps the index
+# generation and records it against the file path, so cached search
+# results can tell which files changed since they were computed
+FILE_SEARCH_GENERATION_SCHEMA = (
+    '''CREATE TABLE IF NOT EXISTS index_generation (
+        id INTEGER PRIMARY KEY CHECK (id = 0),
+        generation INTEGER NOT NULL
+    )''',
+    '''INSERT OR IGNORE INTO index_generation (id, generation)
+        VALUES (0, 0)''',
+    '''CREATE TABLE IF NOT EXISTS index_file_generations (
+        file_path TEXT PRIMARY KEY,
+        generation INTEGER NOT NULL
+    )''',
+    '''CREATE INDEX IF NOT EXISTS idx_index_file_generations_generation
+        ON index_file_generations(generation)''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_indexed_files_insert
+        AFTER INSERT ON indexed_files
+    BEGIN
+        UPDATE index_generation SET generation = generation + 1
+            WHERE id = 0;
+        INSERT OR REPLACE INTO index_file_generations (file_path, generation)
+            SELECT NEW.file_path, generation FROM index_generation
+            WHERE id = 0;
+    END''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_indexed_files_update
+        AFTER UPDATE ON indexed_files
+    BEGIN
+        UPDATE index_generation SET generation = generation + 1
+            WHERE id = 0;
+        INSERT OR REPLACE INTO index_file_generations (file_path, generation)
+            SELECT NEW.file_path, generation FROM index_generation
+            WHERE id = 0;
+    END''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_indexed_files_delete
+        AFTER DELETE ON indexed_files
+    BEGIN
+        UPDATE index_generation SET generation = generation + 1
+            WHERE id = 0;
+        INSERT OR REPLACE INTO index_file_generations (file_path, generation)
+            SELECT OLD.file_path, generation FROM index_generation
+            WHERE id = 0;
+    END''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_file_embeddings_insert
+        AFTER INSERT ON file_embeddings
+    BEGIN
+        UPDATE index_generation SET generation = generation + 1
+            WHERE id = 0;
+        INSERT OR REPLACE INTO index_file_generations (file_path, generation)
+            SELECT f.file_path, g.generation
+            FROM file_chunks c
+            JOIN indexed_files f ON f.id = c.file_id
+            JOIN index_generation g ON g.id = 0
+            WHERE c.id = NEW.chunk_id;
+    END''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_file_embeddings_delete
+        AFTER DELETE ON file_embeddings
+    BEGIN
+        UPDATE index_generation SET generation = generation + 1
+            WHERE id = 0;
+        INSERT OR REPLACE INTO index_file_generations (file_path, generation)
+            SELECT f.file_path, g.generation
+            FROM file_chunks c
+            JOIN indexed_files f ON f.id = c.file_id
+            JOIN index_generation g ON g.id = 0
+            WHERE c.id = OLD.chunk_id;
+    END''',
+    '''CREATE TABLE IF NOT EXISTS hot_query_cache (
+        cache_key TEXT PRIMARY KEY,
+        query TEXT NOT NULL,
+        params TEXT NOT NULL,
+        hits INTEGER NOT NULL DEFAULT 0,
+        generation INTEGER NOT NULL,
+        results TEXT NOT NULL,
+        updated_date DATETIME DEFAULT CURRENT_TIMESTAMP
+    )''',
+)
+
+# Each file's extracted text, stored once as zlib-compressed frames (see
+# text_frames). Chunks whose content column is empty read their text
+# from here by (start_pos, end_pos) offsets instead of keeping a copy
+FILE_SEARCH_TEXT_SCHEMA = (
+    '''CREATE TABLE IF NOT EXISTS file_text_frames (
+        file_id TEXT NOT NULL,
+        frame_index INTEGER NOT NULL,
+        data BLOB NOT NULL,
+        PRIMARY KEY (file_id, frame_index),
+        FOREIGN KEY (file_id) REFERENCES indexed_files (id)
+            ON DELETE CASCADE
+    ) WITHOUT ROWID''',
+)
+
+# Per-file-type totals for active files, kept current by triggers in the
+# same transaction as every write so index statistics never need a scan.
+# Deleting a parent row subtracts its children up front: cascaded child
+# deletes run after the parent row is gone and cannot attribute
+# themselves to a file type. Trigger bodies avoid OR IGNORE because the
+# INSERT OR REPLACE of the outer statement would override it.
+INDEX_STATS_AGGREGATE_QUERY = '''
+    SELECT
+        COALESCE(f.file_type, '') AS file_type,
+        COUNT(*) AS files,
+        COALESCE(SUM(f.size), 0) AS size_bytes,
+        COALESCE(SUM((
+            SELECT COUNT(*) FROM file_chunks c WHERE c.file_id = f.id
+        )), 0) AS chunks,
+        COALESCE(SUM((
+            SELECT COUNT(*) FROM file_embeddings e
+            JOIN file_chunks c ON e.chunk_id = c.id
+            WHERE c.file_id = f.id
+        )), 0) AS embeddings
+    FROM indexed_files f
+    WHERE f.status = 'active'
+    GROUP BY COALESCE(f.file_type, '')
+'''
+
+FILE_SEARCH_STATS_SCHEMA = (
+    '''CREATE TABLE IF NOT EXISTS index_stats (
+        file_type TEXT PRIMARY KEY,
+        files INTEGER NOT NULL DEFAULT 0,
+        size_bytes INTEGER NOT NULL DEFAULT 0,
+        chunks INTEGER NOT NULL DEFAULT 0,
+        embeddings INTEGER NOT NULL DEFAULT 0
+    )''',
+    '''CREATE INDEX IF NOT EXISTS idx_indexed_files_indexed_date
+        ON indexed_files(indexed_date)''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_index_stats_file_insert
+        AFTER INSERT ON indexed_files
+        WHEN NEW.status = 'active'
+    BEGIN
+        INSERT INTO index_stats (file_type)
+            SELECT COALESCE(NEW.file_type, '')
+            WHERE NOT EXISTS (
+                SELECT 1 FROM index_stats
+                WHERE file_type = COALESCE(NEW.file_type, '')
+            );
+        UPDATE index_stats
+            SET files = files + 1, size_bytes = size_bytes + NEW.size
+            WHERE file_type = COALESCE(NEW.file_type, '');
+    END''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_index_stats_file_delete
+        BEFORE DELETE ON indexed_files
+        WHEN OLD.status = 'active'
+    BEGIN
+        UPDATE index_stats SET
+            files = files - 1,
+            size_bytes = size_bytes - OLD.size,
+            chunks = chunks - (
+                SELECT COUNT(*) FROM file_chunks WHERE file_id = OLD.id
+            ),
+            embeddings = embeddings - (
+                SELECT COUNT(*) FROM file_embeddings e
+                JOIN file_chunks c ON e.chunk_id = c.id
+                WHERE c.file_id = OLD.id
+            )
+            WHERE file_type = COALESCE(OLD.file_type, '');
+    END''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_index_stats_file_update
+        AFTER UPDATE OF id, size, file_type, status ON indexed_files
+    BEGIN
+        UPDATE index_stats SET
+            files = files - 1,
+            size_bytes = size_bytes - OLD.size,
+            chunks = chunks - (
+                SELECT COUNT(*) FROM file_chunks WHERE file_id = OLD.id
+            ),
+            embeddings = embeddings - (
+                SELECT COUNT(*) FROM file_embeddings e
+                JOIN file_chunks c ON e.chunk_id = c.id
+                WHERE c.file_id = OLD.id
+            )
+            WHERE OLD.status = 'active'
+            AND file_type = COALESCE(OLD.file_type, '');
+        INSERT INTO index_stats (file_type)
+            SELECT COALESCE(NEW.file_type, '')
+            WHERE NEW.status = 'active' AND NOT EXISTS (
+                SELECT 1 FROM index_stats
+                WHERE file_type = COALESCE(NEW.file_type, '')
+            );
+        UPDATE index_stats SET
+            files = files + 1,
+            size_bytes = size_bytes + NEW.size,
+            chunks = chunks + (
+                SELECT COUNT(*) FROM file_chunks WHERE file_id = NEW.id
+            ),
+            embeddings = embeddings + (
+                SELECT COUNT(*) FROM file_embeddings e
+                JOIN file_chunks c ON e.chunk_id = c.id
+                WHERE c.file_id = NEW.id
+            )
+            WHERE NEW.status = 'active'
+            AND file_type = COALESCE(NEW.file_type, '');
+    END''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_index_stats_chunk_insert
+        AFTER INSERT ON file_chunks
+    BEGIN
+        UPDATE index_stats SET
+            chunks = chunks + 1,
+            embeddings = embeddings + (
+                SELECT COUNT(*) FROM file_embeddings WHERE chunk_id = NEW.id
+            )
+            WHERE file_type = (
+                SELECT COALESCE(file_type, '') FROM indexed_files
+                WHERE id = NEW.file_id AND status = 'active'
+            );
+    END''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_index_stats_chunk_delete
+        BEFORE DELETE ON file_chunks
+    BEGIN
+        UPDATE index_stats SET
+            chunks = chunks - 1,
+            embeddings = embeddings - (
+                SELECT COUNT(*) FROM file_embeddings WHERE chunk_id = OLD.id
+            )
+            WHERE file_type = (
+                SELECT COALESCE(file_type, '') FROM indexed_files
+                WHERE id = OLD.file_id AND status = 'active'
+            );
+    END''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_index_stats_embedding_insert
+        AFTER INSERT ON file_embeddings
+    BEGIN
+        UPDATE index_stats SET embeddings = embeddings + 1
+            WHERE file_type = (
+                SELECT COALESCE(f.file_type, '') FROM file_chunks c
+                JOIN indexed_files f ON f.id = c.file_id
+                WHERE c.id = NEW.chunk_id AND f.status = 'active'
+            );
+    END''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_index_stats_embedding_delete
+        BEFORE DELETE ON file_embeddings
+    BEGIN
+        UPDATE index_stats SET embeddings = embeddings - 1
+            WHERE file_type = (
+                SELECT COALESCE(f.file_type, '') FROM file_chunks c
+                JOIN indexed_files f ON f.id = c.file_id
+                WHERE c.id = OLD.chunk_id AND f.status = 'active'
+            );
+    END''',
+)
+
+
+def setup_index_stats(cursor) -> None:
+    """
+    Create the index statistics counters, seeding them from the existing
+    index the first time so databases created before the counters existed
+    start out correct.
+    """
+    cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' "
+        "AND name = 'index_stats'"
+    )
+    exists = cursor.fetchone() is not None
+    
+    for statement in FILE_SEARCH_STATS_SCHEMA:
+        cursor.execute(statement)
+    
+    if not exists:
+        cursor.execute(
+            "INSERT INTO index_stats "
+            "(file_type, files, size_bytes, chunks, embeddings) "
+            + INDEX_STATS_AGGREGATE_QUERY
+        )
+
+
 class DatabaseManager:
     """Manages multiple SQLite databases for the DinoAir application"""
     
-    def __init__(self, user_name=None, user_feedback=None):
+    def __init__(self, user_name=None, user_feedback=None, base_dir=None):
         self.user_name = user_name or "default_user"
         self.user_feedback = user_feedback or print
-        self.base_dir = Path(__file__).parent.parent  # Root of DinoAir2.0dev
+        # Root of DinoAir2.0dev unless given, e.g. a temporary directory
+        self.base_dir = Path(base_dir) if base_dir else Path(__file__).parent.parent
         self.user_db_dir = self.base_dir / "user_data" / self.user_name / "databases"
         
         # Track active connections for cleanup
@@ -281,11 +548,13 @@ class DatabaseManager:
         
         # Create indexes for performance
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_sessions_created ON chat_sessions(created_at DESC)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_sessions_updated ON chat_sessions(updated_at DESC, id DESC)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_sessions_project ON chat_sessions(project_id)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_sessions_task ON chat_sessions(task_id)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_sessions_status ON chat_sessions(status)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_messages_session ON chat_messages(session_id)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_messages_timestamp ON chat_messages(timestamp)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_messages_session_timestamp ON chat_messages(session_id, timestamp, id)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_schedules_session ON chat_schedules(session_id)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_schedules_next_run ON chat_schedules(next_run)')
         
@@ -462,6 +731,10 @@ class DatabaseManager:
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_artifacts_project ON artifacts(project_id)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_artifacts_created ON artifacts(created_at)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_artifacts_tags ON artifacts(tags)')
+        # Per-collection counts and newest-first pages of the artifacts tree
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_artifacts_collection_status ON artifacts(collection_id, status)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_artifacts_updated ON artifacts(updated_at, id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_artifacts_collection_updated ON artifacts(collection_id, updated_at, id)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_versions_artifact ON artifact_versions(artifact_id)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_versions_number ON artifact_versions(version_number)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_collections_name ON artifact_collections(name)')
@@ -473,6 +746,18 @@ class DatabaseManager:
     
     def _setup_file_search_schema(self, conn):
         """Initialize the file search database schema for RAG functionality"""
+        # Foreign keys are off by default in SQLite and the setting is
+        # per-connection; without it the ON DELETE CASCADE clauses below
+        # never fire and removed files leave orphaned chunks behind
+        conn.execute("PRAGMA foreign_keys = ON")
+        # INSERT OR REPLACE deletes the row it replaces; delete triggers
+        # only see that when recursive triggers are enabled, and the index
+        # statistics counters depend on seeing every delete
+        conn.execute("PRAGMA recursive_triggers = ON")
+        # Only takes effect before the first table is created; databases
+        # from older versions switch over on their next full rebuild
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        
         cursor = conn.cursor()
         
         # Table for tracking indexed files
@@ -531,6 +816,18 @@ class DatabaseManager:
             )
         ''')
         
+        # Table for search history used by query suggestions
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS search_history (
+                query_key TEXT PRIMARY KEY,
+                query TEXT NOT NULL,
+                weight REAL NOT NULL,
+                use_count INTEGER NOT NULL DEFAULT 1,
+                result_count INTEGER DEFAULT 0,
+                last_used DATETIME NOT NULL
+            )
+        ''')
+
         # Create indexes for performance
         cursor.execute('''CREATE INDEX IF NOT EXISTS
             idx_indexed_files_path ON indexed_files(file_path)''')
@@ -548,6 +845,15 @@ class DatabaseManager:
         cursor.execute('''CREATE INDEX IF NOT EXISTS
             idx_search_settings_name
             ON search_settings(setting_name)''')
+        cursor.execute('''CREATE INDEX IF NOT EXISTS
+            idx_search_history_last_used
+            ON search_history(last_used)''')
+        
+        for statement in FILE_SEARCH_GENERATION_SCHEMA:
+            cursor.execute(statement)
+        for statement in FILE_SEARCH_TEXT_SCHEMA:
+            cursor.execute(statement)
+        setup_index_stats(cursor)
         
         conn.commit()
     
@@ -579,6 +885,7 @@ class DatabaseManager:
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_projects_name ON projects(name)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_projects_status ON projects(status)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_projects_parent ON projects(parent_project_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_projects_parent_name ON projects(parent_project_id, name, created_at DESC)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_projects_created ON projects(created_at)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_projects_tags ON projects(tags)')
         
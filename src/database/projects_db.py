@@ -274,6 +274,84 @@ class ProjectsDatabase:
             self.logger.error(f"Failed to get root projects: {str(e)}")
             return []
     
+    def get_project_tree_rows(
+            self,
+            parent_id: Optional[str] = None,
+            project_ids: Optional[List[str]] = None) -> List[tuple]:
+        """Get the light-weight rows the projects tree is built from
+        
+        Returns (id, name, status, color, icon, parent_project_id,
+        created_at, child_count) for the direct children of parent_id,
+        or of root projects when parent_id is None, in tree order
+        (name, then newest first). When project_ids is given, returns
+        the rows of those projects wherever they are in the hierarchy.
+        """
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                
+                sql = '''
+                    SELECT p.id, p.name, p.status, p.color, p.icon,
+                           p.parent_project_id, p.created_at,
+                           (SELECT COUNT(*) FROM projects c
+                            WHERE c.parent_project_id = p.id)
+                    FROM projects p
+                '''
+                
+                if project_ids is None:
+                    if parent_id is None:
+                        sql += ' WHERE p.parent_project_id IS NULL'
+                        params: List[Any] = []
+                    else:
+                        sql += ' WHERE p.parent_project_id = ?'
+                        params = [parent_id]
+                    sql += ' ORDER BY p.name, p.created_at DESC'
+                    cursor.execute(sql, params)
+                    return cursor.fetchall()
+                
+                # Stay well inside SQLite's bound parameter limit
+                rows = []
+                ids = list(project_ids)
+                for start in range(0, len(ids), 500):
+                    batch = ids[start:start + 500]
+                    placeholders = ','.join('?' * len(batch))
+                    cursor.execute(
+                        sql + f' WHERE p.id IN ({placeholders})', batch
+                    )
+                    rows.extend(cursor.fetchall())
+                return rows
+                
+        except Exception as e:
+            self.logger.error(f"Failed to get project tree rows: {str(e)}")
+            return []
+    
+    def get_project_count(self) -> int:
+        """Get the total number of projects"""
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('SELECT COUNT(*) FROM projects')
+                return cursor.fetchone()[0]
+                
+        except Exception as e:
+            self.logger.error(f"Failed to count projects: {str(e)}")
+            return 0
+    
+    def get_project_child_count(self, project_id: str) -> int:
+        """Get the number of direct subprojects of a project"""
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    'SELECT COUNT(*) FROM projects WHERE parent_project_id = ?',
+                    (project_id,)
+                )
+                return cursor.fetchone()[0]
+                
+        except Exception as e:
+            self.logger.error(f"Failed to count child projects: {str(e)}")
+            return 0
+    
     def get_project_tree(self, project_id: str) -> Dict[str, Any]:
         """Get project tree structure starting from a project"""
         try:
@@ -0,0 +1,128 @@
+"""
+Compressed file text storage for DinoAir 2.0 file search.
+Each indexed file's text is stored once as a run of zlib-compressed
+frames; chunks keep only (start_pos, end_pos) character offsets into it
+and their text is decompressed on demand through a small frame cache.
+"""
+
+import zlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+# Characters of text per frame. Typical prose compresses three to four
+# times, so a frame lands well inside one 4 KiB database page and a
+# snippet fetch never decompresses much more than it returns
+FRAME_CHARS = 8192
+
+# zlib level; 6 is the library default and within a few percent of 9
+COMPRESSION_LEVEL = 6
+
+
+def compress_frames(text: str,
+                    frame_chars: int = FRAME_CHARS) -> List[bytes]:
+    """Split text into frame_chars-sized frames and compress each one."""
+    return [
+        zlib.compress(text[start:start + frame_chars].encode('utf-8'),
+                      COMPRESSION_LEVEL)
+        for start in range(0, len(text), frame_chars)
+    ]
+
+
+def decompress_frame(data: bytes) -> str:
+    """Inverse of compress_frames for a single frame."""
+    return zlib.decompress(data).decode('utf-8')
+
+
+def frame_range(start_pos: int, end_pos: int,
+                frame_chars: int = FRAME_CHARS) -> Tuple[int, int]:
+    """First and last frame index covering text[start_pos:end_pos]."""
+    return start_pos // frame_chars, max(start_pos, end_pos - 1) // frame_chars
+
+
+class FrameCache:
+    """Thread-safe LRU of decompressed frames keyed by (owner, index)"""
+
+    def __init__(self, max_frames: int = 256):
+        self.max_frames = max_frames
+        self._frames: 'OrderedDict[Tuple[Hashable, int], str]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, owner: Hashable, index: int) -> Optional[str]:
+        with self._lock:
+            key = (owner, index)
+            text = self._frames.get(key)
+            if text is None:
+                self.misses += 1
+                return None
+            self._frames.move_to_end(key)
+            self.hits += 1
+            return text
+
+    def put(self, owner: Hashable, index: int, text: str) -> None:
+        with self._lock:
+            self._frames[(owner, index)] = text
+            self._frames.move_to_end((owner, index))
+            while len(self._frames) > self.max_frames:
+                self._frames.popitem(last=False)
+
+    def invalidate(self, owner: Hashable) -> None:
+        """Drop every cached frame belonging to owner."""
+        with self._lock:
+            for key in [k for k in self._frames if k[0] == owner]:
+                del self._frames[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._frames.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'size': len(self._frames),
+                'max_frames': self.max_frames,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+
+def read_span(owner: Hashable, start_pos: int, end_pos: int,
+              cache: FrameCache,
+              load_frames: Callable[[int, int], Iterable[Tuple[int, bytes]]],
+              frame_chars: int = FRAME_CHARS) -> Optional[str]:
+    """
+    Return text[start_pos:end_pos] of a framed text.
+
+    Frames missing from the cache are fetched in one call to
+    load_frames(first, last), which yields (frame_index, data) pairs.
+    Returns None when the text has no stored frames.
+    """
+    if end_pos <= start_pos:
+        return ''
+
+    first, last = frame_range(start_pos, end_pos, frame_chars)
+    frames: Dict[int, str] = {}
+    missing = []
+    for index in range(first, last + 1):
+        text = cache.get(owner, index)
+        if text is None:
+            missing.append(index)
+        else:
+            frames[index] = text
+
+    if missing:
+        for index, data in load_frames(missing[0], missing[-1]):
+            if index not in frames:
+                frames[index] = decompress_frame(data)
+                cache.put(owner, index, frames[index])
+        if any(index not in frames for index in missing):
+            return None
+
+    joined = ''.join(frames[index] for index in range(first, last + 1))
+    offset = first * frame_chars
+    return joined[start_pos - offset:end_pos - offset]
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Artifact Tree Model
+Item model behind the artifacts page tree. A refresh costs one count
+query; the artifacts of a collection are fetched a page at a time as
+the collection is expanded or scrolled, and single artifacts can be
+added, updated or removed in place.
+"""
+
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from PySide6.QtCore import QAbstractItemModel, QModelIndex, Qt
+from PySide6.QtGui import QBrush, QColor
+
+from src.models.artifact import Artifact, ArtifactCollection, ArtifactType
+
+
+# Icons shown in front of artifact names, by content type
+ARTIFACT_ICONS = {
+    ArtifactType.TEXT.value: "📄",
+    ArtifactType.DOCUMENT.value: "📋",
+    ArtifactType.IMAGE.value: "🖼️",
+    ArtifactType.CODE.value: "💻",
+    ArtifactType.BINARY.value: "📦"
+}
+
+# Row layout returned by ArtifactsDatabase.get_artifact_tree_rows
+(ROW_ID, ROW_NAME, ROW_TYPE, ROW_COLLECTION, ROW_PROJECT, ROW_ENCRYPTED,
+ ROW_UPDATED) = range(7)
+
+
+class _Node:
+    """A tree node. Group nodes ('all' and 'collection') know how many
+    artifacts they hold and keep the artifact nodes fetched so far,
+    newest first, plus the (updated_at, id) key to fetch on from."""
+
+    __slots__ = ('kind', 'key', 'parent', 'children', 'count', 'cursor',
+                 'collection')
+
+    def __init__(self, kind: str, key: Optional[str] = None,
+                 parent: Optional['_Node'] = None,
+                 collection: Optional[ArtifactCollection] = None):
+        self.kind = kind
+        self.key = key
+        self.parent = parent
+        self.children: List['_Node'] = []
+        self.count = 0
+        self.cursor: Optional[Tuple[str, str]] = None
+        self.collection = collection
+
+
+class ArtifactTreeModel(QAbstractItemModel):
+    """Tree of 'All Artifacts' and root collections with their artifacts.
+
+    A refresh only needs the artifact count of each collection. The
+    artifacts of a group are fetched a page at a time through
+    fetch_rows(collection_id, after, limit) when the view expands or
+    scrolls it, with collection_id None for 'All Artifacts'.
+
+    The UserRole data of an index is the same dict the page has always
+    stored on tree items: {"type": "all"}, {"type": "collection", "id",
+    "collection"} or {"type": "artifact", "id", "artifact"}. Full
+    Artifact objects are loaded through load_artifact the first time
+    that data is asked for.
+    """
+
+    # Artifacts fetched per fetchMore call
+    FETCH_BATCH = 200
+
+    def __init__(self,
+                 fetch_rows: Callable[[Optional[str], Optional[tuple], int],
+                                      List[tuple]],
+                 load_artifact: Callable[[str], Optional[Artifact]],
+                 parent=None):
+        super().__init__(parent)
+        self._fetch_rows = fetch_rows
+        self._load_artifact = load_artifact
+        self._root = _Node('root')
+        self._all = _Node('all', parent=self._root)
+        self._root.children = [self._all]
+        self._collections: Dict[str, _Node] = {}
+        # Rows of fetched artifacts and full artifacts loaded so far
+        self._rows: Dict[str, tuple] = {}
+        self._artifacts: Dict[str, Artifact] = {}
+        self._projects: Dict[str, object] = {}
+
+    # --- Loading -------------------------------------------------------
+
+    def load(self, collections: Sequence[ArtifactCollection],
+             counts: Dict[Optional[str], int], projects: Dict[str, object]):
+        """Replace the whole tree.
+
+        Args:
+            collections: Root collections, in display order
+            counts: Artifact count per collection id, None for
+                artifacts outside any collection
+            projects: Projects by id, for badges and colours
+        """
+        self.beginResetModel()
+        self._projects = projects
+        self._rows = {}
+        self._artifacts = {}
+        self._all = _Node('all', parent=self._root)
+        self._root.children = [self._all]
+        self._collections = {}
+        for collection in collections:
+            node = _Node('collection', collection.id, self._root, collection)
+            self._collections[collection.id] = node
+            self._root.children.append(node)
+        self._set_counts(counts)
+        self.endResetModel()
+
+    def set_projects(self, projects: Dict[str, object]):
+        """Update the projects used for badges and repaint"""
+        self._projects = projects
+        for group in self._root.children:
+            if group.children:
+                parent = self._group_index(group)
+                self.dataChanged.emit(
+                    self.index(0, 0, parent),
+                    self.index(len(group.children) - 1, 0, parent)
+                )
+
+    def apply_updates(self, artifact_ids: Sequence[str],
+                      rows: Sequence[tuple],
+                      counts: Dict[Optional[str], int]):
+        """Apply changes to a few artifacts without rebuilding the tree.
+
+        Any change moves an artifact's updated_at forward, so changed
+        artifacts that were not fetched yet go to the top of groups
+        that have been fetched; later pages continue from the cursor
+        and never return them again.
+
+        Args:
+            artifact_ids: Every artifact that changed
+            rows: Current rows of those of them that should be shown;
+                ids without a row are removed
+            counts: Current artifact counts, as for load()
+        """
+        current = {row[ROW_ID]: row for row in rows}
+        for artifact_id in dict.fromkeys(artifact_ids):
+            self._artifacts.pop(artifact_id, None)
+            old = self._rows.get(artifact_id)
+            new = current.get(artifact_id)
+            if new is not None:
+                self._rows[artifact_id] = new
+            groups = [self._all]
+            for row in (old, new):
+                group = row and self._collections.get(row[ROW_COLLECTION])
+                if group is not None and group not in groups:
+                    groups.append(group)
+            for group in groups:
+                belongs = new is not None and (
+                    group is self._all or group.key == new[ROW_COLLECTION]
+                )
+                position = self._position(group, artifact_id)
+                if position >= 0 and not belongs:
+                    parent = self._group_index(group)
+                    self.beginRemoveRows(parent, position, position)
+                    del group.children[position]
+                    self.endRemoveRows()
+                elif position >= 0:
+                    index = self.index(position, 0, self._group_index(group))
+                    self.dataChanged.emit(index, index)
+                elif belongs and (group.children or group.count == 0):
+                    self.beginInsertRows(self._group_index(group), 0, 0)
+                    group.children.insert(
+                        0, _Node('artifact', artifact_id, group)
+                    )
+                    self.endInsertRows()
+            if new is None:
+                self._rows.pop(artifact_id, None)
+        self._set_counts(counts, notify=True)
+
+    def _set_counts(self, counts: Dict[Optional[str], int],
+                    notify: bool = False):
+        """Set group sizes, never below what has been fetched"""
+        totals = [(self._all, sum(counts.values()))] + [
+            (group, counts.get(key, 0))
+            for key, group in self._collections.items()
+        ]
+        for group, count in totals:
+            count = max(count, len(group.children))
+            if count != group.count:
+                group.count = count
+                if notify:
+                    # Lets the view update the group's expand arrow
+                    index = self._group_index(group)
+                    self.dataChanged.emit(index, index)
+
+    def _position(self, group: _Node, artifact_id: str) -> int:
+        for position, node in enumerate(group.children):
+            if node.key == artifact_id:
+                return position
+        return -1
+
+    def _fetch(self, group: _Node, limit: int):
+        """Fetch the next page of a group's artifacts"""
+        rows = self._fetch_rows(
+            group.key if group.kind == 'collection' else None,
+            group.cursor, limit
+        )
+        exhausted = len(rows) < limit
+        if rows:
+            group.cursor = (rows[-1][ROW_UPDATED], rows[-1][ROW_ID])
+            # Skip artifacts already added at the top by apply_updates
+            present = {node.key for node in group.children}
+            rows = [row for row in rows if row[ROW_ID] not in present]
+        if rows:
+            for row in rows:
+                self._rows[row[ROW_ID]] = row
+            start = len(group.children)
+            self.beginInsertRows(self._group_index(group), start,
+                                 start + len(rows) - 1)
+            group.children.extend(
+                _Node('artifact', row[ROW_ID], group) for row in rows
+            )
+            self.endInsertRows()
+        if exhausted:
+            # Reached the end; correct a count that drifted since refresh
+            group.count = len(group.children)
+
+    # --- Lookup --------------------------------------------------------
+
+    def all_artifacts_index(self) -> QModelIndex:
+        """Index of the 'All Artifacts' node"""
+        return self._group_index(self._all)
+
+    def index_for_artifact(self, artifact_id: str) -> QModelIndex:
+        """Index of an artifact under 'All Artifacts', fetching up to it
+
+        Returns an invalid index when the artifact is not in the tree.
+        """
+        limit = self.FETCH_BATCH
+        while True:
+            position = self._position(self._all, artifact_id)
+            if position >= 0:
+                return self.index(position, 0,
+                                  self._group_index(self._all))
+            if not self.canFetchMore(self._group_index(self._all)):
+                return QModelIndex()
+            self._fetch(self._all, limit)
+            limit *= 2
+
+    def artifact_count(self) -> int:
+        """Number of artifacts in the tree"""
+        return self._all.count
+
+    def _group_index(self, group: _Node) -> QModelIndex:
+        return self.createIndex(self._root.children.index(group), 0, group)
+
+    def _node(self, index: QModelIndex) -> _Node:
+        return index.internalPointer() if index.isValid() else self._root
+
+    # --- QAbstractItemModel --------------------------------------------
+
+    def index(self, row, column, parent=QModelIndex()):
+        if column != 0 or row < 0:
+            return QModelIndex()
+        node = self._node(parent)
+        if row >= len(node.children):
+            return QModelIndex()
+        return self.createIndex(row, 0, node.children[row])
+
+    def parent(self, index=QModelIndex()):
+        if not index.isValid():
+            return QModelIndex()
+        node = index.internalPointer()
+        if node.parent is None or node.parent is self._root:
+            return QModelIndex()
+        return self._group_index(node.parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        return len(self._node(parent).children)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def hasChildren(self, parent=QModelIndex()):
+        node = self._node(parent)
+        if node.kind == 'root':
+            return True
+        return node.kind != 'artifact' and node.count > 0
+
+    def canFetchMore(self, parent):
+        node = self._node(parent)
+        return node.kind in ('all', 'collection') and \
+            len(node.children) < node.count
+
+    def fetchMore(self, parent):
+        node = self._node(parent)
+        if node.kind in ('all', 'collection'):
+            self._fetch(node, self.FETCH_BATCH)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        if node.kind == 'all':
+            if role == Qt.ItemDataRole.DisplayRole:
+                return "All Artifacts"
+            if role == Qt.ItemDataRole.UserRole:
+                return {"type": "all"}
+            return None
+        if node.kind == 'collection':
+            if role == Qt.ItemDataRole.DisplayRole:
+                return f"📁 {node.collection.name}"
+            if role == Qt.ItemDataRole.UserRole:
+                return {
+                    "type": "collection",
+                    "id": node.key,
+                    "collection": node.collection
+                }
+            return None
+
+        row = self._rows.get(node.key)
+        if row is None:
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._artifact_text(row)
+        if role == Qt.ItemDataRole.ForegroundRole:
+            project = self._projects.get(row[ROW_PROJECT])
+            if project is not None and getattr(project, 'color', None):
+                return QBrush(QColor(project.color))
+            return None
+        if role == Qt.ItemDataRole.UserRole:
+            return {
+                "type": "artifact",
+                "id": node.key,
+                "artifact": self._artifact(node.key)
+            }
+        return None
+
+    def _artifact(self, artifact_id: str) -> Optional[Artifact]:
+        artifact = self._artifacts.get(artifact_id)
+        if artifact is None:
+            artifact = self._load_artifact(artifact_id)
+            if artifact is not None:
+                self._artifacts[artifact_id] = artifact
+        return artifact
+
+    def _artifact_text(self, row: tuple) -> str:
+        icon = ARTIFACT_ICONS.get(row[ROW_TYPE], "📄")
+        text = f"{icon} {row[ROW_NAME]}"
+
+        # Add project badge if artifact has a project
+        project = self._projects.get(row[ROW_PROJECT])
+        if project is not None:
+            text += f" [{project.get_display_icon()} {project.name}]"
+
+        # Add lock icon if encrypted
+        if row[ROW_ENCRYPTED]:
+            text += " 🔒"
+        return text
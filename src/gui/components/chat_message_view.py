@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Chat Message View
+Model/view display of chat messages. Messages live in a list model and
+are painted by a delegate, so a session costs one view regardless of
+how many messages have been loaded into it.
+"""
+
+import queue
+import threading
+from typing import List, Optional, Tuple
+
+from PySide6.QtWidgets import (
+    QAbstractItemView, QFrame, QListView, QStyledItemDelegate
+)
+from PySide6.QtCore import (
+    QAbstractListModel, QModelIndex, QObject, QRectF, QSize, QSizeF, Qt,
+    Signal
+)
+from PySide6.QtGui import (
+    QAbstractTextDocumentLayout, QColor, QFont, QPainter, QPalette,
+    QTextDocument
+)
+
+from src.models.chat_session import ChatMessage
+from src.utils.colors import DinoPitColors
+from src.utils.logger import Logger
+from src.utils.scaling import get_scaling_helper
+from .render_cache import get_render_cache
+
+
+class ChatMessageModel(QAbstractListModel):
+    """List model holding the loaded messages of one session, oldest first."""
+
+    MessageRole = Qt.ItemDataRole.UserRole + 1
+    IsUserRole = Qt.ItemDataRole.UserRole + 2
+    MessageIdRole = Qt.ItemDataRole.UserRole + 3
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._messages: List[ChatMessage] = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._messages)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._messages):
+            return None
+        message = self._messages[index.row()]
+        if role in (Qt.ItemDataRole.DisplayRole, self.MessageRole):
+            return message.message
+        if role == self.IsUserRole:
+            return message.is_user
+        if role == self.MessageIdRole:
+            return message.id
+        return None
+
+    def message_at(self, row: int) -> Optional[ChatMessage]:
+        """Get the message at a row, or None when out of range"""
+        if 0 <= row < len(self._messages):
+            return self._messages[row]
+        return None
+
+    def set_messages(self, messages: List[ChatMessage]):
+        """Replace all messages"""
+        self.beginResetModel()
+        self._messages = list(messages)
+        self.endResetModel()
+
+    def prepend_messages(self, messages: List[ChatMessage]):
+        """Insert an older page of messages above the loaded ones"""
+        if not messages:
+            return
+        self.beginInsertRows(QModelIndex(), 0, len(messages) - 1)
+        self._messages[:0] = messages
+        self.endInsertRows()
+
+    def append_message(self, message: ChatMessage):
+        """Add a new message at the bottom"""
+        row = len(self._messages)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._messages.append(message)
+        self.endInsertRows()
+
+    def clear(self):
+        """Remove all messages"""
+        self.set_messages([])
+
+
+class ChatMessageDelegate(QStyledItemDelegate):
+    """Paints messages as chat bubbles from cached text documents.
+
+    Laying out a document is the expensive part of both sizeHint and
+    paint, so documents and their sizes come from the shared render
+    cache, keyed by message text, width bucket and zoom level. Zooming
+    back or resizing within a bucket reuses earlier layouts, and
+    relayouts after loading older pages do not rebuild documents that
+    were evicted, since their sizes are kept.
+    """
+
+    # Render cache kind of message documents
+    RENDER_KIND = "chat_message"
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._scaling_helper = get_scaling_helper()
+        self._render_cache = get_render_cache()
+
+    def _metrics(self):
+        """Scaled (outer margin, bubble padding, radius, max bubble width)"""
+        scale = self._scaling_helper.scaled_size
+        return scale(10), scale(12), scale(15), scale(600)
+
+    def _text_width(self, view_width: int) -> int:
+        margin, padding, _, max_width = self._metrics()
+        bubble_width = min(max_width, view_width - 2 * margin)
+        return max(1, bubble_width - 2 * padding)
+
+    def _build_document(self, text: str, text_width: int) -> QTextDocument:
+        document = QTextDocument()
+        document.setDocumentMargin(0)
+        font = QFont()
+        font.setPixelSize(
+            self._scaling_helper.get_font_for_role('body_primary')
+        )
+        document.setDefaultFont(font)
+        # Plain text keeps message content from being read as HTML
+        document.setPlainText(text)
+        document.setTextWidth(text_width)
+        # Short messages get a bubble that fits them
+        ideal = int(document.idealWidth()) + 1
+        if ideal < text_width:
+            document.setTextWidth(ideal)
+        return document
+
+    def document(self, index, text_width: int) -> QTextDocument:
+        """Get the laid-out document for a message at a text width"""
+        return self._render_cache.document(
+            self.RENDER_KIND, index.data(ChatMessageModel.MessageRole) or "",
+            text_width, self._build_document
+        )
+
+    def document_size(self, index, text_width: int) -> QSizeF:
+        """Get a message's laid-out size without keeping its document"""
+        return self._render_cache.size(
+            self.RENDER_KIND, index.data(ChatMessageModel.MessageRole) or "",
+            text_width, self._build_document
+        )
+
+    def _view_width(self, option) -> int:
+        widget = option.widget
+        if isinstance(widget, QAbstractItemView):
+            return widget.viewport().width()
+        return option.rect.width()
+
+    def sizeHint(self, option, index):
+        margin, padding, _, _ = self._metrics()
+        width = self._view_width(option)
+        size = self.document_size(index, self._text_width(width))
+        height = int(size.height()) + 2 * padding + margin
+        return QSize(width, height)
+
+    def paint(self, painter, option, index):
+        margin, padding, radius, _ = self._metrics()
+        document = self.document(index, self._text_width(option.rect.width()))
+        size = document.size()
+        is_user = index.data(ChatMessageModel.IsUserRole)
+
+        bubble_width = size.width() + 2 * padding
+        bubble_height = size.height() + 2 * padding
+        if is_user:
+            left = option.rect.right() - margin - bubble_width
+            background = QColor(DinoPitColors.DINOPIT_ORANGE)
+            foreground = QColor("white")
+        else:
+            left = option.rect.left() + margin
+            background = QColor(DinoPitColors.PANEL_BACKGROUND)
+            foreground = QColor(DinoPitColors.PRIMARY_TEXT)
+        bubble = QRectF(left, option.rect.top() + margin / 2,
+                        bubble_width, bubble_height)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(background)
+        painter.drawRoundedRect(bubble, radius, radius)
+
+        painter.translate(bubble.left() + padding, bubble.top() + padding)
+        context = QAbstractTextDocumentLayout.PaintContext()
+        context.palette.setColor(QPalette.ColorRole.Text, foreground)
+        document.documentLayout().draw(painter, context)
+        painter.restore()
+
+
+class ChatMessageView(QListView):
+    """List view for chat messages that asks for older pages on scroll-up."""
+
+    # Emitted when the user scrolls near the top and more history exists
+    older_messages_requested = Signal()
+
+    # Distance from the top, in pixels, at which older messages load
+    FETCH_THRESHOLD = 200
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.has_older_messages = False
+        self._loading_older = False
+
+        self.setVerticalScrollMode(
+            QAbstractItemView.ScrollMode.ScrollPerPixel
+        )
+        self.setHorizontalScrollBarPolicy(
+            Qt.ScrollBarPolicy.ScrollBarAlwaysOff
+        )
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.setFrameShape(QFrame.Shape.NoFrame)
+        self.verticalScrollBar().setSingleStep(
+            get_scaling_helper().scaled_size(20)
+        )
+        self.verticalScrollBar().valueChanged.connect(self._on_scrolled)
+        # Cached layouts are dropped on theme changes; measure again
+        get_render_cache().invalidated.connect(self.refresh_layout)
+
+    def _on_scrolled(self, value: int):
+        if (value <= self.FETCH_THRESHOLD and self.has_older_messages
+                and not self._loading_older):
+            self._loading_older = True
+            try:
+                self.older_messages_requested.emit()
+            finally:
+                self._loading_older = False
+
+    def prepend_messages(self, model: ChatMessageModel,
+                         messages: List[ChatMessage]):
+        """Insert older messages while keeping the visible ones in place"""
+        scroll_bar = self.verticalScrollBar()
+        from_bottom = scroll_bar.maximum() - scroll_bar.value()
+        # Block scroll signals so the adjustment below does not look like
+        # the user reaching the top again
+        scroll_bar.blockSignals(True)
+        try:
+            model.prepend_messages(messages)
+            self.executeDelayedItemsLayout()
+            scroll_bar.setValue(scroll_bar.maximum() - from_bottom)
+        finally:
+            scroll_bar.blockSignals(False)
+
+    def refresh_layout(self):
+        """Re-measure every message, e.g. after a zoom change. Layouts
+        for the new zoom level come from the render cache when known."""
+        self.scheduleDelayedItemsLayout()
+        self.viewport().update()
+
+
+class ChatMessageWriter(QObject):
+    """Persists chat messages on a background thread.
+
+    Messages are queued from the GUI thread and written in order, so a
+    slow disk never stalls typing or scrolling.
+    """
+
+    # Emitted with an error message when a write fails
+    save_failed = Signal(str)
+
+    def __init__(self, chat_db, parent=None):
+        super().__init__(parent)
+        self.chat_db = chat_db
+        self.logger = Logger()
+        self._queue: "queue.Queue[Optional[Tuple[str, ChatMessage]]]" = (
+            queue.Queue()
+        )
+        self._thread: Optional[threading.Thread] = None
+        # A stopped thread that may still be writing what was queued
+        self._stopped_thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        # Messages queued but not yet written
+        self._pending = 0
+        self._idle = threading.Condition()
+
+    def enqueue(self, session_id: str, message: ChatMessage):
+        """Queue a message to be written to the session"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                if self._stopped_thread is not None:
+                    # Two writers would share the queue and its stop marker
+                    self._stopped_thread.join()
+                    self._stopped_thread = None
+                self._thread = threading.Thread(
+                    target=self._run, name="ChatMessageWriter", daemon=True
+                )
+                self._thread.start()
+        with self._idle:
+            self._pending += 1
+        self._queue.put((session_id, message))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued message has been written.
+
+        Returns:
+            True if the queue drained before the timeout
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def stop(self, timeout: float = 5.0):
+        """Write what is queued, then stop the background thread"""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+            if thread is not None and thread.is_alive():
+                self._queue.put(None)
+                thread.join(timeout)
+                if thread.is_alive():
+                    self._stopped_thread = thread
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            try:
+                session_id, message = item
+                result = self.chat_db.add_message(session_id, message)
+                if not result.get("success"):
+                    error = result.get("error", "Unknown error")
+                    self.logger.error(f"Failed to save message: {error}")
+                    self.save_failed.emit(error)
+            except Exception as e:
+                self.logger.error(f"Failed to save message: {str(e)}")
+                self.save_failed.emit(str(e))
+            finally:
+                with self._idle:
+                    self._pending -= 1
+                    self._idle.notify_all()
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Chat Session List
+Model/view display of chat sessions for the chat history. Sessions are
+loaded a page at a time as the list is scrolled and painted by a
+delegate under date headers, so the history costs one view however many
+sessions exist.
+"""
+
+from datetime import datetime
+from typing import List, Optional, Tuple, Union
+
+from PySide6.QtWidgets import (
+    QAbstractItemView, QFrame, QListView, QStyle, QStyledItemDelegate
+)
+from PySide6.QtCore import (
+    QAbstractListModel, QModelIndex, QRect, QRectF, QSize, Qt, Signal
+)
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QPainter, QPen
+
+from src.models.chat_session import ChatSession
+from src.utils.colors import DinoPitColors
+from src.utils.scaling import get_scaling_helper
+
+
+# Labels of the date buckets computed by get_sessions_page
+BUCKET_LABELS = {
+    "today": "Today",
+    "yesterday": "Yesterday",
+    "week": "Previous 7 days"
+}
+
+
+def bucket_label(bucket: str) -> str:
+    """Header text of a date bucket; months read as 'October 2026'"""
+    if bucket in BUCKET_LABELS:
+        return BUCKET_LABELS[bucket]
+    try:
+        return datetime.strptime(bucket, "%Y-%m").strftime("%B %Y")
+    except (TypeError, ValueError):
+        return bucket or "Earlier"
+
+
+def time_ago(moment: datetime) -> str:
+    """How long ago a moment was, e.g. '3 hours ago'"""
+    time_diff = datetime.now() - moment
+    if time_diff.days > 0:
+        days = time_diff.days
+        return f"{days} day{'s' if days > 1 else ''} ago"
+    if time_diff.seconds > 3600:
+        hours = time_diff.seconds // 3600
+        return f"{hours} hour{'s' if hours > 1 else ''} ago"
+    minutes = max(1, time_diff.seconds // 60)
+    return f"{minutes} minute{'s' if minutes > 1 else ''} ago"
+
+
+class ChatSessionListModel(QAbstractListModel):
+    """List model of the loaded sessions, most recent first, with a header
+    row before the first session of each date bucket.
+
+    Further pages are asked for through more_requested when the view
+    scrolls to the end; the owner answers with append_sessions.
+    """
+
+    SessionRole = Qt.ItemDataRole.UserRole + 1
+    IsHeaderRole = Qt.ItemDataRole.UserRole + 2
+
+    # Emitted when the view wants the next page of sessions
+    more_requested = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows: List[Union[str, ChatSession]] = []
+        self._session_count = 0
+        self._last_bucket: Optional[str] = None
+        self._has_more = False
+        self._fetching = False
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._rows):
+            return None
+        row = self._rows[index.row()]
+        is_header = isinstance(row, str)
+        if role == Qt.ItemDataRole.DisplayRole:
+            return row if is_header else (row.title or "Untitled Chat")
+        if role == self.IsHeaderRole:
+            return is_header
+        if role == self.SessionRole:
+            return None if is_header else row
+        return None
+
+    def flags(self, index):
+        if self.data(index, self.IsHeaderRole):
+            return Qt.ItemFlag.NoItemFlags
+        return super().flags(index)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return (not parent.isValid() and self._has_more
+                and not self._fetching)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if self.canFetchMore(parent):
+            self._fetching = True
+            self.more_requested.emit()
+
+    def set_sessions(self, page: List[Tuple[str, ChatSession]],
+                     has_more: bool):
+        """Replace all sessions with a first page of (bucket, session)"""
+        self.beginResetModel()
+        self._rows = []
+        self._session_count = 0
+        self._last_bucket = None
+        self._add_rows(page)
+        self._has_more = has_more
+        self._fetching = False
+        self.endResetModel()
+
+    def append_sessions(self, page: List[Tuple[str, ChatSession]],
+                        has_more: bool):
+        """Add the next page of (bucket, session) below the loaded ones"""
+        self._has_more = has_more
+        self._fetching = False
+        if not page:
+            return
+        # One header row for each bucket the page starts
+        headers = 0
+        bucket = self._last_bucket
+        for page_bucket, _ in page:
+            if page_bucket != bucket:
+                headers += 1
+                bucket = page_bucket
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first,
+                             first + len(page) + headers - 1)
+        self._add_rows(page)
+        self.endInsertRows()
+
+    def _add_rows(self, page: List[Tuple[str, ChatSession]]):
+        for bucket, session in page:
+            if bucket != self._last_bucket:
+                self._rows.append(bucket_label(bucket))
+                self._last_bucket = bucket
+            self._rows.append(session)
+        self._session_count += len(page)
+
+    def cancel_fetch(self):
+        """Forget a requested page that will not arrive"""
+        self._fetching = False
+
+    def has_more(self) -> bool:
+        return self._has_more
+
+    def session_count(self) -> int:
+        return self._session_count
+
+    def sessions(self) -> List[ChatSession]:
+        return [row for row in self._rows if not isinstance(row, str)]
+
+    def session_at(self, row: int) -> Optional[ChatSession]:
+        """Get the session at a row, or None for headers and out of range"""
+        if 0 <= row < len(self._rows) and \
+                not isinstance(self._rows[row], str):
+            return self._rows[row]
+        return None
+
+    def last_session(self) -> Optional[ChatSession]:
+        """The oldest loaded session, after which the next page starts"""
+        for row in reversed(self._rows):
+            if not isinstance(row, str):
+                return row
+        return None
+
+
+class ChatSessionDelegate(QStyledItemDelegate):
+    """Paints sessions as cards with title, preview, age and status, and
+    headers as small labels. Rows have fixed heights per kind, so sizing
+    a row needs no layout."""
+
+    STATUS_COLORS = {
+        "active": "#4CAF50",  # Green
+        "archived": "#FFC107"  # Amber
+    }
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._scaling_helper = get_scaling_helper()
+        self._style_zoom: Optional[float] = None
+
+    def _font(self, size: int, bold: bool = False) -> QFont:
+        font = QFont()
+        font.setPixelSize(self._scaling_helper.scaled_font_size(size))
+        font.setBold(bold)
+        return font
+
+    def _style(self):
+        """Fonts, metrics and row heights for the current zoom level,
+        built once per zoom level rather than per row"""
+        zoom = self._scaling_helper.get_current_zoom_level()
+        if self._style_zoom != zoom:
+            scale = self._scaling_helper.scaled_size
+            self.margin, self.padding = scale(10), scale(10)
+            self.spacing, self.radius = scale(5), scale(8)
+            self.dot = scale(8)
+            self.header_font = self._font(11, True)
+            self.title_font = self._font(14, True)
+            self.preview_font = self._font(12)
+            self.info_font = self._font(10)
+            self.title_height = QFontMetrics(self.title_font).height()
+            self.preview_height = QFontMetrics(self.preview_font).height()
+            self.info_height = QFontMetrics(self.info_font).height()
+            self.header_height = (QFontMetrics(self.header_font).height()
+                                  + 2 * self.spacing + self.margin // 2)
+            self.session_height = (self.title_height + self.preview_height
+                                   + self.info_height + 2 * self.spacing
+                                   + 2 * self.padding + self.margin)
+            self._style_zoom = zoom
+        return self
+
+    def sizeHint(self, option, index):
+        style = self._style()
+        if index.data(ChatSessionListModel.IsHeaderRole):
+            return QSize(option.rect.width(), style.header_height)
+        return QSize(option.rect.width(), style.session_height)
+
+    def paint(self, painter, option, index):
+        style = self._style()
+        margin, padding = style.margin, style.padding
+        spacing, radius = style.spacing, style.radius
+        rect = option.rect.adjusted(margin, 0, -margin, 0)
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        if index.data(ChatSessionListModel.IsHeaderRole):
+            painter.setFont(style.header_font)
+            painter.setPen(QColor(DinoPitColors.DINOPIT_ORANGE))
+            painter.drawText(
+                rect.adjusted(0, margin // 2, 0, 0),
+                Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                index.data()
+            )
+            painter.restore()
+            return
+
+        session = index.data(ChatSessionListModel.SessionRole)
+        hovered = option.state & QStyle.StateFlag.State_MouseOver
+        card = QRectF(rect.adjusted(0, margin // 2, 0, -(margin // 2)))
+        painter.setPen(QPen(QColor(DinoPitColors.SOFT_ORANGE), 1))
+        painter.setBrush(QColor(DinoPitColors.SOFT_ORANGE if hovered
+                                else DinoPitColors.PANEL_BACKGROUND))
+        painter.drawRoundedRect(card.adjusted(0.5, 0.5, -0.5, -0.5),
+                                radius, radius)
+
+        inner = card.toRect().adjusted(padding, padding, -padding, -padding)
+        top = inner.top()
+        for text, font, height, color in (
+            (session.title or "Untitled Chat", style.title_font,
+             style.title_height, DinoPitColors.DINOPIT_ORANGE),
+            (session.get_preview(60), style.preview_font,
+             style.preview_height, DinoPitColors.PRIMARY_TEXT)
+        ):
+            painter.setFont(font)
+            painter.setPen(QColor(color))
+            painter.drawText(
+                QRect(inner.left(), top, inner.width(), height),
+                Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                QFontMetrics(font).elidedText(
+                    text, Qt.TextElideMode.ElideRight, inner.width()
+                )
+            )
+            top += height + spacing
+
+        # Age and message count, with the status dot on the right
+        info = QRect(inner.left(), top, inner.width(), style.info_height)
+        painter.setFont(style.info_font)
+        painter.setPen(QColor(DinoPitColors.PRIMARY_TEXT))
+        painter.drawText(
+            info, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+            f"{time_ago(session.updated_at)}    "
+            f"{len(session.messages)} messages"
+        )
+        dot = style.dot
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor(self.STATUS_COLORS.get(session.status,
+                                                       "#9E9E9E")))
+        painter.drawEllipse(info.right() - dot,
+                            info.center().y() - dot // 2, dot, dot)
+        painter.restore()
+
+
+class ChatSessionListView(QListView):
+    """List view for chat sessions; the model's fetchMore loads further
+    pages as the list is scrolled to its end."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setVerticalScrollMode(
+            QAbstractItemView.ScrollMode.ScrollPerPixel
+        )
+        self.setHorizontalScrollBarPolicy(
+            Qt.ScrollBarPolicy.ScrollBarAlwaysOff
+        )
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setFrameShape(QFrame.Shape.NoFrame)
+        self.setMouseTracking(True)
+        self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.viewport().setCursor(Qt.CursorShape.PointingHandCursor)
+        self.verticalScrollBar().setSingleStep(
+            get_scaling_helper().scaled_size(20)
+        )
+
+    def refresh_layout(self):
+        """Re-measure every row, e.g. after a zoom change"""
+        self.scheduleDelayedItemsLayout()
+        self.viewport().update()
@@ -7,208 +7,22 @@ Chat history with database integration, filtering, and search capabilities.
 """
 
 from datetime import datetime
-from typing import List
+from typing import List, Tuple
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QFrame,
-    QScrollArea, QPushButton, QLineEdit, QComboBox,
-    QDateEdit, QMenu, QMessageBox
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+    QLineEdit, QComboBox, QDateEdit, QMenu, QMessageBox
 )
-from PySide6.QtCore import Qt, Signal, QTimer, QDate, Slot
+from PySide6.QtCore import Qt, Signal, QDate, Slot
 from PySide6.QtGui import QAction
 
 from src.database.chat_history_db import ChatHistoryDatabase
 from src.models.chat_session import ChatSession
 from src.utils.colors import DinoPitColors
 from src.utils.scaling import get_scaling_helper
-
-
-class ChatHistoryItem(QFrame):
-    """Enhanced chat history item with more information"""
-    
-    clicked = Signal(str)  # Emit session ID when clicked
-    delete_requested = Signal(str)  # Emit session ID for deletion
-    
-    def __init__(self, session: ChatSession):
-        """Initialize the chat history item.
-        
-        Args:
-            session: ChatSession object
-        """
-        super().__init__()
-        self.session = session
-        self._scaling_helper = get_scaling_helper()
-        
-        # Set frame style
-        self.setFrameShape(QFrame.Shape.StyledPanel)
-        self.setFrameShadow(QFrame.Shadow.Plain)
-        self.setLineWidth(1)
-        self.setCursor(Qt.CursorShape.PointingHandCursor)
-        
-        # Set initial style
-        self._update_style(hover=False)
-        
-        # Create layout
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(
-            self._scaling_helper.scaled_size(10),
-            self._scaling_helper.scaled_size(10),
-            self._scaling_helper.scaled_size(10),
-            self._scaling_helper.scaled_size(10)
-        )
-        layout.setSpacing(self._scaling_helper.scaled_size(5))
-        
-        # Create title label
-        self.title_label = QLabel(session.title or "Untitled Chat")
-        self.title_label.setWordWrap(True)
-        self.title_label.setStyleSheet(f"""
-            color: {DinoPitColors.DINOPIT_ORANGE};
-            font-size: {self._scaling_helper.scaled_font_size(14)}px;
-            font-weight: bold;
-        """)
-        
-        # Create preview label
-        preview_text = session.get_preview(60)
-        self.preview_label = QLabel(preview_text)
-        self.preview_label.setWordWrap(True)
-        self.preview_label.setStyleSheet(f"""
-            color: {DinoPitColors.PRIMARY_TEXT};
-            font-size: {self._scaling_helper.scaled_font_size(12)}px;
-        """)
-        
-        # Create info layout
-        info_layout = QHBoxLayout()
-        info_layout.setSpacing(self._scaling_helper.scaled_size(10))
-        
-        # Time label
-        time_diff = datetime.now() - session.updated_at
-        if time_diff.days > 0:
-            days = time_diff.days
-            time_str = f"{days} day{'s' if days > 1 else ''} ago"
-        elif time_diff.seconds > 3600:
-            hours = time_diff.seconds // 3600
-            time_str = f"{hours} hour{'s' if hours > 1 else ''} ago"
-        else:
-            minutes = max(1, time_diff.seconds // 60)
-            time_str = f"{minutes} minute{'s' if minutes > 1 else ''} ago"
-            
-        self.time_label = QLabel(time_str)
-        self.time_label.setStyleSheet(f"""
-            color: {DinoPitColors.PRIMARY_TEXT};
-            font-size: {self._scaling_helper.scaled_font_size(10)}px;
-        """)
-        
-        # Message count
-        message_count = len(session.messages)
-        self.count_label = QLabel(f"{message_count} messages")
-        self.count_label.setStyleSheet(f"""
-            color: {DinoPitColors.PRIMARY_TEXT};
-            font-size: {self._scaling_helper.scaled_font_size(10)}px;
-        """)
-        
-        # Status indicator
-        if session.status == "active":
-            status_color = "#4CAF50"  # Green
-        elif session.status == "archived":
-            status_color = "#FFC107"  # Amber
-        else:
-            status_color = "#9E9E9E"  # Gray
-            
-        self.status_indicator = QLabel("●")
-        self.status_indicator.setStyleSheet(f"""
-            color: {status_color};
-            font-size: {self._scaling_helper.scaled_font_size(12)}px;
-        """)
-        
-        info_layout.addWidget(self.time_label)
-        info_layout.addWidget(self.count_label)
-        info_layout.addStretch()
-        info_layout.addWidget(self.status_indicator)
-        
-        # Add widgets to layout
-        layout.addWidget(self.title_label)
-        layout.addWidget(self.preview_label)
-        layout.addLayout(info_layout)
-        
-        # Connect zoom changes
-        self._scaling_helper.zoom_changed.connect(self._on_zoom_changed)
-        
-    def _update_style(self, hover: bool = False):
-        """Update the widget style"""
-        if hover:
-            bg_color = DinoPitColors.SOFT_ORANGE
-        else:
-            bg_color = DinoPitColors.PANEL_BACKGROUND
-            
-        self.setStyleSheet(f"""
-            QFrame {{
-                background-color: {bg_color};
-                border: 1px solid {DinoPitColors.SOFT_ORANGE};
-                border-radius: {self._scaling_helper.scaled_size(8)}px;
-            }}
-        """)
-        
-    def enterEvent(self, event):
-        """Handle mouse enter"""
-        self._update_style(hover=True)
-        super().enterEvent(event)
-        
-    def leaveEvent(self, event):
-        """Handle mouse leave"""
-        self._update_style(hover=False)
-        super().leaveEvent(event)
-        
-    def mousePressEvent(self, event):
-        """Handle mouse click"""
-        if event.button() == Qt.MouseButton.LeftButton:
-            self.clicked.emit(self.session.id)
-        elif event.button() == Qt.MouseButton.RightButton:
-            self._show_context_menu(event.pos())
-        super().mousePressEvent(event)
-        
-    def _show_context_menu(self, pos):
-        """Show context menu"""
-        menu = QMenu(self)
-        menu.setStyleSheet(f"""
-            QMenu {{
-                background-color: {DinoPitColors.PANEL_BACKGROUND};
-                border: 1px solid {DinoPitColors.SOFT_ORANGE};
-                border-radius: 4px;
-            }}
-            QMenu::item {{
-                color: {DinoPitColors.PRIMARY_TEXT};
-                padding: {self._scaling_helper.scaled_size(8)}px;
-                padding-left: {self._scaling_helper.scaled_size(20)}px;
-                padding-right: {self._scaling_helper.scaled_size(20)}px;
-            }}
-            QMenu::item:selected {{
-                background-color: {DinoPitColors.SOFT_ORANGE};
-            }}
-        """)
-        
-        # Add actions
-        delete_action = QAction("Delete", self)
-        delete_action.triggered.connect(
-            lambda: self.delete_requested.emit(self.session.id)
-        )
-        menu.addAction(delete_action)
-        
-        is_active = self.session.status == "active"
-        action_text = "Archive" if is_active else "Unarchive"
-        archive_action = QAction(action_text, self)
-        archive_action.triggered.connect(self._toggle_archive)
-        menu.addAction(archive_action)
-        
-        menu.exec(self.mapToGlobal(pos))
-        
-    def _toggle_archive(self):
-        """Toggle archive status"""
-        # This will be handled by the parent widget
-        pass
-        
-    def _on_zoom_changed(self, zoom_level: float):
-        """Handle zoom level changes"""
-        # Update all scaled values
-        self._update_style(hover=False)
+from .chat_session_list import (
+    ChatSessionListModel, ChatSessionDelegate, ChatSessionListView
+)
+from .refresh_scheduler import RefreshPriority, get_refresh_scheduler
 
 
 class EnhancedChatHistoryWidget(QWidget):
@@ -216,12 +30,18 @@ class EnhancedChatHistoryWidget(QWidget):
     
     session_selected = Signal(str)  # Emit session ID when selected
     
+    # Sessions fetched per page as the list is scrolled
+    PAGE_SIZE = 50
+    
     def __init__(self, chat_db: ChatHistoryDatabase):
         """Initialize the enhanced chat history widget"""
         super().__init__()
         self.chat_db = chat_db
         self._scaling_helper = get_scaling_helper()
-        self._current_sessions: List[ChatSession] = []
+        # Bumped by every reload; queries of older generations are
+        # abandoned and their results dropped
+        self._load_generation = 0
+        self._reset_pending = True
         
         # Set fixed width
         self.setFixedWidth(self._scaling_helper.scaled_size(350))
@@ -229,14 +49,21 @@ class EnhancedChatHistoryWidget(QWidget):
         # Setup UI
         self._setup_ui()
         
+        # Auto-refresh every 30 seconds and load further pages on scroll,
+        # run by the shared scheduler with queries on its workers
+        scheduler = get_refresh_scheduler()
+        self.refresh_job = scheduler.register(
+            "chat_history", self._scheduled_refresh, 30000, owner=self
+        )
+        self.page_job = scheduler.register(
+            "chat_history_pages", self._fetch_next_page,
+            priority=RefreshPriority.HIGH, owner=self
+        )
+        self.session_model.more_requested.connect(self._request_next_page)
+        
         # Load initial sessions
         self._load_recent_sessions()
         
-        # Auto-refresh timer
-        self.refresh_timer = QTimer()
-        self.refresh_timer.timeout.connect(self._load_recent_sessions)
-        self.refresh_timer.start(30000)  # Refresh every 30 seconds
-        
         # Connect to zoom changes
         self._scaling_helper.zoom_changed.connect(self._on_zoom_changed)
         
@@ -275,53 +102,30 @@ class EnhancedChatHistoryWidget(QWidget):
         # Create filter section
         filter_container = self._create_filter_section()
         
-        # Create scroll area for chat history items
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setHorizontalScrollBarPolicy(
-            Qt.ScrollBarPolicy.ScrollBarAlwaysOff
+        # Create the session list, painted by a delegate
+        self.session_model = ChatSessionListModel(self)
+        self.session_view = ChatSessionListView()
+        self.session_view.setItemDelegate(ChatSessionDelegate(self.session_view))
+        self.session_view.setModel(self.session_model)
+        self._update_list_style()
+        self.session_view.clicked.connect(self._on_index_clicked)
+        self.session_view.customContextMenuRequested.connect(
+            self._show_context_menu
         )
-        self.scroll_area.setFrameShape(QFrame.Shape.NoFrame)
-        self.scroll_area.setStyleSheet(f"""
-            QScrollArea {{
-                background-color: {DinoPitColors.MAIN_BACKGROUND};
-                border: none;
-            }}
-            QScrollBar:vertical {{
-                border: none;
-                background: {DinoPitColors.PANEL_BACKGROUND};
-                width: {self._scaling_helper.scaled_size(10)}px;
-                border-radius: {self._scaling_helper.scaled_size(5)}px;
-            }}
-            QScrollBar::handle:vertical {{
-                background: {DinoPitColors.SOFT_ORANGE};
-                border-radius: {self._scaling_helper.scaled_size(5)}px;
-                min-height: {self._scaling_helper.scaled_size(30)}px;
-            }}
-            QScrollBar::handle:vertical:hover {{
-                background: {DinoPitColors.DINOPIT_ORANGE};
-            }}
-        """)
         
-        # Create container widget for chat history items
-        self.scroll_content = QWidget()
-        self.scroll_layout = QVBoxLayout(self.scroll_content)
-        self.scroll_layout.setContentsMargins(
-            self._scaling_helper.scaled_size(10),
-            self._scaling_helper.scaled_size(10),
-            self._scaling_helper.scaled_size(10),
-            self._scaling_helper.scaled_size(10)
+        # Shown instead of the list when no session matches
+        self.empty_label = QLabel("No chats found")
+        self.empty_label.setAlignment(
+            Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop
         )
-        self.scroll_layout.setSpacing(self._scaling_helper.scaled_size(10))
-        self.scroll_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
-        
-        # Set scroll content as the widget for scroll area
-        self.scroll_area.setWidget(self.scroll_content)
+        self._update_empty_style()
+        self.empty_label.hide()
         
         # Add components to main layout
         self.main_layout.addWidget(self.header)
         self.main_layout.addWidget(filter_container)
-        self.main_layout.addWidget(self.scroll_area, 1)
+        self.main_layout.addWidget(self.session_view, 1)
+        self.main_layout.addWidget(self.empty_label, 1)
         
     def _create_filter_section(self) -> QWidget:
         """Create the filter controls section"""
@@ -453,7 +257,64 @@ class EnhancedChatHistoryWidget(QWidget):
         self._load_recent_sessions()
         
     def _load_recent_sessions(self):
-        """Load recent sessions from database with current filters"""
+        """Reload the first page of sessions with the current filters.
+        
+        The query runs on a worker; a query still running for earlier
+        filters is abandoned, so typing a search never waits on it.
+        """
+        self._load_generation += 1
+        self._reset_pending = True
+        self.refresh_job.request()
+        
+    def _is_superseded(self, generation: int) -> bool:
+        """Polled by running queries; also read from worker threads"""
+        return generation != self._load_generation
+        
+    def _scheduled_refresh(self):
+        """Load the first page after a reload, or refresh the loaded
+        sessions in place on the periodic refresh"""
+        generation = self._load_generation
+        reset, self._reset_pending = self._reset_pending, False
+        limit = self.PAGE_SIZE
+        if not reset:
+            limit = max(limit, self.session_model.session_count())
+        filters = self._session_filters()
+        page = yield lambda: self.chat_db.get_sessions_page(
+            limit=limit,
+            is_cancelled=lambda: self._is_superseded(generation),
+            **filters
+        )
+        if self._is_superseded(generation):
+            return
+        self._show_sessions(page, len(page) == limit, keep_scroll=not reset)
+        
+    def _request_next_page(self):
+        """The list was scrolled to its end; load the next page"""
+        self.page_job.request()
+        
+    def _fetch_next_page(self):
+        """Append the page after the last loaded session"""
+        after = self.session_model.last_session()
+        if after is None:
+            self.session_model.cancel_fetch()
+            return
+        generation = self._load_generation
+        filters = self._session_filters()
+        page = yield lambda: self.chat_db.get_sessions_page(
+            limit=self.PAGE_SIZE, after=after,
+            is_cancelled=lambda: self._is_superseded(generation),
+            **filters
+        )
+        if (self._is_superseded(generation)
+                or self.session_model.last_session() is not after):
+            # Reloaded or refreshed meanwhile; scrolling asks again
+            self.session_model.cancel_fetch()
+            return
+        self.session_model.append_sessions(page,
+                                           len(page) == self.PAGE_SIZE)
+            
+    def _session_filters(self) -> dict:
+        """Filter arguments of get_recent_sessions from the filter bar"""
         # Get filter values
         search_query = None
         if hasattr(self, 'search_input'):
@@ -477,42 +338,85 @@ class EnhancedChatHistoryWidget(QWidget):
             if status_text != "All":
                 filter_status = status_text.lower()
         
-        # Load sessions from database
-        self._current_sessions = self.chat_db.get_recent_sessions(
-            limit=50,
-            filter_date=filter_date,
-            filter_status=filter_status,
-            search_query=search_query
-        )
-        
-        # Clear existing items
-        while self.scroll_layout.count():
-            child = self.scroll_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-                
-        # Add new items
-        if self._current_sessions:
-            for session in self._current_sessions:
-                item = ChatHistoryItem(session)
-                item.clicked.connect(self._on_session_clicked)
-                item.delete_requested.connect(self._delete_session)
-                self.scroll_layout.addWidget(item)
-        else:
-            # Show empty state
-            empty_label = QLabel("No chats found")
-            empty_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            empty_label.setStyleSheet(f"""
-                color: {DinoPitColors.PRIMARY_TEXT};
-                font-size: {self._scaling_helper.scaled_font_size(14)}px;
-                padding: {self._scaling_helper.scaled_size(50)}px;
-            """)
-            self.scroll_layout.addWidget(empty_label)
+        return {
+            "filter_date": filter_date,
+            "filter_status": filter_status,
+            "search_query": search_query
+        }
+        
+    def _show_sessions(self, page: List[Tuple[str, ChatSession]],
+                       has_more: bool, keep_scroll: bool = False):
+        """Replace the listed sessions with a page of (bucket, session)"""
+        scroll_bar = self.session_view.verticalScrollBar()
+        position = scroll_bar.value() if keep_scroll else 0
+        self.session_model.set_sessions(page, has_more)
+        self.session_view.executeDelayedItemsLayout()
+        scroll_bar.setValue(position)
+        
+        # Show empty state
+        self.session_view.setVisible(bool(page))
+        self.empty_label.setVisible(not page)
+        
+    def _on_index_clicked(self, index):
+        """Handle a click on a session row"""
+        session = self.session_model.session_at(index.row())
+        if session is not None:
+            self._on_session_clicked(session.id)
             
     def _on_session_clicked(self, session_id: str):
         """Handle session click"""
         self.session_selected.emit(session_id)
         
+    def _show_context_menu(self, pos):
+        """Show the context menu of the session under pos"""
+        session = self.session_model.session_at(
+            self.session_view.indexAt(pos).row()
+        )
+        if session is None:
+            return
+            
+        menu = QMenu(self)
+        menu.setStyleSheet(f"""
+            QMenu {{
+                background-color: {DinoPitColors.PANEL_BACKGROUND};
+                border: 1px solid {DinoPitColors.SOFT_ORANGE};
+                border-radius: 4px;
+            }}
+            QMenu::item {{
+                color: {DinoPitColors.PRIMARY_TEXT};
+                padding: {self._scaling_helper.scaled_size(8)}px;
+                padding-left: {self._scaling_helper.scaled_size(20)}px;
+                padding-right: {self._scaling_helper.scaled_size(20)}px;
+            }}
+            QMenu::item:selected {{
+                background-color: {DinoPitColors.SOFT_ORANGE};
+            }}
+        """)
+        
+        # Add actions
+        delete_action = QAction("Delete", menu)
+        delete_action.triggered.connect(
+            lambda: self._delete_session(session.id)
+        )
+        menu.addAction(delete_action)
+        
+        is_active = session.status == "active"
+        action_text = "Archive" if is_active else "Unarchive"
+        archive_action = QAction(action_text, menu)
+        archive_action.triggered.connect(
+            lambda: self._toggle_archive(session)
+        )
+        menu.addAction(archive_action)
+        
+        menu.exec(self.session_view.viewport().mapToGlobal(pos))
+        
+    def _toggle_archive(self, session: ChatSession):
+        """Archive an active session or restore an archived one"""
+        status = "archived" if session.status == "active" else "active"
+        result = self.chat_db.update_session(session.id, {"status": status})
+        if result.get("success"):
+            self.refresh_job.request()
+            
     def _delete_session(self, session_id: str):
         """Delete a session"""
         reply = QMessageBox.question(
@@ -527,7 +431,7 @@ class EnhancedChatHistoryWidget(QWidget):
         if reply == QMessageBox.StandardButton.Yes:
             result = self.chat_db.delete_session(session_id)
             if result.get("success"):
-                self._load_recent_sessions()
+                self.refresh_job.request()
             else:
                 QMessageBox.warning(
                     self,
@@ -548,6 +452,39 @@ class EnhancedChatHistoryWidget(QWidget):
                           {DinoPitColors.DINOPIT_FIRE};
         """)
         
+    def _update_list_style(self):
+        """Update session list style with current scaling"""
+        self.session_view.setStyleSheet(f"""
+            QListView {{
+                background-color: {DinoPitColors.MAIN_BACKGROUND};
+                border: none;
+                padding-top: {self._scaling_helper.scaled_size(5)}px;
+            }}
+            QScrollBar:vertical {{
+                border: none;
+                background: {DinoPitColors.PANEL_BACKGROUND};
+                width: {self._scaling_helper.scaled_size(10)}px;
+                border-radius: {self._scaling_helper.scaled_size(5)}px;
+            }}
+            QScrollBar::handle:vertical {{
+                background: {DinoPitColors.SOFT_ORANGE};
+                border-radius: {self._scaling_helper.scaled_size(5)}px;
+                min-height: {self._scaling_helper.scaled_size(30)}px;
+            }}
+            QScrollBar::handle:vertical:hover {{
+                background: {DinoPitColors.DINOPIT_ORANGE};
+            }}
+        """)
+        
+    def _update_empty_style(self):
+        """Update empty state style with current scaling"""
+        self.empty_label.setStyleSheet(f"""
+            background-color: {DinoPitColors.MAIN_BACKGROUND};
+            color: {DinoPitColors.PRIMARY_TEXT};
+            font-size: {self._scaling_helper.scaled_font_size(14)}px;
+            padding: {self._scaling_helper.scaled_size(50)}px;
+        """)
+        
     def _on_zoom_changed(self, zoom_level: float):
         """Handle zoom level changes"""
         # Update fixed width
@@ -576,5 +513,7 @@ class EnhancedChatHistoryWidget(QWidget):
                 }}
             """)
             
-        # Reload sessions to update item styles
-        self._load_recent_sessions()
\ No newline at end of file
+        # Re-measure sessions at the new size
+        self._update_list_style()
+        self._update_empty_style()
+        self.session_view.refresh_layout()
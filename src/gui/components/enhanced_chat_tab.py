@@ -4,112 +4,30 @@
 """
 Enhanced Chat Tab Widget
 Chat interface with database integration for message persistence.
+Messages are shown through a model/view pair and loaded a page at a
+time, newest first, as the user scrolls back through a session.
 """
 
 from datetime import datetime
 from typing import Optional
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLineEdit,
-    QPushButton, QScrollArea, QLabel, QFrame, QMessageBox
+    QPushButton, QLabel, QFrame, QMessageBox
 )
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import QTimer, Signal
 from PySide6.QtGui import QKeySequence, QShortcut
 
-from src.models.chat_session import ChatSession
+from src.models.chat_session import ChatSession, ChatMessage
 from src.database.chat_history_db import ChatHistoryDatabase
 from src.utils.colors import DinoPitColors
 from src.utils.scaling import get_scaling_helper
 from .loading_components import (
     TypingIndicator, MessageSendIndicator
 )
-
-
-class ChatMessageWidget(QFrame):
-    """A single chat message widget."""
-    
-    def __init__(self, message, is_user=True):
-        """Initialize a chat message.
-        
-        Args:
-            message (str): The message text
-            is_user (bool): True if from user, False if from assistant
-        """
-        super().__init__()
-        self._scaling_helper = get_scaling_helper()
-        
-        # Set frame style
-        self.setFrameShape(QFrame.Shape.NoFrame)
-        self.setMaximumWidth(self._scaling_helper.scaled_size(600))
-        
-        # Create layout
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(
-            self._scaling_helper.scaled_size(10),
-            self._scaling_helper.scaled_size(5),
-            self._scaling_helper.scaled_size(10),
-            self._scaling_helper.scaled_size(5)
-        )
-        
-        # Create message bubble
-        message_frame = QFrame()
-        message_frame.setFrameShape(QFrame.Shape.StyledPanel)
-        message_frame.setFrameShadow(QFrame.Shadow.Plain)
-        message_frame.setLineWidth(1)
-        
-        # Style based on sender with DinoPit brand colors and blue theme
-        if is_user:
-            message_frame.setStyleSheet(f"""
-                QFrame {{
-                    background-color: {DinoPitColors.DINOPIT_ORANGE};
-                    color: white;
-                    border-radius: {self._scaling_helper.scaled_size(15)}px;
-                    border: none;
-                }}
-            """)
-            layout.setAlignment(Qt.AlignmentFlag.AlignRight)
-        else:
-            message_frame.setStyleSheet(f"""
-                QFrame {{
-                    background-color: {DinoPitColors.PANEL_BACKGROUND};
-                    color: {DinoPitColors.PRIMARY_TEXT};
-                    border-radius: {self._scaling_helper.scaled_size(15)}px;
-                    border: none;
-                }}
-            """)
-            layout.setAlignment(Qt.AlignmentFlag.AlignLeft)
-        
-        # Create message layout
-        message_layout = QVBoxLayout(message_frame)
-        message_layout.setContentsMargins(
-            self._scaling_helper.scaled_size(15),
-            self._scaling_helper.scaled_size(10),
-            self._scaling_helper.scaled_size(15),
-            self._scaling_helper.scaled_size(10)
-        )
-        
-        # Create message label with improved typography
-        message_label = QLabel(message)
-        message_label.setWordWrap(True)
-        # Use new font scale system for 16px base font size
-        font_size = self._scaling_helper.get_font_for_role('body_primary')
-        message_label.setStyleSheet(f"""
-            border: none;
-            background: transparent;
-            font-size: {font_size}px;
-            line-height: 1.5;
-        """)
-        # Prevent HTML injection
-        message_label.setTextFormat(Qt.TextFormat.PlainText)
-        
-        message_layout.addWidget(message_label)
-        layout.addWidget(message_frame)
-        
-        # Connect to zoom changes
-        self._scaling_helper.zoom_changed.connect(self._on_zoom_changed)
-        
-    def _on_zoom_changed(self, zoom_level: float):
-        """Handle zoom level changes"""
-        self.setMaximumWidth(self._scaling_helper.scaled_size(600))
+from .chat_message_view import (
+    ChatMessageModel, ChatMessageDelegate, ChatMessageView,
+    ChatMessageWriter
+)
 
 
 class EnhancedChatTabWidget(QWidget):
@@ -120,6 +38,9 @@ class EnhancedChatTabWidget(QWidget):
     # Signal emitted when session changes
     session_changed = Signal(str)  # session_id
     
+    # Messages loaded per page when opening or scrolling back a session
+    PAGE_SIZE = 50
+    
     def __init__(self, chat_db: ChatHistoryDatabase):
         """Initialize the enhanced chat tab widget."""
         super().__init__()
@@ -128,6 +49,10 @@ class EnhancedChatTabWidget(QWidget):
         self.current_model: Optional[str] = None
         self._scaling_helper = get_scaling_helper()
         
+        # New messages are written off the GUI thread
+        self._message_writer = ChatMessageWriter(chat_db, self)
+        self._message_writer.save_failed.connect(self._on_save_failed)
+        
         # Loading and feedback components
         self._typing_indicator: Optional[TypingIndicator] = None
         self._message_send_indicator: Optional[MessageSendIndicator] = None
@@ -157,28 +82,14 @@ class EnhancedChatTabWidget(QWidget):
         self.session_bar = self._create_session_bar()
         
         # Create chat area
-        self.chat_scroll = QScrollArea()
-        self.chat_scroll.setWidgetResizable(True)
-        self.chat_scroll.setHorizontalScrollBarPolicy(
-            Qt.ScrollBarPolicy.ScrollBarAlwaysOff
+        self.message_model = ChatMessageModel(self)
+        self.chat_view = ChatMessageView()
+        self.chat_view.setModel(self.message_model)
+        self.chat_view.setItemDelegate(ChatMessageDelegate(self.chat_view))
+        self.chat_view.older_messages_requested.connect(
+            self._load_older_messages
         )
-        self.chat_scroll.setFrameShape(QFrame.Shape.NoFrame)
-        self._update_chat_scroll_style()
-        
-        # Create chat content widget
-        self.chat_content = QWidget()
-        self.chat_layout = QVBoxLayout(self.chat_content)
-        self.chat_layout.setContentsMargins(
-            self._scaling_helper.scaled_size(10),
-            self._scaling_helper.scaled_size(10),
-            self._scaling_helper.scaled_size(10),
-            self._scaling_helper.scaled_size(10)
-        )
-        self.chat_layout.setSpacing(self._scaling_helper.scaled_size(10))
-        self.chat_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
-        
-        # Set chat content as the widget for scroll area
-        self.chat_scroll.setWidget(self.chat_content)
+        self._update_chat_view_style()
         
         # Create input area
         self.input_frame = QFrame()
@@ -231,7 +142,7 @@ class EnhancedChatTabWidget(QWidget):
         # Add widgets to main layout
         self.main_layout.addWidget(self.session_bar)
         # Give more space to chat area
-        self.main_layout.addWidget(self.chat_scroll, 1)
+        self.main_layout.addWidget(self.chat_view, 1)
         self.main_layout.addWidget(self._message_send_indicator)
         self.main_layout.addWidget(self.input_frame)
         
@@ -356,9 +267,14 @@ class EnhancedChatTabWidget(QWidget):
         self.session_changed.emit(self.current_session.id)
         
     def load_session(self, session_id: str):
-        """Load an existing chat session"""
+        """Load an existing chat session, newest page of messages first"""
+        # Messages still being written must be visible to the page query
+        self._message_writer.flush(timeout=5.0)
+        
         # Load session from database
-        session = self.chat_db.get_session(session_id)
+        session = self.chat_db.get_session(
+            session_id, message_limit=self.PAGE_SIZE
+        )
         if not session:
             QMessageBox.warning(
                 self,
@@ -375,13 +291,12 @@ class EnhancedChatTabWidget(QWidget):
         # Update UI
         self.session_title_label.setText(session.title)
         
-        # Load all messages
-        for msg in session.messages:
-            self.add_message(
-                msg.message,
-                is_user=msg.is_user,
-                save_to_db=False  # Already in database
-            )
+        # Show the newest page; older pages load on scroll-up
+        self.message_model.set_messages(session.messages)
+        self.chat_view.has_older_messages = (
+            len(session.messages) == self.PAGE_SIZE
+        )
+        self.scroll_to_bottom()
             
         # Emit signal
         self.session_changed.emit(session.id)
@@ -439,44 +354,51 @@ class EnhancedChatTabWidget(QWidget):
         if not is_user:
             self.hide_typing_indicator()
             
-        # Create message widget
-        message_widget = ChatMessageWidget(message, is_user)
-        self.chat_layout.addWidget(message_widget)
-        
-        # Save to database if requested
         if save_to_db and self.current_session:
-            # Add to session
+            # Add to session and queue the database write
             msg = self.current_session.add_message(message, is_user)
-            
-            # Save to database
-            result = self.chat_db.add_message(self.current_session.id, msg)
-            if not result.get("success"):
-                # Log error but don't interrupt user experience
-                print(f"Failed to save message: {result.get('error')}")
-                # Show error in send indicator
-                if self._message_send_indicator:
-                    self._message_send_indicator.set_error("Failed to save")
+            self._message_writer.enqueue(self.current_session.id, msg)
+        else:
+            msg = ChatMessage(message=message, is_user=is_user)
+        
+        self.message_model.append_message(msg)
         
         # Scroll to bottom after adding message
         self.scroll_to_bottom()
         
+    def _load_older_messages(self):
+        """Prepend the page of messages before the oldest one shown"""
+        oldest = self.message_model.message_at(0)
+        if not self.current_session or oldest is None:
+            return
+        
+        page = self.chat_db.get_messages_page(
+            self.current_session.id, before=oldest, limit=self.PAGE_SIZE
+        )
+        self.chat_view.has_older_messages = len(page) == self.PAGE_SIZE
+        self.current_session.messages[:0] = page
+        self.chat_view.prepend_messages(self.message_model, page)
+        
+    def _on_save_failed(self, error: str):
+        """Report a message that could not be written"""
+        # Don't interrupt the user; show the error in the send indicator
+        if self._message_send_indicator:
+            self._message_send_indicator.set_error("Failed to save")
+        
     def scroll_to_bottom(self):
         """Scroll the chat area to the bottom."""
-        # Use a timer to ensure the scroll happens after the widget is rendered
-        from PySide6.QtCore import QTimer
-        QTimer.singleShot(
-            10,
-            lambda: self.chat_scroll.verticalScrollBar().setValue(
-                self.chat_scroll.verticalScrollBar().maximum()
-            )
-        )
+        # Use a timer to ensure the scroll happens after layout
+        QTimer.singleShot(10, self.chat_view.scrollToBottom)
         
     def clear_chat(self):
         """Clear all messages from the chat display."""
-        while self.chat_layout.count():
-            child = self.chat_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
+        self.hide_typing_indicator()
+        self.message_model.clear()
+        self.chat_view.has_older_messages = False
+        
+    def shutdown(self):
+        """Finish writing queued messages; call before the app exits"""
+        self._message_writer.stop()
                 
     def _on_new_chat_clicked(self):
         """Handle new chat button click"""
@@ -495,10 +417,10 @@ class EnhancedChatTabWidget(QWidget):
                 
         self.start_new_session()
         
-    def _update_chat_scroll_style(self):
-        """Update chat scroll area style"""
-        self.chat_scroll.setStyleSheet(f"""
-            QScrollArea {{
+    def _update_chat_view_style(self):
+        """Update chat view style"""
+        self.chat_view.setStyleSheet(f"""
+            QListView {{
                 background-color: {DinoPitColors.MAIN_BACKGROUND};
                 border: 1px solid {DinoPitColors.PANEL_BACKGROUND};
                 border-radius: {self._scaling_helper.scaled_size(8)}px;
@@ -578,7 +500,8 @@ class EnhancedChatTabWidget(QWidget):
     def _on_zoom_changed(self, zoom_level: float):
         """Handle zoom level changes"""
         # Update all styled components
-        self._update_chat_scroll_style()
+        self._update_chat_view_style()
+        self.chat_view.refresh_layout()
         self._update_input_frame_style()
         self._update_input_field_style()
         self._update_send_button_style()
@@ -644,8 +567,11 @@ class EnhancedChatTabWidget(QWidget):
         if self._typing_indicator is None:
             self._typing_indicator = TypingIndicator()
             
-        # Add typing indicator to chat
-        self.chat_layout.addWidget(self._typing_indicator)
+        # Show typing indicator below the messages
+        self.main_layout.insertWidget(
+            self.main_layout.indexOf(self.chat_view) + 1,
+            self._typing_indicator
+        )
         self._typing_indicator.start_animation()
         
         # Scroll to bottom to show typing indicator
@@ -655,6 +581,6 @@ class EnhancedChatTabWidget(QWidget):
         """Hide the typing indicator"""
         if self._typing_indicator is not None:
             self._typing_indicator.stop_animation()
-            self.chat_layout.removeWidget(self._typing_indicator)
+            self.main_layout.removeWidget(self._typing_indicator)
             self._typing_indicator.setParent(None)
             self._typing_indicator = None
\ No newline at end of file
@@ -2,173 +2,224 @@
 Note List Widget Component - Displays list of notes with custom items
 """
 
-from typing import List, Optional
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import re
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QListWidget, QListWidgetItem,
-    QLabel, QHBoxLayout, QLineEdit
+    QApplication, QWidget, QVBoxLayout, QListWidget, QListWidgetItem,
+    QLabel, QLineEdit, QStyle, QStyledItemDelegate
 )
 from PySide6.QtCore import Signal, Qt, QSize
-from PySide6.QtGui import QFont
+from PySide6.QtGui import QColor, QFont, QFontMetrics
 
 from src.utils.colors import DinoPitColors
 from src.utils.scaling import get_scaling_helper
 from src.models.note import Note
 
 
-class NoteListItem(QWidget):
-    """Custom widget for displaying a note in the list."""
+# Item data role holding the Note object of a row
+NOTE_ROLE = Qt.ItemDataRole.UserRole + 1
+
+
+class NoteListDelegate(QStyledItemDelegate):
+    """Paints a note row: title, preview, date and tags.
+    
+    Rows are painted rather than built from per-row widgets, and the
+    preview, date and search highlight of a note are only worked out
+    when its row is first painted, so off-screen notes cost nothing.
+    """
+    
+    ROW_HEIGHT = 80
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._scaling_helper = get_scaling_helper()
+        self.search_query = ""
+        # Display text per note id, and highlight spans per note id for
+        # the current query
+        self._display_cache: Dict[str, Tuple[str, str, str]] = {}
+        self._highlight_cache: Dict[str, List[Tuple[int, int]]] = {}
+    
+    def set_search_query(self, query: str):
+        """Set the text highlighted in previews"""
+        if query != self.search_query:
+            self.search_query = query
+            self._highlight_cache.clear()
+    
+    def invalidate(self, note_id: Optional[str] = None):
+        """Forget cached display text for one note, or all notes"""
+        if note_id is None:
+            self._display_cache.clear()
+            self._highlight_cache.clear()
+        else:
+            self._display_cache.pop(note_id, None)
+            self._highlight_cache.pop(note_id, None)
+    
+    def sizeHint(self, option, index):
+        return QSize(0, self._scaling_helper.scaled_size(self.ROW_HEIGHT))
+    
+    def _display_text(self, note: Note) -> Tuple[str, str, str]:
+        """Preview, date and tags text for a note"""
+        cached = self._display_cache.get(note.id)
+        if cached is None:
+            tags_text = ""
+            if note.tags:
+                tags_text = " • ".join(note.tags[:3])  # Show max 3 tags
+                if len(note.tags) > 3:
+                    tags_text += f" +{len(note.tags) - 3}"
+            cached = (_preview_text(note), _format_date(note), tags_text)
+            self._display_cache[note.id] = cached
+        return cached
     
-    def __init__(self, note: Note, search_query: str = ""):
-        """Initialize the note list item.
+    def _highlight_spans(self, note: Note,
+                         preview: str) -> List[Tuple[int, int]]:
+        """Case-insensitive (start, end) matches of the query in preview"""
+        spans = self._highlight_cache.get(note.id)
+        if spans is None:
+            spans = []
+            if self.search_query:
+                pattern = re.compile(re.escape(self.search_query),
+                                     re.IGNORECASE)
+                spans = [m.span() for m in pattern.finditer(preview)]
+            self._highlight_cache[note.id] = spans
+        return spans
+    
+    def paint(self, painter, option, index):
+        note = index.data(NOTE_ROLE)
+        if note is None:
+            super().paint(painter, option, index)
+            return
         
-        Args:
-            note: The Note object to display
-            search_query: Optional search query to highlight
-        """
-        super().__init__()
-        self.note = note
-        self.search_query = search_query
-        self._setup_ui()
+        # Background, hover and selection come from the list style sheet
+        self.initStyleOption(option, index)
+        option.text = ""
+        widget = option.widget
+        style = widget.style() if widget else QApplication.style()
+        style.drawPrimitive(
+            QStyle.PrimitiveElement.PE_PanelItemViewItem,
+            option, painter, widget
+        )
         
-    def _setup_ui(self):
-        """Setup the item UI."""
-        self._scaling_helper = get_scaling_helper()
-        layout = QVBoxLayout(self)
-        s = self._scaling_helper  # Shorter alias
-        layout.setContentsMargins(
+        s = self._scaling_helper
+        rect = option.rect.adjusted(
             s.scaled_size(10), s.scaled_size(8),
-            s.scaled_size(10), s.scaled_size(8)
+            -s.scaled_size(10), -s.scaled_size(8)
         )
-        layout.setSpacing(s.scaled_size(4))
+        preview, date_text, tags_text = self._display_text(note)
+        spacing = s.scaled_size(4)
         
-        # Title
-        self.title_label = QLabel(self.note.title or "Untitled Note")
-        self.title_label.setStyleSheet("color: #FFFFFF;")
-        self.title_font = QFont()
-        self.title_font.setBold(True)
-        self.title_font.setPointSize(self._scaling_helper.scaled_font_size(11))
-        self.title_label.setFont(self.title_font)
-        self.title_label.setStyleSheet(f"color: {DinoPitColors.PRIMARY_TEXT};")
-        layout.addWidget(self.title_label)
-        
-        # Preview text (with possible highlighting)
-        preview_text = self._get_preview_text()
-        if preview_text:
-            if self.search_query:
-                # Highlight search terms in preview
-                preview_html = self._highlight_text(
-                    preview_text, self.search_query
-                )
-                self.preview_label = QLabel(preview_html)
-                self.preview_label.setTextFormat(Qt.TextFormat.RichText)
-            else:
-                self.preview_label = QLabel(preview_text)
-                
-            self.preview_label.setStyleSheet("color: #FFFFFF;")
-            self.preview_label.setWordWrap(False)
-            self._update_preview_style()
-            layout.addWidget(self.preview_label)
-        
-        # Bottom row with date and tags
-        bottom_layout = QHBoxLayout()
-        bottom_layout.setSpacing(self._scaling_helper.scaled_size(10))
-        
-        # Date
-        date_str = self._format_date()
-        self.date_label = QLabel(date_str)
-        self.date_label.setStyleSheet("color: #FFFFFF;")
-        self._update_date_style()
-        bottom_layout.addWidget(self.date_label)
-        
-        # Tags (if any)
-        if self.note.tags:
-            tags_text = " • ".join(self.note.tags[:3])  # Show max 3 tags
-            if len(self.note.tags) > 3:
-                tags_text += f" +{len(self.note.tags) - 3}"
-            self.tags_label = QLabel(tags_text)
-            self.tags_label.setStyleSheet("color: #FFFFFF;")
-            self._update_tags_style()
-            bottom_layout.addWidget(self.tags_label)
-        
-        bottom_layout.addStretch()
-        layout.addLayout(bottom_layout)
-        
-    def _get_preview_text(self) -> str:
-        """Get preview text from note content."""
-        if not self.note.content:
-            return ""
-        
-        # Get first line or first 60 chars
-        lines = self.note.content.strip().split('\n')
-        preview = lines[0] if lines else self.note.content
-        
-        if len(preview) > 60:
-            preview = preview[:57] + "..."
-            
-        return preview
+        painter.save()
+        painter.setClipRect(option.rect)
         
-    def _format_date(self) -> str:
-        """Format the note's date for display."""
-        try:
-            # Parse ISO format date
-            dt = datetime.fromisoformat(self.note.updated_at)
-            
-            # Check if today
-            today = datetime.now().date()
-            note_date = dt.date()
-            
-            if note_date == today:
-                return dt.strftime("Today %I:%M %p")
-            elif (today - note_date).days == 1:
-                return dt.strftime("Yesterday %I:%M %p")
-            elif (today - note_date).days < 7:
-                return dt.strftime("%A")  # Day name
-            else:
-                return dt.strftime("%b %d, %Y")
-        except Exception:
-            return "Unknown date"
-    
-    def _highlight_text(self, text: str, query: str) -> str:
-        """Highlight search query in text."""
-        if not query:
-            return text
-            
-        # Escape special regex characters in query
-        escaped_query = re.escape(query)
-        # Create case-insensitive pattern
-        pattern = re.compile(f'({escaped_query})', re.IGNORECASE)
-        # Replace matches with highlighted version
-        highlighted = pattern.sub(
-            f'<span style="background-color: {DinoPitColors.DINOPIT_ORANGE}; '
-            f'color: white; padding: 1px 2px; border-radius: 2px;">\\1</span>',
-            text
+        # Title
+        title_font = QFont(option.font)
+        title_font.setBold(True)
+        title_font.setPointSize(s.scaled_font_size(11))
+        painter.setFont(title_font)
+        painter.setPen(QColor(DinoPitColors.PRIMARY_TEXT))
+        title_metrics = QFontMetrics(title_font)
+        painter.drawText(
+            rect.left(), rect.top() + title_metrics.ascent(),
+            title_metrics.elidedText(
+                note.title or "Untitled Note",
+                Qt.TextElideMode.ElideRight, rect.width()
+            )
         )
-        return highlighted
-    
-    def _update_preview_style(self):
-        """Update preview label style with current scaling."""
-        if hasattr(self, 'preview_label'):
-            self.preview_label.setStyleSheet(
-                f"color: {DinoPitColors.PRIMARY_TEXT}; "
-                f"font-size: {self._scaling_helper.scaled_font_size(10)}px;"
+        y = rect.top() + title_metrics.height() + spacing
+        
+        # Preview with search matches highlighted
+        if preview:
+            preview_font = QFont(option.font)
+            preview_font.setPixelSize(s.scaled_font_size(10))
+            painter.setFont(preview_font)
+            metrics = QFontMetrics(preview_font)
+            self._draw_highlighted(
+                painter, metrics, rect.left(), y, preview,
+                self._highlight_spans(note, preview)
             )
+            y += metrics.height() + spacing
+        
+        # Date and tags
+        small_font = QFont(option.font)
+        small_font.setPixelSize(s.scaled_font_size(9))
+        painter.setFont(small_font)
+        metrics = QFontMetrics(small_font)
+        painter.setPen(QColor(DinoPitColors.SOFT_ORANGE))
+        painter.drawText(rect.left(), y + metrics.ascent(), date_text)
+        if tags_text:
+            painter.setPen(QColor(DinoPitColors.PRIMARY_TEXT))
+            painter.drawText(
+                rect.left() + metrics.horizontalAdvance(date_text)
+                + s.scaled_size(10),
+                y + metrics.ascent(), tags_text
+            )
+        painter.restore()
     
-    def _update_date_style(self):
-        """Update date label style with current scaling."""
-        self.date_label.setStyleSheet(
-            f"color: {DinoPitColors.SOFT_ORANGE}; "
-            f"font-size: {self._scaling_helper.scaled_font_size(9)}px;"
-        )
+    @staticmethod
+    def _draw_highlighted(painter, metrics, x: int, y: int, text: str,
+                          spans: List[Tuple[int, int]]):
+        """Draw one line of text with the given spans highlighted"""
+        position = 0
+        baseline = y + metrics.ascent()
+        for start, end in spans + [(len(text), len(text))]:
+            plain = text[position:start]
+            if plain:
+                painter.setPen(QColor(DinoPitColors.PRIMARY_TEXT))
+                painter.drawText(x, baseline, plain)
+                x += metrics.horizontalAdvance(plain)
+            match = text[start:end]
+            if match:
+                width = metrics.horizontalAdvance(match)
+                painter.fillRect(x, y, width, metrics.height(),
+                                 QColor(DinoPitColors.DINOPIT_ORANGE))
+                painter.setPen(QColor("white"))
+                painter.drawText(x, baseline, match)
+                x += width
+            position = end
+
+
+def _preview_text(note: Note) -> str:
+    """Get preview text from note content."""
+    if not note.content:
+        return ""
     
-    def _update_tags_style(self):
-        """Update tags label style with current scaling."""
-        if hasattr(self, 'tags_label'):
-            self.tags_label.setStyleSheet(
-                f"color: {DinoPitColors.PRIMARY_TEXT}; "
-                f"font-size: {self._scaling_helper.scaled_font_size(9)}px;"
-            )
+    # Get first line or first 60 chars
+    lines = note.content.strip().split('\n')
+    preview = lines[0] if lines else note.content
+    
+    if len(preview) > 60:
+        preview = preview[:57] + "..."
+        
+    return preview
+
+
+def _format_date(note: Note) -> str:
+    """Format the note's date for display."""
+    try:
+        # Parse ISO format date
+        dt = datetime.fromisoformat(note.updated_at)
+        
+        # Check if today
+        today = datetime.now().date()
+        note_date = dt.date()
+        
+        if note_date == today:
+            return dt.strftime("Today %I:%M %p")
+        elif (today - note_date).days == 1:
+            return dt.strftime("Yesterday %I:%M %p")
+        elif (today - note_date).days < 7:
+            return dt.strftime("%A")  # Day name
+        else:
+            return dt.strftime("%b %d, %Y")
+    except Exception:
+        return "Unknown date"
+
+
+def _note_signature(note: Note) -> tuple:
+    """Everything a row holds; rows are updated when it changes"""
+    return (note.title, note.content, tuple(note.tags or ()),
+            note.project_id, note.created_at, note.updated_at)
 
 
 class NoteListWidget(QWidget):
@@ -176,6 +227,7 @@ class NoteListWidget(QWidget):
     
     Features:
     - Custom note item display with title and preview
+    - Rows updated in place by note id rather than rebuilt on reload
     - Note selection signals
     - Refresh capability
     - Styling consistent with DinoAir theme
@@ -184,6 +236,10 @@ class NoteListWidget(QWidget):
     # Signals
     note_selected = Signal(Note)  # Emitted when a note is selected
     
+    # Reloads that would add or remove more rows than this (or a quarter
+    # of the list, if larger) rebuild the list instead of patching it
+    REBUILD_THRESHOLD = 100
+    
     def __init__(self):
         """Initialize the note list widget."""
         super().__init__()
@@ -192,6 +248,11 @@ class NoteListWidget(QWidget):
         self._selected_note_id: Optional[str] = None
         self._search_mode = False
         self._search_query = ""
+        # Row items by note id, note ids in row order, and what each row
+        # was last drawn from
+        self._items: Dict[str, QListWidgetItem] = {}
+        self._order: List[str] = []
+        self._signatures: Dict[str, tuple] = {}
         self._scaling_helper = get_scaling_helper()
         self._setup_ui()
         
@@ -217,6 +278,9 @@ class NoteListWidget(QWidget):
 
         # Create the list widget
         self.list_widget = QListWidget()
+        self.list_widget.setUniformItemSizes(True)
+        self.delegate = NoteListDelegate(self.list_widget)
+        self.list_widget.setItemDelegate(self.delegate)
         self._update_list_style(False)
 
         # Create empty state widget
@@ -258,8 +322,6 @@ class NoteListWidget(QWidget):
         Args:
             notes: List of Note objects to display
         """
-        # Clear existing items
-        self.list_widget.clear()
         self._notes = notes
         
         # Display appropriate notes based on search mode
@@ -276,35 +338,115 @@ class NoteListWidget(QWidget):
             self.list_widget.show()
             self.empty_state.hide()
         
-        # Add notes to list
-        for note in notes_to_display:
-            # Create custom widget with search highlighting if in search mode
-            item_widget = NoteListItem(
-                note,
-                self._search_query if self._search_mode else ""
-            )
-            
-            # Create list item
-            list_item = QListWidgetItem()
-            list_item.setText(note.title or "")
-            list_item.setSizeHint(
-                QSize(0, self._scaling_helper.scaled_size(80))
-            )  # Scaled height
-            list_item.setData(Qt.ItemDataRole.UserRole, note.id)
-            # Attach note object for tests expecting attribute
-            try:
-                list_item.note = note  # type: ignore[attr-defined]
-            except Exception:
-                pass
-            
-            # Set the custom widget
-            self.list_widget.addItem(list_item)
-            self.list_widget.setItemWidget(list_item, item_widget)
+        # Highlighting is worked out per row as rows are painted
+        self.delegate.set_search_query(
+            self._search_query if self._search_mode else ""
+        )
+        
+        # Patch rows in place; signals are blocked so moving the current
+        # row does not look like a new selection
+        self.list_widget.blockSignals(True)
+        try:
+            self._sync_items(notes_to_display)
+        finally:
+            self.list_widget.blockSignals(False)
+        self.list_widget.viewport().update()
             
         # Restore selection if possible
         if self._selected_note_id:
             self._select_note_by_id(self._selected_note_id)
-            
+    
+    def _make_item(self, note: Note) -> QListWidgetItem:
+        """Create the list item for a note."""
+        list_item = QListWidgetItem()
+        self._set_item_note(list_item, note)
+        return list_item
+    
+    def _set_item_note(self, list_item: QListWidgetItem, note: Note):
+        """Point a list item at a (possibly updated) note."""
+        list_item.setText(note.title or "")
+        list_item.setData(Qt.ItemDataRole.UserRole, note.id)
+        list_item.setData(NOTE_ROLE, note)
+        # Attach note object for tests expecting attribute
+        try:
+            list_item.note = note  # type: ignore[attr-defined]
+        except Exception:
+            pass
+        self._signatures[note.id] = _note_signature(note)
+    
+    def _rebuild_items(self, notes: List[Note]):
+        """Replace every row."""
+        self.list_widget.clear()
+        self._items = {}
+        self._signatures = {}
+        self.delegate.invalidate()
+        for note in notes:
+            list_item = self._make_item(note)
+            self.list_widget.addItem(list_item)
+            self._items[note.id] = list_item
+        self._order = [note.id for note in notes]
+        if len(self._items) != len(notes):
+            # Duplicate ids cannot be patched by id; rebuild next time
+            self._order = []
+    
+    def _sync_items(self, notes: List[Note]):
+        """Bring the rows in line with notes, touching only what changed.
+        
+        Rows whose note is gone are removed, new notes get new rows,
+        rows that moved are re-inserted at their new position and rows
+        whose note changed are updated in place.
+        """
+        wanted = {note.id: note for note in notes}
+        stale = [note_id for note_id in self._order if note_id not in wanted]
+        inserted = len(wanted) - (len(self._order) - len(stale))
+        if (len(self._order) != self.list_widget.count()
+                or len(wanted) != len(notes)
+                or len(stale) + inserted > max(self.REBUILD_THRESHOLD,
+                                               len(notes) // 4)):
+            self._rebuild_items(notes)
+            return
+        
+        # Rows that stay, in their current order
+        kept = [note_id for note_id in self._order if note_id in wanted]
+        target = [note.id for note in notes if note.id in self._items]
+        moved = set()
+        if kept != target:
+            # Keep the longest run already in order; move the rest
+            position = {note_id: i for i, note_id in enumerate(target)}
+            in_order = _longest_increasing_run(
+                [position[note_id] for note_id in kept]
+            )
+            moved = {note_id for i, note_id in enumerate(kept)
+                     if i not in in_order}
+        
+        # Take out removed and moved rows, bottom-up so rows stay valid
+        removing = set(stale) | moved
+        for row in range(len(self._order) - 1, -1, -1):
+            note_id = self._order[row]
+            if note_id in removing:
+                self.list_widget.takeItem(row)
+                if note_id not in wanted:
+                    del self._items[note_id]
+                    self._signatures.pop(note_id, None)
+                    self.delegate.invalidate(note_id)
+        
+        # Insert new and moved rows in ascending order, update the rest
+        for row, note in enumerate(notes):
+            list_item = self._items.get(note.id)
+            if list_item is None:
+                list_item = self._make_item(note)
+                self._items[note.id] = list_item
+                self.list_widget.insertItem(row, list_item)
+                continue
+            if note.id in moved:
+                self.list_widget.insertItem(row, list_item)
+            # Unchanged rows keep their (equal) note object, so a reload
+            # of fresh objects from the database touches no rows
+            if self._signatures.get(note.id) != _note_signature(note):
+                self._set_item_note(list_item, note)
+                self.delegate.invalidate(note.id)
+        self._order = [note.id for note in notes]
+        
     def refresh_notes(self, notes: List[Note]):
         """Refresh the notes list while maintaining selection.
         
@@ -330,6 +472,10 @@ class NoteListWidget(QWidget):
 
     def clear(self):
         self.list_widget.clear()
+        self._items = {}
+        self._order = []
+        self._signatures = {}
+        self.delegate.invalidate()
         self._notes = []
         self._filtered_notes = []
         self._selected_note_id = None
@@ -350,12 +496,7 @@ class NoteListWidget(QWidget):
         if not current_item:
             return None
             
-        note_id = current_item.data(Qt.ItemDataRole.UserRole)
-        for note in self._notes:
-            if note.id == note_id:
-                return note
-                
-        return None
+        return current_item.data(NOTE_ROLE)
         
     def select_first_note(self):
         """Select the first note in the list."""
@@ -373,11 +514,9 @@ class NoteListWidget(QWidget):
         Args:
             note_id: The ID of the note to select
         """
-        for i in range(self.list_widget.count()):
-            item = self.list_widget.item(i)
-            if item.data(Qt.ItemDataRole.UserRole) == note_id:
-                self.list_widget.setCurrentItem(item)
-                break
+        item = self._items.get(note_id)
+        if item is not None and self.list_widget.currentItem() is not item:
+            self.list_widget.setCurrentItem(item)
                 
     def _on_item_clicked(self, item: QListWidgetItem):
         """Handle item click."""
@@ -385,11 +524,10 @@ class NoteListWidget(QWidget):
         # Avoid double-emitting for same selection
         if self._selected_note_id == note_id:
             return
-        for note in self._notes:
-            if note.id == note_id:
-                self._selected_note_id = note_id
-                self.note_selected.emit(note)
-                break
+        note = item.data(NOTE_ROLE)
+        if note is not None:
+            self._selected_note_id = note_id
+            self.note_selected.emit(note)
                 
     def _on_current_changed(self, current: QListWidgetItem,
                             previous: QListWidgetItem):
@@ -494,26 +632,25 @@ class NoteListWidget(QWidget):
         """Update filtered visibility based on search text."""
         self._search_query = text or ""
         self._search_mode = bool(self._search_query)
+        self.delegate.set_search_query(self._search_query)
         self._apply_visibility_filter()
+        self.list_widget.viewport().update()
 
     def _apply_visibility_filter(self):
         """Apply visibility to items inline, for tests reading isHidden()."""
         query = (self._search_query or "").lower()
-        for i in range(self.list_widget.count()):
-            item = self.list_widget.item(i)
-            note_id = item.data(Qt.ItemDataRole.UserRole)
-            note = next((n for n in self._notes if n.id == note_id), None)
-            if not note:
-                item.setHidden(False)
-                continue
-            if not query:
-                item.setHidden(False)
-                continue
-            title = (note.title or "").lower()
-            content = (note.content or "").lower()
-            # Show if query in title or content
-            visible = (query in title) or (query in content)
-            item.setHidden(not visible)
+        notes_by_id = {note.id: note for note in self._notes}
+        for item in self._items.values():
+            note = notes_by_id.get(item.data(Qt.ItemDataRole.UserRole))
+            if not note or not query:
+                hidden = False
+            else:
+                title = (note.title or "").lower()
+                content = (note.content or "").lower()
+                # Show if query in title or content
+                hidden = not ((query in title) or (query in content))
+            if item.isHidden() != hidden:
+                item.setHidden(hidden)
     
     def _update_empty_icon_style(self):
         """Update empty icon style with current scaling."""
@@ -535,14 +672,30 @@ class NoteListWidget(QWidget):
         self._update_empty_icon_style()
         self._update_empty_text_style()
         
-        # Force reload of notes to update item sizes
-        if self._notes:
-            # Store current selection
-            current_item = self.list_widget.currentItem()
-            if current_item:
-                self._selected_note_id = current_item.data(
-                    Qt.ItemDataRole.UserRole
-                )
-            
-            # Reload notes with new scaling
-            self.load_notes(self._notes)
\ No newline at end of file
+        # Re-measure and repaint rows at the new scale. Cached preview,
+        # date and highlight text do not depend on the zoom level.
+        self.list_widget.doItemsLayout()
+        self.list_widget.viewport().update()
+
+
+def _longest_increasing_run(values: List[int]) -> set:
+    """Indexes of a longest strictly increasing subsequence of values."""
+    tails: List[int] = []  # index of the smallest tail for each length
+    previous = [-1] * len(values)
+    tail_values: List[int] = []
+    for i, value in enumerate(values):
+        length = bisect_left(tail_values, value)
+        if length:
+            previous[i] = tails[length - 1]
+        if length == len(tails):
+            tails.append(i)
+            tail_values.append(value)
+        else:
+            tails[length] = i
+            tail_values[length] = value
+    result = set()
+    i = tails[-1] if tails else -1
+    while i != -1:
+        result.add(i)
+        i = previous[i]
+    return result
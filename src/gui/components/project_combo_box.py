@@ -5,12 +5,13 @@ A reusable combo box for project selection with hierarchical display
 
 from typing import Optional, List, Dict
 from PySide6.QtWidgets import QComboBox, QWidget
-from PySide6.QtCore import Signal, QTimer
+from PySide6.QtCore import Signal
 
 from src.tools.projects_service import ProjectsService
 from src.models.project import Project, ProjectStatus
 from src.utils.logger import Logger
 from src.utils.colors import DinoPitColors
+from .refresh_scheduler import get_refresh_scheduler, RefreshPriority
 
 
 class ProjectComboBox(QComboBox):
@@ -48,11 +49,11 @@ class ProjectComboBox(QComboBox):
         # Connect signals
         self.currentIndexChanged.connect(self._on_selection_changed)
         
-        # Setup auto-refresh timer
-        self._refresh_timer = QTimer()
-        self._refresh_timer.timeout.connect(self.refresh_projects)
-        self._refresh_timer.setInterval(30000)  # Refresh every 30 seconds
-        self._refresh_timer.start()
+        # Auto-refresh every 30 seconds, run by the shared scheduler
+        self._refresh_job = get_refresh_scheduler().register(
+            "project_combo_box", self.refresh_projects, 30000,
+            priority=RefreshPriority.LOW, owner=self
+        )
         
     def _setup_ui(self):
         """Setup the UI appearance"""
@@ -237,8 +238,8 @@ class ProjectComboBox(QComboBox):
         
     def cleanup(self):
         """Cleanup resources"""
-        if hasattr(self, '_refresh_timer'):
-            self._refresh_timer.stop()
+        if hasattr(self, '_refresh_job'):
+            get_refresh_scheduler().unregister(self._refresh_job)
 
 
 class ProjectFilterWidget(QWidget):
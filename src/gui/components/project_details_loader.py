@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Project Details Loader
+Fetches the notes, artifacts and calendar events linked to a project,
+with their counts, on a worker thread so selecting a project never
+waits on the databases.
+"""
+
+from typing import Any, Dict, Optional
+
+from PySide6.QtCore import QObject, QThread, Signal
+
+from src.utils.logger import Logger
+
+
+class _DetailsWorker(QThread):
+    """Worker thread fetching the details of one project"""
+    details_fetched = Signal(dict)
+
+    def __init__(self, loader: 'ProjectDetailsLoader', project_id: str):
+        super().__init__()
+        self.loader = loader
+        self.project_id = project_id
+
+    def run(self):
+        self.details_fetched.emit(self.loader.fetch(self.project_id))
+
+
+class ProjectDetailsLoader(QObject):
+    """Loads project details off the UI thread.
+
+    At most one fetch runs at a time. Selecting other projects while it
+    runs only records the latest one: the running fetch stops at its
+    next query, its result is dropped, and the latest project is fetched
+    next. details_loaded is only emitted for the project still wanted.
+
+    The result dict holds success, project_id, notes, artifacts, events
+    and child_count, or success False with an error.
+    """
+
+    details_loaded = Signal(dict)
+
+    def __init__(self, projects_db, notes_db, artifacts_db, appointments_db,
+                 parent=None):
+        super().__init__(parent)
+        self.logger = Logger()
+        self.projects_db = projects_db
+        self.notes_db = notes_db
+        self.artifacts_db = artifacts_db
+        self.appointments_db = appointments_db
+        self._wanted: Optional[str] = None
+        self._worker: Optional[_DetailsWorker] = None
+
+    def load(self, project_id: str):
+        """Fetch the details of a project, replacing any earlier request"""
+        self._wanted = project_id
+        if self._worker is None:
+            self._start(project_id)
+
+    def cancel(self):
+        """Drop the pending request; its result will not be emitted"""
+        self._wanted = None
+
+    def is_loading(self) -> bool:
+        return self._worker is not None
+
+    def wait(self, msecs: int = 5000) -> bool:
+        """Cancel and wait for a running fetch, e.g. before closing"""
+        self.cancel()
+        worker = self._worker
+        return worker is None or worker.wait(msecs)
+
+    def shutdown(self, msecs: int = 5000) -> bool:
+        """Stop and wait for a running fetch before the loader goes away
+
+        Returns:
+            True if no fetch is left running
+        """
+        self.cancel()
+        worker = self._worker
+        if worker is None:
+            return True
+        worker.requestInterruption()
+        worker.quit()
+        if not worker.wait(msecs):
+            self.logger.warning("Project details fetch still running")
+            return False
+        return True
+
+    def _start(self, project_id: str):
+        self._worker = _DetailsWorker(self, project_id)
+        self._worker.details_fetched.connect(self._on_details_fetched)
+        self._worker.start()
+
+    def _on_details_fetched(self, result: Dict[str, Any]):
+        worker, self._worker = self._worker, None
+        if worker is not None:
+            worker.wait()
+            worker.deleteLater()
+        if self._wanted is None:
+            return
+        if result.get('project_id') == self._wanted and \
+                not result.get('cancelled'):
+            self._wanted = None
+            self.details_loaded.emit(result)
+        else:
+            # The selection moved on while this one was fetched
+            self._start(self._wanted)
+
+    def fetch(self, project_id: str) -> Dict[str, Any]:
+        """Fetch everything the details panel shows for a project.
+
+        Runs on the worker thread; each database call opens its own
+        connection. Stops early once the project is no longer wanted.
+        """
+        result: Dict[str, Any] = {"success": True, "project_id": project_id}
+        queries = (
+            ("notes", lambda: self.notes_db.get_notes_by_project(project_id)),
+            ("artifacts",
+             lambda: self.artifacts_db.get_artifacts_by_project(project_id)),
+            ("events",
+             lambda: self.appointments_db.get_events_by_project(project_id)),
+            ("child_count",
+             lambda: self.projects_db.get_project_child_count(project_id))
+        )
+        try:
+            for key, query in queries:
+                if self._wanted != project_id or \
+                        QThread.currentThread().isInterruptionRequested():
+                    return {"success": False, "cancelled": True,
+                            "project_id": project_id}
+                result[key] = query()
+            return result
+        except Exception as e:
+            self.logger.error(f"Failed to load project details: {str(e)}")
+            return {"success": False, "project_id": project_id,
+                    "error": str(e)}
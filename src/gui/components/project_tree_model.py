@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Project Tree Model
+Item model behind the projects page tree. A refresh fetches the root
+projects only; the children of a project are fetched when it is
+expanded, and single projects can be added, updated, moved or removed
+in place.
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+from PySide6.QtCore import QAbstractItemModel, QModelIndex, Qt
+from PySide6.QtGui import QBrush, QColor
+
+from src.models.project import ProjectStatus
+
+
+# Row layout returned by ProjectsDatabase.get_project_tree_rows
+(ROW_ID, ROW_NAME, ROW_STATUS, ROW_COLOR, ROW_ICON, ROW_PARENT, ROW_CREATED,
+ ROW_CHILDREN) = range(8)
+
+# Same labels as Project.get_status_display
+STATUS_LABELS = {
+    ProjectStatus.ACTIVE.value: "Active",
+    ProjectStatus.COMPLETED.value: "Completed",
+    ProjectStatus.ARCHIVED.value: "Archived"
+}
+
+
+class _Node:
+    """A tree node: the project's row, its text and the child nodes
+    fetched so far. loaded is set once the children have been fetched."""
+
+    __slots__ = ('key', 'parent', 'children', 'row', 'text', 'loaded')
+
+    def __init__(self, row: Optional[tuple] = None,
+                 parent: Optional['_Node'] = None):
+        self.key = row[ROW_ID] if row else None
+        self.parent = parent
+        self.children: List['_Node'] = []
+        self.loaded = False
+        self.set_row(row)
+
+    def set_row(self, row: Optional[tuple]):
+        self.row = row
+        self.text = _project_text(row) if row else ""
+
+
+def _project_text(row: tuple) -> str:
+    """Tree text of a project, as the page has always shown it"""
+    text = f"{row[ROW_ICON] or '📁'} {row[ROW_NAME]}"
+    status = row[ROW_STATUS]
+    if status != ProjectStatus.ACTIVE.value:
+        text += f" ({STATUS_LABELS.get(status, (status or '').title())})"
+    return text
+
+
+def _comes_before(row: tuple, other: tuple) -> bool:
+    """Tree order: by name, then newest first"""
+    if row[ROW_NAME] != other[ROW_NAME]:
+        return row[ROW_NAME] < other[ROW_NAME]
+    return (row[ROW_CREATED] or "") > (other[ROW_CREATED] or "")
+
+
+class ProjectTreeModel(QAbstractItemModel):
+    """Tree of projects and their subprojects.
+
+    Rows come from fetch_rows(parent_id, project_ids), which returns the
+    children of parent_id (root projects for None) in tree order, or the
+    rows of the given project ids. Only projects whose parents have been
+    expanded are ever fetched.
+
+    The UserRole data of an index is the project id, as stored on the
+    tree items the page used before.
+    """
+
+    def __init__(self,
+                 fetch_rows: Callable[[Optional[str], Optional[List[str]]],
+                                      List[tuple]],
+                 parent=None):
+        super().__init__(parent)
+        self._fetch_rows = fetch_rows
+        self._root = _Node()
+        self._root.loaded = True
+        self._nodes: Dict[str, _Node] = {}
+        self._filtered = False
+
+    # --- Loading -------------------------------------------------------
+
+    def load(self, rows: Optional[List[tuple]] = None):
+        """Replace the tree with the root projects, or with the given
+        root rows when they were fetched already"""
+        if rows is None:
+            rows = self._fetch_rows(None, None)
+        self.beginResetModel()
+        self._filtered = False
+        self._nodes = {}
+        self._root.children = [self._new_node(row, self._root) for row in rows]
+        self.endResetModel()
+
+    def set_filter(self, project_ids: Optional[Iterable[str]]):
+        """Show only the given projects and their ancestors, all loaded,
+        or every project again when project_ids is None"""
+        if project_ids is None:
+            self.load()
+            return
+
+        # Fetch the matches, then their ancestors a level at a time
+        rows: Dict[str, tuple] = {}
+        fetched = set()
+        wanted = list(dict.fromkeys(project_ids))
+        while wanted:
+            fetched.update(wanted)
+            for row in self._fetch_rows(None, wanted):
+                rows[row[ROW_ID]] = row
+            wanted = list(dict.fromkeys(
+                row[ROW_PARENT] for row in rows.values()
+                if row[ROW_PARENT] and row[ROW_PARENT] not in fetched
+            ))
+
+        self.beginResetModel()
+        self._filtered = True
+        self._nodes = {}
+        self._root.children = []
+        ordered = sorted(rows.values(), key=lambda row: row[ROW_CREATED] or "",
+                         reverse=True)
+        ordered.sort(key=lambda row: row[ROW_NAME])
+        for row in ordered:
+            self._nodes[row[ROW_ID]] = _Node(row)
+        for row in ordered:
+            node = self._nodes[row[ROW_ID]]
+            node.loaded = True
+            if row[ROW_PARENT] is None:
+                parent = self._root
+            else:
+                parent = self._nodes.get(row[ROW_PARENT])
+                if parent is None:
+                    # Orphans are not shown, as in the full tree
+                    del self._nodes[row[ROW_ID]]
+                    continue
+            node.parent = parent
+            parent.children.append(node)
+        self._drop_detached()
+        self.endResetModel()
+
+    def _drop_detached(self):
+        """Forget nodes whose ancestors are not in the tree"""
+        attached: Dict[str, _Node] = {}
+        stack = list(self._root.children)
+        while stack:
+            node = stack.pop()
+            attached[node.key] = node
+            stack.extend(node.children)
+        self._nodes = attached
+
+    def is_filtered(self) -> bool:
+        return self._filtered
+
+    def apply_updates(self, project_ids: Sequence[str]):
+        """Apply changes to a few projects without rebuilding the tree.
+
+        Projects are re-read and added, updated, moved to their new
+        parent or removed. The parents they left or joined are re-read
+        too, so their expand arrows follow their child counts.
+
+        Args:
+            project_ids: Every project that was created, changed or
+                deleted
+        """
+        ids = list(dict.fromkeys(project_ids))
+        current = {row[ROW_ID]: row for row in self._fetch_rows(None, ids)}
+        parents = set()
+        for project_id in ids:
+            node = self._nodes.get(project_id)
+            row = current.get(project_id)
+            if node is not None:
+                parents.add(node.row[ROW_PARENT])
+            if row is not None:
+                parents.add(row[ROW_PARENT])
+
+            if node is not None and (
+                    row is None or row[ROW_PARENT] != node.row[ROW_PARENT]):
+                self._remove(node)
+                node = None
+            if row is None:
+                continue
+            if node is not None:
+                self._update(node, row)
+                continue
+            parent = self._parent_node(row[ROW_PARENT])
+            if parent is not None and parent.loaded:
+                self._insert(parent, _Node(row, parent))
+
+        parents = [key for key in parents
+                   if key and key not in current and key in self._nodes]
+        for row in self._fetch_rows(None, parents) if parents else []:
+            self._update(self._nodes[row[ROW_ID]], row)
+
+    def _parent_node(self, key: Optional[str]) -> Optional[_Node]:
+        return self._root if key is None else self._nodes.get(key)
+
+    def _new_node(self, row: tuple, parent: _Node) -> _Node:
+        node = _Node(row, parent)
+        self._nodes[node.key] = node
+        return node
+
+    def _insert(self, parent: _Node, node: _Node):
+        position = self._position_for(parent, node.row)
+        self.beginInsertRows(self._index(parent), position, position)
+        parent.children.insert(position, node)
+        self._nodes[node.key] = node
+        self.endInsertRows()
+
+    def _remove(self, node: _Node):
+        parent = node.parent
+        position = parent.children.index(node)
+        self.beginRemoveRows(self._index(parent), position, position)
+        del parent.children[position]
+        stack = [node]
+        while stack:
+            removed = stack.pop()
+            self._nodes.pop(removed.key, None)
+            stack.extend(removed.children)
+        self.endRemoveRows()
+
+    def _update(self, node: _Node, row: tuple):
+        parent = node.parent
+        position = parent.children.index(node)
+        node.set_row(row)
+        # Keep the siblings in order after a rename
+        target = position
+        while target > 0 and _comes_before(row, parent.children[target - 1].row):
+            target -= 1
+        while (target < len(parent.children) - 1 and
+               _comes_before(parent.children[target + 1].row, row)):
+            target += 1
+        if target != position:
+            parent_index = self._index(parent)
+            destination = target + 1 if target > position else target
+            self.beginMoveRows(parent_index, position, position,
+                               parent_index, destination)
+            del parent.children[position]
+            parent.children.insert(target, node)
+            self.endMoveRows()
+        index = self._index(node)
+        self.dataChanged.emit(index, index)
+
+    def _position_for(self, parent: _Node, row: tuple) -> int:
+        for position, child in enumerate(parent.children):
+            if _comes_before(row, child.row):
+                return position
+        return len(parent.children)
+
+    def _fetch_children(self, node: _Node):
+        """Fetch the children of an expanded project"""
+        node.loaded = True
+        rows = self._fetch_rows(node.key, None)
+        if rows:
+            self.beginInsertRows(self._index(node), 0, len(rows) - 1)
+            node.children = [self._new_node(row, node) for row in rows]
+            self.endInsertRows()
+        elif node.row[ROW_CHILDREN]:
+            # The children went away since the row was read
+            index = self._index(node)
+            self.dataChanged.emit(index, index)
+
+    # --- Lookup --------------------------------------------------------
+
+    def index_for_project(self, project_id: str) -> QModelIndex:
+        """Index of a project, fetching the children of its ancestors
+
+        Returns an invalid index when the project is not in the tree.
+        """
+        chain = []
+        key = project_id
+        while key is not None and key not in self._nodes:
+            if key in chain or self._filtered:
+                return QModelIndex()
+            rows = self._fetch_rows(None, [key])
+            if not rows:
+                return QModelIndex()
+            chain.append(key)
+            key = rows[0][ROW_PARENT]
+
+        parent = self._parent_node(key)
+        for key in reversed(chain):
+            if not parent.loaded:
+                self._fetch_children(parent)
+            parent = self._nodes.get(key)
+            if parent is None:
+                return QModelIndex()
+        return self._index(self._nodes[project_id])
+
+    def project_row(self, project_id: str) -> Optional[tuple]:
+        """Row of a project that is in the tree"""
+        node = self._nodes.get(project_id)
+        return node.row if node is not None else None
+
+    def loaded_children(self, project_id: str) -> Optional[List[str]]:
+        """Ids of a project's children, None if not fetched yet"""
+        node = self._nodes.get(project_id)
+        if node is None or not node.loaded:
+            return None
+        return [child.key for child in node.children]
+
+    def _index(self, node: _Node) -> QModelIndex:
+        if node is self._root:
+            return QModelIndex()
+        return self.createIndex(node.parent.children.index(node), 0, node)
+
+    def _node(self, index: QModelIndex) -> _Node:
+        return index.internalPointer() if index.isValid() else self._root
+
+    # --- QAbstractItemModel --------------------------------------------
+
+    def index(self, row, column, parent=QModelIndex()):
+        if column != 0 or row < 0:
+            return QModelIndex()
+        node = self._node(parent)
+        if row >= len(node.children):
+            return QModelIndex()
+        return self.createIndex(row, 0, node.children[row])
+
+    def parent(self, index=QModelIndex()):
+        if not index.isValid():
+            return QModelIndex()
+        return self._index(index.internalPointer().parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        return len(self._node(parent).children)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def hasChildren(self, parent=QModelIndex()):
+        node = self._node(parent)
+        if node.loaded:
+            return bool(node.children)
+        return node.row[ROW_CHILDREN] > 0
+
+    def canFetchMore(self, parent):
+        node = self._node(parent)
+        return not node.loaded and node.row[ROW_CHILDREN] > 0
+
+    def fetchMore(self, parent):
+        node = self._node(parent)
+        if not node.loaded:
+            self._fetch_children(node)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return node.text
+        if role == Qt.ItemDataRole.UserRole:
+            return node.key
+        if role == Qt.ItemDataRole.ForegroundRole and node.row[ROW_COLOR]:
+            return QBrush(QColor(node.row[ROW_COLOR]))
+        return None
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Refresh Scheduler
+One scheduler for the periodic and on-demand refreshes of all pages.
+It wakes up once for refreshes that fall due together, skips pages that
+are not visible until they are shown again, runs database queries on a
+small worker pool and spreads main-thread work over short slices so the
+event loop keeps painting.
+"""
+
+import time
+import weakref
+from enum import IntEnum
+from typing import Any, Callable, List, Optional
+
+from PySide6.QtCore import (
+    QEvent, QObject, QRunnable, QThreadPool, QTimer, Signal
+)
+from PySide6.QtWidgets import QWidget
+
+from src.utils.logger import Logger
+
+
+class RefreshPriority(IntEnum):
+    """Order in which due refreshes run; lower runs first"""
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+
+class RefreshJob:
+    """A registered refresh.
+
+    refresh is called on the main thread. A plain function runs in one
+    go. A generator function is stepped: yielding a callable runs that
+    callable on the worker pool and sends its result back into the
+    generator (or raises its exception there); yielding None marks a
+    point where the refresh can pause until the next slice.
+    """
+
+    __slots__ = ('name', 'refresh', 'interval_ms', 'priority', '_owner',
+                 'run_hidden', 'next_due', 'state', 'stale', 'again', 'steps',
+                 'sent', 'seq', 'runs', 'scheduler')
+
+    IDLE, QUEUED, RUNNING, FETCHING = range(4)
+
+    def __init__(self, scheduler: 'RefreshScheduler', name: str,
+                 refresh: Callable, interval_ms: int,
+                 priority: RefreshPriority, owner: Optional[QObject],
+                 run_hidden: bool = False):
+        self.scheduler = scheduler
+        self.name = name
+        self.refresh = refresh
+        self.interval_ms = interval_ms
+        self.priority = priority
+        # Weak, so a registered refresh does not keep its owner alive
+        self._owner = weakref.ref(owner) if owner is not None else None
+        self.run_hidden = run_hidden
+        self.next_due: Optional[float] = None
+        self.state = self.IDLE
+        self.stale = False  # Fell due while its page was hidden
+        self.again = False  # Requested again while running
+        self.steps = None
+        self.sent: Any = None
+        self.seq = 0
+        self.runs = 0
+
+    @property
+    def owner(self) -> Optional[QObject]:
+        return self._owner() if self._owner is not None else None
+
+    def request(self):
+        """Run this refresh soon, once however often it is requested"""
+        self.scheduler.request(self)
+
+    def is_hidden(self) -> bool:
+        owner = self.owner
+        return (not self.run_hidden and isinstance(owner, QWidget)
+                and not owner.isVisible())
+
+
+class _FetchSignals(QObject):
+    """Carries worker results back to the main thread"""
+    fetched = Signal(object, bool, object)  # job, succeeded, result
+
+
+class _FetchTask(QRunnable):
+    """Runs one fetch of a refresh on the worker pool"""
+
+    def __init__(self, job: RefreshJob, fetch: Callable,
+                 signals: _FetchSignals):
+        super().__init__()
+        self.job = job
+        self.fetch = fetch
+        self.signals = signals
+
+    def run(self):
+        try:
+            result, succeeded = self.fetch(), True
+        except Exception as e:
+            result, succeeded = e, False
+        self.signals.fetched.emit(self.job, succeeded, result)
+
+
+class RefreshScheduler(QObject):
+    """Runs registered refreshes by priority within a frame budget.
+
+    Periodic refreshes that fall due within COALESCE_MS of each other
+    run in the same pass. A refresh whose owner is a hidden widget is
+    marked stale instead of run, and runs when the widget is shown.
+    Owners that are destroyed take their refreshes with them.
+    """
+
+    # Main-thread time spent per slice before yielding to the event loop
+    FRAME_BUDGET_MS = 8
+    # Refreshes due this close to a wake-up run with it
+    COALESCE_MS = 2000
+    # Worker threads for database fetches
+    MAX_WORKERS = 2
+
+    job_finished = Signal(str)  # job name
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.logger = Logger()
+        self._jobs: List[RefreshJob] = []
+        self._ready: List[RefreshJob] = []
+        self._seq = 0
+
+        self._due_timer = QTimer(self)
+        self._due_timer.setSingleShot(True)
+        self._due_timer.timeout.connect(self._on_due)
+        self._slice_timer = QTimer(self)
+        self._slice_timer.setSingleShot(True)
+        self._slice_timer.setInterval(0)
+        self._slice_timer.timeout.connect(self._run_slice)
+
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(self.MAX_WORKERS)
+        self._signals = _FetchSignals(self)
+        self._signals.fetched.connect(self._on_fetched)
+
+    # --- Registration ----------------------------------------------------
+
+    def register(self, name: str, refresh: Callable, interval_ms: int = 0,
+                 priority: RefreshPriority = RefreshPriority.NORMAL,
+                 owner: Optional[QObject] = None,
+                 run_hidden: bool = False) -> RefreshJob:
+        """Register a refresh.
+
+        Args:
+            name: Name used in logs
+            refresh: Function or generator function doing the refresh
+            interval_ms: Period, or 0 for refreshes that only run when
+                requested
+            priority: Order among refreshes due at the same time
+            owner: Object the refresh belongs to. When it is a widget,
+                the refresh waits while the widget is hidden. The
+                refresh is unregistered when the owner is destroyed.
+            run_hidden: Run even while the owner widget is hidden, for
+                refreshes with effects beyond the page
+
+        Returns:
+            The job, whose request() asks for a run
+        """
+        job = RefreshJob(self, name, refresh, interval_ms, priority, owner,
+                         run_hidden)
+        if interval_ms > 0:
+            job.next_due = self._now() + interval_ms
+        self._jobs.append(job)
+        if owner is not None:
+            owner.destroyed.connect(self._on_owner_destroyed)
+            if isinstance(owner, QWidget) and not run_hidden:
+                owner.installEventFilter(self)
+        self._arm_due_timer()
+        return job
+
+    def unregister(self, job: RefreshJob):
+        """Forget a refresh, abandoning a run in progress"""
+        if job in self._jobs:
+            self._jobs.remove(job)
+        if job in self._ready:
+            self._ready.remove(job)
+        if job.steps is not None:
+            steps, job.steps = job.steps, None
+            try:
+                steps.close()
+            except Exception:
+                pass
+        job.state = RefreshJob.IDLE
+        job._owner = None
+        self._arm_due_timer()
+
+    def _on_owner_destroyed(self, owner: QObject):
+        for job in list(self._jobs):
+            if job._owner is not None and job.owner in (None, owner):
+                self.unregister(job)
+
+    def request(self, job: RefreshJob):
+        """Run a refresh soon; repeated requests before it runs coalesce"""
+        if job not in self._jobs:
+            return
+        if job.state in (RefreshJob.RUNNING, RefreshJob.FETCHING):
+            job.again = True
+        elif job.is_hidden():
+            job.stale = True
+        else:
+            self._queue(job)
+
+    def is_idle(self) -> bool:
+        """True when no refresh is queued, running or fetching"""
+        return all(job.state == RefreshJob.IDLE for job in self._jobs)
+
+    def jobs(self) -> List[RefreshJob]:
+        return list(self._jobs)
+
+    # --- Scheduling ------------------------------------------------------
+
+    def _now(self) -> float:
+        return time.monotonic() * 1000
+
+    def _arm_due_timer(self):
+        """Wake up once, for the earliest due refresh"""
+        due = [job.next_due for job in self._jobs if job.next_due is not None]
+        if not due:
+            self._due_timer.stop()
+            return
+        self._due_timer.start(max(0, int(min(due) - self._now())))
+
+    def _on_due(self):
+        now = self._now()
+        for job in list(self._jobs):
+            if job.next_due is None or job.next_due > now + self.COALESCE_MS:
+                continue
+            if job.is_hidden():
+                # Nothing to wake up for until the page is shown
+                job.next_due = None
+                job.stale = True
+            else:
+                job.next_due = now + job.interval_ms
+                self.request(job)
+        self._arm_due_timer()
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Type.Show:
+            for job in list(self._jobs):
+                if job.owner is watched and job.stale:
+                    job.stale = False
+                    self.request(job)
+        return False
+
+    def _queue(self, job: RefreshJob):
+        if job.state == RefreshJob.QUEUED:
+            return
+        job.state = RefreshJob.QUEUED
+        self._make_ready(job)
+
+    def _make_ready(self, job: RefreshJob):
+        self._seq += 1
+        job.seq = self._seq
+        self._ready.append(job)
+        self._ready.sort(key=lambda j: (j.priority, j.seq))
+        if not self._slice_timer.isActive():
+            self._slice_timer.start()
+
+    # --- Running ---------------------------------------------------------
+
+    def _run_slice(self):
+        """Step ready refreshes until the frame budget is spent"""
+        deadline = self._now() + self.FRAME_BUDGET_MS
+        while self._ready and self._now() < deadline:
+            job = self._ready[0]
+            self._step(job, deadline)
+        if self._ready:
+            # Let the event loop paint and handle input first
+            self._slice_timer.start()
+
+    def _step(self, job: RefreshJob, deadline: float):
+        try:
+            if job.steps is None:
+                job.state = RefreshJob.RUNNING
+                result = job.refresh()
+                if not hasattr(result, 'send'):
+                    self._finish(job)
+                    return
+                job.steps, job.sent = result, None
+            while True:
+                sent, job.sent = job.sent, None
+                if isinstance(sent, _Failure):
+                    value = job.steps.throw(sent.error)
+                else:
+                    value = job.steps.send(sent)
+                if callable(value):
+                    # Wait for the worker; other refreshes go on meanwhile
+                    self._ready.remove(job)
+                    job.state = RefreshJob.FETCHING
+                    self._pool.start(_FetchTask(job, value, self._signals))
+                    return
+                if self._now() >= deadline:
+                    return
+        except StopIteration:
+            self._finish(job)
+        except Exception as e:
+            self.logger.error(f"Refresh '{job.name}' failed: {str(e)}")
+            self._finish(job)
+
+    def _on_fetched(self, job: RefreshJob, succeeded: bool, result: Any):
+        if job not in self._jobs or job.steps is None:
+            return
+        job.sent = result if succeeded else _Failure(result)
+        job.state = RefreshJob.RUNNING
+        self._make_ready(job)
+
+    def _finish(self, job: RefreshJob):
+        if job in self._ready:
+            self._ready.remove(job)
+        job.steps = None
+        job.state = RefreshJob.IDLE
+        job.runs += 1
+        if job.interval_ms > 0:
+            job.next_due = self._now() + job.interval_ms
+            self._arm_due_timer()
+        self.job_finished.emit(job.name)
+        if job.again:
+            job.again = False
+            self.request(job)
+
+    def wait_for_workers(self, msecs: int = 5000) -> bool:
+        """Wait for running fetches, e.g. before closing"""
+        return self._pool.waitForDone(msecs)
+
+
+class _Failure:
+    """An exception raised by a fetch, to be rethrown in its refresh"""
+
+    __slots__ = ('error',)
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+# Global instance for easy access
+_refresh_scheduler = None
+
+
+def get_refresh_scheduler() -> RefreshScheduler:
+    """
+    Get the global RefreshScheduler instance
+
+    Returns:
+        RefreshScheduler: The global refresh scheduler instance
+    """
+    global _refresh_scheduler
+    if _refresh_scheduler is None:
+        _refresh_scheduler = RefreshScheduler()
+    return _refresh_scheduler
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Render Cache
+Laid-out text documents and their sizes, shared by the views that paint
+text. Entries are keyed by content, width bucket and zoom level, so
+zooming back, resizing by a few pixels or reopening a session reuses
+earlier layouts instead of laying out every message again.
+"""
+
+from collections import OrderedDict
+from typing import Callable, Dict, Tuple
+
+from PySide6.QtCore import QObject, QSizeF, Signal
+from PySide6.QtGui import QGuiApplication, QTextDocument
+
+from src.utils.scaling import get_scaling_helper
+
+
+# (kind, content hash, content length, width bucket, zoom level)
+RenderKey = Tuple[str, int, int, int, float]
+
+
+class RenderCache(QObject):
+    """LRU of laid-out documents and sizes, bounded by estimated memory.
+
+    Documents are laid out at the width bucket below the requested width,
+    so widths within one bucket share a layout. Sizes outlive their
+    documents, so views can be measured without keeping every document.
+    Everything is dropped when the application palette, font or color
+    scheme changes, and invalidated is emitted so views lay out again.
+    """
+
+    # Widths are rounded down to a multiple of this many pixels
+    WIDTH_STEP = 16
+    # Memory budgets, in bytes, for documents and for sizes
+    DOCUMENT_BUDGET = 24 * 1024 * 1024
+    SIZE_BUDGET = 4 * 1024 * 1024
+    # Estimated memory of a document and of one size entry
+    DOCUMENT_BASE_COST = 16 * 1024
+    DOCUMENT_CHAR_COST = 64
+    SIZE_ENTRY_COST = 256
+
+    invalidated = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._scaling_helper = get_scaling_helper()
+        self._documents: 'OrderedDict[RenderKey, Tuple[QTextDocument, int]]' = (
+            OrderedDict()
+        )
+        self._sizes: 'OrderedDict[RenderKey, QSizeF]' = OrderedDict()
+        self._document_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+        app = QGuiApplication.instance()
+        if app is not None:
+            app.paletteChanged.connect(self.invalidate)
+            app.fontChanged.connect(self.invalidate)
+            app.styleHints().colorSchemeChanged.connect(self.invalidate)
+
+    def width_bucket(self, width: int) -> int:
+        """Width a document is laid out at for an available width"""
+        if width < self.WIDTH_STEP:
+            return max(1, width)
+        return width - width % self.WIDTH_STEP
+
+    def key(self, kind: str, text: str, width: int) -> RenderKey:
+        return (kind, hash(text), len(text), self.width_bucket(width),
+                self._scaling_helper.get_current_zoom_level())
+
+    def document(self, kind: str, text: str, width: int,
+                 build: Callable[[str, int], QTextDocument]) -> QTextDocument:
+        """Get the laid-out document for text at a width.
+
+        Args:
+            kind: What the text is rendered as; callers rendering the
+                same text differently use different kinds
+            text: Content to render
+            width: Available width in pixels
+            build: Builds the document for (text, bucket width)
+
+        Returns:
+            The cached or newly built document
+        """
+        key = self.key(kind, text, width)
+        entry = self._documents.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._documents.move_to_end(key)
+            return entry[0]
+
+        self.misses += 1
+        document = build(text, key[3])
+        cost = self.DOCUMENT_BASE_COST + len(text) * self.DOCUMENT_CHAR_COST
+        self._documents[key] = (document, cost)
+        self._document_bytes += cost
+        self._store_size(key, document.size())
+        while (self._document_bytes > self.DOCUMENT_BUDGET
+               and len(self._documents) > 1):
+            _, (_, evicted_cost) = self._documents.popitem(last=False)
+            self._document_bytes -= evicted_cost
+        return document
+
+    def size(self, kind: str, text: str, width: int,
+             build: Callable[[str, int], QTextDocument]) -> QSizeF:
+        """Get the laid-out size of text at a width, building its
+        document only when the size is not known"""
+        key = self.key(kind, text, width)
+        size = self._sizes.get(key)
+        if size is not None:
+            self.hits += 1
+            self._sizes.move_to_end(key)
+            return size
+        return self.document(kind, text, width, build).size()
+
+    def _store_size(self, key: RenderKey, size: QSizeF):
+        self._sizes[key] = size
+        self._sizes.move_to_end(key)
+        limit = max(1, self.SIZE_BUDGET // self.SIZE_ENTRY_COST)
+        while len(self._sizes) > limit:
+            self._sizes.popitem(last=False)
+
+    def invalidate(self, *args):
+        """Drop every cached layout, e.g. after a theme change"""
+        self._documents.clear()
+        self._sizes.clear()
+        self._document_bytes = 0
+        self.invalidated.emit()
+
+    def memory_used(self) -> int:
+        """Estimated bytes held by cached documents and sizes"""
+        return (self._document_bytes
+                + len(self._sizes) * self.SIZE_ENTRY_COST)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "documents": len(self._documents),
+            "sizes": len(self._sizes),
+            "memory_bytes": self.memory_used(),
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+# Global instance for easy access
+_render_cache = None
+
+
+def get_render_cache() -> RenderCache:
+    """
+    Get the global RenderCache instance
+
+    Returns:
+        RenderCache: The global render cache instance
+    """
+    global _render_cache
+    if _render_cache is None:
+        _render_cache = RenderCache()
+    return _render_cache
@@ -18,6 +18,7 @@ except Exception:
     pass
 
 from src.utils.logger import Logger
+from .refresh_scheduler import get_refresh_scheduler, RefreshPriority
 
 
 def retry_on_error(max_retries: int = 3, delay_ms: int = 100):
@@ -222,9 +223,12 @@ class SignalCoordinator(QObject):
             'projects': [],
             'notes': []
         }
-        self._batch_timer = QTimer()
-        self._batch_timer.timeout.connect(self._process_batch_updates)
-        self._batch_timer.setInterval(100)  # 100ms delay for batching
+        # Batches are flushed by the shared scheduler, ahead of page
+        # refreshes due at the same time
+        self._batch_job = get_refresh_scheduler().register(
+            "signal_batch_updates", self._process_batch_updates,
+            priority=RefreshPriority.HIGH, owner=self
+        )
         
         # Error handling and circuit breaker
         self._error_count = 0
@@ -355,6 +359,23 @@ class SignalCoordinator(QObject):
                             'filter'
                         )
                     )
+            
+            # Pages that can refresh single artifacts get batch updates
+            # instead of reloading everything
+            if hasattr(page_widget, 'apply_artifact_updates'):
+                self.artifacts_batch_updated.connect(
+                    lambda ids: self._safe_handler(
+                        lambda: self._apply_artifact_updates(page_id, ids),
+                        'update'
+                    )
+                )
+            if hasattr(page_widget, 'apply_project_updates'):
+                self.projects_batch_updated.connect(
+                    lambda ids: self._safe_handler(
+                        lambda: self._apply_project_updates(page_id, ids),
+                        'update'
+                    )
+                )
                     
         except Exception as e:
             self.logger.error(f"Failed to connect signals for {page_id}: {str(e)}")
@@ -490,17 +511,15 @@ class SignalCoordinator(QObject):
             if item_id not in self._pending_batch_updates[update_type]:
                 self._pending_batch_updates[update_type].append(item_id)
 
-            # Ensure batch processing runs on next event loop turn
-            # Using 0ms guarantees prompt coalescing of multiple updates
-            self._batch_timer.start(0)
+            # Batch processing runs on the next event loop turn, once
+            # for all updates queued until then
+            self._batch_job.request()
                 
     @Slot()
     @retry_on_error(max_retries=1, delay_ms=50)
     def _process_batch_updates(self):
         """Process pending batch updates with error handling"""
         try:
-            self._batch_timer.stop()
-            
             # Process each type
             if self._pending_batch_updates['artifacts']:
                 unique_ids = list(set(self._pending_batch_updates['artifacts']))
@@ -521,6 +540,28 @@ class SignalCoordinator(QObject):
             self.logger.error(f"Batch update processing failed: {str(e)}")
             self._record_error('batch_update', str(e))
             
+    def _apply_artifact_updates(self, page_id: str, artifact_ids: List[str]):
+        """Pass batched artifact updates to a registered page
+        
+        Args:
+            page_id: The page to update
+            artifact_ids: The artifacts that changed
+        """
+        page_widget = self.pages.get(page_id)
+        if page_widget is not None:
+            page_widget.apply_artifact_updates(artifact_ids)
+            
+    def _apply_project_updates(self, page_id: str, project_ids: List[str]):
+        """Pass batched project updates to a registered page
+        
+        Args:
+            page_id: The page to update
+            project_ids: The projects that changed
+        """
+        page_widget = self.pages.get(page_id)
+        if page_widget is not None:
+            page_widget.apply_project_updates(project_ids)
+            
     def emit_artifact_linked(self, artifact_id: str, project_id: str):
         """Emit artifact linked signal
         
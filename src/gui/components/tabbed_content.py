@@ -620,6 +620,13 @@ class TabbedContentWidget(QWidget):
         """
         return self.chat_tab
     
+    def cleanup_pages(self):
+        """Let pages stop their background work before the app exits"""
+        for index in range(self.tab_widget.count()):
+            page = self.tab_widget.widget(index)
+            if hasattr(page, 'cleanup'):
+                page.cleanup()
+    
     def _register_page_with_coordinator(self, page_id: str,
                                         page_widget: QWidget):
         """Register a page with the signal coordinator
@@ -1024,6 +1024,12 @@ class MainWindow(QMainWindow):
             window_state_manager.save_zoom_level(
                 self._scaling_helper.get_current_zoom_level()
             )
+            # Finish writing chat messages still queued for the database
+            chat_tab = self.tabbed_content.get_chat_tab()
+            if chat_tab:
+                chat_tab.shutdown()
+            # Wait for page workers so no QThread outlives its page
+            self.tabbed_content.cleanup_pages()
             event.accept()
     
     def register_agent(self, name: str, agent):
@@ -13,7 +13,7 @@ from PySide6.QtWidgets import (
     QCheckBox, QComboBox, QSpinBox, QDateEdit, QDialogButtonBox,
     QGroupBox
 )
-from PySide6.QtCore import Qt, QDate, QTime, Signal, QTimer
+from PySide6.QtCore import Qt, QDate, QTime, Signal
 from PySide6.QtGui import (
     QAction, QKeySequence, QShortcut, QTextCharFormat, QColor
 )
@@ -34,6 +34,9 @@ except ImportError:
     from utils.window_state import window_state_manager
 from ..components.tag_input_widget import TagInputWidget
 from ..components.project_combo_box import ProjectComboBox
+from ..components.refresh_scheduler import (
+    get_refresh_scheduler, RefreshPriority
+)
 
 
 class EventListItem(QListWidgetItem):
@@ -549,10 +552,17 @@ class AppointmentsPage(QWidget):
         self._event_dates: Dict[date, int] = {}  # Date to event count mapping
         self._current_project_filter: Optional[str] = None
         self._scaling_helper = get_scaling_helper()
-        self._refresh_timer = QTimer()
-        self._refresh_timer.timeout.connect(self._refresh_calendar)
-        self._refresh_timer.setInterval(60000)  # Refresh every minute
-        self._refresh_timer.start()
+        
+        # Periodic refreshes, run by the shared scheduler. Reminders are
+        # due whether or not the page is shown.
+        scheduler = get_refresh_scheduler()
+        self._refresh_job = scheduler.register(
+            "calendar", self._refresh_calendar, 60000, owner=self
+        )
+        self._reminder_job = scheduler.register(
+            "reminders", self._scheduled_reminders, 60000,
+            priority=RefreshPriority.HIGH, owner=self, run_hidden=True
+        )
         
         self.setup_ui()
         self._load_events()
@@ -1544,45 +1554,62 @@ class AppointmentsPage(QWidget):
         # Update "today" highlighting
         self.calendar.setSelectedDate(self.calendar.selectedDate())
         
-        # Check for upcoming reminders
-        self._check_reminders()
-        
     def _check_reminders(self):
         """Check for events that need reminders"""
         try:
-            # Get upcoming events
-            # Get upcoming events for next 24 hours
-            today = datetime.now().date()
-            tomorrow = today + timedelta(days=1)
-            upcoming = self.appointments_db.get_events_for_date_range(
-                today,
-                tomorrow
-            )
+            self._show_reminders(self._collect_due_reminders())
+        except Exception as e:
+            self.logger.error(f"Failed to check reminders: {str(e)}")
             
-            for event in upcoming:
-                if event.reminder_minutes_before and not event.reminder_sent:
-                    event_datetime = event.get_datetime()
-                    if event_datetime:
-                        reminder_time = event_datetime - timedelta(
-                            minutes=event.reminder_minutes_before
-                        )
-                        
-                        if datetime.now() >= reminder_time:
-                            # Show reminder (placeholder)
-                            self.logger.info(
-                                f"Reminder: {event.title} at "
-                                f"{event_datetime.strftime('%I:%M %p')}"
-                            )
-                            
-                            # Mark reminder as sent
-                            self.appointments_db.update_event(
-                                event.id,
-                                {"reminder_sent": True}
-                            )
-                            
+    def _scheduled_reminders(self):
+        """Periodic reminder check, reading events on a worker"""
+        try:
+            due = yield self._collect_due_reminders
+            self._show_reminders(due)
         except Exception as e:
             self.logger.error(f"Failed to check reminders: {str(e)}")
             
+    def _collect_due_reminders(self):
+        """Find events whose reminder is due and mark them sent
+        
+        Returns:
+            List of (title, event datetime) of the reminders to show
+        """
+        # Get upcoming events for next 24 hours
+        today = datetime.now().date()
+        tomorrow = today + timedelta(days=1)
+        upcoming = self.appointments_db.get_events_for_date_range(
+            today,
+            tomorrow
+        )
+        
+        due = []
+        for event in upcoming:
+            if event.reminder_minutes_before and not event.reminder_sent:
+                event_datetime = event.get_datetime()
+                if event_datetime:
+                    reminder_time = event_datetime - timedelta(
+                        minutes=event.reminder_minutes_before
+                    )
+                    
+                    if datetime.now() >= reminder_time:
+                        due.append((event.title, event_datetime))
+                        
+                        # Mark reminder as sent
+                        self.appointments_db.update_event(
+                            event.id,
+                            {"reminder_sent": True}
+                        )
+        return due
+        
+    def _show_reminders(self, due):
+        """Show due reminders (placeholder)"""
+        for title, event_datetime in due:
+            self.logger.info(
+                f"Reminder: {title} at "
+                f"{event_datetime.strftime('%I:%M %p')}"
+            )
+            
     def _update_splitter_sizes(self):
         """Set splitter proportions based on window width"""
         total_width = self.width()
@@ -9,13 +9,13 @@ from pathlib import Path
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QSplitter,
     QToolBar, QMessageBox, QLabel, QPushButton, QFrame,
-    QMenu, QTreeWidget, QTreeWidgetItem, QLineEdit,
+    QMenu, QTreeView, QLineEdit,
     QDialog, QFormLayout, QTextEdit, QComboBox,
     QDialogButtonBox, QGroupBox, QCheckBox,
     QTabWidget, QListWidget, QListWidgetItem, QFileDialog,
     QPlainTextEdit
 )
-from PySide6.QtCore import Qt, Signal, QTimer
+from PySide6.QtCore import Qt, Signal, QModelIndex
 from PySide6.QtGui import (
     QAction, QKeySequence, QShortcut, QDragEnterEvent, QDropEvent,
     QDragMoveEvent
@@ -55,6 +55,10 @@ except ImportError:
     from utils.window_state import window_state_manager
 from ..components.tag_input_widget import TagInputWidget
 from ..components.project_combo_box import ProjectComboBox
+from ..components.artifact_tree_model import ArtifactTreeModel, ARTIFACT_ICONS
+from ..components.refresh_scheduler import (
+    get_refresh_scheduler, RefreshPriority
+)
 try:
     from src.tools.artifacts_service import ArtifactsService
     from src.tools.projects_service import ProjectsService
@@ -680,14 +684,14 @@ class ArtifactsPage(QWidget):
         self._projects_cache: Dict[str, Any] = {}  # Cache project info
         self._scaling_helper = get_scaling_helper()
         
-        # Refresh timer
-        self._refresh_timer = QTimer()
-        self._refresh_timer.timeout.connect(self._refresh_artifacts)
-        self._refresh_timer.setInterval(300000)  # Refresh every 5 minutes
-        self._refresh_timer.start()
+        # Periodic refresh, run by the shared scheduler
+        self._refresh_job = get_refresh_scheduler().register(
+            "artifacts", self._scheduled_refresh, 300000,
+            priority=RefreshPriority.LOW, owner=self
+        )
         
         self.setup_ui()
-        self._load_collections()
+        self._load_collections(update_tree=False)
         self._load_projects_cache()
         self._load_artifacts()
         
@@ -955,33 +959,49 @@ class ArtifactsPage(QWidget):
         header.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(header)
         
-        # Tree widget
-        self.artifact_tree = QTreeWidget()
+        # Tree view; artifacts are fetched a page at a time as collections
+        # are expanded
+        self.artifact_model = ArtifactTreeModel(
+            lambda collection_id, after, limit:
+                self.artifacts_db.get_artifact_tree_rows(
+                    project_id=self._current_project_filter,
+                    collection_id=collection_id, after=after, limit=limit
+                ),
+            lambda artifact_id: self.artifacts_db.get_artifact(
+                artifact_id, update_accessed=False
+            ),
+            self
+        )
+        self.artifact_tree = QTreeView()
+        self.artifact_tree.setModel(self.artifact_model)
         self.artifact_tree.setHeaderHidden(True)
+        self.artifact_tree.setUniformRowHeights(True)
         self.artifact_tree.setAcceptDrops(True)
-        self.artifact_tree.setDragDropMode(QTreeWidget.DragDropMode.InternalMove)
+        self.artifact_tree.setDragDropMode(QTreeView.DragDropMode.InternalMove)
         self.artifact_tree.setStyleSheet(f"""
-            QTreeWidget {{
+            QTreeView {{
                 background-color: {DinoPitColors.MAIN_BACKGROUND};
                 border: 1px solid {DinoPitColors.SOFT_ORANGE};
                 border-radius: 0 0 5px 5px;
             }}
-            QTreeWidget::item {{
+            QTreeView::item {{
                 color: {DinoPitColors.PRIMARY_TEXT};
                 padding: 5px;
             }}
-            QTreeWidget::item:selected {{
+            QTreeView::item:selected {{
                 background-color: {DinoPitColors.DINOPIT_ORANGE};
                 color: white;
             }}
-            QTreeWidget::item:hover {{
+            QTreeView::item:hover {{
                 background-color: {DinoPitColors.PANEL_BACKGROUND};
             }}
         """)
         
         # Connect signals
-        self.artifact_tree.itemSelectionChanged.connect(self._on_tree_selection_changed)
-        self.artifact_tree.itemDoubleClicked.connect(self._on_tree_item_double_clicked)
+        self.artifact_tree.selectionModel().selectionChanged.connect(
+            self._on_tree_selection_changed
+        )
+        self.artifact_tree.doubleClicked.connect(self._on_tree_item_double_clicked)
         self.artifact_tree.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.artifact_tree.customContextMenuRequested.connect(self._show_tree_context_menu)
         
@@ -1166,32 +1186,14 @@ class ArtifactsPage(QWidget):
         Args:
             artifact_id: The artifact ID to navigate to
         """
-        # Find the artifact in the tree
-        def find_item(parent_item, target_id):
-            for i in range(parent_item.childCount()):
-                child = parent_item.child(i)
-                data = child.data(0, Qt.ItemDataRole.UserRole)
-                if data and data.get('type') == 'artifact':
-                    if data.get('id') == target_id:
-                        return child
-                # Recursively search children
-                result = find_item(child, target_id)
-                if result:
-                    return result
-            return None
-        
-        # Search from root
-        item = find_item(self.artifact_tree.invisibleRootItem(),
-                         artifact_id)
-        if item:
-            # Select the item
-            self.artifact_tree.setCurrentItem(item)
-            self.artifact_tree.scrollToItem(item)
+        # Find the artifact under "All Artifacts", loading rows up to it
+        index = self.artifact_model.index_for_artifact(artifact_id)
+        if index.isValid():
             # Ensure it's visible by expanding parents
-            parent = item.parent()
-            while parent:
-                parent.setExpanded(True)
-                parent = parent.parent()
+            self.artifact_tree.expand(index.parent())
+            # Select the item
+            self.artifact_tree.setCurrentIndex(index)
+            self.artifact_tree.scrollTo(index)
     
     def _view_project(self):
         """View the current artifact's project"""
@@ -1200,17 +1202,26 @@ class ArtifactsPage(QWidget):
                 self._current_artifact.project_id
             )
         
-    def _load_collections(self):
-        """Load all collections"""
+    def _load_collections(self, update_tree: bool = True):
+        """Load all collections
+        
+        Args:
+            update_tree: Rebuild the tree; callers about to reload the
+                artifacts anyway pass False
+        """
         try:
-            if getattr(self, 'artifacts_service', None):
-                self._collections_cache = self.artifacts_service.get_collections()
-            else:
-                self._collections_cache = self.artifacts_db.get_collections()
-            self._update_tree()
+            self._collections_cache = self._fetch_collections()
+            if update_tree:
+                self._update_tree()
         except Exception as e:
             self.logger.error(f"Failed to load collections: {str(e)}")
     
+    def _fetch_collections(self) -> List[ArtifactCollection]:
+        """Read all collections"""
+        if getattr(self, 'artifacts_service', None):
+            return self.artifacts_service.get_collections()
+        return self.artifacts_db.get_collections()
+    
     def _load_projects_cache(self):
         """Load project information for badges"""
         try:
@@ -1219,131 +1230,69 @@ class ArtifactsPage(QWidget):
             else:
                 projects = self.projects_db.get_all_projects()
             self._projects_cache = {p.id: p for p in projects}
+            self.artifact_model.set_projects(self._projects_cache)
         except Exception as e:
             self.logger.error(f"Failed to load projects cache: {str(e)}")
             
     def _load_artifacts(self):
         """Load all artifacts"""
         try:
-            # Apply project filter if active
-            if self._current_project_filter:
-                if getattr(self, 'artifacts_service', None):
-                    artifacts = self.artifacts_service.get_artifacts_by_project(
-                        self._current_project_filter
-                    )
-                else:
-                    artifacts = self.artifacts_db.get_artifacts_by_project(
-                        self._current_project_filter
-                    )
-            else:
-                # For now, search with empty query to get all artifacts
-                if getattr(self, 'artifacts_service', None):
-                    artifacts = self.artifacts_service.get_all_artifacts(limit=1000)
-                else:
-                    artifacts = self.artifacts_db.search_artifacts("", limit=1000)
             self._update_tree()
             self._update_stats()
         except Exception as e:
             self.logger.error(f"Failed to load artifacts: {str(e)}")
             
-    def _update_tree(self):
-        """Update the tree view with collections and artifacts"""
-        self.artifact_tree.clear()
-        
-        # Create root items
-        self.all_artifacts_item = QTreeWidgetItem(["All Artifacts"])
-        self.all_artifacts_item.setData(0, Qt.ItemDataRole.UserRole, {"type": "all"})
-        self.artifact_tree.addTopLevelItem(self.all_artifacts_item)
-        
-        # Add collections
-        collection_items = {}
-        for collection in self._collections_cache:
-            item = QTreeWidgetItem([f"📁 {collection.name}"])
-            item.setData(0, Qt.ItemDataRole.UserRole, {
-                "type": "collection",
-                "id": collection.id,
-                "collection": collection
-            })
-            collection_items[collection.id] = item
-            
-            if collection.parent_id and collection.parent_id in collection_items:
-                collection_items[collection.parent_id].addChild(item)
-            else:
-                self.artifact_tree.addTopLevelItem(item)
-                
-        # Add artifacts to collections and all artifacts
-        if self._current_project_filter:
-            if getattr(self, 'artifacts_service', None):
-                artifacts = self.artifacts_service.get_artifacts_by_project(
-                    self._current_project_filter
-                )
-            else:
-                artifacts = self.artifacts_db.get_artifacts_by_project(
-                    self._current_project_filter
-                )
-        else:
-            if getattr(self, 'artifacts_service', None):
-                artifacts = self.artifacts_service.get_all_artifacts(limit=1000)
-            else:
-                artifacts = self.artifacts_db.search_artifacts("", limit=1000)
+    def _update_tree(self, counts: Optional[Dict[str, int]] = None):
+        """Update the tree view with collections and artifacts
+        
+        Only the artifact count of each collection (within the project
+        filter, if any) is queried here, unless counts were fetched
+        already; the model fetches artifacts as collections are expanded.
+        """
+        if counts is None:
+            counts = self.artifacts_db.get_artifact_tree_counts(
+                project_id=self._current_project_filter
+            )
+        self.artifact_model.load(
+            self._collections_cache, counts, self._projects_cache
+        )
         
-        for artifact in artifacts:
-            # Create artifact item
-            icon = self._get_artifact_icon(artifact.content_type)
-            item_text = f"{icon} {artifact.name}"
-            
-            # Add project badge if artifact has a project
-            if hasattr(artifact, 'project_id') and artifact.project_id:
-                project = self._projects_cache.get(artifact.project_id)
-                if project:
-                    # Add project icon and name as a badge
-                    project_icon = project.get_display_icon()
-                    item_text += f" [{project_icon} {project.name}]"
-            
-            # Add lock icon if encrypted
-            if artifact.is_encrypted():
-                item_text += " 🔒"
-                
-            artifact_item = QTreeWidgetItem([item_text])
-            artifact_item.setData(0, Qt.ItemDataRole.UserRole, {
-                "type": "artifact",
-                "id": artifact.id,
-                "artifact": artifact
-            })
-            
-            # Apply project color if available
-            if hasattr(artifact, 'project_id') and artifact.project_id:
-                project = self._projects_cache.get(artifact.project_id)
-                if project and project.color:
-                    from PySide6.QtGui import QBrush, QColor
-                    brush = QBrush(QColor(project.color))
-                    artifact_item.setForeground(0, brush)
-            
-            # Add to appropriate collection
-            if artifact.collection_id and artifact.collection_id in collection_items:
-                collection_items[artifact.collection_id].addChild(artifact_item.clone())
-                
-            # Always add to all artifacts
-            self.all_artifacts_item.addChild(artifact_item)
-            
         # Expand all artifacts by default
-        self.all_artifacts_item.setExpanded(True)
+        self.artifact_tree.expand(self.artifact_model.all_artifacts_index())
+        
+    def apply_artifact_updates(self, artifact_ids: List[str]):
+        """Refresh just the given artifacts in the tree
+        
+        Connected to SignalCoordinator.artifacts_batch_updated, and used
+        after changes made on this page, instead of reloading everything.
+        
+        Args:
+            artifact_ids: IDs of created, changed or deleted artifacts
+        """
+        if not artifact_ids:
+            return
+        try:
+            rows = self.artifacts_db.get_artifact_tree_rows(
+                project_id=self._current_project_filter,
+                artifact_ids=list(artifact_ids)
+            )
+            counts = self.artifacts_db.get_artifact_tree_counts(
+                project_id=self._current_project_filter
+            )
+            self.artifact_model.apply_updates(artifact_ids, rows, counts)
+            self._update_stats()
+        except Exception as e:
+            self.logger.error(f"Failed to update artifacts: {str(e)}")
         
     def _get_artifact_icon(self, content_type: str) -> str:
         """Get icon for artifact type"""
-        icons = {
-            ArtifactType.TEXT.value: "📄",
-            ArtifactType.DOCUMENT.value: "📋",
-            ArtifactType.IMAGE.value: "🖼️",
-            ArtifactType.CODE.value: "💻",
-            ArtifactType.BINARY.value: "📦"
-        }
-        return icons.get(content_type, "📄")
-        
-    def _update_stats(self):
+        return ARTIFACT_ICONS.get(content_type, "📄")
+        
+    def _update_stats(self, stats: Optional[Dict[str, Any]] = None):
         """Update statistics display"""
         try:
-            stats = self.artifacts_db.get_artifact_statistics()
+            if stats is None:
+                stats = self.artifacts_db.get_artifact_statistics()
             total = stats.get('total_artifacts', 0)
             size = stats.get('total_size_mb', 0)
             
@@ -1352,13 +1301,13 @@ class ArtifactsPage(QWidget):
         except Exception as e:
             self.logger.error(f"Failed to update stats: {str(e)}")
             
-    def _on_tree_selection_changed(self):
+    def _on_tree_selection_changed(self, *args):
         """Handle tree selection change"""
-        selected_items = self.artifact_tree.selectedItems()
+        selected_items = self.artifact_tree.selectionModel().selectedIndexes()
         
         if selected_items:
             item = selected_items[0]
-            data = item.data(0, Qt.ItemDataRole.UserRole)
+            data = item.data(Qt.ItemDataRole.UserRole)
             
             if data and data.get('type') == 'artifact':
                 self._current_artifact = data.get('artifact')
@@ -1394,16 +1343,16 @@ class ArtifactsPage(QWidget):
                 
         if selected_items:
             item = selected_items[0]
-            data = item.data(0, Qt.ItemDataRole.UserRole)
+            data = item.data(Qt.ItemDataRole.UserRole)
             
             if data and data.get('type') == 'collection':
                 self._current_collection = data.get('id')
             else:
                 self._current_collection = None
                     
-    def _on_tree_item_double_clicked(self, item: QTreeWidgetItem):
+    def _on_tree_item_double_clicked(self, item: QModelIndex):
         """Handle tree item double-click"""
-        data = item.data(0, Qt.ItemDataRole.UserRole)
+        data = item.data(Qt.ItemDataRole.UserRole)
         
         if data and data.get('type') == 'artifact':
             self._current_artifact = data.get('artifact')
@@ -1527,7 +1476,7 @@ class ArtifactsPage(QWidget):
                         except Exception:
                             pass
                     # Refresh displays
-                    self._load_artifacts()
+                    self.apply_artifact_updates([artifact.id])
                     
                     # TODO: Select the new artifact in tree
                 else:
@@ -1598,7 +1547,7 @@ class ArtifactsPage(QWidget):
                         except Exception:
                             pass
                     # Refresh displays
-                    self._load_artifacts()
+                    self.apply_artifact_updates([updated_artifact.id])
                     self._show_artifact_details(updated_artifact)
                     
                     # Emit project change signal if project changed
@@ -1654,11 +1603,12 @@ class ArtifactsPage(QWidget):
                         except Exception:
                             pass
                     # Clear selection
+                    deleted_id = self._current_artifact.id
                     self._current_artifact = None
                     self._clear_artifact_details()
                     
                     # Refresh displays
-                    self._load_artifacts()
+                    self.apply_artifact_updates([deleted_id])
                 else:
                     raise Exception("Failed to delete artifact")
                     
@@ -1824,11 +1774,11 @@ class ArtifactsPage(QWidget):
         
     def _show_tree_context_menu(self, position):
         """Show context menu for tree items"""
-        item = self.artifact_tree.itemAt(position)
-        if not item:
+        item = self.artifact_tree.indexAt(position)
+        if not item.isValid():
             return
             
-        data = item.data(0, Qt.ItemDataRole.UserRole)
+        data = item.data(Qt.ItemDataRole.UserRole)
         if not data:
             return
             
@@ -1922,7 +1872,7 @@ class ArtifactsPage(QWidget):
                         self.artifacts_service.invalidate_cache()
                     except Exception:
                         pass
-                self._load_artifacts()
+                self.apply_artifact_updates([new_artifact.id])
             else:
                 raise Exception(result.get("error", "Unknown error"))
                 
@@ -2050,7 +2000,7 @@ class ArtifactsPage(QWidget):
                             self.artifacts_service.invalidate_cache()
                         except Exception:
                             pass
-                    self._load_artifacts()
+                    self.apply_artifact_updates([self._current_artifact.id])
                     
                     # Refresh current artifact details
                     self._current_artifact = self.artifacts_db.get_artifact(
@@ -2071,9 +2021,25 @@ class ArtifactsPage(QWidget):
                 
     def _refresh_artifacts(self):
         """Refresh artifacts display"""
-        self._load_collections()
+        self._load_collections(update_tree=False)
         self._load_artifacts()
         
+    def _scheduled_refresh(self):
+        """Periodic refresh: collections, counts and statistics are read
+        on a worker, then the tree is reloaded in one step"""
+        project_filter = self._current_project_filter
+        collections, counts, stats = yield lambda: (
+            self._fetch_collections(),
+            self.artifacts_db.get_artifact_tree_counts(project_id=project_filter),
+            self.artifacts_db.get_artifact_statistics()
+        )
+        if project_filter != self._current_project_filter:
+            # The filter changed meanwhile and reloaded the tree itself
+            return
+        self._collections_cache = collections
+        self._update_tree(counts)
+        self._update_stats(stats)
+        
     def _format_size(self, size_bytes: int) -> str:
         """Format file size"""
         if size_bytes == 0:
@@ -929,8 +929,8 @@ class ModelPage(QWidget):
         logger.info(f"[ModelPage] _refresh_models: Clearing combo box (had {self.model_combo.count()} items)")
         self.model_combo.clear()
         
-        # Get models from wrapper
-        models = self.ollama_wrapper.list_models()
+        # Get models from wrapper, bypassing its cached list
+        models = self.ollama_wrapper.list_models(refresh=True)
         logger.info(f"[ModelPage] _refresh_models: Got {len(models)} models from wrapper")
         
         # Add placeholder if no models
@@ -7,12 +7,14 @@ from datetime import datetime
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QSplitter,
     QToolBar, QMessageBox, QLabel, QPushButton, QFrame,
-    QMenu, QTreeWidget, QTreeWidgetItem, QTabWidget,
+    QMenu, QTreeView, QTabWidget,
     QListWidget, QListWidgetItem, QDialog, QFormLayout,
     QLineEdit, QTextEdit, QComboBox, QDialogButtonBox,
     QColorDialog, QGroupBox, QGridLayout
 )
-from PySide6.QtCore import Qt, Signal, QTimer, QMimeData, QByteArray
+from PySide6.QtCore import (
+    Qt, Signal, QMimeData, QByteArray, QModelIndex
+)
 from PySide6.QtGui import (
     QAction, QKeySequence, QShortcut, QColor, QIcon,
     QDragEnterEvent, QDropEvent, QDragMoveEvent
@@ -56,6 +58,9 @@ except ImportError:
     from utils.scaling import get_scaling_helper
     from utils.window_state import window_state_manager
 from ..components.tag_input_widget import TagInputWidget
+from ..components.project_tree_model import ProjectTreeModel
+from ..components.project_details_loader import ProjectDetailsLoader
+from ..components.refresh_scheduler import get_refresh_scheduler
 try:
     from src.tools.projects_service import ProjectsService
     from src.tools.notes_service import NotesService
@@ -540,15 +545,22 @@ class ProjectsPage(QWidget):
             from database.appointments_db import AppointmentsDatabase
         self.appointments_db = AppointmentsDatabase(db_manager)
         
+        # Statistics and linked items are fetched off the UI thread
+        self.details_loader = ProjectDetailsLoader(
+            self.projects_db, self.notes_db, self.artifacts_db,
+            self.appointments_db, self
+        )
+        self.details_loader.details_loaded.connect(self._on_details_loaded)
+        
         self._current_project: Optional[Project] = None
+        # Full projects loaded so far; the tree only holds light rows
         self._projects_cache: Dict[str, Project] = {}
         self._scaling_helper = get_scaling_helper()
         
-        # Refresh timer
-        self._refresh_timer = QTimer()
-        self._refresh_timer.timeout.connect(self._refresh_projects)
-        self._refresh_timer.setInterval(300000)  # Refresh every 5 minutes
-        self._refresh_timer.start()
+        # Periodic refresh, run by the shared scheduler
+        self._refresh_job = get_refresh_scheduler().register(
+            "projects", self._scheduled_refresh, 300000, owner=self
+        )
         
         self.setup_ui()
         self._load_projects()
@@ -713,33 +725,38 @@ class ProjectsPage(QWidget):
         header.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(header)
         
-        # Project tree
-        self.project_tree = QTreeWidget()
+        # Project tree; subprojects are fetched as projects are expanded
+        self.project_model = ProjectTreeModel(
+            self.projects_db.get_project_tree_rows, self
+        )
+        self.project_tree = QTreeView()
         self.project_tree.setHeaderHidden(True)
-        self.project_tree.setAcceptDrops(True)
-        self.project_tree.setDragDropMode(QTreeWidget.DragDropMode.InternalMove)
+        self.project_tree.setUniformRowHeights(True)
+        self.project_tree.setModel(self.project_model)
         self.project_tree.setStyleSheet(f"""
-            QTreeWidget {{
+            QTreeView {{
                 background-color: {DinoPitColors.MAIN_BACKGROUND};
                 border: 1px solid {DinoPitColors.SOFT_ORANGE};
                 border-radius: 0 0 5px 5px;
             }}
-            QTreeWidget::item {{
+            QTreeView::item {{
                 color: {DinoPitColors.PRIMARY_TEXT};
                 padding: 8px;
             }}
-            QTreeWidget::item:selected {{
+            QTreeView::item:selected {{
                 background-color: {DinoPitColors.DINOPIT_ORANGE};
                 color: white;
             }}
-            QTreeWidget::item:hover {{
+            QTreeView::item:hover {{
                 background-color: {DinoPitColors.PANEL_BACKGROUND};
             }}
         """)
         
         # Connect signals
-        self.project_tree.itemSelectionChanged.connect(self._on_tree_selection_changed)
-        self.project_tree.itemDoubleClicked.connect(self._on_tree_item_double_clicked)
+        self.project_tree.selectionModel().selectionChanged.connect(
+            self._on_tree_selection_changed
+        )
+        self.project_tree.doubleClicked.connect(self._on_tree_item_double_clicked)
         self.project_tree.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.project_tree.customContextMenuRequested.connect(self._show_tree_context_menu)
         
@@ -1047,34 +1064,24 @@ class ProjectsPage(QWidget):
         return panel
         
     def _load_projects(self):
-        """Load all projects from database"""
+        """Load the root projects, keeping expanded projects and the
+        selection"""
         try:
             self._projects_cache.clear()
-            self.project_tree.clear()
             
-            # Get all projects
-            if getattr(self, 'projects_service', None):
-                projects = self.projects_service.get_projects(filter_active_only=False)
+            search_text = self.search_input.text()
+            if search_text:
+                self._filter_projects(search_text)
             else:
-                projects = self.projects_db.get_all_projects()
-            
-            # Build project cache
-            for project in projects:
-                self._projects_cache[project.id] = project
-                
-            # Build tree hierarchy
-            root_projects = [p for p in projects if not p.parent_project_id]
-            
-            # Create tree items
-            for project in root_projects:
-                self._add_project_to_tree(project, self.project_tree)
-                
-            # Update count
-            self.count_label.setText(f"{len(projects)} project{'s' if len(projects) != 1 else ''}")
-            
-            # Expand all items by default
-            self.project_tree.expandAll()
+                expanded = self._expanded_project_ids()
+                self._reset_tree(self.project_model.load)
+                for project_id in expanded:
+                    index = self.project_model.index_for_project(project_id)
+                    if index.isValid():
+                        self.project_tree.expand(index)
             
+            self._update_count_label()
+        
         except Exception as e:
             self.logger.error(f"Failed to load projects: {str(e)}")
             QMessageBox.critical(
@@ -1082,45 +1089,93 @@ class ProjectsPage(QWidget):
                 "Error",
                 f"Failed to load projects: {str(e)}"
             )
+    
+    def _reset_tree(self, reset):
+        """Rebuild the tree through reset and select the current
+        project again if it is still shown"""
+        selected = self._current_project.id if self._current_project else None
+        reset()
+        if selected:
+            self._select_project_in_tree(selected)
+        if not self.project_tree.selectionModel().hasSelection() and \
+                self._current_project:
+            # A reset clears the selection without notifying
+            self._current_project = None
+            self._clear_project_details()
+    
+    def _expanded_project_ids(self) -> List[str]:
+        """Ids of expanded projects, parents before their children"""
+        expanded = []
+        pending = [QModelIndex()]
+        while pending:
+            parent = pending.pop()
+            for row in range(self.project_model.rowCount(parent)):
+                index = self.project_model.index(row, 0, parent)
+                if self.project_tree.isExpanded(index):
+                    expanded.append(index.data(Qt.ItemDataRole.UserRole))
+                    pending.append(index)
+        return expanded
+    
+    def _update_count_label(self, count: Optional[int] = None):
+        """Show the number of projects in the toolbar"""
+        if count is None:
+            count = self.projects_db.get_project_count()
+        self.count_label.setText(f"{count} project{'s' if count != 1 else ''}")
+    
+    def _get_project(self, project_id: str) -> Optional[Project]:
+        """Get a full project, loading it on first use"""
+        project = self._projects_cache.get(project_id)
+        if project is None:
+            project = self.projects_db.get_project(project_id)
+            if project is not None:
+                self._projects_cache[project_id] = project
+        return project
+    
+    def _all_projects(self) -> List[Project]:
+        """All projects, for the parent choices of the project dialog"""
+        if getattr(self, 'projects_service', None):
+            return self.projects_service.get_projects(filter_active_only=False)
+        return self.projects_db.get_all_projects()
+    
+    def apply_project_updates(self, project_ids: List[str]):
+        """Show changes to a few projects without reloading the tree
+        
+        Args:
+            project_ids: Projects that were created, changed or deleted
+        """
+        try:
+            for project_id in project_ids:
+                self._projects_cache.pop(project_id, None)
             
-    def _add_project_to_tree(self, project: Project, parent_item):
-        """Add project to tree recursively"""
-        # Create tree item
-        item_text = f"{project.get_display_icon()} {project.name}"
-        if project.status != ProjectStatus.ACTIVE.value:
-            item_text += f" ({project.get_status_display()})"
-            
-        if isinstance(parent_item, QTreeWidget):
-            item = QTreeWidgetItem([item_text])
-            parent_item.addTopLevelItem(item)
-        else:
-            item = QTreeWidgetItem(parent_item, [item_text])
-            
-        # Store project reference
-        item.setData(0, Qt.ItemDataRole.UserRole, project.id)
-        
-        # Set color if specified
-        if project.color:
-            from PySide6.QtGui import QBrush
-            brush = QBrush(QColor(project.color))
-            item.setForeground(0, brush)
-            
-        # Add children recursively
-        children = [p for p in self._projects_cache.values() 
-                    if p.parent_project_id == project.id]
-        for child in children:
-            self._add_project_to_tree(child, item)
+            search_text = self.search_input.text()
+            if search_text:
+                # Changed projects may start or stop matching the search
+                self._filter_projects(search_text)
+            else:
+                self.project_model.apply_updates(project_ids)
+            self._update_count_label()
             
-    def _on_tree_selection_changed(self):
+            # Refresh the details of the selected project
+            if self._current_project and \
+                    self._current_project.id in project_ids:
+                project = self._get_project(self._current_project.id)
+                if project:
+                    self._current_project = project
+                    self._show_project_details(project)
+        
+        except Exception as e:
+            self.logger.error(f"Failed to apply project updates: {str(e)}")
+    
+    def _on_tree_selection_changed(self, *args):
         """Handle project selection in tree"""
-        selected_items = self.project_tree.selectedItems()
+        selected = self.project_tree.selectionModel().selectedIndexes()
         
-        if selected_items:
-            item = selected_items[0]
-            project_id = item.data(0, Qt.ItemDataRole.UserRole)
+        if selected:
+            project_id = selected[0].data(Qt.ItemDataRole.UserRole)
+            project = self._get_project(project_id) if project_id else None
             
-            if project_id and project_id in self._projects_cache:
-                self._current_project = self._projects_cache[project_id]
+            if project:
+                self._current_project = project
                 self._show_project_details(self._current_project)
                 
                 # Enable actions
@@ -1138,11 +1193,12 @@ class ProjectsPage(QWidget):
             self._current_project = None
             self._clear_project_details()
             
-    def _on_tree_item_double_clicked(self, item: QTreeWidgetItem):
+    def _on_tree_item_double_clicked(self, index: QModelIndex):
         """Handle tree item double-click"""
-        project_id = item.data(0, Qt.ItemDataRole.UserRole)
-        if project_id and project_id in self._projects_cache:
-            self._current_project = self._projects_cache[project_id]
+        project_id = index.data(Qt.ItemDataRole.UserRole)
+        project = self._get_project(project_id) if project_id else None
+        if project:
+            self._current_project = project
             self._edit_project()
             
     def _show_project_details(self, project: Project):
@@ -1155,8 +1211,10 @@ class ProjectsPage(QWidget):
         self.info_labels['description'].setText(project.description or "No description")
         self.info_labels['status'].setText(project.get_status_display())
         
-        if project.parent_project_id and project.parent_project_id in self._projects_cache:
-            parent = self._projects_cache[project.parent_project_id]
+        parent = None
+        if project.parent_project_id:
+            parent = self._get_project(project.parent_project_id)
+        if parent:
             self.info_labels['parent'].setText(f"{parent.get_display_icon()} {parent.name}")
         else:
             self.info_labels['parent'].setText("No parent project")
@@ -1168,20 +1226,37 @@ class ProjectsPage(QWidget):
             project.updated_at.strftime("%Y-%m-%d %H:%M") if project.updated_at else "-"
         )
         
-        # Get and display statistics
-        stats = self.projects_db.get_project_statistics(project.id)
-        self.stats_widgets['notes'].setText(str(stats.total_notes))
-        self.stats_widgets['artifacts'].setText(str(stats.total_artifacts))
-        self.stats_widgets['events'].setText(str(stats.total_calendar_events))
-        self.stats_widgets['subprojects'].setText(str(stats.child_project_count))
-        
-        # Load associated items
-        self._load_project_notes(project.id)
-        self._load_project_artifacts(project.id)
-        self._load_project_events(project.id)
+        # Statistics and associated items arrive in _on_details_loaded
+        for widget in self.stats_widgets.values():
+            widget.setText("-")
+        self.notes_list.clear()
+        self.artifacts_list.clear()
+        self.events_list.clear()
+        self.details_loader.load(project.id)
+    
+    def _on_details_loaded(self, result: Dict[str, Any]):
+        """Show the statistics and associated items of a project"""
+        if not self._current_project or \
+                result.get('project_id') != self._current_project.id:
+            return
+        if not result.get('success'):
+            return
         
+        notes = result['notes']
+        artifacts = result['artifacts']
+        events = result['events']
+        self.stats_widgets['notes'].setText(str(len(notes)))
+        self.stats_widgets['artifacts'].setText(str(len(artifacts)))
+        self.stats_widgets['events'].setText(str(len(events)))
+        self.stats_widgets['subprojects'].setText(str(result['child_count']))
+        
+        self._populate_notes(notes)
+        self._populate_artifacts(artifacts)
+        self._populate_events(events)
+    
     def _clear_project_details(self):
         """Clear project details display"""
+        self.details_loader.cancel()
         self.details_header.setText("Select a project to view details")
         
         for label in self.info_labels.values():
@@ -1201,12 +1276,17 @@ class ProjectsPage(QWidget):
         
     def _load_project_notes(self, project_id: str):
         """Load notes associated with project"""
+        try:
+            # Get notes for this project
+            self._populate_notes(self.notes_db.get_notes_by_project(project_id))
+        except Exception as e:
+            self.logger.error(f"Failed to load project notes: {str(e)}")
+    
+    def _populate_notes(self, notes: List[Any]):
+        """Fill the notes list"""
         self.notes_list.clear()
         
         try:
-            # Get notes for this project
-            notes = self.notes_db.get_notes_by_project(project_id)
-            
             for note in notes:
                 item_text = f"📝 {note.title}"
                 if note.tags:
@@ -1221,11 +1301,11 @@ class ProjectsPage(QWidget):
                 self.notes_list.addItem(item)
                 
         except Exception as e:
-            self.logger.error(f"Failed to load project notes: {str(e)}")
-            
+            self.logger.error(f"Failed to show project notes: {str(e)}")
+    
     def _create_new_project(self):
         """Create a new project"""
-        dialog = ProjectDialog(self, all_projects=list(self._projects_cache.values()))
+        dialog = ProjectDialog(self, all_projects=self._all_projects())
         
         if dialog.exec() == QDialog.DialogCode.Accepted:
             try:
@@ -1247,7 +1327,7 @@ class ProjectsPage(QWidget):
                     self.logger.info(f"Created new project: {project.id}")
                     
                     # Refresh display
-                    self._load_projects()
+                    self.apply_project_updates([project.id])
                     
                     # Select the new project
                     self._select_project_in_tree(project.id)
@@ -1270,7 +1350,7 @@ class ProjectsPage(QWidget):
         dialog = ProjectDialog(
             self,
             project=self._current_project,
-            all_projects=list(self._projects_cache.values())
+            all_projects=self._all_projects()
         )
         
         if dialog.exec() == QDialog.DialogCode.Accepted:
@@ -1301,7 +1381,7 @@ class ProjectsPage(QWidget):
                     self.logger.info(f"Updated project: {updated_project.id}")
                     
                     # Refresh display
-                    self._load_projects()
+                    self.apply_project_updates([updated_project.id])
                     
                     # Restore selection
                     self._select_project_in_tree(updated_project.id)
@@ -1322,8 +1402,7 @@ class ProjectsPage(QWidget):
             return
             
         # Check if project has children
-        children = [p for p in self._projects_cache.values() 
-                    if p.parent_project_id == self._current_project.id]
+        children = self.projects_db.get_child_projects(self._current_project.id)
         
         message = f"Are you sure you want to delete '{self._current_project.name}'?"
         if children:
@@ -1346,14 +1425,17 @@ class ProjectsPage(QWidget):
                 )
                 
                 if success:
-                    self.logger.info(f"Deleted project: {self._current_project.id}")
+                    deleted_id = self._current_project.id
+                    self.logger.info(f"Deleted project: {deleted_id}")
                     
                     # Clear selection
                     self._current_project = None
                     self._clear_project_details()
                     
                     # Refresh display
-                    self._load_projects()
+                    self.apply_project_updates(
+                        [deleted_id] + [child.id for child in children]
+                    )
                 else:
                     raise Exception("Failed to delete project")
                     
@@ -1381,7 +1463,7 @@ class ProjectsPage(QWidget):
                 self.logger.info(f"Archived project: {self._current_project.id}")
                 
                 # Refresh display
-                self._load_projects()
+                self.apply_project_updates([self._current_project.id])
                 
                 # Restore selection
                 self._select_project_in_tree(self._current_project.id)
@@ -1398,85 +1480,47 @@ class ProjectsPage(QWidget):
             
     def _filter_projects(self, search_text: str):
         """Filter projects based on search text"""
-        if not search_text:
-            # Show all items
-            self._show_all_tree_items(self.project_tree.invisibleRootItem())
-        else:
-            # Hide non-matching items
-            self._filter_tree_items(self.project_tree.invisibleRootItem(), search_text.lower())
-            
-    def _show_all_tree_items(self, parent_item):
-        """Show all tree items recursively"""
-        if parent_item != self.project_tree.invisibleRootItem():
-            parent_item.setHidden(False)
+        try:
+            if not search_text:
+                # Show all projects
+                self._reset_tree(self.project_model.load)
+                return
             
-        for i in range(parent_item.childCount()):
-            child = parent_item.child(i)
-            self._show_all_tree_items(child)
+            # Show matching projects under their parents
+            matches = self.projects_db.search_projects(search_text)
             
-    def _filter_tree_items(self, parent_item, search_text: str) -> bool:
-        """Filter tree items based on search text, returns True if any child matches"""
-        if parent_item == self.project_tree.invisibleRootItem():
-            # Root item - just process children
-            for i in range(parent_item.childCount()):
-                child = parent_item.child(i)
-                self._filter_tree_items(child, search_text)
-            return False
+            def show_matches():
+                self.project_model.set_filter([p.id for p in matches])
+                self.project_tree.expandAll()
             
-        # Check if this item matches
-        project_id = parent_item.data(0, Qt.ItemDataRole.UserRole)
-        matches = False
-        
-        if project_id and project_id in self._projects_cache:
-            project = self._projects_cache[project_id]
-            matches = (search_text in project.name.lower() or
-                       (project.description and search_text in project.description.lower()) or
-                       any(search_text in tag.lower() for tag in project.tags))
-                       
-        # Check children
-        child_matches = False
-        for i in range(parent_item.childCount()):
-            child = parent_item.child(i)
-            if self._filter_tree_items(child, search_text):
-                child_matches = True
-                
-        # Show item if it matches or has matching children
-        parent_item.setHidden(not (matches or child_matches))
-        
-        return matches or child_matches
+            self._reset_tree(show_matches)
         
+        except Exception as e:
+            self.logger.error(f"Failed to filter projects: {str(e)}")
+    
     def _select_project_in_tree(self, project_id: str):
         """Select a project in the tree by ID"""
-        # Find the tree item
-        item = self._find_tree_item(self.project_tree.invisibleRootItem(), project_id)
-        if item:
-            self.project_tree.setCurrentItem(item)
-            self.project_tree.scrollToItem(item)
-            
-    def _find_tree_item(self, parent_item, project_id: str) -> Optional[QTreeWidgetItem]:
-        """Find tree item by project ID"""
-        for i in range(parent_item.childCount()):
-            child = parent_item.child(i)
-            if child.data(0, Qt.ItemDataRole.UserRole) == project_id:
-                return child
-                
-            # Check children recursively
-            found = self._find_tree_item(child, project_id)
-            if found:
-                return found
-                
-        return None
-        
+        # Fetches the subprojects of its parents as needed
+        index = self.project_model.index_for_project(project_id)
+        if index.isValid():
+            self.project_tree.setCurrentIndex(index)
+            self.project_tree.scrollTo(index)
+    
     def _load_project_artifacts(self, project_id: str):
         """Load artifacts for the selected project"""
         try:
             # Get artifacts for the project
-            # For now, this is a placeholder - actual implementation depends on artifacts_db
+            self._populate_artifacts(
+                self.artifacts_db.get_artifacts_by_project(project_id)
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to load project artifacts: {str(e)}")
+    
+    def _populate_artifacts(self, artifacts: List[Any]):
+        """Fill the artifacts list"""
+        try:
             self.artifacts_list.clear()
             
-            # Get artifacts for the project
-            artifacts = self.artifacts_db.get_artifacts_by_project(project_id)
-            
             for artifact in artifacts:
                 item = QListWidgetItem(f"🎨 {artifact.name}")
                 item.setData(Qt.ItemDataRole.UserRole, artifact.id)
@@ -1488,17 +1532,23 @@ class ProjectsPage(QWidget):
                 self.artifacts_list.addItem(item)
                 
         except Exception as e:
-            self.logger.error(f"Failed to load project artifacts: {str(e)}")
+            self.logger.error(f"Failed to show project artifacts: {str(e)}")
     
     def _load_project_events(self, project_id: str):
         """Load calendar events for the selected project"""
         try:
             # Get events for the project
-            # For now, this is a placeholder - actual implementation depends on calendar_db
+            self._populate_events(
+                self.appointments_db.get_events_by_project(project_id)
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to load project events: {str(e)}")
+    
+    def _populate_events(self, events: List[Any]):
+        """Fill the calendar events list"""
+        try:
             self.events_list.clear()
             
-            events = self.appointments_db.get_events_by_project(project_id)
-            
             for event in events:
                 event_text = f"📅 {event.title}"
                 if event.event_date:
@@ -1513,8 +1563,8 @@ class ProjectsPage(QWidget):
                 self.events_list.addItem(item)
                 
         except Exception as e:
-            self.logger.error(f"Failed to load project events: {str(e)}")
-            
+            self.logger.error(f"Failed to show project events: {str(e)}")
+    
     def _view_note(self):
         """View the selected note"""
         current_item = self.notes_list.currentItem()
@@ -1628,15 +1678,14 @@ class ProjectsPage(QWidget):
             
     def _show_tree_context_menu(self, position):
         """Show context menu for tree items"""
-        item = self.project_tree.itemAt(position)
-        if not item:
+        index = self.project_tree.indexAt(position)
+        if not index.isValid():
             return
-            
-        project_id = item.data(0, Qt.ItemDataRole.UserRole)
-        if not project_id or project_id not in self._projects_cache:
+        
+        project_id = index.data(Qt.ItemDataRole.UserRole)
+        project = self._get_project(project_id) if project_id else None
+        if not project:
             return
-            
-        project = self._projects_cache[project_id]
         
         menu = QMenu(self)
         menu.setStyleSheet(f"""
@@ -1702,7 +1751,7 @@ class ProjectsPage(QWidget):
         
     def _create_subproject(self, parent_project: Project):
         """Create a new subproject"""
-        dialog = ProjectDialog(self, all_projects=list(self._projects_cache.values()))
+        dialog = ProjectDialog(self, all_projects=self._all_projects())
         # Pre-set the parent
         parent_index = dialog.parent_combo.findData(parent_project.id)
         if parent_index >= 0:
@@ -1729,7 +1778,7 @@ class ProjectsPage(QWidget):
                     self.logger.info(f"Created new subproject: {project.id}")
                     
                     # Refresh display
-                    self._load_projects()
+                    self.apply_project_updates([project.id])
                     
                     # Select the new project
                     self._select_project_in_tree(project.id)
@@ -1754,7 +1803,7 @@ class ProjectsPage(QWidget):
                 self.logger.info(f"Updated project status: {project.id} -> {new_status}")
                 
                 # Refresh display
-                self._load_projects()
+                self.apply_project_updates([project.id])
                 
                 # Restore selection
                 self._select_project_in_tree(project.id)
@@ -1773,6 +1822,26 @@ class ProjectsPage(QWidget):
         """Refresh projects display"""
         self._load_projects()
         
+    def _scheduled_refresh(self):
+        """Periodic refresh: the root projects are read on a worker and
+        expanded projects are restored one per step"""
+        if self.search_input.text():
+            self._load_projects()
+            return
+        rows, count = yield lambda: (
+            self.projects_db.get_project_tree_rows(),
+            self.projects_db.get_project_count()
+        )
+        expanded = self._expanded_project_ids()
+        self._projects_cache.clear()
+        self._reset_tree(lambda: self.project_model.load(rows))
+        self._update_count_label(count)
+        for project_id in expanded:
+            yield
+            index = self.project_model.index_for_project(project_id)
+            if index.isValid():
+                self.project_tree.expand(index)
+        
     def _setup_shortcuts(self):
         """Setup keyboard shortcuts"""
         # Ctrl+N for new project
@@ -1811,6 +1880,15 @@ class ProjectsPage(QWidget):
             if not hasattr(self, '_state_restored'):
                 self._update_splitter_sizes()
                 
+    def closeEvent(self, event):
+        """Stop background work when the page is closed"""
+        self.cleanup()
+        super().closeEvent(event)
+        
+    def cleanup(self):
+        """Stop and wait for a running project details fetch"""
+        self.details_loader.shutdown()
+        
     def _save_splitter_state(self):
         """Save the splitter state"""
         window_state_manager.save_splitter_from_widget(
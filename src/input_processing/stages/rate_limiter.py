@@ -4,10 +4,10 @@ Provides configurable rate limiting with different strategies
 and time windows to prevent abuse while maintaining good UX.
 """
 
-from typing import Dict, Optional, List, Tuple
+from typing import Dict, Optional, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from collections import defaultdict, deque
+from itertools import islice
 import time
 from enum import Enum
 from math import isfinite
@@ -32,6 +32,10 @@ class RateLimitConfig:
     penalty_threshold: int = 3          # Violations before penalty
     penalty_duration: int = 300         # Penalty duration in seconds
     
+    # Memory bounds
+    max_tracked_keys: int = 100_000     # Keys kept before evicting
+    sweep_interval: int = 300           # Seconds between expiry sweeps
+    
     # Different limits for different actions
     action_limits: Dict[str, int] = field(default_factory=lambda: {
         'default': 60,
@@ -53,12 +57,50 @@ class RateLimitStatus:
     message: str = ""
 
 
+class _ViolationRing:
+    """Times of a key's most recent violations in a fixed-size ring.
+
+    Only penalty_threshold violations are ever needed to decide on a
+    penalty, so older ones are overwritten.
+    """
+
+    __slots__ = ('times', 'next')
+
+    def __init__(self, size: int):
+        self.times = [0.0] * max(size, 1)
+        self.next = 0
+
+    def add(self, timestamp: float):
+        self.times[self.next] = timestamp
+        self.next = (self.next + 1) % len(self.times)
+
+    def count(self, since: float = 0.0) -> int:
+        """Number of recorded violations after since"""
+        return sum(1 for t in self.times if t > since)
+
+    def latest(self) -> float:
+        return self.times[self.next - 1]
+
+
 class RateLimiter:
     """Advanced rate limiter with multiple strategies.
     
     This class provides flexible rate limiting with support for
     different strategies, user-specific limits, and penalties.
+
+    Each key holds one small value: a (window, count) pair, a single
+    timestamp for the sliding window, or a (tokens, last_update,
+    full_at) triple. State that has expired is treated as absent when
+    the key is checked again and dropped by periodic sweeps; when more
+    than max_tracked_keys keys are tracked, the oldest are evicted.
     """
+
+    # A sweep over the cap evicts keys down to this fraction of it, so
+    # forced sweeps stay rare
+    SWEEP_TARGET = 0.75
+
+    # Allowance for float rounding in sliding window arrival times
+    _TOLERANCE = 1e-6
     
     def __init__(self, config: Optional[RateLimitConfig] = None):
         """Initialize with configuration.
@@ -69,25 +111,23 @@ class RateLimiter:
         self.config = config or RateLimitConfig()
         
         # Storage for different strategies
-        self.fixed_windows: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
-        self.sliding_windows: Dict[str, deque] = defaultdict(deque)
-        self.token_buckets: Dict[str, Dict[str, float]] = defaultdict(
-            lambda: {
-                'tokens': float(self.config.burst_size),
-                'last_update': time.time()
-            }
-        )
+        self.fixed_windows: Dict[str, Tuple[int, int]] = {}
+        self.sliding_windows: Dict[str, float] = {}
+        self.token_buckets: Dict[str, Tuple[float, float, float]] = {}
         
         # Violation tracking
-        self.violations: Dict[str, List[datetime]] = defaultdict(list)
+        self.violations: Dict[str, _ViolationRing] = {}
         self.penalties: Dict[str, datetime] = {}
         
-        # Statistics
+        self._next_sweep = time.monotonic() + self.config.sweep_interval
+        
+        # Statistics; a key whose state expired counts as a new user
         self.stats = {
             'total_requests': 0,
             'blocked_requests': 0,
-            'unique_users': set(),
-            'violations_issued': 0
+            'unique_users': 0,
+            'violations_issued': 0,
+            'sweeps': 0
         }
     
     def check_rate_limit(self, key: str, action: str = 'default') -> RateLimitStatus:
@@ -101,24 +141,27 @@ class RateLimiter:
             RateLimitStatus with result and details
         """
         self.stats['total_requests'] += 1
-        self.stats['unique_users'].add(key)
+        states = self._states()
+        if key not in states and key not in self.penalties:
+            self.stats['unique_users'] += 1
         
         # Check if user is in penalty
         if key in self.penalties:
             if datetime.now() < self.penalties[key]:
                 self.stats['blocked_requests'] += 1
+                ring = self.violations.get(key)
                 return RateLimitStatus(
                     allowed=False,
                     remaining_requests=0,
                     reset_time=self.penalties[key],
-                    violations=len(self.violations[key]),
+                    violations=ring.count() if ring else 0,
                     penalty_until=self.penalties[key],
                     message=f"Rate limit penalty until {self.penalties[key].strftime('%H:%M:%S')}"
                 )
             else:
                 # Penalty expired
                 del self.penalties[key]
-                self.violations[key].clear()
+                self.violations.pop(key, None)
         
         # Get action-specific limit
         limit = self.config.action_limits.get(action, self.config.max_requests)
@@ -133,8 +176,7 @@ class RateLimiter:
         
         # Handle violations
         if not status.allowed:
-            self._record_violation(key)
-            status.violations = len(self.violations[key])
+            status.violations = self._record_violation(key)
             
             # Check if penalty should be applied
             if status.violations >= self.config.penalty_threshold:
@@ -146,9 +188,21 @@ class RateLimiter:
         
         if not status.allowed:
             self.stats['blocked_requests'] += 1
+        
+        if (len(states) > self.config.max_tracked_keys
+                or time.monotonic() >= self._next_sweep):
+            self._sweep()
             
         return status
     
+    def _states(self) -> dict:
+        """Per-key state of the configured strategy"""
+        if self.config.strategy == RateLimitStrategy.FIXED_WINDOW:
+            return self.fixed_windows
+        if self.config.strategy == RateLimitStrategy.SLIDING_WINDOW:
+            return self.sliding_windows
+        return self.token_buckets
+    
     def _check_fixed_window(self, key: str, limit: int) -> RateLimitStatus:
         """Check rate limit using fixed window strategy.
         
@@ -160,23 +214,17 @@ class RateLimiter:
             RateLimitStatus
         """
         current_window = int(time.time() / self.config.window_seconds)
-        window_key = f"{current_window}"
         
-        # Clean old windows
-        windows_to_remove = []
-        for window in self.fixed_windows[key]:
-            if int(window) < current_window - 1:
-                windows_to_remove.append(window)
-        for window in windows_to_remove:
-            del self.fixed_windows[key][window]
+        # A count from an earlier window has expired
+        window, current_count = self.fixed_windows.get(key, (current_window, 0))
+        if window != current_window:
+            current_count = 0
         
-        # Check current window
-        current_count = self.fixed_windows[key][window_key]
+        reset_time = datetime.fromtimestamp(
+            (current_window + 1) * self.config.window_seconds
+        )
         
         if current_count >= limit:
-            reset_time = datetime.fromtimestamp(
-                (current_window + 1) * self.config.window_seconds
-            )
             return RateLimitStatus(
                 allowed=False,
                 remaining_requests=0,
@@ -185,11 +233,7 @@ class RateLimiter:
             )
         
         # Increment counter
-        self.fixed_windows[key][window_key] += 1
-        
-        reset_time = datetime.fromtimestamp(
-            (current_window + 1) * self.config.window_seconds
-        )
+        self.fixed_windows[key] = (current_window, current_count + 1)
         
         return RateLimitStatus(
             allowed=True,
@@ -200,6 +244,13 @@ class RateLimiter:
     def _check_sliding_window(self, key: str, limit: int) -> RateLimitStatus:
         """Check rate limit using sliding window strategy.
         
+        Implemented as a generic cell rate algorithm: each request
+        pushes the key's theoretical arrival time forward by
+        window_seconds / limit, and a request is refused when that
+        would put it more than a full window ahead. Up to limit
+        requests can be made at once, then one per window / limit
+        seconds; a key whose arrival time has passed is idle.
+        
         Args:
             key: User identifier
             limit: Request limit
@@ -207,18 +258,23 @@ class RateLimiter:
         Returns:
             RateLimitStatus
         """
-        now = datetime.now()
-        window_start = now - timedelta(seconds=self.config.window_seconds)
+        window = self.config.window_seconds
+        if window <= 0:
+            # No window means no limiting
+            return RateLimitStatus(
+                allowed=True,
+                remaining_requests=limit,
+                reset_time=datetime.now()
+            )
         
-        # Remove old entries
-        window = self.sliding_windows[key]
-        while window and window[0] < window_start:
-            window.popleft()
+        now = time.monotonic()
+        arrival = max(self.sliding_windows.get(key, now), now)
+        interval = window / limit if limit > 0 else float('inf')
         
         # Check limit
-        if len(window) >= limit:
-            oldest_request = window[0]
-            reset_time = oldest_request + timedelta(seconds=self.config.window_seconds)
+        if arrival + interval - now > window + self._TOLERANCE:
+            wait = arrival + interval - window - now if limit > 0 else window
+            reset_time = datetime.now() + timedelta(seconds=wait)
             return RateLimitStatus(
                 allowed=False,
                 remaining_requests=0,
@@ -227,18 +283,16 @@ class RateLimiter:
             )
         
         # Add current request
-        window.append(now)
-        
-        # Calculate reset time (when oldest request expires)
-        if window:
-            reset_time = window[0] + timedelta(seconds=self.config.window_seconds)
-        else:
-            reset_time = now + timedelta(seconds=self.config.window_seconds)
+        arrival += interval
+        self.sliding_windows[key] = arrival
         
+        # Reset time is when the full limit is available again
         return RateLimitStatus(
             allowed=True,
-            remaining_requests=limit - len(window),
-            reset_time=reset_time
+            remaining_requests=int(
+                (window - (arrival - now)) / interval + self._TOLERANCE
+            ),
+            reset_time=datetime.now() + timedelta(seconds=arrival - now)
         )
     
     def _check_token_bucket(self, key: str, limit: int) -> RateLimitStatus:
@@ -251,11 +305,13 @@ class RateLimiter:
         Returns:
             RateLimitStatus
         """
-        bucket = self.token_buckets[key]
         now = time.time()
+        tokens, last_update, _ = self.token_buckets.get(
+            key, (float(self.config.burst_size), now, now)
+        )
         
         # Refill tokens based on time passed
-        time_passed = now - bucket['last_update']
+        time_passed = now - last_update
         
         # Avoid division by zero
         if self.config.window_seconds <= 0:
@@ -265,16 +321,12 @@ class RateLimiter:
             refill_rate = limit / self.config.window_seconds
             new_tokens = time_passed * refill_rate
         
-        bucket['tokens'] = min(
-            bucket['tokens'] + new_tokens,
-            self.config.burst_size
-        )
-        bucket['last_update'] = now
+        tokens = min(tokens + new_tokens, self.config.burst_size)
         
         # Check if token available
-        if bucket['tokens'] < 1:
+        if tokens < 1:
             # Calculate when next token will be available
-            tokens_needed = 1 - bucket['tokens']
+            tokens_needed = 1 - tokens
             
             # Avoid division by zero
             if refill_rate <= 0 or not isfinite(refill_rate):
@@ -282,6 +334,7 @@ class RateLimiter:
             else:
                 seconds_until_token = tokens_needed / refill_rate
             
+            self._store_bucket(key, tokens, now, refill_rate)
             reset_time = datetime.now() + timedelta(seconds=seconds_until_token)
             
             return RateLimitStatus(
@@ -292,10 +345,24 @@ class RateLimiter:
             )
         
         # Consume token
-        bucket['tokens'] -= 1
+        tokens -= 1
+        seconds_to_full = self._store_bucket(key, tokens, now, refill_rate)
+        reset_time = datetime.now() + timedelta(seconds=seconds_to_full)
+        
+        return RateLimitStatus(
+            allowed=True,
+            remaining_requests=int(tokens),
+            reset_time=reset_time
+        )
+    
+    def _store_bucket(self, key: str, tokens: float, now: float,
+                      refill_rate: float) -> float:
+        """Store a bucket with the time it will be full again.
         
-        # Calculate reset time (when bucket will be full)
-        tokens_to_full = self.config.burst_size - bucket['tokens']
+        Returns:
+            Seconds until the bucket is full
+        """
+        tokens_to_full = self.config.burst_size - tokens
         
         # Avoid division by zero
         if refill_rate <= 0 or not isfinite(refill_rate):
@@ -303,29 +370,68 @@ class RateLimiter:
         else:
             seconds_to_full = tokens_to_full / refill_rate
         
-        reset_time = datetime.now() + timedelta(seconds=seconds_to_full)
-        
-        return RateLimitStatus(
-            allowed=True,
-            remaining_requests=int(bucket['tokens']),
-            reset_time=reset_time
-        )
+        self.token_buckets[key] = (tokens, now, now + seconds_to_full)
+        return seconds_to_full
     
-    def _record_violation(self, key: str):
+    def _record_violation(self, key: str) -> int:
         """Record a rate limit violation.
         
         Args:
             key: User identifier
+            
+        Returns:
+            Violations within the penalty duration, this one included
         """
-        now = datetime.now()
-        violations = self.violations[key]
-        
-        # Clean old violations (older than penalty duration)
-        cutoff = now - timedelta(seconds=self.config.penalty_duration)
-        self.violations[key] = [v for v in violations if v > cutoff]
+        now = time.time()
+        ring = self.violations.get(key)
+        if ring is None:
+            ring = _ViolationRing(self.config.penalty_threshold)
+            self.violations[key] = ring
+        ring.add(now)
+        return ring.count(now - self.config.penalty_duration)
+    
+    def _sweep(self):
+        """Drop expired state, then evict the oldest keys while more
+        than max_tracked_keys are tracked."""
+        now = time.time()
+        self.stats['sweeps'] += 1
+        self._next_sweep = time.monotonic() + self.config.sweep_interval
+        
+        if self.config.window_seconds > 0:
+            current_window = int(now / self.config.window_seconds)
+            self.fixed_windows = {
+                key: state for key, state in self.fixed_windows.items()
+                if state[0] == current_window
+            }
+        monotonic_now = time.monotonic()
+        self.sliding_windows = {
+            key: arrival for key, arrival in self.sliding_windows.items()
+            if arrival > monotonic_now
+        }
+        self.token_buckets = {
+            key: bucket for key, bucket in self.token_buckets.items()
+            if bucket[2] > now
+        }
+        cutoff = now - self.config.penalty_duration
+        self.violations = {
+            key: ring for key, ring in self.violations.items()
+            if ring.latest() > cutoff
+        }
+        penalty_now = datetime.now()
+        self.penalties = {
+            key: until for key, until in self.penalties.items()
+            if until > penalty_now
+        }
         
-        # Add new violation
-        self.violations[key].append(now)
+        target = int(self.config.max_tracked_keys * self.SWEEP_TARGET)
+        for name in ('fixed_windows', 'sliding_windows', 'token_buckets',
+                     'violations', 'penalties'):
+            states = getattr(self, name)
+            if len(states) > self.config.max_tracked_keys:
+                # Dicts keep insertion order: keys seen first go first
+                setattr(self, name, dict(
+                    islice(states.items(), len(states) - target, None)
+                ))
     
     def reset_user(self, key: str):
         """Reset rate limits for a specific user.
@@ -334,16 +440,11 @@ class RateLimiter:
             key: User identifier
         """
         # Clear all tracking for this user
-        if key in self.fixed_windows:
-            del self.fixed_windows[key]
-        if key in self.sliding_windows:
-            del self.sliding_windows[key]
-        if key in self.token_buckets:
-            del self.token_buckets[key]
-        if key in self.violations:
-            del self.violations[key]
-        if key in self.penalties:
-            del self.penalties[key]
+        self.fixed_windows.pop(key, None)
+        self.sliding_windows.pop(key, None)
+        self.token_buckets.pop(key, None)
+        self.violations.pop(key, None)
+        self.penalties.pop(key, None)
     
     def get_stats(self) -> Dict[str, any]:
         """Get rate limiter statistics.
@@ -358,9 +459,11 @@ class RateLimiter:
                 self.stats['blocked_requests'] / self.stats['total_requests']
                 if self.stats['total_requests'] > 0 else 0
             ),
-            'unique_users': len(self.stats['unique_users']),
+            'unique_users': self.stats['unique_users'],
             'violations_issued': self.stats['violations_issued'],
             'active_penalties': len(self.penalties),
+            'tracked_keys': len(self._states()),
+            'sweeps': self.stats['sweeps'],
             'strategy': self.config.strategy.value
         }
     
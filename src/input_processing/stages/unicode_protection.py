@@ -4,10 +4,15 @@ Unicode Attack Protection Module.
 Provides comprehensive protection against Unicode-based attacks.
 """
 
+import re
 import unicodedata
-from typing import Dict, Set, Optional
+from functools import lru_cache
+from typing import Dict, Set, Optional, Tuple
 
 
+# ASCII characters of category Cc; no other ASCII character is flagged
+_ASCII_CONTROL = re.compile('[\x00-\x1f\x7f]')
+
 class UnicodeProtection:
     """Comprehensive Unicode attack protection."""
     
@@ -135,83 +140,95 @@ class UnicodeProtection:
         'BUHID', 'TAGBANWA', 'KHMER', 'MONGOLIAN'
     }
     
+    # Bidirectional control characters
+    BIDI_CONTROLS: Set[str] = {
+        '\u200e',  # LRM
+        '\u200f',  # RLM
+        '\u202a',  # LRE
+        '\u202b',  # RLE
+        '\u202c',  # PDF
+        '\u202d',  # LRO
+        '\u202e',  # RLO
+        '\u2066',  # LRI
+        '\u2067',  # RLI
+        '\u2068',  # FSI
+        '\u2069',  # PDI
+    }
+
+    # Dangerous characters map to '' and homographs to their Latin form
+    _REPLACEMENTS: Dict[str, str] = {
+        **HOMOGRAPH_MAP, **dict.fromkeys(DANGEROUS_CHARS, '')
+    }
+    # Above this many distinct characters to replace, one str.translate
+    # pass is cheaper than a str.replace pass per character
+    _MAX_REPLACE_PASSES = 16
+
     @staticmethod
     def normalize_unicode(text: str) -> str:
-        """Normalize Unicode text to prevent attacks."""
-        if not text:
+        """Normalize Unicode text to prevent attacks.
+
+        ASCII text is returned unchanged, as none of the steps below
+        alter it.
+        """
+        if not text or text.isascii():
             return text
             
         # Step 1: NFD normalization (decompose)
         text = unicodedata.normalize('NFD', text)
         
-        # Step 2: Remove dangerous characters
-        cleaned = []
-        for char in text:
-            if char not in UnicodeProtection.DANGEROUS_CHARS:
-                cleaned.append(char)
-        text = ''.join(cleaned)
-        
-        # Step 3: Remove characters from dangerous categories
-        cleaned = []
-        for char in text:
-            category = unicodedata.category(char)
-            if category not in UnicodeProtection.DANGEROUS_CATEGORIES:
-                cleaned.append(char)
-        text = ''.join(cleaned)
-        
-        # Step 4: Convert homographs
-        chars = list(text)
-        for i, char in enumerate(chars):
-            if char in UnicodeProtection.HOMOGRAPH_MAP:
-                chars[i] = UnicodeProtection.HOMOGRAPH_MAP[char]
-        text = ''.join(chars)
+        # Steps 2-4: Remove dangerous characters and characters from
+        # dangerous categories, convert homographs
+        replacements = UnicodeProtection._REPLACEMENTS
+        changes = {}
+        for char in set(text):
+            if char in replacements:
+                changes[char] = replacements[char]
+            elif _char_info(char)[0] in UnicodeProtection.DANGEROUS_CATEGORIES:
+                changes[char] = ''
+        if len(changes) > UnicodeProtection._MAX_REPLACE_PASSES:
+            text = text.translate(
+                {ord(char): new for char, new in changes.items()}
+            )
+        else:
+            for char, new in changes.items():
+                text = text.replace(char, new)
         
         # Step 5: NFC normalization (compose)
         text = unicodedata.normalize('NFC', text)
+        if text.isascii():
+            return text
         
         # Step 6: Remove excessive combining characters
         # Allow max 2 combining chars per base character
-        result = []
-        combining_count = 0
-        
-        for char in text:
-            if unicodedata.category(char).startswith('M'):
-                # Combining character
-                combining_count += 1
-                if combining_count <= 2:
-                    result.append(char)
-            else:
-                # Base character
-                combining_count = 0
-                result.append(char)
-        
-        return ''.join(result)
+        marks = sorted(
+            c for c in set(text) if _char_info(c)[0].startswith('M')
+        )
+        if not marks:
+            return text
+        runs = re.compile('[%s]{3,}' % ''.join(map(re.escape, marks)))
+        return runs.sub(lambda run: run.group()[:2], text)
     
     @staticmethod
     def detect_unicode_attack(text: str) -> bool:
         """Detect potential Unicode-based attacks."""
         if not text:
             return False
+        if text.isascii():
+            # Only control characters can be flagged in ASCII text
+            return _ASCII_CONTROL.search(text) is not None
             
-        # Check for dangerous characters
-        for char in text:
-            if char in UnicodeProtection.DANGEROUS_CHARS:
-                return True
-        
-        # Check for mixed scripts
+        # Each distinct character is classified once
         scripts = set()
-        for char in text:
-            if char.isalpha():
-                try:
-                    char_name = unicodedata.name(char, '')
-                    if char_name:
-                        # Extract script from character name
-                        for script in UnicodeProtection.SCRIPT_NAMES:
-                            if script in char_name:
-                                scripts.add(script)
-                                break
-                except ValueError:
-                    pass
+        marks = []
+        for char in set(text):
+            category, script, flagged = _char_info(char)
+            # Dangerous, right-to-left or invisible character
+            if flagged:
+                return True
+            if script:
+                scripts.add(script)
+            if category.startswith('M'):
+                marks.append(char)
         
         # Multiple scripts = possible homograph attack
         if len(scripts) > 1:
@@ -226,51 +243,23 @@ class UnicodeProtection:
                     return True
         
         # Check for excessive combining characters
-        text_len = len(text)
-        if text_len > 0:
-            combining_count = sum(
-                1 for c in text 
-                if unicodedata.category(c).startswith('M')
-            )
-            if combining_count > text_len * 0.3:  # More than 30%
+        if marks:
+            combining_count = sum(text.count(mark) for mark in marks)
+            if combining_count > len(text) * 0.3:  # More than 30%
                 return True
         
-        # Check for right-to-left override
-        rtl_chars = {'\u202e', '\u202b', '\u200f'}
-        if any(char in text for char in rtl_chars):
-            return True
-        
-        # Check for invisible characters
-        invisible_count = sum(
-            1 for c in text 
-            if unicodedata.category(c) in {'Cf', 'Cc'}
-        )
-        if invisible_count > 0:
-            return True
-        
         return False
     
     @staticmethod
     def remove_bidi_controls(text: str) -> str:
         """Remove bidirectional control characters."""
-        if not text:
+        if not text or text.isascii():
             return text
             
-        bidi_controls = {
-            '\u200e',  # LRM
-            '\u200f',  # RLM
-            '\u202a',  # LRE
-            '\u202b',  # RLE
-            '\u202c',  # PDF
-            '\u202d',  # LRO
-            '\u202e',  # RLO
-            '\u2066',  # LRI
-            '\u2067',  # RLI
-            '\u2068',  # FSI
-            '\u2069',  # PDI
-        }
-        
-        return ''.join(c for c in text if c not in bidi_controls)
+        for char in UnicodeProtection.BIDI_CONTROLS:
+            if char in text:
+                text = text.replace(char, '')
+        return text
     
     @staticmethod
     def to_ascii_safe(text: str) -> str:
@@ -327,4 +316,27 @@ class UnicodeProtection:
         if max_length and len(text) > max_length:
             text = text[:max_length]
         
-        return text.strip()
\ No newline at end of file
+        return text.strip()
+
+
+@lru_cache(maxsize=4096)
+def _char_info(char: str) -> Tuple[str, Optional[str], bool]:
+    """Classify a character once for normalize_unicode and
+    detect_unicode_attack.
+
+    Returns:
+        The Unicode category, the script named in the character name
+        (alphabetic characters only) and whether the character alone
+        marks an attack: a dangerous character or a format/control one.
+    """
+    category = unicodedata.category(char)
+    script = None
+    if char.isalpha():
+        char_name = unicodedata.name(char, '')
+        for name in UnicodeProtection.SCRIPT_NAMES:
+            if name in char_name:
+                script = name
+                break
+    flagged = (char in UnicodeProtection.DANGEROUS_CHARS
+               or category in ('Cf', 'Cc'))
+    return category, script, flagged
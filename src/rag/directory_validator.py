@@ -5,11 +5,34 @@ preventing unauthorized access and path traversal attacks.
 """
 
 import os
+import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Set
+from typing import List, Dict, Any, Optional, Set, Tuple
 from src.utils.logger import Logger
 
 
+# Rule flags stored on directory trie nodes
+_EXCLUDED = 1
+_ALLOWED = 2
+_CRITICAL = 4
+
+
+def _default_case_sensitive() -> bool:
+    """Windows and macOS file systems are case-insensitive by default."""
+    return not (os.name == 'nt' or sys.platform == 'darwin')
+
+
+class _RuleNode:
+    """A single path component in the directory rule trie."""
+
+    __slots__ = ('children', 'flags')
+
+    def __init__(self):
+        self.children: Dict[str, '_RuleNode'] = {}
+        self.flags = 0
+
+
 class DirectoryValidator:
     """Validates directory and file access for the RAG file search system.
     
@@ -19,19 +42,58 @@ class DirectoryValidator:
     - Absolute path resolution
     - Security logging
     - File filtering based on directory rules
+
+    Rules are compiled into a trie keyed by path component, so a lookup
+    costs O(path depth) regardless of the number of rules. Verdicts for
+    parent directories are kept in an LRU, so files in the same folder
+    share a single resolve and trie walk.
     """
+
+    # Number of directory verdicts kept in the LRU
+    DIRECTORY_CACHE_SIZE = 4096
+
+    _CRITICAL_FILES = frozenset({
+        "pagefile.sys",
+        "hiberfil.sys",
+        "swapfile.sys",
+        "bootmgr",
+        "ntldr",
+        "ntdetect.com",
+        "boot.ini"
+    })
+
+    _CRITICAL_PATHS = (
+        "C:\\Windows\\System32\\config",
+        "C:\\Windows\\System32\\drivers",
+        "C:\\Windows\\CSC",  # Client Side Caching
+        "C:\\Windows\\Prefetch",
+        "C:\\Windows\\System32\\spool",
+        "C:\\Windows\\System32\\LogFiles"
+    )
     
     def __init__(self, allowed_dirs: Optional[List[str]] = None,
-                 excluded_dirs: Optional[List[str]] = None):
+                 excluded_dirs: Optional[List[str]] = None,
+                 case_sensitive: Optional[bool] = None):
         """Initialize the directory validator.
         
         Args:
             allowed_dirs: List of allowed directory paths
             excluded_dirs: List of excluded directory paths
+            case_sensitive: Whether path components are compared
+                case-sensitively. Defaults to the platform convention
+                (insensitive on Windows and macOS).
         """
         self.logger = Logger()
         self._allowed_dirs: Set[str] = set()
         self._excluded_dirs: Set[str] = set()
+        self._case_sensitive = (
+            _default_case_sensitive() if case_sensitive is None
+            else case_sensitive
+        )
+        self._rule_root = _RuleNode()
+        self._dir_lookup = lru_cache(maxsize=self.DIRECTORY_CACHE_SIZE)(
+            self._lookup_directory
+        )
         
         # Default excluded system directories for Windows
         self._default_excluded = {
@@ -53,6 +115,7 @@ class DirectoryValidator:
         else:
             # Use default exclusions if none provided
             self._excluded_dirs = self._default_excluded.copy()
+        self._rebuild_rules()
     
     def set_allowed_directories(self, directories: List[str]) -> None:
         """Set the list of allowed directories.
@@ -71,6 +134,7 @@ class DirectoryValidator:
                 self.logger.error(
                     f"Error adding allowed directory {directory}: {str(e)}"
                 )
+        self._rebuild_rules()
     
     def set_excluded_directories(self, directories: List[str]) -> None:
         """Set the list of excluded directories.
@@ -89,6 +153,72 @@ class DirectoryValidator:
                 self.logger.error(
                     f"Error adding excluded directory {directory}: {str(e)}"
                 )
+        self._rebuild_rules()
+
+    def clear_cache(self) -> None:
+        """Drop cached directory verdicts.
+
+        Call this if symlinks under the indexed directories change.
+        """
+        self._dir_lookup.cache_clear()
+
+    def _split_path(self, path: str) -> List[str]:
+        """Split an absolute path into comparable components."""
+        if not self._case_sensitive:
+            path = path.casefold()
+        if os.altsep:
+            path = path.replace(os.altsep, os.sep)
+        return [part for part in path.split(os.sep) if part]
+
+    def _rebuild_rules(self) -> None:
+        """Compile the directory rules into the lookup trie."""
+        root = _RuleNode()
+        rules = [(_CRITICAL, path) for path in self._CRITICAL_PATHS]
+        rules.extend((_EXCLUDED, path) for path in self._excluded_dirs)
+        rules.extend((_ALLOWED, path) for path in self._allowed_dirs)
+
+        for flag, path in rules:
+            node = root
+            for part in self._split_path(os.path.normpath(path)):
+                child = node.children.get(part)
+                if child is None:
+                    child = node.children[part] = _RuleNode()
+                node = child
+            node.flags |= flag
+
+        self._rule_root = root
+        self._dir_lookup.cache_clear()
+
+    def _match_rules(self, parts: List[str]) -> Tuple[int, Optional[_RuleNode]]:
+        """Walk the rule trie along path components.
+
+        Returns:
+            Tuple of the combined flags of every rule covering the path
+            and the trie node for the last component, or None when no
+            deeper rule can apply.
+        """
+        node = self._rule_root
+        flags = node.flags
+        for part in parts:
+            node = node.children.get(part)
+            if node is None:
+                break
+            flags |= node.flags
+            if flags & (_EXCLUDED | _CRITICAL):
+                return flags, None
+        return flags, node
+
+    def _lookup_directory(
+        self, directory: str
+    ) -> Tuple[Optional[str], int, Optional[_RuleNode]]:
+        """Resolve a directory and match it against the rules (LRU cached)."""
+        resolved = self.resolve_path(directory)
+        if not resolved:
+            return None, 0, None
+        flags, node = self._match_rules(self._split_path(resolved))
+        if flags & _EXCLUDED:
+            self.logger.debug(f"Directory {resolved} is excluded")
+        return resolved, flags, node
     
     def is_path_allowed(self, path: str) -> bool:
         """Check if a path is allowed for access.
@@ -100,40 +230,44 @@ class DirectoryValidator:
             True if path is allowed, False otherwise
         """
         try:
-            # Resolve to absolute path
-            abs_path = self.resolve_path(path)
-            if not abs_path:
+            abs_path = os.path.abspath(path)
+            # Lexical '..' collapsing and symlinked files could point
+            # elsewhere, so those paths are fully resolved up front
+            if '..' in path or os.path.islink(abs_path):
+                abs_path = self.resolve_path(path)
+                if not abs_path:
+                    return False
+
+            directory, name = os.path.split(abs_path)
+            resolved_dir, flags, node = self._dir_lookup(directory)
+            if resolved_dir is None:
                 return False
-            
+
+            if name:
+                if node is not None:
+                    child = node.children.get(
+                        name if self._case_sensitive else name.casefold()
+                    )
+                    if child is not None:
+                        flags |= child.flags
+                if name.lower() in self._CRITICAL_FILES:
+                    flags |= _CRITICAL
+
             # Check if it's a critical system file
-            if self._is_critical_system_file(abs_path):
+            if flags & _CRITICAL:
                 self.logger.warning(
                     f"Access denied to critical system file: {abs_path}"
                 )
                 return False
-            
+
             # Check against excluded directories
-            for excluded in self._excluded_dirs:
-                if abs_path.lower().startswith(excluded.lower()):
-                    self.logger.debug(
-                        f"Path {abs_path} is in excluded directory {excluded}"
-                    )
-                    return False
-            
-            # If we have allowed directories, check if path is within them
-            if self._allowed_dirs:
-                for allowed in self._allowed_dirs:
-                    if abs_path.lower().startswith(allowed.lower()):
-                        self.logger.debug(
-                            f"Path {abs_path} is in allowed directory {allowed}"
-                        )
-                        return True
-                # Path not in any allowed directory
-                self.logger.debug(
-                    f"Path {abs_path} is not in any allowed directory"
-                )
+            if flags & _EXCLUDED:
                 return False
-            
+
+            # If we have allowed directories, path must be within them
+            if self._allowed_dirs:
+                return bool(flags & _ALLOWED)
+
             # No allowed directories specified, so allow if not excluded
             return True
             
@@ -257,37 +391,11 @@ class DirectoryValidator:
         Returns:
             True if path is a critical system file
         """
-        critical_files = {
-            "pagefile.sys",
-            "hiberfil.sys", 
-            "swapfile.sys",
-            "bootmgr",
-            "ntldr",
-            "ntdetect.com",
-            "boot.ini"
-        }
-        
-        critical_paths = {
-            "C:\\Windows\\System32\\config",
-            "C:\\Windows\\System32\\drivers",
-            "C:\\Windows\\CSC",  # Client Side Caching
-            "C:\\Windows\\Prefetch",
-            "C:\\Windows\\System32\\spool",
-            "C:\\Windows\\System32\\LogFiles"
-        }
-        
-        # Check filename
-        filename = os.path.basename(path).lower()
-        if filename in critical_files:
+        if os.path.basename(path).lower() in self._CRITICAL_FILES:
             return True
-        
-        # Check critical paths
-        path_lower = path.lower()
-        for critical in critical_paths:
-            if path_lower.startswith(critical.lower()):
-                return True
-        
-        return False
+
+        flags, _ = self._match_rules(self._split_path(path))
+        return bool(flags & _CRITICAL)
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get statistics about current directory settings.
@@ -295,12 +403,16 @@ class DirectoryValidator:
         Returns:
             Dict with statistics
         """
+        cache_info = self._dir_lookup.cache_info()
         return {
             "allowed_directories": list(self._allowed_dirs),
             "excluded_directories": list(self._excluded_dirs),
             "allowed_count": len(self._allowed_dirs),
             "excluded_count": len(self._excluded_dirs),
-            "has_restrictions": bool(self._allowed_dirs)
+            "has_restrictions": bool(self._allowed_dirs),
+            "case_sensitive": self._case_sensitive,
+            "directory_cache_hits": cache_info.hits,
+            "directory_cache_misses": cache_info.misses
         }
     
     def log_access_attempt(self, path: str, allowed: bool,
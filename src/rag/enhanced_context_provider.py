@@ -7,29 +7,248 @@ search history, suggestions, and export functionality.
 import os
 import json
 import csv
+import gzip
+import math
+import time
+import heapq
+import bisect
+import tempfile
+import threading
+import itertools
 from datetime import datetime
-from typing import List, Dict, Any, Optional, Tuple, Set
+from typing import (
+    List, Dict, Any, Optional, Tuple, Set, Iterable, Iterator, Callable, TextIO
+)
 from collections import deque, Counter
 import re
 
+import numpy as np
+
 from .vector_search import VectorSearchEngine
 from .file_processor import FileProcessor
 from ..database.file_search_db import FileSearchDB
 from ..utils.logger import Logger
 
 
+class PrefixCompletionIndex:
+    """
+    Prefix completion over keys ranked by time-decayed popularity.
+    
+    Keys are kept in a sorted list with a parallel score array, so every
+    prefix maps to a contiguous range found with bisect. Scores use forward decay: a use at time t
+    adds exp(decay * (t - landmark)), so the relative order of keys never
+    changes as time passes and nothing has to be rescored. Top-k lists
+    for prefixes with large ranges are memoized and kept current as
+    scores grow.
+    """
+    
+    # Prefix ranges larger than this get a memoized top-k list
+    MEMO_RANGE = 2048
+    # Rebase scores well before exp() leaves the float range
+    MAX_EXPONENT = 600.0
+    
+    def __init__(self, half_life_days: float = 30.0, top_k: int = 10):
+        self._decay = math.log(2) / (half_life_days * 86400)
+        self._landmark = time.time()
+        self._top_k = top_k
+        self._keys: List[str] = []
+        self._scores: Dict[str, float] = {}
+        self._score_array = np.zeros(0)
+        self._memo: Dict[str, List[Tuple[float, str]]] = {}
+        self._lock = threading.RLock()
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+    
+    def _forward(self, weight: float, timestamp: float) -> float:
+        """Convert a weight observed at timestamp to forward-decay form"""
+        return weight * math.exp(self._decay * (timestamp - self._landmark))
+    
+    def _rebase(self, timestamp: float) -> None:
+        """Move the landmark forward so forward scores stay finite"""
+        factor = math.exp(-self._decay * (timestamp - self._landmark))
+        for key in self._scores:
+            self._scores[key] *= factor
+        self._score_array *= factor
+        self._memo.clear()
+        self._landmark = timestamp
+    
+    def add(self, key: str, timestamp: Optional[float] = None,
+            weight: float = 1.0) -> float:
+        """
+        Record a use of key.
+        
+        Returns:
+            The key's decayed weight as of timestamp
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            if self._decay * (timestamp - self._landmark) > self.MAX_EXPONENT:
+                self._rebase(timestamp)
+            
+            position = bisect.bisect_left(self._keys, key)
+            score = self._scores.get(key)
+            if score is None:
+                self._keys.insert(position, key)
+                self._score_array = np.insert(self._score_array, position, 0.0)
+                score = 0.0
+            score += self._forward(weight, timestamp)
+            self._scores[key] = score
+            self._score_array[position] = score
+            
+            # Keep memoized top-k lists on the key's prefix path current
+            for end in range(len(key) + 1):
+                top = self._memo.get(key[:end])
+                if top is None:
+                    continue
+                top[:] = [item for item in top if item[1] != key]
+                if len(top) < self._top_k or score > top[-1][0]:
+                    top.append((score, key))
+                    top.sort(key=lambda item: (-item[0], item[1]))
+                    del top[self._top_k:]
+            
+            return score / self._forward(1.0, timestamp)
+    
+    def load(self, items: Iterable[Tuple[str, float, float]]) -> None:
+        """
+        Bulk-load (key, weight, timestamp) triples; weights of repeated
+        keys are summed after decay.
+        """
+        with self._lock:
+            scores = self._scores
+            decay, landmark = self._decay, self._landmark
+            for key, weight, timestamp in items:
+                scores[key] = scores.get(key, 0.0) + weight * math.exp(
+                    decay * (timestamp - landmark)
+                )
+            self._keys = sorted(self._scores)
+            self._score_array = np.fromiter(
+                (self._scores[key] for key in self._keys),
+                dtype=np.float64, count=len(self._keys)
+            )
+            self._memo.clear()
+    
+    def complete(self, prefix: str, limit: int = 5) -> List[str]:
+        """Return up to limit keys starting with prefix, best first"""
+        with self._lock:
+            if limit <= self._top_k:
+                top = self._memo.get(prefix)
+                if top is not None:
+                    return [key for _, key in top[:limit]]
+            
+            lo = bisect.bisect_left(self._keys, prefix)
+            hi = bisect.bisect_left(self._keys, prefix + '\U0010ffff', lo)
+            
+            if hi - lo > self.MEMO_RANGE and limit <= self._top_k:
+                # Select candidates in numpy, then order them exactly
+                scores = self._score_array[lo:hi]
+                picks = np.argpartition(scores, -self._top_k)[-self._top_k:]
+                top = sorted(
+                    ((float(scores[i]), self._keys[lo + i]) for i in picks),
+                    key=lambda item: (-item[0], item[1])
+                )
+                self._memo[prefix] = top
+                return [key for _, key in top[:limit]]
+            
+            return heapq.nlargest(
+                limit, self._keys[lo:hi], key=self._scores.__getitem__
+            )
+    
+    def decayed_score(self, key: str,
+                      timestamp: Optional[float] = None) -> float:
+        """Current decayed weight of key (0.0 if unknown)"""
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            score = self._scores.get(key, 0.0)
+            return score / self._forward(1.0, timestamp)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._keys.clear()
+            self._scores.clear()
+            self._score_array = np.zeros(0)
+            self._memo.clear()
+            self._landmark = time.time()
+
+
 class SearchHistory:
-    """Manages search history and suggestions"""
+    """
+    Manages search history and suggestions.
+    
+    Suggestions come from prefix completion indexes over past queries and
+    query terms, ranked by time-decayed popularity. When a FileSearchDB is
+    given, queries are persisted in the per-user database and reloaded on
+    start.
+    """
     
-    def __init__(self, max_history: int = 100):
+    def __init__(self, max_history: int = 100,
+                 db: Optional[FileSearchDB] = None,
+                 half_life_days: float = 30.0):
+        self.logger = Logger()
         self.history = deque(maxlen=max_history)
         self.term_frequency = Counter()
+        self.db = db
+        self._queries = PrefixCompletionIndex(half_life_days)
+        self._terms = PrefixCompletionIndex(half_life_days)
+        # Normalized query -> query as last typed
+        self._display: Dict[str, str] = {}
+        
+        if db is not None:
+            self._load_from_db()
+    
+    @staticmethod
+    def _normalize(query: str) -> str:
+        return ' '.join(query.lower().split())
+    
+    def _load_from_db(self) -> None:
+        """Restore persisted history from the per-user database"""
+        result = self.db.get_search_history()
+        if not result.get('success'):
+            self.logger.error(
+                f"Failed to load search history: {result.get('error')}"
+            )
+            return
+        self.load_entries(result['entries'])
+    
+    def load_entries(self, entries: List[Dict[str, Any]]) -> None:
+        """
+        Bulk-load aggregated history entries, most recent first.
+        
+        Each entry has query_key, query, weight (decayed as of
+        last_used), use_count, result_count and last_used.
+        """
+        query_items = []
+        term_items = []
+        for entry in entries:
+            key = entry['query_key']
+            last_used = entry['last_used']
+            timestamp = (datetime.fromisoformat(last_used).timestamp()
+                         if isinstance(last_used, str) else last_used)
+            query_items.append((key, entry['weight'], timestamp))
+            for term in key.split():
+                term_items.append((term, entry['weight'], timestamp))
+                self.term_frequency[term] += entry.get('use_count', 1)
+            self._display[key] = entry['query']
+        
+        self._queries.load(query_items)
+        self._terms.load(term_items)
+        
+        for entry in reversed(entries[:self.history.maxlen]):
+            last_used = entry['last_used']
+            self.history.append({
+                'query': entry['query'],
+                'timestamp': (last_used if isinstance(last_used, str)
+                              else datetime.fromtimestamp(
+                                  last_used).isoformat()),
+                'result_count': entry.get('result_count', 0)
+            })
         
     def add_query(self, query: str, result_count: int) -> None:
         """Add a query to history"""
+        now = time.time()
         entry = {
             'query': query,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': datetime.fromtimestamp(now).isoformat(),
             'result_count': result_count
         }
         self.history.append(entry)
@@ -37,27 +256,44 @@ class SearchHistory:
         # Update term frequency for suggestions
         terms = query.lower().split()
         self.term_frequency.update(terms)
+        
+        key = self._normalize(query)
+        if not key:
+            return
+        weight = self._queries.add(key, now)
+        for term in terms:
+            self._terms.add(term, now)
+        self._display[key] = query
+        
+        if self.db is not None:
+            result = self.db.record_search_query(
+                key, query, weight, entry['timestamp'], result_count
+            )
+            if not result.get('success'):
+                self.logger.error(
+                    f"Failed to store search query: {result.get('error')}"
+                )
     
     def get_suggestions(self, partial_query: str, limit: int = 5) -> List[str]:
         """Get query suggestions based on history"""
         if not partial_query:
             return []
         
-        partial_lower = partial_query.lower()
-        suggestions = []
+        # Collapse whitespace but keep a trailing space as typed
+        partial_lower = re.sub(r'\s+', ' ', partial_query.lower()).lstrip()
+        if not partial_lower:
+            return []
         
-        # Recent queries matching partial
-        for entry in reversed(self.history):
-            if entry['query'].lower().startswith(partial_lower):
-                if entry['query'] not in suggestions:
-                    suggestions.append(entry['query'])
-                if len(suggestions) >= limit:
-                    break
+        # Popular recent queries matching partial
+        suggestions = [
+            self._display.get(key, key)
+            for key in self._queries.complete(partial_lower, limit)
+        ]
         
         # Popular terms matching partial
         if len(suggestions) < limit:
-            for term, count in self.term_frequency.most_common():
-                if term.startswith(partial_lower) and term not in suggestions:
+            for term in self._terms.complete(partial_lower, limit):
+                if term not in suggestions:
                     suggestions.append(term)
                 if len(suggestions) >= limit:
                     break
@@ -72,6 +308,11 @@ class SearchHistory:
         """Clear search history"""
         self.history.clear()
         self.term_frequency.clear()
+        self._queries.clear()
+        self._terms.clear()
+        self._display.clear()
+        if self.db is not None:
+            self.db.clear_search_history()
 
 
 class InputValidator:
@@ -159,6 +400,9 @@ class EnhancedContextProvider:
     - Improved relevance scoring
     """
     
+    # Exports report progress and check for cancellation this often
+    EXPORT_PROGRESS_INTERVAL = 1000
+    
     def __init__(self, user_name: str = "default_user"):
         """Initialize the enhanced context provider"""
         self.user_name = user_name
@@ -168,7 +412,7 @@ class EnhancedContextProvider:
         try:
             self.search_engine = VectorSearchEngine(user_name)
             self.file_search_db = FileSearchDB(user_name)
-            self.search_history = SearchHistory()
+            self.search_history = SearchHistory(db=self.file_search_db)
             self.validator = InputValidator()
             
             # Configuration
@@ -395,19 +639,76 @@ class EnhancedContextProvider:
         
         return suggestions[:5]  # Limit total suggestions
     
+    def iter_search_results(
+        self,
+        query: str,
+        file_types: Optional[List[str]] = None,
+        batch_size: int = 1000
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream every chunk matching the query's keywords as context items.
+        
+        Rows are read lazily from a database cursor, so the result set can
+        be passed straight to export_results without materializing it.
+        Items carry the same fields as get_context_for_query results; the
+        score is the keyword match ratio.
+        
+        Raises:
+            ValueError: If the query or file types are invalid
+        """
+        is_valid, sanitized_query, error_msg = self.validator.validate_query(query)
+        if not is_valid:
+            raise ValueError(f"Invalid query: {error_msg}")
+        
+        is_valid, sanitized_types, error_msg = self.validator.validate_file_types(file_types)
+        if not is_valid:
+            raise ValueError(f"Invalid file types: {error_msg}")
+        
+        keywords = self.search_engine._extract_keywords(sanitized_query)
+        for row in self.file_search_db.iter_keyword_matches(
+            keywords, file_types=sanitized_types, batch_size=batch_size
+        ):
+            content = row['content']
+            score = row['relevance_score']
+            yield {
+                'file_path': row['file_path'],
+                'file_name': os.path.basename(row['file_path']),
+                'content': content,
+                'chunk_index': row['chunk_index'],
+                'score': score,
+                'match_type': 'keyword',
+                'relevance_level': self._get_relevance_level(score),
+                'file_type': row.get('file_type') or 'unknown',
+                'file_size': row.get('file_size') or 0,
+                'preview': self._create_preview(content)
+            }
+    
     def export_results(
         self,
-        results: List[Dict[str, Any]],
+        results: Iterable[Dict[str, Any]],
         format: str = 'json',
-        file_path: Optional[str] = None
+        file_path: Optional[str] = None,
+        compress: bool = False,
+        snippet_only: bool = False,
+        progress_callback: Optional[Callable[[int], None]] = None,
+        should_cancel: Optional[Callable[[], bool]] = None
     ) -> Dict[str, Any]:
         """
         Export search results to file.
         
+        Results are consumed one at a time and written incrementally, so
+        a generator such as iter_search_results exports in constant memory.
+        
         Args:
-            results: Search results to export
+            results: Search results to export (any iterable of dicts)
             format: Export format ('json', 'csv', 'markdown')
             file_path: Optional output file path
+            compress: Write gzip-compressed output (adds a .gz suffix)
+            snippet_only: Write previews instead of full chunk content
+            progress_callback: Called with the number of results written
+                every EXPORT_PROGRESS_INTERVAL results and at the end
+            should_cancel: Polled with each progress update; returning True
+                stops the export and removes the partial file
             
         Returns:
             Dictionary with export status
@@ -419,30 +720,69 @@ class EnhancedContextProvider:
                     'error': f"Unsupported format: {format}"
                 }
             
-            if not results:
+            rows = iter(results)
+            first = next(rows, None)
+            if first is None:
                 return {
                     'success': False,
                     'error': "No results to export"
                 }
+            rows = itertools.chain([first], rows)
+            if snippet_only:
+                rows = map(self._snippet_only, rows)
             
             # Generate default filename if not provided
             if not file_path:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 file_path = f"search_results_{timestamp}.{format}"
+            if compress and not file_path.endswith('.gz'):
+                file_path += '.gz'
+            
+            progress = {'count': 0, 'cancelled': False}
+            rows = self._track_export(
+                rows, progress, progress_callback, should_cancel
+            )
             
-            # Export based on format
-            if format == 'json':
-                self._export_json(results, file_path)
-            elif format == 'csv':
-                self._export_csv(results, file_path)
-            elif format == 'markdown':
-                self._export_markdown(results, file_path)
+            # Written beside the target and moved into place when done, so
+            # a failed or cancelled export never leaves a partial file
+            fd, temp_path = tempfile.mkstemp(
+                prefix=f".{os.path.basename(file_path)}.", suffix='.tmp',
+                dir=os.path.dirname(os.path.abspath(file_path))
+            )
+            os.close(fd)
+            try:
+                opener = gzip.open if compress else open
+                with opener(temp_path, 'wt', encoding='utf-8',
+                            newline='') as f:
+                    # Export based on format
+                    if format == 'json':
+                        self._export_json(rows, f)
+                    elif format == 'csv':
+                        self._export_csv(rows, f)
+                    elif format == 'markdown':
+                        self._export_markdown(rows, f)
+                
+                if progress['cancelled']:
+                    return {
+                        'success': False,
+                        'cancelled': True,
+                        'error': "Export cancelled",
+                        'result_count': progress['count']
+                    }
+                os.replace(temp_path, file_path)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+            
+            if progress_callback:
+                progress_callback(progress['count'])
             
             return {
                 'success': True,
                 'file_path': file_path,
                 'format': format,
-                'result_count': len(results)
+                'compressed': compress,
+                'result_count': progress['count']
             }
             
         except Exception as e:
@@ -452,50 +792,98 @@ class EnhancedContextProvider:
                 'error': f"Export failed: {str(e)}"
             }
     
-    def _export_json(self, results: List[Dict[str, Any]], file_path: str) -> None:
-        """Export results as JSON"""
-        export_data = {
-            'export_date': datetime.now().isoformat(),
-            'result_count': len(results),
-            'results': results
-        }
-        
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, indent=2, ensure_ascii=False)
+    def _snippet_only(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy of a result with its full content replaced by the preview"""
+        result = dict(result)
+        content = result.pop('content', '')
+        if 'preview' not in result:
+            result['preview'] = self._create_preview(content or '')
+        return result
     
-    def _export_csv(self, results: List[Dict[str, Any]], file_path: str) -> None:
-        """Export results as CSV"""
-        if not results:
-            return
+    def _track_export(
+        self,
+        rows: Iterator[Dict[str, Any]],
+        progress: Dict[str, Any],
+        progress_callback: Optional[Callable[[int], None]],
+        should_cancel: Optional[Callable[[], bool]]
+    ) -> Iterator[Dict[str, Any]]:
+        """Count exported rows, reporting progress and stopping on cancel"""
+        interval = self.EXPORT_PROGRESS_INTERVAL
+        for row in rows:
+            yield row
+            progress['count'] += 1
+            if progress['count'] % interval:
+                continue
+            if progress_callback:
+                progress_callback(progress['count'])
+            if should_cancel and should_cancel():
+                progress['cancelled'] = True
+                return
+    
+    def _export_json(self, results: Iterable[Dict[str, Any]], f: TextIO) -> None:
+        """Export results as JSON, one result per line"""
+        f.write('{\n')
+        f.write(f'  "export_date": {json.dumps(datetime.now().isoformat())},\n')
+        f.write('  "results": [')
         
-        # Get all unique keys
-        all_keys = set()
+        count = 0
         for result in results:
-            all_keys.update(result.keys())
-        
-        # Write CSV
-        with open(file_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=sorted(all_keys))
-            writer.writeheader()
-            writer.writerows(results)
+            f.write(',\n    ' if count else '\n    ')
+            f.write(json.dumps(result, ensure_ascii=False, default=str))
+            count += 1
+        
+        # The count is only known once every result has been written
+        f.write('\n  ],\n' if count else '],\n')
+        f.write(f'  "result_count": {count}\n')
+        f.write('}\n')
     
-    def _export_markdown(self, results: List[Dict[str, Any]], file_path: str) -> None:
+    def _export_csv(self, results: Iterable[Dict[str, Any]], f: TextIO) -> None:
+        """Export results as CSV, with a column for every key of any row"""
+        # The header must list keys that only later rows have, so rows are
+        # spooled to disk while the columns are collected, then copied
+        # under the header; memory stays constant either way
+        columns: Dict[str, int] = {}
+        with tempfile.TemporaryFile('w+', encoding='utf-8',
+                                    newline='') as spool:
+            writer = csv.writer(spool)
+            for result in results:
+                for key in result:
+                    columns.setdefault(key, len(columns))
+                row = [''] * len(columns)
+                for key, value in result.items():
+                    row[columns[key]] = '' if value is None else value
+                writer.writerow(row)
+            if not columns:
+                return
+            
+            fieldnames = sorted(columns)
+            order = [columns[name] for name in fieldnames]
+            out = csv.writer(f)
+            out.writerow(fieldnames)
+            spool.seek(0)
+            for row in csv.reader(spool):
+                # Rows written before a column appeared are short
+                row.extend([''] * (len(columns) - len(row)))
+                out.writerow([row[i] for i in order])
+    
+    def _export_markdown(self, results: Iterable[Dict[str, Any]], f: TextIO) -> None:
         """Export results as Markdown"""
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(f"# Search Results\n\n")
-            f.write(f"**Export Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"**Total Results:** {len(results)}\n\n")
-            
-            for i, result in enumerate(results, 1):
-                f.write(f"## Result {i}\n\n")
-                f.write(f"**File:** `{result.get('file_name', 'Unknown')}`\n")
-                f.write(f"**Path:** `{result.get('file_path', 'Unknown')}`\n")
-                f.write(f"**Relevance:** {result.get('relevance_level', 'Unknown')} ")
-                f.write(f"({result.get('score', 0):.1%})\n")
-                f.write(f"**Type:** {result.get('file_type', 'Unknown')}\n\n")
-                f.write(f"### Content Preview\n\n")
-                f.write(f"```\n{result.get('preview', result.get('content', ''))}\n```\n\n")
-                f.write("---\n\n")
+        f.write(f"# Search Results\n\n")
+        f.write(f"**Export Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+        
+        count = 0
+        for count, result in enumerate(results, 1):
+            f.write(f"## Result {count}\n\n")
+            f.write(f"**File:** `{result.get('file_name', 'Unknown')}`\n")
+            f.write(f"**Path:** `{result.get('file_path', 'Unknown')}`\n")
+            f.write(f"**Relevance:** {result.get('relevance_level', 'Unknown')} ")
+            f.write(f"({result.get('score', 0):.1%})\n")
+            f.write(f"**Type:** {result.get('file_type', 'Unknown')}\n\n")
+            f.write(f"### Content Preview\n\n")
+            f.write(f"```\n{result.get('preview', result.get('content', ''))}\n```\n\n")
+            f.write("---\n\n")
+        
+        f.write(f"**Total Results:** {count}\n")
     
     def get_search_history(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get recent search history"""
@@ -548,8 +936,13 @@ class EnhancedContextProvider:
                 issues.append(f"Database connection issue: {str(e)}")
             
             # Check for orphaned entries
-            # This would need implementation in the database layer
-            
+            orphans = self.file_search_db.find_dangling_references()
+            if orphans.get('success') and orphans.get('total_orphans'):
+                issues.append(
+                    f"Found {orphans['orphaned_chunks']} orphaned chunks and "
+                    f"{orphans['orphaned_embeddings']} orphaned embeddings"
+                )
+
             # Check embedding generator
             try:
                 test_embedding = self.search_engine.embedding_generator.generate_embedding("test")
@@ -18,6 +18,9 @@ from .text_extractors import ExtractorFactory
 from .file_chunker import FileChunker, TextChunk
 from .embedding_generator import get_embedding_generator
 from .directory_validator import DirectoryValidator
+from .text_signatures import (
+    SIGNATURE_KEY, minhash_signature, encode_signature
+)
 
 
 class FileProcessor:
@@ -237,7 +240,8 @@ class FileProcessor:
                 store_result = self._store_in_database(
                     file_path, file_info, file_type,
                     chunks, extraction_metadata,
-                    progress_callback=progress_callback
+                    progress_callback=progress_callback,
+                    text=text
                 )
                 
                 if not store_result['success']:
@@ -527,9 +531,13 @@ class FileProcessor:
                            extraction_metadata: Dict[str, Any],
                            progress_callback: Optional[
                                Callable[[str, int, int], None]
-                           ] = None) -> Dict[str, Any]:
+                           ] = None,
+                           text: Optional[str] = None) -> Dict[str, Any]:
         """
         Store file and chunks in the database.
+        
+        When the extracted text is given it is stored once, compressed,
+        and chunks that are exact slices of it keep only their offsets.
         """
         try:
             # Add file to index
@@ -547,6 +555,11 @@ class FileProcessor:
             
             file_id = file_result['file_id']
             
+            stored_text = False
+            if text is not None:
+                text_result = self.db.add_file_text(file_id, text)
+                stored_text = text_result['success']
+            
             # Store chunks and generate embeddings if enabled
             embeddings_generated = 0
             chunk_ids = []
@@ -560,11 +573,17 @@ class FileProcessor:
                     content=chunk.content,
                     start_pos=chunk.metadata.start_pos,
                     end_pos=chunk.metadata.end_pos,
+                    stored_text=stored_text and text[
+                        chunk.metadata.start_pos:chunk.metadata.end_pos
+                    ] == chunk.content,
                     metadata={
                         'chunk_type': chunk.metadata.chunk_type,
                         'overlap_prev': chunk.metadata.overlap_with_previous,
                         'overlap_next': chunk.metadata.overlap_with_next,
-                        'additional_info': chunk.metadata.additional_info
+                        'additional_info': chunk.metadata.additional_info,
+                        SIGNATURE_KEY: encode_signature(
+                            minhash_signature(chunk.content)
+                        )
                     }
                 )
                 
@@ -686,8 +686,9 @@ class BatchEmbeddingProcessor:
             with self.db._get_connection() as conn:
                 cursor = conn.cursor()
                 
-                cursor.execute('''
-                    SELECT c.id as chunk_id, c.content
+                cursor.execute(f'''
+                    SELECT c.id as chunk_id,
+                        {self.db.CHUNK_TEXT_SQL} as content
                     FROM file_chunks c
                     LEFT JOIN file_embeddings e ON c.id = e.chunk_id
                     WHERE e.id IS NULL
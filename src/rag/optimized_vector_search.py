@@ -9,8 +9,8 @@ import json
 import time
 import concurrent.futures
 from typing import List, Dict, Any, Optional, Callable, Tuple, Set
-from dataclasses import dataclass
-from collections import defaultdict
+from dataclasses import dataclass, asdict
+from collections import defaultdict, Counter
 import threading
 import heapq
 
@@ -21,6 +21,10 @@ from ..database.file_search_db import FileSearchDB
 # Import RAG components
 from .embedding_generator import get_embedding_generator
 from .vector_search import VectorSearchEngine, SearchResult
+from .text_signatures import (
+    NUM_PERMUTATIONS, SIGNATURE_KEY, EMPTY_HASH, tokenize, jaccard,
+    minhash_signature, decode_signature, lsh_band_layout
+)
 
 
 class SearchCache:
@@ -96,6 +100,198 @@ class SearchCache:
             }
 
 
+class HotQueryCache:
+    """
+    Persistent cache of results for frequently repeated queries.
+    
+    Query frequency is tracked in memory. Once a query has been run
+    hot_threshold times, its results are stored in the file search
+    database with the index generation they were computed against, so
+    they survive restarts. Entries from older generations are not served
+    until they have been confirmed or recomputed for the current one.
+    """
+    
+    # Buffered hit counts are written back once this many accumulate
+    HIT_FLUSH_THRESHOLD = 100
+    # Queries counted per cache entry before the rarest counts are dropped
+    COUNTED_PER_ENTRY = 10
+    
+    def __init__(self, db: FileSearchDB, max_entries: int = 500,
+                 hot_threshold: int = 2):
+        self.logger = Logger()
+        self.db = db
+        self.max_entries = max_entries
+        self.hot_threshold = hot_threshold
+        self.lock = threading.Lock()
+        self.frequency: Counter = Counter()
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._pending_hits: Counter = Counter()
+        self.hits = 0
+        self.misses = 0
+        self._load()
+    
+    @staticmethod
+    def make_key(query: str, params: Dict[str, Any]) -> str:
+        """Create cache key from query and parameters"""
+        return f"{query}:{json.dumps(params, sort_keys=True)}"
+    
+    def _load(self):
+        """Load persisted entries from the database"""
+        result = self.db.get_hot_queries(self.max_entries)
+        if not result.get('success'):
+            self.logger.error(
+                f"Failed to load hot queries: {result.get('error')}"
+            )
+            return
+        
+        for entry in result['entries']:
+            entry['results'] = [
+                SearchResult(**data) for data in entry['results']
+            ]
+            self.entries[entry['cache_key']] = entry
+            self.frequency[entry['cache_key']] = entry['hits']
+        
+        self.logger.info(f"Loaded {len(self.entries)} hot queries")
+    
+    def get(self, query: str, params: Dict[str, Any],
+            generation: int) -> Optional[List[SearchResult]]:
+        """Count a use of the query and return results current for generation"""
+        key = self.make_key(query, params)
+        flush = False
+        
+        with self.lock:
+            self.frequency[key] += 1
+            self._prune_frequency()
+            entry = self.entries.get(key)
+            if entry is None or entry['generation'] != generation:
+                self.misses += 1
+                return None
+            
+            self.hits += 1
+            self._pending_hits[key] += 1
+            flush = (sum(self._pending_hits.values()) >=
+                     self.HIT_FLUSH_THRESHOLD)
+            results = entry['results']
+        
+        if flush:
+            self.flush()
+        return results
+    
+    def _prune_frequency(self):
+        """
+        Keep counting at most COUNTED_PER_ENTRY queries per entry.
+        
+        Over the limit, counts of queries without an entry are cut down
+        to the most frequent half of the limit, so the counter stays
+        bounded however many distinct queries are seen. Called with the
+        lock held.
+        """
+        limit = self.max_entries * self.COUNTED_PER_ENTRY
+        if len(self.frequency) <= limit:
+            return
+        
+        kept = heapq.nlargest(
+            limit // 2,
+            (item for item in self.frequency.items()
+             if item[0] not in self.entries),
+            key=lambda item: item[1]
+        )
+        self.frequency = Counter(
+            {key: self.frequency[key] for key in self.entries}
+        )
+        self.frequency.update(dict(kept))
+    
+    def put(self, query: str, params: Dict[str, Any],
+            results: List[SearchResult], generation: int):
+        """Persist results if the query is hot enough to keep"""
+        key = self.make_key(query, params)
+        evicted = None
+        
+        with self.lock:
+            hits = self.frequency[key]
+            if hits < self.hot_threshold:
+                return
+            current = self.entries.get(key)
+            if current is not None and current['generation'] == generation:
+                return
+            
+            if key not in self.entries and len(self.entries) >= self.max_entries:
+                evicted = min(self.entries, key=self.frequency.__getitem__)
+                if self.frequency[evicted] >= hits:
+                    return
+                del self.entries[evicted]
+                self._pending_hits.pop(evicted, None)
+            
+            self.entries[key] = {
+                'cache_key': key,
+                'query': query,
+                'params': params,
+                'hits': hits,
+                'generation': generation,
+                'results': results
+            }
+            # The saved row carries the full count
+            self._pending_hits.pop(key, None)
+        
+        if evicted is not None:
+            self.db.delete_hot_queries([evicted])
+        self.db.save_hot_query(
+            key, query, params, hits, generation,
+            [asdict(result) for result in results]
+        )
+    
+    def stale_entries(self, generation: int) -> List[Dict[str, Any]]:
+        """Entries computed against a generation older than the given one"""
+        with self.lock:
+            return [
+                entry for entry in self.entries.values()
+                if entry['generation'] < generation
+            ]
+    
+    def confirm(self, cache_keys: List[str], generation: int):
+        """Mark entries as still valid for a newer generation"""
+        with self.lock:
+            for key in cache_keys:
+                if key in self.entries:
+                    self.entries[key]['generation'] = generation
+        self.db.update_hot_queries(
+            generations={key: generation for key in cache_keys}
+        )
+    
+    def flush(self):
+        """Write buffered hit counts to the database"""
+        with self.lock:
+            pending = dict(self._pending_hits)
+            self._pending_hits.clear()
+        if pending:
+            self.db.update_hot_queries(hits=pending)
+    
+    def clear(self):
+        """Drop all entries, in memory and persisted"""
+        with self.lock:
+            keys = list(self.entries)
+            self.entries.clear()
+            self.frequency.clear()
+            self._pending_hits.clear()
+            self.hits = 0
+            self.misses = 0
+        if keys:
+            self.db.delete_hot_queries(keys)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self.entries),
+                "max_size": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total > 0 else 0,
+                "hot_threshold": self.hot_threshold
+            }
+
+
 class OptimizedVectorSearchEngine(VectorSearchEngine):
     """
     Optimized vector search with performance improvements:
@@ -104,14 +300,24 @@ class OptimizedVectorSearchEngine(VectorSearchEngine):
     - Efficient top-k selection using heaps
     - Batch embedding loading
     - Pre-computed normalized vectors
+    - Persistent hot-query results tied to the index generation
     """
     
+    # How often the index generation is re-read from the database
+    GENERATION_POLL_SECONDS = 1.0
+    
+    # Keep each combined keyword query well inside SQLite's column and
+    # bound-parameter limits
+    _MAX_KEYWORDS_PER_PASS = 400
+    
     def __init__(self, user_name: Optional[str] = None,
                  embedding_generator=None,
                  cache_size: int = 100,
                  cache_ttl: int = 3600,
                  enable_caching: bool = True,
-                 max_workers: Optional[int] = None):
+                 max_workers: Optional[int] = None,
+                 enable_hot_cache: bool = True,
+                 hot_cache_size: int = 500):
         """
         Initialize OptimizedVectorSearchEngine.
         
@@ -120,13 +326,25 @@ class OptimizedVectorSearchEngine(VectorSearchEngine):
             cache_ttl: Cache time-to-live in seconds
             enable_caching: Whether to enable result caching
             max_workers: Maximum number of parallel workers
+            enable_hot_cache: Whether to persist results of frequent
+                queries (requires enable_caching)
+            hot_cache_size: Maximum number of persisted hot queries
         """
         super().__init__(user_name, embedding_generator)
         
         # Caching
         self.enable_caching = enable_caching
+        self.hot_cache: Optional[HotQueryCache] = None
         if enable_caching:
             self.search_cache = SearchCache(cache_size, cache_ttl)
+            if enable_hot_cache:
+                self.hot_cache = HotQueryCache(self.db, hot_cache_size)
+        
+        # Index generation, polled so cached results can be validated
+        self._generation: Optional[int] = None
+        self._generation_checked = 0.0
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._closed = False
         
         # Parallel processing
         self.max_workers = max_workers or min(4, os.cpu_count() or 1)
@@ -134,8 +352,14 @@ class OptimizedVectorSearchEngine(VectorSearchEngine):
         # Pre-computed embeddings cache
         self._embeddings_cache = None
         self._embeddings_cache_time = 0
+        self._embeddings_generation: Optional[int] = None
         self._cache_refresh_interval = 300  # 5 minutes
         
+        # Dense matrix of the cached embeddings for batched scoring
+        self._embedding_matrix = None
+        self._embedding_sq_norms = None
+        self._matrix_lock = threading.Lock()
+        
         self.logger.info(
             f"OptimizedVectorSearchEngine initialized with "
             f"caching={'enabled' if enable_caching else 'disabled'}, "
@@ -151,6 +375,8 @@ class OptimizedVectorSearchEngine(VectorSearchEngine):
         Perform optimized vector similarity search.
         """
         try:
+            generation = self._current_generation()
+            
             # Check cache first
             if self.enable_caching:
                 cache_params = {
@@ -159,7 +385,9 @@ class OptimizedVectorSearchEngine(VectorSearchEngine):
                     'file_types': file_types,
                     'metric': distance_metric
                 }
-                cached_results = self.search_cache.get(query, cache_params)
+                cached_results = self._get_cached_results(
+                    query, cache_params, generation
+                )
                 if cached_results is not None:
                     self.logger.debug(f"Cache hit for query: {query[:50]}...")
                     return cached_results
@@ -187,7 +415,7 @@ class OptimizedVectorSearchEngine(VectorSearchEngine):
             
             # Cache results
             if self.enable_caching:
-                self.search_cache.put(query, cache_params, results)
+                self._cache_results(query, cache_params, results, generation)
             
             return results
             
@@ -200,12 +428,19 @@ class OptimizedVectorSearchEngine(VectorSearchEngine):
         """Get embeddings with caching"""
         # Check if cache needs refresh
         current_time = time.time()
-        if (self._embeddings_cache is None or 
+        generation = self._current_generation()
+        if (self._embeddings_cache is None or
+            generation != self._embeddings_generation or
             current_time - self._embeddings_cache_time > self._cache_refresh_interval):
             
             self.logger.debug("Refreshing embeddings cache")
-            self._embeddings_cache = self._retrieve_all_embeddings(file_types)
+            # Always cache the full corpus; file type filters are applied
+            # below so one filtered search cannot narrow later ones
+            self._embeddings_cache = self._retrieve_all_embeddings()
             self._embeddings_cache_time = current_time
+            self._embeddings_generation = generation
+            self._embedding_matrix = None
+            self._embedding_sq_norms = None
             
             # Pre-parse embeddings for efficiency
             for emb_data in self._embeddings_cache:
@@ -304,42 +539,37 @@ class OptimizedVectorSearchEngine(VectorSearchEngine):
         top_k: int
     ) -> List[SearchResult]:
         """Efficiently get top-k results using a heap"""
-        # Use negative scores for max heap
-        heap = []
-        
-        for score, emb_data in scored_results:
-            if len(heap) < top_k:
-                heapq.heappush(heap, (-score, emb_data))
-            elif score > -heap[0][0]:
-                heapq.heapreplace(heap, (-score, emb_data))
-        
-        # Extract results in descending order
-        results = []
-        while heap:
-            neg_score, emb_data = heapq.heappop(heap)
-            score = -neg_score
-            
-            result = SearchResult(
-                chunk_id=emb_data['chunk_id'],
-                file_id=emb_data['file_id'],
-                file_path=emb_data['file_path'],
-                content=emb_data['content'],
-                score=score,
-                chunk_index=emb_data['chunk_index'],
-                start_pos=emb_data['start_pos'],
-                end_pos=emb_data['end_pos'],
-                file_type=emb_data.get('file_type'),
-                metadata=emb_data.get('chunk_metadata'),
-                match_type='vector'
-            )
-            results.append(result)
-        
-        # Reverse to get descending order
-        results.reverse()
+        # nlargest keeps a bounded min-heap of the best scores and only
+        # compares scores, never the (unorderable) embedding dicts
+        top = heapq.nlargest(
+            top_k, scored_results, key=lambda item: item[0]
+        )
+        results = [
+            self._to_search_result(emb_data, score)
+            for score, emb_data in top
+        ]
         
         self.logger.info(f"Vector search found {len(results)} results")
         return results
     
+    @staticmethod
+    def _to_search_result(data: Dict[str, Any], score: float,
+                          match_type: str = 'vector') -> SearchResult:
+        """Build a SearchResult from an embedding or chunk row"""
+        return SearchResult(
+            chunk_id=data['chunk_id'],
+            file_id=data['file_id'],
+            file_path=data['file_path'],
+            content=data['content'],
+            score=score,
+            chunk_index=data['chunk_index'],
+            start_pos=data['start_pos'],
+            end_pos=data['end_pos'],
+            file_type=data.get('file_type'),
+            metadata=data.get('chunk_metadata'),
+            match_type=match_type
+        )
+    
     def hybrid_search(self, query: str,
                       top_k: int = 10,
                       vector_weight: float = 0.7,
@@ -351,6 +581,8 @@ class OptimizedVectorSearchEngine(VectorSearchEngine):
         Optimized hybrid search with parallel execution.
         """
         try:
+            generation = self._current_generation()
+            
             # Check cache for hybrid results
             if self.enable_caching:
                 cache_params = {
@@ -362,7 +594,9 @@ class OptimizedVectorSearchEngine(VectorSearchEngine):
                     'rerank': rerank,
                     'type': 'hybrid'
                 }
-                cached_results = self.search_cache.get(query, cache_params)
+                cached_results = self._get_cached_results(
+                    query, cache_params, generation
+                )
                 if cached_results is not None:
                     return cached_results
             
@@ -411,7 +645,9 @@ class OptimizedVectorSearchEngine(VectorSearchEngine):
             
             # Cache results
             if self.enable_caching:
-                self.search_cache.put(query, cache_params, merged_results)
+                self._cache_results(
+                    query, cache_params, merged_results, generation
+                )
             
             self.logger.info(
                 f"Hybrid search returned {len(merged_results)} results"
@@ -433,50 +669,605 @@ class OptimizedVectorSearchEngine(VectorSearchEngine):
         """
         Perform batch search for multiple queries efficiently.
         
+        All uncached queries are embedded in a single model call and
+        scored against the corpus with one matrix product, and their
+        keyword legs share a single SQL pass.
+        
         Args:
             queries: List of search queries
             top_k: Number of results per query
             search_type: 'vector', 'keyword', or 'hybrid'
-            **kwargs: Additional search parameters
+            **kwargs: Additional search parameters (similarity_threshold,
+                file_types, distance_metric, vector_weight,
+                keyword_weight, rerank)
             
         Returns:
             Dictionary mapping queries to their results
         """
-        results = {}
+        similarity_threshold = kwargs.get('similarity_threshold')
+        file_types = kwargs.get('file_types')
+        distance_metric = kwargs.get('distance_metric', 'cosine')
+        vector_weight = kwargs.get('vector_weight', 0.7)
+        keyword_weight = kwargs.get('keyword_weight', 0.3)
+        rerank = kwargs.get('rerank', True)
         
-        # Choose search function
         if search_type == 'vector':
-            search_func = self.search
-        elif search_type == 'keyword':
-            search_func = self.keyword_search
+            cache_params = {
+                'top_k': top_k,
+                'threshold': similarity_threshold,
+                'file_types': file_types,
+                'metric': distance_metric
+            }
+        elif search_type == 'hybrid':
+            cache_params = {
+                'top_k': top_k,
+                'vector_weight': vector_weight,
+                'keyword_weight': keyword_weight,
+                'threshold': similarity_threshold,
+                'file_types': file_types,
+                'rerank': rerank,
+                'type': 'hybrid'
+            }
         else:
-            search_func = self.hybrid_search
+            cache_params = None
         
-        # Process queries in parallel
-        with concurrent.futures.ThreadPoolExecutor(
-            max_workers=self.max_workers
-        ) as executor:
-            future_to_query = {
-                executor.submit(search_func, query, top_k, **kwargs): query
-                for query in queries
-            }
+        generation = self._current_generation()
+        results: Dict[str, List[SearchResult]] = {}
+        pending = []
+        for query in dict.fromkeys(queries):
+            if not query or not query.strip():
+                results[query] = []
+                continue
+            if self.enable_caching and cache_params is not None:
+                cached_results = self._get_cached_results(
+                    query, cache_params, generation
+                )
+                if cached_results is not None:
+                    results[query] = cached_results
+                    continue
+            pending.append(query)
+        
+        if not pending:
+            return results
+        
+        try:
+            if search_type == 'keyword':
+                results.update(
+                    self._batch_keyword_search(pending, top_k, file_types)
+                )
+                return results
             
-            for future in concurrent.futures.as_completed(future_to_query):
-                query = future_to_query[future]
-                try:
-                    results[query] = future.result()
-                except Exception as e:
-                    self.logger.error(f"Error searching for '{query}': {str(e)}")
-                    results[query] = []
+            # Hybrid searches over-fetch each leg before merging
+            leg_k = top_k * 2 if search_type == 'hybrid' else top_k
+            vector_results = self._batch_vector_search(
+                pending,
+                leg_k,
+                similarity_threshold or self.DEFAULT_SIMILARITY_THRESHOLD,
+                file_types,
+                distance_metric
+            )
+            
+            if search_type == 'vector':
+                batch_results = vector_results
+            else:
+                keyword_results = self._batch_keyword_search(
+                    pending, leg_k, file_types
+                )
+                total_weight = vector_weight + keyword_weight
+                batch_results = {}
+                for query in pending:
+                    merged = self._merge_search_results(
+                        vector_results.get(query, []),
+                        keyword_results.get(query, []),
+                        vector_weight / total_weight,
+                        keyword_weight / total_weight
+                    )
+                    if rerank and merged:
+                        merged = self.rerank_results(
+                            query, merged, top_k=top_k
+                        )
+                    else:
+                        merged = merged[:top_k]
+                    batch_results[query] = merged
+            
+            if self.enable_caching and cache_params is not None:
+                for query, query_results in batch_results.items():
+                    self._cache_results(
+                        query, cache_params, query_results, generation
+                    )
+            
+            results.update(batch_results)
+            
+        except Exception as e:
+            self.logger.error(f"Error in batch search: {str(e)}")
+            for query in pending:
+                results.setdefault(query, [])
+        
+        return results
+    
+    def _get_embedding_matrix(self) -> Tuple[List[Dict[str, Any]],
+                                             Optional[np.ndarray],
+                                             Optional[np.ndarray]]:
+        """
+        Get the cached embeddings with a dense float32 matrix view.
+        
+        Returns:
+            Tuple of (embedding rows, matrix, squared row norms)
+        """
+        embeddings = self._get_cached_embeddings()
+        if not embeddings:
+            return [], None, None
+        
+        with self._matrix_lock:
+            if self._embedding_matrix is None:
+                matrix = np.vstack([
+                    np.asarray(emb['embedding_vector'], dtype=np.float32)
+                    for emb in embeddings
+                ])
+                self._embedding_sq_norms = np.einsum(
+                    'ij,ij->i', matrix, matrix
+                )
+                self._embedding_matrix = matrix
+            return (embeddings, self._embedding_matrix,
+                    self._embedding_sq_norms)
+    
+    def _batch_vector_search(
+        self,
+        queries: List[str],
+        top_k: int,
+        similarity_threshold: float,
+        file_types: Optional[List[str]],
+        distance_metric: str
+    ) -> Dict[str, List[SearchResult]]:
+        """Score many queries against the corpus in one matrix product"""
+        embeddings, matrix, sq_norms = self._get_embedding_matrix()
+        if matrix is None:
+            self.logger.info("No embeddings found in database")
+            return {query: [] for query in queries}
+        
+        if file_types:
+            rows = np.array([
+                i for i, emb in enumerate(embeddings)
+                if emb.get('file_type') in file_types
+            ], dtype=np.intp)
+            if rows.size == 0:
+                return {query: [] for query in queries}
+            matrix = matrix[rows]
+            sq_norms = sq_norms[rows]
+        else:
+            rows = None
+        
+        query_matrix = np.vstack(
+            self.embedding_generator.generate_embeddings_batch(
+                queries, normalize=True, show_progress=False
+            )
+        ).astype(np.float32, copy=False)
         
+        scores = self._similarity_scores(
+            query_matrix, matrix, sq_norms, distance_metric
+        )
+        
+        # Per-row top-k: partition first, then sort only the k candidates
+        k = min(top_k, scores.shape[1])
+        if k <= 0:
+            return {query: [] for query in queries}
+        if k < scores.shape[1]:
+            candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            candidates = np.broadcast_to(
+                np.arange(scores.shape[1]), scores.shape
+            )
+        
+        results = {}
+        for row, query in enumerate(queries):
+            row_scores = scores[row]
+            top = candidates[row]
+            top = top[row_scores[top] >= similarity_threshold]
+            top = top[np.argsort(-row_scores[top], kind='stable')]
+            
+            query_results = []
+            for idx in top:
+                corpus_idx = rows[idx] if rows is not None else idx
+                query_results.append(self._to_search_result(
+                    embeddings[corpus_idx], float(row_scores[idx])
+                ))
+            results[query] = query_results
+        
+        self.logger.info(
+            f"Batch vector search scored {len(queries)} queries against "
+            f"{scores.shape[1]} chunks"
+        )
+        return results
+    
+    @staticmethod
+    def _similarity_scores(query_matrix: np.ndarray, matrix: np.ndarray,
+                           sq_norms: np.ndarray,
+                           distance_metric: str) -> np.ndarray:
+        """(queries x corpus) similarity scores for either metric"""
+        # One matrix product serves both metrics
+        dots = query_matrix @ matrix.T
+        query_sq_norms = np.einsum('ij,ij->i', query_matrix, query_matrix)
+        if distance_metric == 'cosine':
+            denom = np.sqrt(np.outer(query_sq_norms, sq_norms))
+            return np.divide(
+                dots, denom, out=np.zeros_like(dots), where=denom > 0
+            )
+        sq_dist = (query_sq_norms[:, None] + sq_norms[None, :]
+                   - 2.0 * dots)
+        return 1.0 / (1.0 + np.sqrt(np.maximum(sq_dist, 0.0)))
+    
+    def _batch_keyword_search(
+        self,
+        queries: List[str],
+        top_k: int,
+        file_types: Optional[List[str]]
+    ) -> Dict[str, List[SearchResult]]:
+        """Run the keyword leg of many queries in one SQL pass"""
+        query_keywords = {
+            query: self._extract_keywords(query) for query in queries
+        }
+        all_keywords = sorted({
+            keyword for keywords in query_keywords.values()
+            for keyword in keywords
+        })
+        if not all_keywords:
+            return {query: [] for query in queries}
+        
+        # chunk_id -> (row data, set of matched keywords)
+        matches: Dict[str, Tuple[Dict[str, Any], Set[str]]] = {}
+        for start in range(0, len(all_keywords),
+                           self._MAX_KEYWORDS_PER_PASS):
+            group = all_keywords[start:start + self._MAX_KEYWORDS_PER_PASS]
+            for row, matched in self._match_keywords(group, file_types):
+                if row['chunk_id'] in matches:
+                    matches[row['chunk_id']][1].update(matched)
+                else:
+                    matches[row['chunk_id']] = (row, set(matched))
+        
+        # Score every query from the shared match table
+        results = {}
+        for query, keywords in query_keywords.items():
+            if not keywords:
+                results[query] = []
+                continue
+            scored = []
+            for row, matched in matches.values():
+                match_count = sum(1 for kw in keywords if kw in matched)
+                if match_count:
+                    scored.append((match_count, row))
+            scored.sort(key=lambda item: (-item[0], item[1]['chunk_index']))
+            results[query] = [
+                self._to_search_result(
+                    row, match_count / len(keywords), match_type='keyword'
+                )
+                for match_count, row in scored[:top_k]
+            ]
+        
+        return results
+    
+    def _match_keywords(
+        self,
+        keywords: List[str],
+        file_types: Optional[List[str]]
+    ) -> List[Tuple[Dict[str, Any], List[str]]]:
+        """
+        Find chunks containing any keyword, flagging which ones matched.
+        
+        Returns:
+            List of (chunk row, matched keywords) tuples
+        """
+        chunk_text = self.db.CHUNK_TEXT_SQL
+        flag_columns = ', '.join(
+            f'(LOWER({chunk_text}) LIKE ?) AS kw_{i}'
+            for i in range(len(keywords))
+        )
+        query = f'''
+            SELECT
+                c.id as chunk_id,
+                c.file_id,
+                c.chunk_index,
+                {chunk_text} as content,
+                c.start_pos,
+                c.end_pos,
+                c.metadata as chunk_metadata,
+                f.file_path,
+                f.file_type,
+                {flag_columns}
+            FROM file_chunks c
+            JOIN indexed_files f ON c.file_id = f.id
+            WHERE f.status = 'active'
+            AND (
+        '''
+        query += ' OR '.join(
+            f'LOWER({chunk_text}) LIKE ?' for _ in keywords
+        )
+        query += ')'
+        
+        patterns = [f'%{keyword}%' for keyword in keywords]
+        params = patterns + patterns
+        if file_types:
+            placeholders = ','.join(['?' for _ in file_types])
+            query += f' AND f.file_type IN ({placeholders})'
+            params.extend(file_types)
+        
+        try:
+            with self.db._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(query, params)
+                
+                base_columns = [
+                    desc[0] for desc in cursor.description
+                ][:-len(keywords)]
+                width = len(base_columns)
+                
+                rows = []
+                for values in cursor.fetchall():
+                    row = dict(zip(base_columns, values[:width]))
+                    if row.get('chunk_metadata'):
+                        try:
+                            row['chunk_metadata'] = json.loads(
+                                row['chunk_metadata']
+                            )
+                        except json.JSONDecodeError:
+                            row['chunk_metadata'] = None
+                    matched = [
+                        keyword for keyword, flag
+                        in zip(keywords, values[width:]) if flag
+                    ]
+                    rows.append((row, matched))
+                return rows
+                
+        except Exception as e:
+            self.logger.error(f"Error in batch keyword search: {str(e)}")
+            return []
+    
+    def _current_generation(self, force: bool = False) -> int:
+        """
+        Current index generation, re-read at most once per poll interval.
+        
+        A change schedules a background refresh of stale hot queries.
+        """
+        now = time.time()
+        if (not force and self._generation is not None and
+                now - self._generation_checked < self.GENERATION_POLL_SECONDS):
+            return self._generation
+        
+        generation = self.db.get_index_generation()
+        changed = (self._generation is not None and
+                   generation != self._generation)
+        self._generation = generation
+        self._generation_checked = now
+        
+        if changed and not force and self.hot_cache is not None:
+            self.schedule_hot_query_refresh()
+        return generation
+    
+    def _get_cached_results(self, query: str, cache_params: Dict[str, Any],
+                            generation: int) -> Optional[List[SearchResult]]:
+        """Look a query up in the hot-query cache, then the memory cache"""
+        if self.hot_cache is not None:
+            results = self.hot_cache.get(query, cache_params, generation)
+            if results is not None:
+                return results
+        results = self.search_cache.get(
+            query, {**cache_params, 'generation': generation}
+        )
+        if results is not None and self.hot_cache is not None:
+            # A repeat served from memory may have just become hot
+            self.hot_cache.put(query, cache_params, results, generation)
         return results
     
+    def _cache_results(self, query: str, cache_params: Dict[str, Any],
+                       results: List[SearchResult], generation: int):
+        """Store results in the memory cache and, if hot, persist them"""
+        self.search_cache.put(
+            query, {**cache_params, 'generation': generation}, results
+        )
+        if self.hot_cache is not None:
+            self.hot_cache.put(query, cache_params, results, generation)
+    
+    def schedule_hot_query_refresh(self) -> bool:
+        """
+        Refresh stale hot queries on a background thread.
+        
+        Returns:
+            True if a refresh was started, False if one is already running
+            or the hot-query cache is disabled
+        """
+        if self.hot_cache is None or self._closed:
+            return False
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            return False
+        
+        self._refresh_thread = threading.Thread(
+            target=self.refresh_hot_queries,
+            name="HotQueryRefresh",
+            daemon=True
+        )
+        self._refresh_thread.start()
+        return True
+    
+    def shutdown(self, timeout: Optional[float] = None) -> bool:
+        """
+        Stop refreshing hot queries and wait for a refresh in progress.
+        
+        Returns:
+            True if no refresh thread is left running
+        """
+        self._closed = True
+        thread = self._refresh_thread
+        if thread is None:
+            return True
+        thread.join(timeout)
+        return not thread.is_alive()
+    
+    def refresh_hot_queries(self) -> Dict[str, Any]:
+        """
+        Bring persisted hot queries up to the current index generation.
+        
+        Entries whose result set includes a changed file are recomputed.
+        The rest are carried forward unless a changed file now holds a
+        chunk that could enter their results: one scoring at least the
+        entry's admission score, or for hybrid entries one that contains a
+        query keyword.
+        
+        Returns:
+            Dict with success status and recomputed/carried_forward counts
+        """
+        if self.hot_cache is None:
+            return {"success": False, "error": "Hot-query cache is disabled"}
+        
+        try:
+            self.hot_cache.flush()
+            generation = self._current_generation(force=True)
+            stale = self.hot_cache.stale_entries(generation)
+            if not stale:
+                return {"success": True, "generation": generation,
+                        "recomputed": 0, "carried_forward": 0}
+            
+            changed = self.db.get_changed_files(
+                min(entry['generation'] for entry in stale)
+            )
+            if not changed.get('success'):
+                return changed
+            changed_files = changed['files']
+            
+            recompute, confirm, check = [], [], []
+            for entry in stale:
+                paths = {
+                    path for path, changed_at in changed_files.items()
+                    if changed_at > entry['generation']
+                }
+                if not paths:
+                    confirm.append(entry)
+                elif paths & {r.file_path for r in entry['results']}:
+                    recompute.append(entry)
+                else:
+                    check.append((entry, paths))
+            
+            if check:
+                affected = self._entries_reached_by_changes(check)
+                for entry, _ in check:
+                    if entry['cache_key'] in affected:
+                        recompute.append(entry)
+                    else:
+                        confirm.append(entry)
+            
+            if confirm:
+                self.hot_cache.confirm(
+                    [entry['cache_key'] for entry in confirm], generation
+                )
+            for entry in recompute:
+                if self._closed:
+                    break
+                self._recompute_hot_query(entry)
+            
+            self.logger.info(
+                f"Hot queries refreshed for generation {generation}: "
+                f"{len(recompute)} recomputed, {len(confirm)} carried forward"
+            )
+            return {
+                "success": True,
+                "generation": generation,
+                "recomputed": len(recompute),
+                "carried_forward": len(confirm)
+            }
+            
+        except Exception as e:
+            self.logger.error(f"Error refreshing hot queries: {str(e)}")
+            return {"success": False, "error": str(e)}
+    
+    def _entries_reached_by_changes(
+        self, checks: List[Tuple[Dict[str, Any], Set[str]]]
+    ) -> Set[str]:
+        """Cache keys of entries that a chunk in their changed files could enter"""
+        changed_paths = set().union(*(paths for _, paths in checks))
+        rows = self.db.get_all_embeddings(file_paths=sorted(changed_paths))
+        if not rows:
+            return set()
+        
+        matrix = np.vstack([
+            np.asarray(json.loads(row['embedding_vector'])
+                       if isinstance(row['embedding_vector'], str)
+                       else row['embedding_vector'], dtype=np.float32)
+            for row in rows
+        ])
+        sq_norms = np.einsum('ij,ij->i', matrix, matrix)
+        query_matrix = np.vstack(
+            self.embedding_generator.generate_embeddings_batch(
+                [entry['query'] for entry, _ in checks],
+                normalize=True, show_progress=False
+            )
+        ).astype(np.float32, copy=False)
+        
+        row_paths = np.array([row['file_path'] for row in rows])
+        row_types = [row.get('file_type') for row in rows]
+        affected = set()
+        
+        for (entry, paths), query_vector in zip(checks, query_matrix):
+            params = entry['params']
+            file_types = params.get('file_types')
+            mask = np.isin(row_paths, list(paths))
+            if file_types:
+                mask &= np.array([t in file_types for t in row_types])
+            if not mask.any():
+                continue
+            
+            scores = self._similarity_scores(
+                query_vector[None, :], matrix[mask], sq_norms[mask],
+                params.get('metric', 'cosine')
+            )[0]
+            admission = (params.get('threshold') or
+                         self.DEFAULT_SIMILARITY_THRESHOLD)
+            results = entry['results']
+            if params.get('type') != 'hybrid' and len(results) >= params['top_k']:
+                admission = max(admission, min(r.score for r in results))
+            if scores.max() >= admission:
+                affected.add(entry['cache_key'])
+                continue
+            
+            if params.get('type') == 'hybrid':
+                keywords = self._extract_keywords(entry['query'])
+                if any(
+                    keyword in rows[i]['content'].lower()
+                    for i in np.flatnonzero(mask) for keyword in keywords
+                ):
+                    affected.add(entry['cache_key'])
+        
+        return affected
+    
+    def _recompute_hot_query(self, entry: Dict[str, Any]):
+        """Re-run a hot query against the current index"""
+        params = entry['params']
+        if params.get('type') == 'hybrid':
+            self.hybrid_search(
+                entry['query'],
+                top_k=params['top_k'],
+                vector_weight=params['vector_weight'],
+                keyword_weight=params['keyword_weight'],
+                similarity_threshold=params['threshold'],
+                file_types=params['file_types'],
+                rerank=params['rerank']
+            )
+        else:
+            self.search(
+                entry['query'],
+                top_k=params['top_k'],
+                similarity_threshold=params['threshold'],
+                file_types=params['file_types'],
+                distance_metric=params['metric']
+            )
+    
     def clear_cache(self):
         """Clear all caches"""
         if self.enable_caching:
             self.search_cache.clear()
         self._embeddings_cache = None
         self._embeddings_cache_time = 0
+        self._embedding_matrix = None
+        self._embedding_sq_norms = None
+        if self.hot_cache is not None:
+            self.hot_cache.clear()
         self.logger.info("Search caches cleared")
     
     def get_performance_stats(self) -> Dict[str, Any]:
@@ -488,6 +1279,8 @@ class OptimizedVectorSearchEngine(VectorSearchEngine):
         
         if self.enable_caching:
             stats["search_cache"] = self.search_cache.get_stats()
+        if self.hot_cache is not None:
+            stats["hot_query_cache"] = self.hot_cache.get_stats()
         
         if self._embeddings_cache is not None:
             stats["embeddings_cache"] = {
@@ -502,6 +1295,9 @@ class OptimizedVectorSearchEngine(VectorSearchEngine):
         """
         Warm up the cache with common queries.
         
+        Persisted hot queries are refreshed for the current index first,
+        so only queries without a valid entry are searched again.
+        
         Args:
             common_queries: List of common search queries
             **search_params: Parameters to use for searches
@@ -515,6 +1311,9 @@ class OptimizedVectorSearchEngine(VectorSearchEngine):
         # Load embeddings into cache
         self._get_cached_embeddings()
         
+        if self.hot_cache is not None:
+            self.refresh_hot_queries()
+        
         # Perform searches to populate cache
         for query in common_queries:
             try:
@@ -530,6 +1329,12 @@ class SearchOptimizer:
     Utility class for optimizing search queries and results
     """
     
+    # Signature estimates this close to the threshold are checked exactly
+    DEDUP_EXACT_MARGIN = 0.2
+    # Below this threshold LSH banding has poor recall, so every kept
+    # result is a candidate
+    DEDUP_MIN_LSH_THRESHOLD = 0.2
+    
     def __init__(self):
         self.logger = Logger()
         self.stop_words = {
@@ -636,6 +1441,11 @@ class SearchOptimizer:
         """
         Remove duplicate or highly similar results.
         
+        MinHash signatures stored with each chunk are bucketed with LSH,
+        so each result is only compared with kept results that share a
+        band. Candidates are settled by their signature estimate, falling
+        back to exact word-set Jaccard near the threshold.
+        
         Args:
             results: List of search results
             similarity_threshold: Threshold for considering results as duplicates
@@ -646,40 +1456,145 @@ class SearchOptimizer:
         if len(results) <= 1:
             return results
         
-        deduplicated = [results[0]]
+        token_sets: Dict[int, Set[str]] = {}
+        signatures = self._result_signatures(results, token_sets)
+        # Text without words has zero similarity to everything
+        empty = (signatures[:, 0] == EMPTY_HASH).tolist()
+        
+        if similarity_threshold >= self.DEDUP_MIN_LSH_THRESHOLD:
+            bands, rows = lsh_band_layout(similarity_threshold)
+            offsets, bucket_keys = self._colliding_band_keys(
+                signatures, bands, rows, empty
+            )
+        else:
+            offsets = bucket_keys = None
         
-        for result in results[1:]:
-            is_duplicate = False
+        kept_chunks: Dict[str, Set[int]] = defaultdict(set)
+        buckets: Dict[int, List[int]] = {}
+        kept: List[int] = []
+        deduplicated = []
+        
+        for i, result in enumerate(results):
+            # Check if from same file and overlapping chunks
+            chunks = kept_chunks.get(result.file_id)
+            if chunks and (result.chunk_index in chunks or
+                           result.chunk_index - 1 in chunks or
+                           result.chunk_index + 1 in chunks):
+                continue
             
-            for kept_result in deduplicated:
-                # Check if from same file and overlapping chunks
-                if (result.file_id == kept_result.file_id and
-                    abs(result.chunk_index - kept_result.chunk_index) <= 1):
-                    is_duplicate = True
-                    break
-                
-                # Check content similarity
-                if self._text_similarity(
-                    result.content,
-                    kept_result.content
-                ) > similarity_threshold:
-                    is_duplicate = True
-                    break
+            keys = ()
+            if empty[i]:
+                candidates = ()
+            elif offsets is None:
+                candidates = kept
+            else:
+                # Only results sharing an LSH band with another result
+                # can be near duplicates
+                keys = bucket_keys[offsets[i]:offsets[i + 1]]
+                candidates = set()
+                for key in keys:
+                    candidates.update(buckets.get(key, ()))
+            
+            if candidates and any(
+                not empty[j] and self._is_near_duplicate(
+                    i, j, results, signatures, token_sets,
+                    similarity_threshold
+                )
+                for j in candidates
+            ):
+                continue
             
-            if not is_duplicate:
-                deduplicated.append(result)
+            for key in keys:
+                buckets.setdefault(key, []).append(i)
+            kept.append(i)
+            kept_chunks[result.file_id].add(result.chunk_index)
+            deduplicated.append(result)
         
         return deduplicated
     
-    def _text_similarity(self, text1: str, text2: str) -> float:
-        """Calculate simple text similarity using Jaccard index"""
-        words1 = set(text1.lower().split())
-        words2 = set(text2.lower().split())
+    @staticmethod
+    def _result_signatures(results: List[SearchResult],
+                           token_sets: Dict[int, Set[str]]) -> np.ndarray:
+        """Stored MinHash signatures of results, computed where missing"""
+        encoded = [
+            result.metadata.get(SIGNATURE_KEY) if result.metadata else None
+            for result in results
+        ]
+        width = NUM_PERMUTATIONS * 8
+        if all(isinstance(e, str) and len(e) == width for e in encoded):
+            # Decode every stored signature in one pass
+            try:
+                return np.frombuffer(
+                    bytes.fromhex(''.join(encoded)), dtype='<u4'
+                ).reshape(len(results), NUM_PERMUTATIONS).astype(np.uint32)
+            except ValueError:
+                pass
+        
+        signatures = np.empty((len(results), NUM_PERMUTATIONS),
+                              dtype=np.uint32)
+        for i, result in enumerate(results):
+            signature = decode_signature(encoded[i])
+            if signature is None:
+                tokens = token_sets[i] = tokenize(result.content)
+                signature = minhash_signature(result.content, tokens)
+            signatures[i] = signature
+        return signatures
+    
+    @staticmethod
+    def _colliding_band_keys(
+        signatures: np.ndarray, bands: int, rows: int, empty: List[bool]
+    ) -> Tuple[List[int], List[int]]:
+        """
+        Hash each signature band to a bucket key, keeping only keys that
+        at least two results share.
+        
+        Returns:
+            Tuple of per-result offsets into the key list and the flat
+            list of colliding keys, grouped by result
+        """
+        # Odd multipliers differ per band, so keys of different bands
+        # rarely meet in the shared bucket map
+        multipliers = np.random.default_rng(rows).integers(
+            1, 2 ** 63, (bands, rows), dtype=np.uint64
+        ) | np.uint64(1)
+        banded = signatures.astype(np.uint64).reshape(-1, bands, rows)
+        keys = (banded * multipliers).sum(axis=2)
+        
+        collides = np.zeros(keys.shape, dtype=bool)
+        live = ~np.asarray(empty, dtype=bool)
+        for band in range(bands):
+            _, inverse, counts = np.unique(
+                keys[live, band], return_inverse=True, return_counts=True
+            )
+            collides[live, band] = counts[inverse] > 1
         
-        intersection = words1.intersection(words2)
-        union = words1.union(words2)
+        offsets = np.concatenate((
+            [0], np.cumsum(collides.sum(axis=1))
+        )).tolist()
+        return offsets, keys[collides].tolist()
+    
+    def _is_near_duplicate(self, i: int, j: int,
+                           results: List[SearchResult],
+                           signatures: np.ndarray,
+                           token_sets: Dict[int, Set[str]],
+                           threshold: float) -> bool:
+        """Decide whether results i and j exceed the similarity threshold"""
+        estimate = np.count_nonzero(
+            signatures[i] == signatures[j]
+        ) / NUM_PERMUTATIONS
+        if estimate - threshold >= self.DEDUP_EXACT_MARGIN:
+            return True
+        if threshold - estimate >= self.DEDUP_EXACT_MARGIN:
+            return False
         
-        return len(intersection) / len(union) if union else 0.0
+        for index in (i, j):
+            if index not in token_sets:
+                token_sets[index] = tokenize(results[index].content)
+        return jaccard(token_sets[i], token_sets[j]) > threshold
+    
+    def _text_similarity(self, text1: str, text2: str) -> float:
+        """Calculate simple text similarity using Jaccard index"""
+        return jaccard(tokenize(text1), tokenize(text2))
 
 
 # Import os for cpu_count
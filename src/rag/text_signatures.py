@@ -0,0 +1,109 @@
+"""
+MinHash signatures for near-duplicate detection in DinoAir 2.0 RAG.
+Signatures are computed once per chunk at index time and stored in the
+chunk metadata, so search-time deduplication never re-tokenizes text
+it does not have to.
+"""
+
+import zlib
+from typing import Optional, Set, Tuple
+
+import numpy as np
+
+
+# Number of hash permutations per signature
+NUM_PERMUTATIONS = 64
+
+# Key under which encoded signatures are stored in chunk metadata
+SIGNATURE_KEY = 'minhash'
+
+# Largest 32-bit prime; a * x + b stays below 2**64 for 32-bit inputs
+_PRIME = np.uint64(4294967291)
+
+# Fixed seed so stored signatures stay comparable across runs
+_rng = np.random.default_rng(0x5EED)
+_A = _rng.integers(1, int(_PRIME), NUM_PERMUTATIONS, dtype=np.uint64)
+_B = _rng.integers(0, int(_PRIME), NUM_PERMUTATIONS, dtype=np.uint64)
+
+# Hash value no token can produce; fills the signature of empty text
+EMPTY_HASH = int(_PRIME)
+_EMPTY_SIGNATURE = np.full(NUM_PERMUTATIONS, EMPTY_HASH, dtype=np.uint32)
+
+
+def tokenize(text: str) -> Set[str]:
+    """Split text into the word set used for Jaccard similarity."""
+    return set(text.lower().split())
+
+
+def jaccard(tokens1: Set[str], tokens2: Set[str]) -> float:
+    """Exact Jaccard index of two token sets."""
+    union = len(tokens1 | tokens2)
+    return len(tokens1 & tokens2) / union if union else 0.0
+
+
+def minhash_signature(text: str,
+                      tokens: Optional[Set[str]] = None) -> np.ndarray:
+    """
+    Compute the MinHash signature of a text.
+
+    Args:
+        text: Text to sign
+        tokens: Pre-computed token set of the text, if available
+
+    Returns:
+        uint32 array of NUM_PERMUTATIONS minimum hash values
+    """
+    if tokens is None:
+        tokens = tokenize(text)
+    if not tokens:
+        return _EMPTY_SIGNATURE.copy()
+
+    # crc32 is stable across processes, unlike the built-in hash()
+    hashes = np.fromiter(
+        (zlib.crc32(token.encode('utf-8')) for token in tokens),
+        dtype=np.uint64, count=len(tokens)
+    )
+    permuted = (_A[:, None] * hashes[None, :] + _B[:, None]) % _PRIME
+    return permuted.min(axis=1).astype(np.uint32)
+
+
+def encode_signature(signature: np.ndarray) -> str:
+    """Encode a signature as a hex string for JSON metadata."""
+    return signature.astype('<u4').tobytes().hex()
+
+
+def decode_signature(encoded: Optional[str]) -> Optional[np.ndarray]:
+    """Decode a stored signature, returning None if it is unusable."""
+    if not isinstance(encoded, str):
+        return None
+    try:
+        signature = np.frombuffer(bytes.fromhex(encoded), dtype='<u4')
+    except ValueError:
+        return None
+    if signature.shape[0] != NUM_PERMUTATIONS:
+        return None
+    return signature.astype(np.uint32)
+
+
+def lsh_band_layout(threshold: float,
+                    min_recall: float = 0.995) -> Tuple[int, int]:
+    """
+    Choose an LSH banding for a Jaccard threshold.
+
+    Picks the most selective layout (most rows per band) that still
+    makes pairs at the threshold candidates with at least min_recall
+    probability.
+
+    Returns:
+        Tuple of (bands, rows_per_band)
+    """
+    threshold = min(max(threshold, 0.0), 1.0)
+    best = (NUM_PERMUTATIONS, 1)
+    for rows in range(1, NUM_PERMUTATIONS + 1):
+        if NUM_PERMUTATIONS % rows:
+            continue
+        bands = NUM_PERMUTATIONS // rows
+        recall = 1.0 - (1.0 - threshold ** rows) ** bands
+        if recall >= min_recall:
+            best = (bands, rows)
+    return best
@@ -414,7 +414,7 @@ class VectorSearchEngine:
                 cursor = conn.cursor()
                 
                 # Build query
-                query = '''
+                query = f'''
                     SELECT 
                         e.id as embedding_id,
                         e.chunk_id,
@@ -422,7 +422,7 @@ class VectorSearchEngine:
                         e.model_name,
                         c.file_id,
                         c.chunk_index,
-                        c.content,
+                        {self.db.CHUNK_TEXT_SQL} as content,
                         c.start_pos,
                         c.end_pos,
                         c.metadata as chunk_metadata,
@@ -515,12 +515,12 @@ class VectorSearchEngine:
                 cursor = conn.cursor()
                 
                 # Build query with LIKE conditions for each keyword
-                query = '''
+                query = f'''
                     SELECT 
                         c.id as chunk_id,
                         c.file_id,
                         c.chunk_index,
-                        c.content,
+                        {self.db.CHUNK_TEXT_SQL} as content,
                         c.start_pos,
                         c.end_pos,
                         c.metadata as chunk_metadata,
@@ -535,7 +535,7 @@ class VectorSearchEngine:
                 
                 for keyword in keywords:
                     like_condition = (
-                        "CASE WHEN LOWER(c.content) LIKE ? "
+                        f"CASE WHEN LOWER({self.db.CHUNK_TEXT_SQL}) LIKE ? "
                         "THEN 1 ELSE 0 END"
                     )
                     like_conditions.append(like_condition)
@@ -553,7 +553,9 @@ class VectorSearchEngine:
                 # Add WHERE conditions
                 where_conditions = []
                 for keyword in keywords:
-                    where_conditions.append("LOWER(c.content) LIKE ?")
+                    where_conditions.append(
+                        f"LOWER({self.db.CHUNK_TEXT_SQL}) LIKE ?"
+                    )
                     params.append(f'%{keyword}%')
                 
                 query += ' OR '.join(where_conditions)
@@ -149,7 +149,8 @@ class ModelInterface(ABC):
     async def stream_generate(
         self, 
         request: ModelRequest,
-        callback: Callable[[str], None]
+        callback: Callable[[str], None],
+        on_tool_call: Optional[Callable[[Dict[str, Any]], None]] = None
     ) -> ModelResponse:
         """
         Generate a streaming response from the model
@@ -157,6 +158,9 @@ class ModelInterface(ABC):
         Args:
             request: Standard model request
             callback: Function to call with each chunk
+            on_tool_call: Function to call with each tool call as soon as
+                it is complete, by models that find tool calls while
+                streaming; the rest ignore it
             
         Returns:
             Final model response
@@ -346,7 +350,8 @@ class StandardModelAdapter(ModelInterface):
     async def stream_generate(
         self,
         request: ModelRequest,
-        callback: Callable[[str], None]
+        callback: Callable[[str], None],
+        on_tool_call: Optional[Callable[[Dict[str, Any]], None]] = None
     ) -> ModelResponse:
         """Generate a streaming response"""
         if not self.supports_capability(ModelCapabilities.STREAMING):
@@ -191,7 +191,8 @@ class BaseModelAdapter(ModelInterface):
     async def stream_generate(
         self,
         request: ModelRequest,
-        callback: Callable[[str], None]
+        callback: Callable[[str], None],
+        on_tool_call: Optional[Callable[[Dict[str, Any]], None]] = None
     ) -> ModelResponse:
         """
         Stream generate a response
@@ -199,6 +200,7 @@ class BaseModelAdapter(ModelInterface):
         Args:
             request: Model request
             callback: Function to call with each chunk
+            on_tool_call: Not used by this adapter
             
         Returns:
             Final model response
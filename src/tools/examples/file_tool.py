@@ -9,13 +9,14 @@ import os
 import json
 import logging
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 import hashlib
 
 from src.tools.base import (
     BaseTool, ToolMetadata, ToolParameter, ToolResult,
     ToolStatus, ToolCategory, ParameterType, ToolProgress
 )
+from src.utils.directory_walker import list_walk
 
 
 logger = logging.getLogger(__name__)
@@ -132,6 +133,42 @@ class FileTool(BaseTool):
                     default=False,
                     example=True
                 ),
+                ToolParameter(
+                    name="max_depth",
+                    type=ParameterType.INTEGER,
+                    description="Maximum directory depth for recursive "
+                                "operations (0 = top level only)",
+                    required=False,
+                    min_value=0,
+                    example=2
+                ),
+                ToolParameter(
+                    name="max_results",
+                    type=ParameterType.INTEGER,
+                    description="Stop listing or searching after this "
+                                "many entries",
+                    required=False,
+                    default=10000,
+                    min_value=1,
+                    example=500
+                ),
+                ToolParameter(
+                    name="ignore_patterns",
+                    type=ParameterType.ARRAY,
+                    description="Glob patterns for names to skip, "
+                                "including whole directories",
+                    required=False,
+                    example=[".git", "node_modules", "*.tmp"]
+                ),
+                ToolParameter(
+                    name="parallel",
+                    type=ParameterType.BOOLEAN,
+                    description="Traverse subdirectories in parallel "
+                                "(result order is not preserved)",
+                    required=False,
+                    default=False,
+                    example=True
+                ),
                 ToolParameter(
                     name="create_parents",
                     type=ParameterType.BOOLEAN,
@@ -556,24 +593,23 @@ class FileTool(BaseTool):
                     errors=[f"Not a directory: {path}"]
                 )
             
-            if recursive:
-                files = list(path.rglob(pattern))
-            else:
-                files = list(path.glob(pattern))
+            entries, truncated = list_walk(
+                path, **self._walk_options(params, recursive)
+            )
             
             file_info = []
-            for f in files:
-                if f.is_file():
+            for entry in entries:
+                if entry.is_dir:
                     file_info.append({
-                        'path': str(f.relative_to(path)),
-                        'size': f.stat().st_size,
-                        'modified': f.stat().st_mtime,
-                        'is_dir': False
+                        'path': entry.rel_path,
+                        'is_dir': True
                     })
-                elif f.is_dir():
+                else:
                     file_info.append({
-                        'path': str(f.relative_to(path)),
-                        'is_dir': True
+                        'path': entry.rel_path,
+                        'size': entry.size,
+                        'modified': entry.modified,
+                        'is_dir': False
                     })
             
             return ToolResult(
@@ -583,8 +619,10 @@ class FileTool(BaseTool):
                     'path': str(path),
                     'count': len(file_info),
                     'pattern': pattern,
-                    'recursive': recursive
-                }
+                    'recursive': recursive,
+                    'truncated': truncated
+                },
+                warnings=self._truncation_warnings(truncated, params)
             )
             
         except Exception as e:
@@ -605,6 +643,7 @@ class FileTool(BaseTool):
                     errors=[f"Path does not exist: {path}"]
                 )
             
+            truncated = False
             if path.is_file():
                 # Single file check
                 if path.match(pattern):
@@ -613,11 +652,13 @@ class FileTool(BaseTool):
                     found = []
             else:
                 # Directory search
-                if recursive:
-                    found = [str(f) for f in path.rglob(pattern)
-                             if f.is_file()]
-                else:
-                    found = [str(f) for f in path.glob(pattern) if f.is_file()]
+                entries, truncated = list_walk(
+                    path,
+                    include_dirs=False,
+                    with_stat=False,
+                    **self._walk_options(params, recursive)
+                )
+                found = [entry.path for entry in entries]
             
             return ToolResult(
                 success=True,
@@ -626,8 +667,10 @@ class FileTool(BaseTool):
                     'path': str(path),
                     'pattern': pattern,
                     'count': len(found),
-                    'recursive': recursive
-                }
+                    'recursive': recursive,
+                    'truncated': truncated
+                },
+                warnings=self._truncation_warnings(truncated, params)
             )
             
         except Exception as e:
@@ -636,6 +679,30 @@ class FileTool(BaseTool):
                 errors=[f"Search error: {e}"]
             )
     
+    def _truncation_warnings(
+        self, truncated: bool, params: Dict[str, Any]
+    ) -> List[str]:
+        """Warn when the walk stopped at max_results"""
+        if not truncated:
+            return []
+        max_results = params.get('max_results', 10000)
+        logger.warning(f"Results truncated at max_results={max_results}")
+        return [f"Results truncated at {max_results} entries; "
+                f"raise max_results to see more"]
+    
+    def _walk_options(
+        self, params: Dict[str, Any], recursive: bool
+    ) -> Dict[str, Any]:
+        """Build directory walker options from tool parameters"""
+        return {
+            'pattern': params.get('pattern', '*'),
+            'recursive': recursive,
+            'max_depth': params.get('max_depth'),
+            'max_results': params.get('max_results', 10000),
+            'ignore_patterns': params.get('ignore_patterns'),
+            'parallel': params.get('parallel', False)
+        }
+    
     def _calculate_checksum(
         self, path: Path, params: Dict[str, Any]
     ) -> ToolResult:
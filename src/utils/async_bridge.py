@@ -0,0 +1,189 @@
+"""
+Async Bridge for DinoAir 2.0
+Runs a blocking iterator on a worker thread and hands its items to a
+coroutine, so blocking client libraries can be streamed from async code
+without stalling the event loop.
+"""
+
+import asyncio
+import threading
+from typing import Any, Callable, Generic, Iterable, Optional, TypeVar
+
+from .logger import Logger
+
+logger = Logger()
+
+T = TypeVar('T')
+
+# Marks the end of the stream in the queue
+_DONE = object()
+
+
+class _Failure:
+    """An exception raised by the producer, to be raised in the consumer"""
+
+    __slots__ = ('error',)
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class ThreadStreamBridge(Generic[T]):
+    """Async iterator over the items of a blocking iterable that is
+    produced on its own thread.
+
+    The producer thread passes each item to the event loop with
+    call_soon_threadsafe, into a bounded asyncio.Queue. It takes one of
+    maxsize slots for every item not yet consumed and waits when none are
+    free, so a slow consumer holds the producer back instead of letting
+    items pile up.
+
+    Closing the bridge stops the producer. This happens on aclose(), on
+    leaving an ``async with`` block, or on cancelling the consuming task
+    inside one. The producer stops before pulling the next item and closes
+    the iterator on its own thread, which for streaming HTTP clients also
+    closes the response.
+
+    Usage:
+        async with ThreadStreamBridge(lambda: client.stream(...)) as items:
+            async for item in items:
+                ...
+    """
+
+    def __init__(self, produce: Callable[[], Iterable[T]],
+                 maxsize: int = 64, name: str = "async-bridge"):
+        """
+        Args:
+            produce: Called on the worker thread to get the iterable
+            maxsize: Most items handed over but not yet consumed
+            name: Name of the worker thread
+        """
+        self._produce = produce
+        self._maxsize = max(1, maxsize)
+        self._name = name
+        self._slots = threading.Semaphore(self._maxsize)
+        self._cancelled = threading.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._finished = False
+
+    @property
+    def cancelled(self) -> bool:
+        """True once the consumer has closed the bridge"""
+        return self._cancelled.is_set()
+
+    def _start(self):
+        if self._thread is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        # One place more than there are slots, for the end marker
+        self._queue = asyncio.Queue(self._maxsize + 1)
+        self._thread = threading.Thread(target=self._run, name=self._name,
+                                        daemon=True)
+        self._thread.start()
+
+    # --- Producer thread -------------------------------------------------
+
+    def _run(self):
+        iterator = None
+        try:
+            iterator = iter(self._produce())
+            while True:
+                # Wait for the consumer to make room before pulling more
+                self._slots.acquire()
+                if self._cancelled.is_set():
+                    break
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                if not self._hand_over(item):
+                    break
+            self._hand_over(_DONE)
+        except BaseException as e:
+            self._hand_over(_Failure(e))
+        finally:
+            if self._cancelled.is_set():
+                close = getattr(iterator, 'close', None)
+                if close is not None:
+                    try:
+                        close()
+                    except Exception as e:
+                        logger.warning(f"Closing bridged iterator failed: {e}")
+
+    def _hand_over(self, item: Any) -> bool:
+        """Queue an item on the event loop; False once it is unreachable"""
+        if self._cancelled.is_set():
+            return False
+        try:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, item)
+            return True
+        except RuntimeError:
+            # The event loop was closed under us
+            self._cancelled.set()
+            return False
+
+    # --- Consumer --------------------------------------------------------
+
+    def __aiter__(self) -> 'ThreadStreamBridge[T]':
+        return self
+
+    async def __anext__(self) -> T:
+        if self._finished or self._cancelled.is_set():
+            raise StopAsyncIteration
+        self._start()
+        item = await self._queue.get()
+        if item is _DONE:
+            self._finished = True
+            raise StopAsyncIteration
+        if isinstance(item, _Failure):
+            self._finished = True
+            raise item.error
+        self._slots.release()
+        return item
+
+    async def aclose(self):
+        """Stop the producer; it exits before pulling its next item"""
+        self.close()
+
+    def close(self):
+        """Stop the producer from any thread"""
+        if not self._cancelled.is_set():
+            self._cancelled.set()
+            # Wake the producer if it is waiting for a slot
+            self._slots.release()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the producer thread to exit, e.g. in tests"""
+        if self._thread is None:
+            return True
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    async def __aenter__(self) -> 'ThreadStreamBridge[T]':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def __del__(self):
+        self.close()
+
+
+def iterate_in_thread(produce: Callable[[], Iterable[T]],
+                      maxsize: int = 64,
+                      name: str = "async-bridge") -> ThreadStreamBridge[T]:
+    """
+    Iterate a blocking iterable from async code without blocking the loop
+
+    Args:
+        produce: Called on a worker thread to get the iterable
+        maxsize: Most items handed over but not yet consumed
+        name: Name of the worker thread
+
+    Returns:
+        ThreadStreamBridge: Async iterator and context manager over the items
+    """
+    return ThreadStreamBridge(produce, maxsize, name)
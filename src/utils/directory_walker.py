@@ -0,0 +1,277 @@
+"""
+Directory Walker for DinoAir 2.0
+Fast, bounded directory traversal built on os.scandir
+"""
+
+import os
+import fnmatch
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import PurePath
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+
+@dataclass
+class WalkEntry:
+    """A single file or directory produced by walk_directory."""
+    path: str
+    rel_path: str
+    name: str
+    is_dir: bool
+    depth: int
+    size: Optional[int] = None
+    modified: Optional[float] = None
+
+
+class _WalkOptions:
+    """Immutable options shared by every subtree scan of one walk."""
+
+    def __init__(self, pattern: str, recursive: bool,
+                 max_depth: Optional[int],
+                 ignore_patterns: Tuple[str, ...],
+                 include_files: bool, include_dirs: bool,
+                 follow_symlinks: bool, with_stat: bool):
+        self.pattern = pattern
+        # Patterns without a separator match the entry name, like rglob
+        self.match_name = '/' not in pattern and os.sep not in pattern
+        self.recursive = recursive
+        self.max_depth = max_depth if recursive else 0
+        self.ignore_patterns = ignore_patterns
+        self.include_files = include_files
+        self.include_dirs = include_dirs
+        self.follow_symlinks = follow_symlinks
+        self.with_stat = with_stat
+
+    def matches(self, name: str, rel_path: str) -> bool:
+        if self.pattern in ('*', '**'):
+            return True
+        if self.match_name:
+            return fnmatch.fnmatch(name, self.pattern)
+        return PurePath(rel_path).match(self.pattern)
+
+    def is_ignored(self, name: str) -> bool:
+        for ignore in self.ignore_patterns:
+            if fnmatch.fnmatch(name, ignore):
+                return True
+        return False
+
+
+def walk_directory(root: str,
+                   pattern: str = '*',
+                   recursive: bool = True,
+                   max_depth: Optional[int] = None,
+                   max_results: Optional[int] = None,
+                   ignore_patterns: Optional[Iterable[str]] = None,
+                   include_files: bool = True,
+                   include_dirs: bool = True,
+                   follow_symlinks: bool = False,
+                   with_stat: bool = True,
+                   parallel: bool = False,
+                   max_workers: Optional[int] = None) -> Iterator[WalkEntry]:
+    """
+    Walk a directory tree lazily, yielding matching entries.
+
+    Unlike Path.rglob followed by per-match stat() calls, each entry is
+    stat'ed at most once through its cached os.DirEntry, ignored
+    directories are never descended into and the walk stops as soon as
+    max_results entries have been produced.
+
+    Args:
+        root: Directory to walk
+        pattern: Glob pattern matched against entry names (or against
+            the relative path when the pattern contains a separator)
+        recursive: Descend into subdirectories
+        max_depth: Maximum depth to descend to; entries directly inside
+            root are at depth 0. None means unlimited
+        max_results: Stop after yielding this many entries
+        ignore_patterns: Glob patterns for names to skip entirely
+        include_files: Yield matching files
+        include_dirs: Yield matching directories
+        follow_symlinks: Follow symlinked directories while walking
+        with_stat: Populate size and modified from the entry's stat data
+        parallel: Scan top-level subtrees concurrently on a thread pool.
+            Entry order is not deterministic in this mode
+        max_workers: Thread pool size for parallel mode
+
+    Yields:
+        WalkEntry for every matching file or directory
+    """
+    options = _WalkOptions(
+        pattern=pattern or '*',
+        recursive=recursive,
+        max_depth=max_depth,
+        ignore_patterns=tuple(ignore_patterns or ()),
+        include_files=include_files,
+        include_dirs=include_dirs,
+        follow_symlinks=follow_symlinks,
+        with_stat=with_stat
+    )
+    if max_results is not None and max_results <= 0:
+        return
+
+    root = os.fspath(root)
+    if parallel and options.max_depth != 0:
+        entries = _walk_parallel(root, options, max_results, max_workers)
+    else:
+        entries = _scan_tree(root, '', 0, options, None)
+
+    count = 0
+    try:
+        for entry in entries:
+            yield entry
+            count += 1
+            if max_results is not None and count >= max_results:
+                break
+    finally:
+        entries.close()
+
+
+def list_walk(root: str, **kwargs) -> Tuple[List[WalkEntry], bool]:
+    """
+    Collect walk_directory results into a list.
+
+    Returns:
+        Tuple of (entries, truncated) where truncated is True when the
+        walk stopped because max_results was reached.
+    """
+    max_results = kwargs.get('max_results')
+    if max_results is None:
+        return list(walk_directory(root, **kwargs)), False
+
+    # Ask for one extra entry so truncation can be detected cheaply
+    kwargs['max_results'] = max_results + 1
+    entries = list(walk_directory(root, **kwargs))
+    truncated = len(entries) > max_results
+    return entries[:max_results], truncated
+
+
+def _scan_tree(root: str, rel_root: str, depth: int,
+               options: _WalkOptions,
+               stop: Optional[threading.Event]) -> Iterator[WalkEntry]:
+    """Depth-first scan of one subtree using an explicit stack."""
+    stack = [(root, rel_root, depth)]
+    while stack:
+        if stop is not None and stop.is_set():
+            return
+        dir_path, dir_rel, dir_depth = stack.pop()
+        try:
+            iterator = os.scandir(dir_path)
+        except OSError:
+            continue
+
+        subdirs = []
+        with iterator:
+            for dir_entry in iterator:
+                name = dir_entry.name
+                if options.ignore_patterns and options.is_ignored(name):
+                    continue
+                try:
+                    is_dir = dir_entry.is_dir(
+                        follow_symlinks=options.follow_symlinks
+                    )
+                except OSError:
+                    continue
+
+                rel_path = (
+                    f"{dir_rel}{os.sep}{name}" if dir_rel else name
+                )
+                if is_dir:
+                    if (options.max_depth is None or
+                            dir_depth < options.max_depth):
+                        subdirs.append(
+                            (dir_entry.path, rel_path, dir_depth + 1)
+                        )
+                    if not options.include_dirs:
+                        continue
+                elif not options.include_files:
+                    continue
+
+                if not options.matches(name, rel_path):
+                    continue
+
+                entry = WalkEntry(
+                    path=dir_entry.path,
+                    rel_path=rel_path,
+                    name=name,
+                    is_dir=is_dir,
+                    depth=dir_depth
+                )
+                if options.with_stat:
+                    try:
+                        # DirEntry caches this result, so each entry is
+                        # stat'ed at most once (and for free on Windows)
+                        stat = dir_entry.stat(
+                            follow_symlinks=options.follow_symlinks
+                        )
+                        entry.modified = stat.st_mtime
+                        if not is_dir:
+                            entry.size = stat.st_size
+                    except OSError:
+                        pass
+                yield entry
+
+        # Reverse so subdirectories are visited in scandir order
+        stack.extend(reversed(subdirs))
+
+
+def _walk_parallel(root: str, options: _WalkOptions,
+                   max_results: Optional[int],
+                   max_workers: Optional[int]) -> Iterator[WalkEntry]:
+    """Scan root serially, then each top-level subtree on a worker."""
+    stop = threading.Event()
+    subtrees = []
+
+    top_options = _WalkOptions(
+        pattern='*',
+        recursive=False,
+        max_depth=0,
+        ignore_patterns=options.ignore_patterns,
+        include_files=options.include_files,
+        include_dirs=True,
+        follow_symlinks=options.follow_symlinks,
+        with_stat=options.with_stat
+    )
+
+    produced = 0
+    for entry in _scan_tree(root, '', 0, top_options, None):
+        if entry.is_dir:
+            subtrees.append(entry)
+            if not options.include_dirs:
+                continue
+        elif not options.include_files:
+            continue
+        if not options.matches(entry.name, entry.rel_path):
+            continue
+        yield entry
+        produced += 1
+
+    def scan_subtree(subtree: WalkEntry) -> List[WalkEntry]:
+        limit = None if max_results is None else max_results - produced
+        results = []
+        for entry in _scan_tree(subtree.path, subtree.rel_path, 1,
+                                options, stop):
+            results.append(entry)
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+
+    if not subtrees:
+        return
+
+    executor = ThreadPoolExecutor(
+        max_workers=max_workers or min(32, (os.cpu_count() or 1) + 4),
+        thread_name_prefix='dir_walker'
+    )
+    futures = []
+    try:
+        futures = [executor.submit(scan_subtree, s) for s in subtrees]
+        for future in as_completed(futures):
+            for entry in future.result():
+                yield entry
+    finally:
+        # Reached when the consumer stops early; abandon pending subtrees
+        stop.set()
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
@@ -0,0 +1,820 @@
+"""
+Note Export for DinoAir 2.0
+Renders notes to the files of a notes export and writes them into a ZIP
+archive. Nothing here imports the GUI, so notes can be rendered in
+worker processes.
+"""
+
+import io
+import os
+import re
+import json
+import time
+import hashlib
+import zipfile
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, \
+    Optional, Tuple
+
+from src.input_processing.stages.enhanced_sanitizer import (
+    EnhancedInputSanitizer
+)
+from src.models.note import Note
+from src.utils.colors import DinoPitColors
+from src.utils.logger import Logger
+
+
+class RenderedNote(NamedTuple):
+    """Export files of one note"""
+    filename: str
+    html: str
+    text: str
+    # <li> line for the archive's index.html
+    index_item: str
+
+
+def sanitize_filename(filename: str) -> str:
+    """Sanitize filename to prevent path traversal and invalid characters.
+
+    Args:
+        filename: Original filename
+
+    Returns:
+        Sanitized filename
+    """
+    # Remove or replace invalid characters
+    filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
+
+    # Remove control characters
+    filename = ''.join(char for char in filename if ord(char) >= 32)
+
+    # Limit length
+    if len(filename) > 200:
+        filename = filename[:200]
+
+    # Remove leading/trailing dots and spaces
+    filename = filename.strip('. ')
+
+    # Default if empty
+    if not filename:
+        filename = "untitled"
+
+    return filename
+
+
+def plain_text_to_html(text: str) -> str:
+    """Convert plain text to HTML with basic formatting.
+
+    Args:
+        text: Plain text content
+
+    Returns:
+        HTML formatted text
+    """
+    # Escape HTML characters
+    text = text.replace('&', '&amp;')
+    text = text.replace('<', '&lt;')
+    text = text.replace('>', '&gt;')
+
+    # Convert line breaks to paragraphs
+    paragraphs = text.split('\n\n')
+    html_paragraphs = []
+
+    for para in paragraphs:
+        if para.strip():
+            # Convert single line breaks to <br>
+            para = para.replace('\n', '<br>')
+            html_paragraphs.append(f"<p>{para}</p>")
+
+    return "\n".join(html_paragraphs)
+
+
+def _parse_date(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+class NoteRenderer:
+    """Renders notes to HTML, plain text and index entries.
+
+    Titles and tags are sanitized the way NotesSecurity does; the limits
+    are passed in so this module does not depend on the GUI package.
+    """
+
+    def __init__(self, max_title_length: int = 255,
+                 max_tag_length: int = 50):
+        """Initialize the renderer.
+
+        Args:
+            max_title_length: Longest title kept when sanitizing
+            max_tag_length: Longest tag kept when sanitizing
+        """
+        self.max_title_length = max_title_length
+        self.max_tag_length = max_tag_length
+        self._sanitizer = EnhancedInputSanitizer()
+
+    @property
+    def limits(self) -> Tuple[int, int]:
+        """Arguments that recreate this renderer in another process"""
+        return self.max_title_length, self.max_tag_length
+
+    def sanitize_title(self, title: str) -> str:
+        """Sanitize a note title for display in HTML"""
+        if not title:
+            return ""
+        return self._sanitizer.sanitize_input(
+            title, context='plain', max_length=self.max_title_length,
+            strict_mode=True
+        )
+
+    def sanitize_tag(self, tag: str) -> Optional[str]:
+        """Sanitize a tag, or None if it should be dropped"""
+        if not tag or not tag.strip():
+            return None
+        sanitized = self._sanitizer.sanitize_input(
+            tag.strip(), context='plain', max_length=self.max_tag_length,
+            strict_mode=True
+        )
+        # Reject if tag changed significantly (possible attack)
+        if not sanitized or len(sanitized) < len(tag) * 0.5:
+            return None
+        return sanitized
+
+    def render(self, note: Note) -> RenderedNote:
+        """Render every export file of a note"""
+        title = self.sanitize_title(note.title)
+        filename = sanitize_filename(note.title)
+        return RenderedNote(
+            filename=filename,
+            html=self.html(note, title),
+            text=self.text(note),
+            index_item=self.index_item(note, title, filename)
+        )
+
+    def html(self, note: Note, title: Optional[str] = None) -> str:
+        """Generate HTML content for a note.
+
+        Args:
+            note: The note to convert to HTML
+            title: The note's sanitized title, if already known
+
+        Returns:
+            HTML string
+        """
+        if title is None:
+            title = self.sanitize_title(note.title)
+
+        # Format dates (parse ISO format strings)
+        created_date = _parse_date(note.created_at).strftime(
+            "%B %d, %Y at %I:%M %p"
+        )
+        updated_date = _parse_date(note.updated_at).strftime(
+            "%B %d, %Y at %I:%M %p"
+        )
+
+        # Format tags
+        tags_html = ""
+        if note.tags:
+            tags_html = ", ".join(
+                f'<span class="tag">{tag}</span>'
+                for tag in note.tags
+            )
+
+        # Get content
+        # Check if note has HTML content (from database)
+        content_html = getattr(note, 'content_html', None)
+        if not content_html:
+            # Convert plain text to HTML
+            content_html = plain_text_to_html(note.content)
+
+        # Generate complete HTML
+        return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title}</title>
+    <style>
+        body {{
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto,
+                         'Helvetica Neue', Arial, sans-serif;
+            line-height: 1.6;
+            color: #333;
+            max-width: 800px;
+            margin: 0 auto;
+            padding: 20px;
+            background-color: #f5f5f5;
+        }}
+
+        .note-container {{
+            background-color: white;
+            border-radius: 8px;
+            padding: 30px;
+            box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
+        }}
+
+        h1 {{
+            color: #1a1a1a;
+            margin-bottom: 10px;
+            font-size: 28px;
+            border-bottom: 2px solid {DinoPitColors.DINOPIT_ORANGE};
+            padding-bottom: 10px;
+        }}
+
+        .metadata {{
+            color: #666;
+            font-size: 14px;
+            margin-bottom: 20px;
+            padding: 10px;
+            background-color: #f9f9f9;
+            border-radius: 4px;
+        }}
+
+        .metadata p {{
+            margin: 5px 0;
+        }}
+
+        .tags {{
+            margin-top: 10px;
+        }}
+
+        .tag {{
+            display: inline-block;
+            background-color: {DinoPitColors.SOFT_ORANGE};
+            color: white;
+            padding: 3px 10px;
+            border-radius: 15px;
+            font-size: 12px;
+            margin-right: 5px;
+        }}
+
+        .content {{
+            margin-top: 30px;
+            font-size: 16px;
+            line-height: 1.8;
+        }}
+
+        .content p {{
+            margin-bottom: 15px;
+        }}
+
+        .content ul, .content ol {{
+            margin-bottom: 15px;
+            padding-left: 30px;
+        }}
+
+        .content li {{
+            margin-bottom: 5px;
+        }}
+
+        .content blockquote {{
+            border-left: 4px solid {DinoPitColors.DINOPIT_ORANGE};
+            padding-left: 15px;
+            margin: 15px 0;
+            color: #666;
+            font-style: italic;
+        }}
+
+        .content code {{
+            background-color: #f4f4f4;
+            padding: 2px 4px;
+            border-radius: 3px;
+            font-family: 'Courier New', Courier, monospace;
+            font-size: 14px;
+        }}
+
+        .content pre {{
+            background-color: #f4f4f4;
+            padding: 15px;
+            border-radius: 5px;
+            overflow-x: auto;
+            margin: 15px 0;
+        }}
+
+        .content pre code {{
+            background-color: transparent;
+            padding: 0;
+        }}
+
+        @media print {{
+            body {{
+                background-color: white;
+                padding: 0;
+            }}
+
+            .note-container {{
+                box-shadow: none;
+                padding: 0;
+            }}
+
+            .metadata {{
+                background-color: #f0f0f0;
+                print-color-adjust: exact;
+                -webkit-print-color-adjust: exact;
+            }}
+        }}
+    </style>
+</head>
+<body>
+    <div class="note-container">
+        <h1>{title}</h1>
+
+        <div class="metadata">
+            <p><strong>Created:</strong> {created_date}</p>
+            <p><strong>Last Updated:</strong> {updated_date}</p>
+            {f'<div class="tags"><strong>Tags:</strong> '
+             f'{tags_html}</div>' if tags_html else ''}
+        </div>
+
+        <div class="content">
+            {content_html}
+        </div>
+    </div>
+</body>
+</html>"""
+
+    def text(self, note: Note) -> str:
+        """Generate plain text content for a note.
+
+        Args:
+            note: The note to convert to text
+
+        Returns:
+            Plain text string
+        """
+        # Format dates (parse ISO format strings)
+        created_date = _parse_date(note.created_at).strftime(
+            "%B %d, %Y at %I:%M %p"
+        )
+        updated_date = _parse_date(note.updated_at).strftime(
+            "%B %d, %Y at %I:%M %p"
+        )
+
+        # Build text content
+        lines = [
+            "=" * 60,
+            note.title.upper(),
+            "=" * 60,
+            "",
+            f"Created: {created_date}",
+            f"Last Updated: {updated_date}",
+        ]
+
+        if note.tags:
+            lines.append(f"Tags: {', '.join(note.tags)}")
+
+        lines.extend([
+            "",
+            "-" * 60,
+            "",
+            note.content,
+            "",
+            "-" * 60
+        ])
+
+        return "\n".join(lines)
+
+    def index_item(self, note: Note, title: Optional[str] = None,
+                   filename: Optional[str] = None) -> str:
+        """Generate the index.html list entry linking to a note"""
+        if title is None:
+            title = self.sanitize_title(note.title)
+        if filename is None:
+            filename = sanitize_filename(note.title)
+
+        tags_html = ""
+        if note.tags:
+            tags = (self.sanitize_tag(tag) for tag in note.tags)
+            tags_html = " - " + ", ".join(
+                f'<span class="tag">{tag}</span>'
+                for tag in tags if tag
+            )
+
+        try:
+            date = _parse_date(note.created_at).strftime("%B %d, %Y")
+        except Exception:
+            date = "Unknown date"
+
+        return (
+            f'<li>'
+            f'<a href="html/{filename}.html">{title}</a>'
+            f'{tags_html}'
+            f'<span class="date"> ({date})</span>'
+            f'</li>'
+        )
+
+    def index_html_parts(self, total: int) -> Tuple[str, str]:
+        """HTML before and after the note list of index.html"""
+        head = f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Notes Export - Index</title>
+    <style>
+        body {{
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto,
+                         'Helvetica Neue', Arial, sans-serif;
+            line-height: 1.6;
+            color: #333;
+            max-width: 1000px;
+            margin: 0 auto;
+            padding: 20px;
+            background-color: #f5f5f5;
+        }}
+
+        .container {{
+            background-color: white;
+            border-radius: 8px;
+            padding: 30px;
+            box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
+        }}
+
+        h1 {{
+            color: #1a1a1a;
+            border-bottom: 2px solid {DinoPitColors.DINOPIT_ORANGE};
+            padding-bottom: 10px;
+        }}
+
+        .export-info {{
+            background-color: #f9f9f9;
+            padding: 15px;
+            border-radius: 5px;
+            margin-bottom: 30px;
+        }}
+
+        ul {{
+            list-style-type: none;
+            padding: 0;
+        }}
+
+        li {{
+            padding: 10px;
+            border-bottom: 1px solid #eee;
+            transition: background-color 0.2s;
+        }}
+
+        li:hover {{
+            background-color: #f9f9f9;
+        }}
+
+        a {{
+            color: {DinoPitColors.DINOPIT_ORANGE};
+            text-decoration: none;
+            font-weight: 500;
+        }}
+
+        a:hover {{
+            text-decoration: underline;
+        }}
+
+        .tag {{
+            display: inline-block;
+            background-color: {DinoPitColors.SOFT_ORANGE};
+            color: white;
+            padding: 2px 8px;
+            border-radius: 12px;
+            font-size: 11px;
+            margin: 0 2px;
+        }}
+
+        .date {{
+            color: #999;
+            font-size: 14px;
+            margin-left: 10px;
+        }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>📝 Notes Export</h1>
+
+        <div class="export-info">
+            <p><strong>Export Date:</strong>
+            {datetime.now().strftime("%B %d, %Y at %I:%M %p")}</p>
+            <p><strong>Total Notes:</strong> {total}</p>
+            <p>Click on any note title to view it.
+            Notes are available in both HTML and TXT formats.</p>
+        </div>
+
+        <h2>All Notes</h2>
+        <ul>
+            """
+        tail = """
+        </ul>
+    </div>
+</body>
+</html>"""
+        return head, tail
+
+
+# Renderer of a render process, set up by _init_render_process
+_process_renderer: Optional[NoteRenderer] = None
+
+
+def _init_render_process(max_title_length: int, max_tag_length: int):
+    global _process_renderer
+    _process_renderer = NoteRenderer(max_title_length, max_tag_length)
+
+
+def _render_notes(notes: List[Note]) -> List[RenderedNote]:
+    return [_process_renderer.render(note) for note in notes]
+
+
+class NotesArchiveWriter:
+    """Writes notes into a ZIP archive, resumably.
+
+    The archive is written to '<file_path>.partial' and moved into place
+    once complete. Every CHECKPOINT_SECONDS the archive is closed, which
+    leaves it a valid ZIP file, and the number of notes it holds is
+    saved to '<file_path>.partial.json'. Exporting the same notes to the
+    same path after a cancel or failure continues from the last
+    checkpoint; a partial archive that cannot be read is started over.
+
+    Large exports render notes in a pool of processes, a few chunks
+    ahead of the thread writing the archive, so only those chunks are
+    held in memory besides the index entries.
+    """
+
+    # Notes sent to a render process at a time
+    RENDER_CHUNK_SIZE = 100
+    # Exports with fewer notes render in the calling thread
+    PARALLEL_THRESHOLD = 500
+    # Seconds of writing between checkpoints
+    CHECKPOINT_SECONDS = 5.0
+    # Notes written between progress reports and cancel checks
+    PROGRESS_INTERVAL = 50
+
+    def __init__(self, renderer: Optional[NoteRenderer] = None,
+                 processes: Optional[int] = None):
+        """Initialize the writer.
+
+        Args:
+            renderer: Renderer for note files; a default one if omitted
+            processes: Render processes for large exports; defaults to
+                the number of CPUs, at most 4
+        """
+        self.logger = Logger()
+        self.renderer = renderer or NoteRenderer()
+        self.processes = processes or min(4, os.cpu_count() or 1)
+
+    def write(
+        self,
+        notes: List[Note],
+        file_path: str,
+        base_folder: str,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        should_cancel: Optional[Callable[[], bool]] = None
+    ) -> Dict[str, Any]:
+        """Write notes to a ZIP archive.
+
+        Args:
+            notes: Notes to export
+            file_path: Path of the finished archive
+            base_folder: Folder holding everything inside the archive;
+                a resumed export keeps the folder it started with
+            progress_callback: Called with (notes written, total) every
+                PROGRESS_INTERVAL notes and at the end
+            should_cancel: Polled with each progress update; returning
+                True stops the export at a resumable point
+
+        Returns:
+            Dictionary with export status
+        """
+        partial_path = file_path + '.partial'
+        state_path = partial_path + '.json'
+        total = len(notes)
+        fingerprint = self._fingerprint(notes)
+        done, base_folder = self._resume_point(
+            partial_path, state_path, fingerprint, base_folder
+        )
+        resumed_from = done
+        if done:
+            self.logger.info(
+                f"Resuming notes export at {done} of {total} notes"
+            )
+
+        archive = None
+        rendered_notes = self._render(notes, done)
+        finished = False
+        cancelled = False
+        index_items: List[Optional[str]] = [None] * total
+        try:
+            archive = zipfile.ZipFile(
+                partial_path, 'a' if done else 'w', zipfile.ZIP_DEFLATED
+            )
+            last_checkpoint = time.monotonic()
+            for position, rendered in rendered_notes:
+                self._write_entry(
+                    archive, f"{base_folder}/html/{rendered.filename}.html",
+                    rendered.html
+                )
+                self._write_entry(
+                    archive, f"{base_folder}/txt/{rendered.filename}.txt",
+                    rendered.text
+                )
+                index_items[position] = rendered.index_item
+                done = position + 1
+
+                if done % self.PROGRESS_INTERVAL == 0:
+                    if progress_callback:
+                        progress_callback(done, total)
+                    if should_cancel and should_cancel():
+                        cancelled = True
+                        break
+
+                if time.monotonic() - last_checkpoint >= \
+                        self.CHECKPOINT_SECONDS:
+                    archive.close()
+                    # Let the closed archive's entry list go before the
+                    # reopened one is read
+                    archive = None
+                    self._save_state(state_path, fingerprint, base_folder,
+                                     done)
+                    archive = zipfile.ZipFile(partial_path, 'a',
+                                              zipfile.ZIP_DEFLATED)
+                    last_checkpoint = time.monotonic()
+
+            if not cancelled:
+                # Index entries of notes written before resuming
+                for position in range(resumed_from):
+                    index_items[position] = self.renderer.index_item(
+                        notes[position]
+                    )
+                self._write_manifest(
+                    archive, f"{base_folder}/manifest.json", notes
+                )
+                self._write_index(
+                    archive, f"{base_folder}/index.html", notes,
+                    index_items
+                )
+                archive.close()
+                os.replace(partial_path, file_path)
+                finished = True
+
+        except Exception as e:
+            self.logger.error(f"Failed to export notes: {str(e)}")
+            return {
+                'success': False,
+                'error': f"Failed to export notes: {str(e)}",
+                'exported': done
+            }
+
+        finally:
+            # Stops render processes still working ahead
+            rendered_notes.close()
+            if not finished:
+                if archive is not None:
+                    archive.close()
+                self._save_state(state_path, fingerprint, base_folder, done)
+
+        if cancelled:
+            return {
+                'success': False,
+                'cancelled': True,
+                'error': "Export cancelled",
+                'exported': done
+            }
+
+        self._remove(state_path)
+        if progress_callback:
+            progress_callback(total, total)
+        return {
+            'success': True,
+            'file_path': file_path,
+            'note_count': total,
+            'resumed_from': resumed_from
+        }
+
+    def _render(self, notes: List[Note],
+                start: int) -> Iterator[Tuple[int, RenderedNote]]:
+        """Render notes from start on, yielding them in order"""
+        pending = notes[start:]
+        if self.processes <= 1 or len(pending) < self.PARALLEL_THRESHOLD:
+            for offset, note in enumerate(pending):
+                yield start + offset, self.renderer.render(note)
+            return
+
+        # Spawned processes do not inherit the GUI's threads or locks
+        pool = ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_render_process,
+            initargs=self.renderer.limits
+        )
+        in_flight = deque()
+        try:
+            size = self.RENDER_CHUNK_SIZE
+            position = start
+            for offset in range(0, len(pending), size):
+                in_flight.append(
+                    pool.submit(_render_notes, pending[offset:offset + size])
+                )
+                # Keep a few chunks ahead of the writer, not all of them
+                if len(in_flight) < self.processes * 2:
+                    continue
+                for rendered in in_flight.popleft().result():
+                    yield position, rendered
+                    position += 1
+            while in_flight:
+                for rendered in in_flight.popleft().result():
+                    yield position, rendered
+                    position += 1
+        finally:
+            # Cancelled or failed part way; drop chunks not yet started
+            for future in in_flight:
+                future.cancel()
+            pool.shutdown(wait=False)
+
+    def _write_entry(self, archive: zipfile.ZipFile, name: str, text: str):
+        with archive.open(name, 'w') as entry:
+            entry.write(text.encode('utf-8'))
+
+    def _write_manifest(self, archive: zipfile.ZipFile, name: str,
+                        notes: List[Note]):
+        """Stream manifest.json, formatted as json.dumps(indent=2)"""
+        with io.TextIOWrapper(archive.open(name, 'w'),
+                             encoding='utf-8') as f:
+            f.write('{\n')
+            f.write(f'  "export_date": '
+                    f'{json.dumps(datetime.now().isoformat())},\n')
+            f.write('  "export_version": "1.0",\n')
+            f.write(f'  "total_notes": {len(notes)},\n')
+            f.write('  "notes": [')
+            for position, note in enumerate(notes):
+                item = json.dumps({
+                    "id": note.id,
+                    "title": note.title,
+                    "created_at": note.created_at,
+                    "updated_at": note.updated_at,
+                    "tags": note.tags,
+                    "filename": sanitize_filename(note.title)
+                }, indent=2, ensure_ascii=False)
+                f.write(',\n    ' if position else '\n    ')
+                f.write(item.replace('\n', '\n    '))
+            f.write('\n  ]\n}' if notes else ']\n}')
+
+    def _write_index(self, archive: zipfile.ZipFile, name: str,
+                     notes: List[Note], items: List[str]):
+        """Stream index.html with notes sorted by title"""
+        # Sorting is stable, so equal titles keep their export order
+        order = sorted(range(len(notes)),
+                       key=lambda position: notes[position].title.lower())
+        head, tail = self.renderer.index_html_parts(len(notes))
+        with io.TextIOWrapper(archive.open(name, 'w'),
+                             encoding='utf-8') as f:
+            f.write(head)
+            for position in order:
+                f.write(items[position])
+            f.write(tail)
+
+    def _fingerprint(self, notes: List[Note]) -> str:
+        """Identify a list of notes and their versions"""
+        digest = hashlib.sha256()
+        for note in notes:
+            digest.update(f"{note.id}\0{note.updated_at}\n".encode('utf-8'))
+        return digest.hexdigest()
+
+    def _resume_point(self, partial_path: str, state_path: str,
+                      fingerprint: str, base_folder: str) -> Tuple[int, str]:
+        """Notes already in a resumable partial archive, and its folder"""
+        if not os.path.exists(partial_path):
+            self._remove(state_path)
+            return 0, base_folder
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            done = state['done']
+            if state['fingerprint'] == fingerprint and done > 0:
+                with zipfile.ZipFile(partial_path) as archive:
+                    entries = len(archive.infolist())
+                # Each note written has an HTML and a text entry
+                if entries == done * 2:
+                    return done, state['base_folder']
+        except Exception as e:
+            self.logger.warning(
+                f"Cannot resume notes export, starting over: {str(e)}"
+            )
+        self._remove(partial_path)
+        self._remove(state_path)
+        return 0, base_folder
+
+    def _save_state(self, state_path: str, fingerprint: str,
+                    base_folder: str, done: int):
+        try:
+            with open(state_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'fingerprint': fingerprint,
+                    'base_folder': base_folder,
+                    'done': done
+                }, f)
+        except Exception as e:
+            self.logger.warning(f"Failed to save export state: {str(e)}")
+
+    def _remove(self, path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,136 @@
+"""
+Event Loop Stall Detector for DinoAir 2.0
+Reports asyncio callbacks that keep the event loop busy longer than a
+threshold, with the stack the loop thread was stuck in.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from .logger import Logger
+
+logger = Logger()
+
+
+@dataclass
+class LoopStall:
+    """One period during which the event loop did not get a turn"""
+    duration: float  # Seconds the loop was blocked
+    stack: str  # Where the loop thread was while blocked, when caught
+
+
+class EventLoopStallDetector:
+    """Detects event loop stalls with a heartbeat and a watchdog thread.
+
+    A heartbeat callback runs on the loop every interval. When one runs
+    at least threshold seconds late, a callback blocked the loop for
+    about that long. The stall is then logged, added to stalls and
+    passed to on_stall. Stalls are measured to within one interval.
+
+    A watchdog thread checks the heartbeat meanwhile. Once a heartbeat
+    is overdue by the threshold, the thread records the loop thread's
+    stack while it is still blocked. The report then says where the
+    time went, not just how much.
+
+    Usage:
+        async with EventLoopStallDetector(threshold=0.1) as detector:
+            ...
+        detector.stalls
+    """
+
+    def __init__(self, threshold: float = 0.1,
+                 interval: Optional[float] = None,
+                 on_stall: Optional[Callable[[LoopStall], None]] = None):
+        """
+        Args:
+            threshold: Seconds a callback may block before it is reported
+            interval: Seconds between heartbeats, a quarter of the
+                threshold by default
+            on_stall: Called on the loop thread with each stall
+        """
+        self.threshold = threshold
+        self.interval = interval if interval is not None else threshold / 4
+        self.on_stall = on_stall
+        self.stalls: List[LoopStall] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._loop_thread: Optional[int] = None
+        self._last_beat = 0.0
+        self._stack = ""
+        self._stopped = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start watching the running event loop"""
+        if self._loop is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._stopped.clear()
+        self._last_beat = time.monotonic()
+        self._handle = self._loop.call_later(self.interval, self._beat)
+        self._watchdog = threading.Thread(target=self._watch,
+                                          name="loop-stall-detector",
+                                          daemon=True)
+        self._watchdog.start()
+
+    def stop(self):
+        """Stop watching; stalls found so far are kept"""
+        self._stopped.set()
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if self._watchdog is not None:
+            self._watchdog.join()
+            self._watchdog = None
+        self._loop = None
+
+    @property
+    def longest_stall(self) -> float:
+        """Duration of the longest stall seen, in seconds"""
+        return max((stall.duration for stall in self.stalls), default=0.0)
+
+    def _beat(self):
+        now = time.monotonic()
+        late = now - self._last_beat - self.interval
+        self._last_beat = now
+        if late >= self.threshold:
+            self._report(LoopStall(late, self._stack))
+        self._stack = ""
+        if not self._stopped.is_set():
+            self._handle = self._loop.call_later(self.interval, self._beat)
+
+    def _report(self, stall: LoopStall):
+        self.stalls.append(stall)
+        message = (f"Event loop blocked for {stall.duration * 1000:.0f} ms "
+                   f"(threshold {self.threshold * 1000:.0f} ms)")
+        if stall.stack:
+            message += f" in:\n{stall.stack}"
+        logger.warning(message)
+        if self.on_stall is not None:
+            try:
+                self.on_stall(stall)
+            except Exception as e:
+                logger.error(f"Stall callback failed: {e}")
+
+    def _watch(self):
+        """Watchdog thread: catch the loop's stack while it is blocked"""
+        while not self._stopped.wait(self.interval / 2):
+            overdue = time.monotonic() - self._last_beat - self.interval
+            if overdue >= self.threshold and not self._stack:
+                frame = sys._current_frames().get(self._loop_thread)
+                if frame is not None:
+                    self._stack = "".join(traceback.format_stack(frame))
+
+    async def __aenter__(self) -> 'EventLoopStallDetector':
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
@@ -0,0 +1,71 @@
+"""
+Helpers shared by the GUI and database tests: running the Qt event loop
+until a condition holds, and throwaway databases in temporary directories
+"""
+
+import time
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+
+from src.database.initialize_db import DatabaseManager
+from src.gui.components.refresh_scheduler import get_refresh_scheduler
+
+
+def spin(app, done, timeout=10.0):
+    """Run the event loop until done() or the timeout"""
+    deadline = time.monotonic() + timeout
+    while not done() and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.001)
+    app.processEvents()
+    return done()
+
+
+def temp_database(prefix="test"):
+    """A DatabaseManager whose databases live in a new temporary
+    directory rather than under src/user_data"""
+    base_dir = tempfile.mkdtemp(prefix=f"dinoair_{prefix}_")
+    return DatabaseManager(prefix, base_dir=base_dir)
+
+
+def remove_database(db_manager):
+    """Delete a temp_database once no scheduled fetch can still open it"""
+    get_refresh_scheduler().wait_for_workers()
+    shutil.rmtree(db_manager.base_dir, ignore_errors=True)
+
+
+def close_widgets(app, widgets):
+    """Stop the refreshes and background work of widgets, then delete
+    them"""
+    scheduler = get_refresh_scheduler()
+    for widget in widgets:
+        if hasattr(widget, 'cleanup'):
+            widget.cleanup()
+        for job in scheduler.jobs():
+            if job.owner is widget:
+                scheduler.unregister(job)
+    scheduler.wait_for_workers()
+    app.processEvents()
+    for widget in widgets:
+        widget.deleteLater()
+    app.processEvents()
+
+
+def populate_sessions(db_manager, count, newest=None,
+                      step=timedelta(hours=1)):
+    """Insert count chat sessions, one every step back from newest (now
+    by default); every tenth one is archived"""
+    newest = newest or datetime.now()
+    rows = []
+    for i in range(count):
+        moment = (newest - i * step).isoformat()
+        status = "archived" if i % 10 == 9 else "active"
+        rows.append((f"chat-{i:06d}", f"Chat {i}", moment, moment,
+                     f"Summary {i}", status))
+    with db_manager.get_chat_history_connection() as conn:
+        conn.executemany(
+            "INSERT INTO chat_sessions (id, title, created_at, updated_at, "
+            "tags, summary, status) VALUES (?, ?, ?, ?, '', ?, ?)", rows
+        )
+        conn.commit()
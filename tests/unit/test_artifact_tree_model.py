@@ -0,0 +1,327 @@
+"""
+Tests for the lazily populated artifacts tree and its incremental updates
+"""
+
+import os
+import sys
+import time
+import uuid
+import shutil
+import unittest
+from collections import Counter
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QApplication
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))))
+
+from src.database.initialize_db import DatabaseManager
+from src.database.artifacts_db import ArtifactsDatabase
+from src.models.artifact import Artifact, ArtifactCollection
+from src.gui.components.artifact_tree_model import ArtifactTreeModel
+from src.gui.components.signal_coordinator import SignalCoordinator
+from src.gui.pages.artifacts_page import ArtifactsPage
+
+
+# Benchmarks run at a reduced size unless full-size runs are requested
+FULL_BENCHMARKS = os.environ.get('DINOAIR_FULL_BENCHMARKS') == '1'
+
+
+def _row(artifact_id, name, collection_id=None, encrypted=False,
+         updated_at="2026-01-01T00:00:00"):
+    return (artifact_id, name, 'text', collection_id, None, encrypted,
+            updated_at)
+
+
+class _Source:
+    """In-memory stand-in for the artifacts database tree queries"""
+
+    def __init__(self, rows):
+        self.rows = {row[0]: row for row in rows}
+        self.fetches = []
+
+    def fetch(self, collection_id, after, limit):
+        self.fetches.append((collection_id, after, limit))
+        rows = sorted(self.rows.values(), key=lambda r: (r[6], r[0]),
+                      reverse=True)
+        return [r for r in rows
+                if collection_id in (None, r[3])
+                and (after is None or (r[6], r[0]) < after)][:limit]
+
+    def counts(self):
+        return dict(Counter(row[3] for row in self.rows.values()))
+
+
+def _children(model, parent):
+    return [model.index(i, 0, parent).data()
+            for i in range(model.rowCount(parent))]
+
+
+class TestArtifactTreeModel(unittest.TestCase):
+    """Paged population and in-place updates of the model"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.loaded = []
+
+        def load(artifact_id):
+            self.loaded.append(artifact_id)
+            return Artifact(id=artifact_id, name=artifact_id)
+
+        # a0 is the most recently updated
+        self.source = _Source(
+            _row(f"a{i}", f"A{i}", f"c{i % 2}",
+                 updated_at=f"2026-01-01T00:{(999 - i) // 60:02d}:"
+                            f"{(999 - i) % 60:02d}")
+            for i in range(500)
+        )
+        self.model = ArtifactTreeModel(self.source.fetch, load)
+        self.collections = [ArtifactCollection(id=f"c{i}", name=f"C{i}")
+                            for i in range(2)]
+        self.model.load(self.collections, self.source.counts(), {})
+        self.all = self.model.all_artifacts_index()
+        self.c0 = self.model.index(1, 0)
+        self.c1 = self.model.index(2, 0)
+
+    def _change(self, row):
+        """Store a changed row and tell the model about it"""
+        self.source.rows[row[0]] = row
+        self.model.apply_updates([row[0]], [row], self.source.counts())
+
+    def test_groups_are_fetched_a_page_at_a_time(self):
+        self.assertEqual(self.source.fetches, [])
+        self.assertEqual(self.model.rowCount(), 3)
+        self.assertEqual(self.model.artifact_count(), 500)
+        self.assertEqual(self.model.rowCount(self.all), 0)
+        self.assertTrue(self.model.hasChildren(self.all))
+        self.assertTrue(self.model.canFetchMore(self.all))
+
+        self.model.fetchMore(self.all)
+        self.assertEqual(self.model.rowCount(self.all),
+                         ArtifactTreeModel.FETCH_BATCH)
+        self.assertEqual(self.model.index(0, 0, self.all).data(), "📄 A0")
+        # Other groups stay unfetched
+        self.assertEqual(self.model.rowCount(self.c0), 0)
+
+        self.model.fetchMore(self.c0)
+        self.assertEqual(self.model.rowCount(self.c0), 200)
+        self.model.fetchMore(self.c0)
+        self.assertEqual(self.model.rowCount(self.c0), 250)
+        self.assertFalse(self.model.canFetchMore(self.c0))
+        # The second page continued from the last row of the first
+        self.assertEqual(self.source.fetches[-1][1][1], "a398")
+
+    def test_artifacts_load_when_data_is_needed(self):
+        self.model.fetchMore(self.all)
+        index = self.model.index(3, 0, self.all)
+        self.assertEqual(self.loaded, [])
+        data = index.data(Qt.ItemDataRole.UserRole)
+        self.assertEqual(data["type"], "artifact")
+        self.assertEqual(data["artifact"].id, "a3")
+        index.data(Qt.ItemDataRole.UserRole)
+        self.assertEqual(self.loaded, ["a3"])
+
+    def test_new_artifact_goes_to_top(self):
+        self.model.fetchMore(self.all)
+        self._change(_row("new", "New", "c1", updated_at="2026-01-02"))
+        self.assertEqual(self.model.index(0, 0, self.all).data(), "📄 New")
+        self.assertEqual(self.model.rowCount(self.all), 201)
+        self.assertEqual(self.model.artifact_count(), 501)
+        # The unfetched collection only learns its new size
+        self.assertEqual(self.model.rowCount(self.c1), 0)
+        self.model.fetchMore(self.c1)
+        self.assertEqual(self.model.index(0, 0, self.c1).data(), "📄 New")
+
+    def test_update_and_move_between_collections(self):
+        self.model.fetchMore(self.all)
+        self.model.fetchMore(self.c0)
+        self.model.fetchMore(self.c1)
+        changed = []
+        self.model.dataChanged.connect(lambda a, b: changed.append(a.row()))
+
+        self._change(_row("a4", "Renamed", "c1", encrypted=True,
+                          updated_at="2026-01-02"))
+        self.assertEqual(self.model.index(4, 0, self.all).data(),
+                         "📄 Renamed 🔒")
+        self.assertIn(4, changed)
+        self.assertNotIn("📄 Renamed 🔒", _children(self.model, self.c0))
+        self.assertEqual(self.model.index(0, 0, self.c1).data(),
+                         "📄 Renamed 🔒")
+        self.assertEqual(self.model.rowCount(self.c1), 201)
+
+    def test_later_pages_skip_artifacts_already_shown(self):
+        self.model.fetchMore(self.all)
+        # Reported as changed without its updated_at moving
+        self._change(self.source.rows["a300"])
+        self.assertEqual(self.model.index(0, 0, self.all).data(), "📄 A300")
+        while self.model.canFetchMore(self.all):
+            self.model.fetchMore(self.all)
+        names = _children(self.model, self.all)
+        self.assertEqual(len(names), 500)
+        self.assertEqual(len(set(names)), 500)
+
+    def test_removed_artifacts_disappear(self):
+        self.model.fetchMore(self.all)
+        del self.source.rows["a0"], self.source.rows["a499"]
+        self.model.apply_updates(["a0", "a499", "unknown"], [],
+                                 self.source.counts())
+        self.assertEqual(self.model.artifact_count(), 498)
+        self.assertEqual(self.model.index(0, 0, self.all).data(), "📄 A1")
+        self.assertEqual(self.model.rowCount(self.all), 199)
+
+    def test_index_for_artifact_fetches_up_to_it(self):
+        index = self.model.index_for_artifact("a450")
+        self.assertTrue(index.isValid())
+        self.assertEqual(index.row(), 450)
+        self.assertEqual(index.data(), "📄 A450")
+        # Pages grow while searching: 200, then 400
+        self.assertEqual(len(self.source.fetches), 2)
+        self.assertFalse(self.model.index_for_artifact("missing").isValid())
+
+
+def _database():
+    return DatabaseManager(f"test_artifact_tree_{uuid.uuid4().hex[:8]}")
+
+
+def _populate(db_manager, artifacts, collections):
+    """Insert artifacts spread over collections, newest last"""
+    start = datetime(2026, 1, 1)
+    with db_manager.get_artifacts_connection() as conn:
+        conn.executemany(
+            "INSERT INTO artifact_collections (id, name) VALUES (?, ?)",
+            [(f"col-{c}", f"Collection {c:04d}") for c in range(collections)]
+        )
+        conn.executemany(
+            "INSERT INTO artifacts (id, name, content_type, status, content, "
+            "collection_id, encrypted_fields, updated_at) "
+            "VALUES (?, ?, 'text', 'active', 'body', ?, '', ?)",
+            [(f"art-{i}", f"Artifact {i}", f"col-{i % collections}",
+              (start + timedelta(seconds=i)).isoformat())
+             for i in range(artifacts)]
+        )
+        conn.commit()
+
+
+def _page(db_manager):
+    with patch('src.database.initialize_db.DatabaseManager',
+               return_value=db_manager):
+        return ArtifactsPage()
+
+
+class TestArtifactsPageTree(unittest.TestCase):
+    """The page builds its tree from counts and patches it in place"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.db_manager = _database()
+        _populate(self.db_manager, 30, 3)
+        self.page = _page(self.db_manager)
+        self.model = self.page.artifact_model
+        self.all = self.model.all_artifacts_index()
+        # Rows of expanded groups are fetched once the view lays out
+        self.page.show()
+        self.app.processEvents()
+
+    def tearDown(self):
+        self.page.deleteLater()
+        self.app.processEvents()
+        shutil.rmtree(self.db_manager.user_db_dir.parent, ignore_errors=True)
+
+    def test_tree_shows_all_artifacts_newest_first(self):
+        self.assertTrue(self.page.artifact_tree.isExpanded(self.all))
+        self.assertEqual(self.model.rowCount(self.all), 30)
+        self.assertEqual(self.model.index(0, 0, self.all).data(),
+                         "📄 Artifact 29")
+        self.assertEqual(self.model.rowCount(), 4)
+
+    def test_batch_update_signal_patches_tree(self):
+        coordinator = SignalCoordinator(Mock())
+        coordinator.register_page('artifacts', self.page)
+        db = ArtifactsDatabase(self.db_manager)
+        db.update_artifact("art-5", {"name": "Renamed"})
+        db.delete_artifact("art-6")
+        created = Artifact(name="Brand new", collection_id="col-0")
+        db.create_artifact(created)
+
+        with patch.object(self.model, 'load') as reload:
+            coordinator.artifacts_batch_updated.emit(
+                ["art-5", "art-6", created.id]
+            )
+            reload.assert_not_called()
+
+        names = _children(self.model, self.all)
+        self.assertEqual(names[0], "📄 Brand new")
+        self.assertIn("📄 Renamed", names)
+        self.assertNotIn("📄 Artifact 6", names)
+        self.assertEqual(len(names), 30)
+
+    def test_navigate_to_artifact_selects_it(self):
+        self.page.navigate_to_artifact("art-3")
+        current = self.page.artifact_tree.currentIndex()
+        self.assertEqual(current.data(Qt.ItemDataRole.UserRole)["id"],
+                         "art-3")
+        self.assertEqual(self.page._current_artifact.id, "art-3")
+
+
+class TestArtifactTreePerformance(unittest.TestCase):
+    """Refresh cost with 100k artifacts in 1,000 collections"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+        cls.artifacts = 100_000 if FULL_BENCHMARKS else 20_000
+        cls.collections = 1_000 if FULL_BENCHMARKS else 200
+        cls.db_manager = _database()
+        _populate(cls.db_manager, cls.artifacts, cls.collections)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.db_manager.user_db_dir.parent, ignore_errors=True)
+
+    def test_refresh_cost(self):
+        def timed(action, repeat=1):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                action()
+                self.app.processEvents()
+            return (time.perf_counter() - start) / repeat * 1000
+
+        page = _page(self.db_manager)
+        page.resize(900, 700)
+        page.show()
+        try:
+            model = page.artifact_model
+            refresh = timed(page._refresh_artifacts, repeat=3)
+            db = ArtifactsDatabase(self.db_manager)
+            db.update_artifact("art-10", {"name": "Edited"})
+            update = timed(lambda: page.apply_artifact_updates(["art-10"]))
+            collection = model.index(500 % model.rowCount(), 0)
+            expand = timed(lambda: page.artifact_tree.expand(collection))
+
+            print(f"\n{self.artifacts} artifacts in {self.collections} "
+                  f"collections: refresh {refresh:7.1f}ms, "
+                  f"single update {update:5.1f}ms, "
+                  f"expand collection {expand:5.1f}ms")
+
+            self.assertEqual(model.artifact_count(), self.artifacts)
+            # Only the pages the view asked for have been fetched
+            self.assertLess(model.rowCount(model.all_artifacts_index()),
+                            self.artifacts // 10)
+        finally:
+            page.deleteLater()
+
+
+if __name__ == '__main__':
+    unittest.main()
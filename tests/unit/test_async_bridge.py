@@ -0,0 +1,329 @@
+"""
+Tests for the thread-to-async bridge, the event loop stall detector and
+streaming through OllamaModelAdapter without blocking the event loop
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))))
+
+from src.utils.async_bridge import ThreadStreamBridge, iterate_in_thread
+from src.utils.stall_detector import EventLoopStallDetector
+from src.agents.ollama_wrapper import OllamaWrapper
+from src.agents.ollama_model_adapter import OllamaModelAdapter
+from src.tools.abstraction.model_interface import ModelRequest
+
+
+class _Counting:
+    """Iterator counting what was pulled from it and whether it was
+    closed, and on which thread"""
+
+    def __init__(self, count, delay=0.0, fail_at=None):
+        self.count = count
+        self.delay = delay
+        self.fail_at = fail_at
+        self.pulled = 0
+        self.closed_on = None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.pulled >= self.count:
+            raise StopIteration
+        if self.pulled == self.fail_at:
+            raise ValueError("producer failed")
+        time.sleep(self.delay)
+        self.pulled += 1
+        return self.pulled
+
+    def close(self):
+        self.closed_on = threading.current_thread().name
+
+
+class TestThreadStreamBridge(unittest.TestCase):
+    """Hand-over, backpressure, cancellation and errors"""
+
+    def test_items_arrive_in_order(self):
+        async def consume():
+            return [item async for item in iterate_in_thread(
+                lambda: _Counting(100), maxsize=8)]
+
+        self.assertEqual(asyncio.run(consume()), list(range(1, 101)))
+
+    def test_slow_consumer_holds_producer_back(self):
+        source = _Counting(1000)
+
+        async def consume():
+            async with iterate_in_thread(lambda: source, maxsize=5) as items:
+                first = await items.__anext__()
+                await asyncio.sleep(0.2)
+                # Only the consumed item and the free slots were pulled
+                return first, source.pulled
+
+        first, pulled = asyncio.run(consume())
+        self.assertEqual(first, 1)
+        self.assertEqual(pulled, 6)
+
+    def test_leaving_the_loop_stops_the_producer(self):
+        source = _Counting(10_000, delay=0.001)
+        bridge = ThreadStreamBridge(lambda: source, maxsize=4,
+                                    name="bridge-test")
+
+        async def consume():
+            async with bridge as items:
+                async for item in items:
+                    if item == 10:
+                        break
+
+        asyncio.run(consume())
+        self.assertTrue(bridge.wait(5))
+        self.assertTrue(bridge.cancelled)
+        self.assertLess(source.pulled, 20)
+        # Closed by the producer thread, where it was iterated
+        self.assertEqual(source.closed_on, "bridge-test")
+
+    def test_cancelling_the_consumer_stops_the_producer(self):
+        source = _Counting(10_000, delay=0.01)
+        bridge = ThreadStreamBridge(lambda: source, maxsize=4)
+
+        async def consume():
+            async with bridge as items:
+                async for _ in items:
+                    pass
+
+        async def main():
+            task = asyncio.create_task(consume())
+            await asyncio.sleep(0.1)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(main())
+        self.assertTrue(bridge.wait(5))
+        self.assertLess(source.pulled, 100)
+        self.assertIsNotNone(source.closed_on)
+
+    def test_producer_errors_reach_the_consumer(self):
+        async def consume():
+            items = []
+            async for item in iterate_in_thread(
+                    lambda: _Counting(10, fail_at=3)):
+                items.append(item)
+            return items
+
+        with self.assertRaises(ValueError):
+            asyncio.run(consume())
+
+    def test_waiting_does_not_block_the_loop(self):
+        async def main():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.005)
+                    ticks += 1
+
+            task = asyncio.create_task(ticker())
+            items = [item async for item in iterate_in_thread(
+                lambda: _Counting(20, delay=0.01))]
+            task.cancel()
+            return items, ticks
+
+        items, ticks = asyncio.run(main())
+        self.assertEqual(len(items), 20)
+        self.assertGreater(ticks, 10)
+
+
+class TestEventLoopStallDetector(unittest.TestCase):
+    """Blocking callbacks are reported with their stack"""
+
+    def test_reports_blocking_callback(self):
+        reported = []
+
+        def blocking_callback():
+            time.sleep(0.3)
+
+        async def main():
+            async with EventLoopStallDetector(
+                    threshold=0.1, on_stall=reported.append) as detector:
+                await asyncio.sleep(0.05)
+                blocking_callback()
+                await asyncio.sleep(0.1)
+            return detector
+
+        detector = asyncio.run(main())
+        self.assertEqual(len(detector.stalls), 1)
+        self.assertEqual(reported, detector.stalls)
+        self.assertGreater(detector.longest_stall, 0.2)
+        self.assertIn("blocking_callback", detector.stalls[0].stack)
+
+    def test_awaiting_is_not_a_stall(self):
+        async def main():
+            async with EventLoopStallDetector(threshold=0.1) as detector:
+                for _ in range(10):
+                    await asyncio.sleep(0.03)
+            return detector
+
+        self.assertEqual(asyncio.run(main()).stalls, [])
+
+
+class _FakeOllama(BaseHTTPRequestHandler):
+    """Ollama API serving one model and streaming replies slowly"""
+
+    chunks = 10
+    delay = 0.05
+
+    def log_message(self, *args):
+        pass
+
+    def _json(self, body):
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/api/tags":
+            self._json({"models": [{
+                "name": "llama3.2:latest", "model": "llama3.2:latest",
+                "modified_at": "2026-01-01T00:00:00Z", "size": 1,
+                "digest": "fake", "details": {}
+            }]})
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(
+            int(self.headers.get("Content-Length", 0))) or b"{}")
+        chat = self.path == "/api/chat"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for i in range(self.chunks + 1):
+                done = i == self.chunks
+                text = "" if done else f"w{i} "
+                body = {"model": request.get("model", ""),
+                        "created_at": "2026-01-01T00:00:00Z", "done": done}
+                if chat:
+                    body["message"] = {"role": "assistant", "content": text}
+                else:
+                    body["response"] = text
+                line = (json.dumps(body) + "\n").encode()
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+                self.wfile.flush()
+                if not done:
+                    time.sleep(self.delay)
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+class TestAdapterStreaming(unittest.TestCase):
+    """Streaming from a slow Ollama server keeps the event loop free"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeOllama)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever,
+                         daemon=True).start()
+        host = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        cls.wrapper = OllamaWrapper(host=host, timeout=10)
+        cls.stream_time = _FakeOllama.chunks * _FakeOllama.delay
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def _adapter(self):
+        adapter = OllamaModelAdapter(ollama_wrapper=self.wrapper)
+        adapter._is_initialized = True
+        return adapter
+
+    def _stream(self, adapter, chunks, chat=True):
+        if chat:
+            request = ModelRequest(
+                prompt="", messages=[{"role": "user", "content": "hi"}],
+                stream=True)
+        else:
+            request = ModelRequest(prompt="hi", stream=True)
+        return adapter.stream_generate(request, chunks.append)
+
+    def test_wrapper_uses_the_bridge(self):
+        self.assertTrue(self.wrapper.is_ready)
+        self.assertFalse(hasattr(self.wrapper, "stream_chat_async"))
+
+    def test_concurrent_streams_progress_together(self):
+        async def main():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            chunks = [[], [], []]
+            async with EventLoopStallDetector(threshold=0.1) as detector:
+                task = asyncio.create_task(ticker())
+                start = time.perf_counter()
+                responses = await asyncio.gather(
+                    self._stream(self._adapter(), chunks[0]),
+                    self._stream(self._adapter(), chunks[1]),
+                    self._stream(self._adapter(), chunks[2], chat=False))
+                elapsed = time.perf_counter() - start
+                task.cancel()
+            return responses, chunks, ticks, elapsed, detector
+
+        responses, chunks, ticks, elapsed, detector = asyncio.run(main())
+        expected = "".join(f"w{i} " for i in range(_FakeOllama.chunks))
+        for response, received in zip(responses, chunks):
+            self.assertTrue(response.success, response.error)
+            self.assertEqual(response.content, expected)
+            self.assertEqual(len(received), _FakeOllama.chunks)
+
+        print(f"\n3 concurrent streams of {self.stream_time:.1f} s: "
+              f"done in {elapsed:.2f} s, {ticks} ticker turns, longest "
+              f"stall {detector.longest_stall * 1000:.0f} ms")
+        # Streams overlap instead of running one after another
+        self.assertLess(elapsed, 2 * self.stream_time)
+        # The loop kept turning while they streamed
+        self.assertGreater(ticks, elapsed / 0.01 / 2)
+        self.assertEqual(detector.stalls, [])
+
+    def test_cancelled_stream_stops_reading(self):
+        async def main():
+            chunks = []
+            task = asyncio.create_task(
+                self._stream(self._adapter(), chunks))
+            await asyncio.sleep(self.stream_time / 3)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            received = len(chunks)
+            await asyncio.sleep(self.stream_time)
+            return received, len(chunks)
+
+        received, later = asyncio.run(main())
+        self.assertLess(received, _FakeOllama.chunks)
+        self.assertEqual(later, received)
+
+
+if __name__ == '__main__':
+    unittest.main()
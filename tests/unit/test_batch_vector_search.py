@@ -0,0 +1,231 @@
+"""
+Tests for batched query execution in OptimizedVectorSearchEngine
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import shutil
+import sqlite3
+import hashlib
+import unittest
+from datetime import datetime
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))))
+
+from src.rag.optimized_vector_search import OptimizedVectorSearchEngine
+
+
+# Benchmarks run at a reduced size unless full-size runs are requested
+FULL_BENCHMARKS = os.environ.get('DINOAIR_FULL_BENCHMARKS') == '1'
+
+DIMENSION = 64
+VOCABULARY = [
+    'python', 'database', 'vector', 'search', 'index', 'query', 'model',
+    'embedding', 'cache', 'thread', 'network', 'server', 'client',
+    'memory', 'storage', 'parser', 'compiler', 'widget', 'layout', 'theme'
+]
+
+
+class FakeEmbeddingGenerator:
+    """Deterministic bag-of-words embeddings that count model calls"""
+
+    def __init__(self):
+        self.single_calls = 0
+        self.batch_calls = 0
+
+    def _embed(self, text):
+        vector = np.zeros(DIMENSION, dtype=np.float32)
+        for word in text.lower().split():
+            digest = hashlib.md5(word.encode()).digest()
+            vector[digest[0] % DIMENSION] += 1.0
+            vector[digest[1] % DIMENSION] += 0.5
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def generate_embedding(self, text, normalize=True):
+        self.single_calls += 1
+        return self._embed(text)
+
+    def generate_embeddings_batch(self, texts, batch_size=None,
+                                  normalize=True, show_progress=True):
+        self.batch_calls += 1
+        return [self._embed(text) for text in texts]
+
+
+def _populate(engine, chunks):
+    """Bulk-insert a synthetic corpus with fake embeddings"""
+    generator = FakeEmbeddingGenerator()
+    rng = np.random.default_rng(42)
+    conn = sqlite3.connect(engine.db.db_manager.file_search_db_path)
+    now = datetime.now().isoformat()
+    chunks_per_file = 20
+    for f in range(0, chunks, chunks_per_file):
+        file_id = f"file_{f}"
+        file_type = 'md' if (f // chunks_per_file) % 3 == 0 else 'txt'
+        conn.execute(
+            "INSERT INTO indexed_files (id, file_path, file_hash, size, "
+            "modified_date, file_type) VALUES (?, ?, ?, ?, ?, ?)",
+            (file_id, f"/docs/{f}.{file_type}", "hash", 100, now, file_type)
+        )
+        for c in range(chunks_per_file):
+            words = rng.choice(VOCABULARY, size=8)
+            content = ' '.join(words) + f" unique{f + c}"
+            chunk_id = f"{file_id}_chunk_{c}"
+            conn.execute(
+                "INSERT INTO file_chunks (id, file_id, chunk_index, content, "
+                "start_pos, end_pos) VALUES (?, ?, ?, ?, ?, ?)",
+                (chunk_id, file_id, c, content, 0, len(content))
+            )
+            conn.execute(
+                "INSERT INTO file_embeddings (id, chunk_id, "
+                "embedding_vector, model_name) VALUES (?, ?, ?, ?)",
+                (f"{chunk_id}_embedding", chunk_id,
+                 json.dumps(generator._embed(content).tolist()), "fake")
+            )
+    conn.commit()
+    conn.close()
+
+
+def _queries(count):
+    rng = np.random.default_rng(7)
+    return [' '.join(rng.choice(VOCABULARY, size=3)) + f" q{i}"
+            for i in range(count)]
+
+
+class TestBatchSearch(unittest.TestCase):
+    """Batched results must match the per-query code paths"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.generator = FakeEmbeddingGenerator()
+        cls.engine = OptimizedVectorSearchEngine(
+            user_name=f"test_batch_search_{uuid.uuid4().hex[:8]}",
+            embedding_generator=cls.generator,
+            enable_caching=False
+        )
+        _populate(cls.engine, 400)
+        cls.queries = _queries(12)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.engine.db.db_manager.user_db_dir.parent,
+                      ignore_errors=True)
+
+    def _assert_same(self, expected, actual):
+        self.assertEqual(len(expected), len(actual))
+        for exp, act in zip(expected, actual):
+            self.assertAlmostEqual(exp.score, act.score, places=4)
+        self.assertEqual(
+            {(r.chunk_id, round(r.score, 4)) for r in expected},
+            {(r.chunk_id, round(r.score, 4)) for r in actual}
+        )
+
+    def test_vector_batch_matches_single_search(self):
+        self.generator.batch_calls = 0
+        batch = self.engine.batch_search(
+            self.queries, top_k=5, search_type='vector',
+            similarity_threshold=0.1
+        )
+        self.assertEqual(self.generator.batch_calls, 1)
+
+        for query in self.queries:
+            single = self.engine.search(
+                query, top_k=5, similarity_threshold=0.1
+            )
+            self._assert_same(single, batch[query])
+
+    def test_euclidean_and_file_type_filter(self):
+        batch = self.engine.batch_search(
+            self.queries, top_k=5, search_type='vector',
+            similarity_threshold=0.1, file_types=['md'],
+            distance_metric='euclidean'
+        )
+        for query in self.queries:
+            single = self.engine.search(
+                query, top_k=5, similarity_threshold=0.1,
+                file_types=['md'], distance_metric='euclidean'
+            )
+            self._assert_same(single, batch[query])
+            self.assertTrue(all(r.file_type == 'md' for r in batch[query]))
+
+    def test_keyword_batch_matches_single_search(self):
+        batch = self.engine.batch_search(
+            self.queries, top_k=8, search_type='keyword'
+        )
+        for query in self.queries:
+            single = self.engine.keyword_search(query, top_k=8)
+            self.assertEqual(
+                sorted(r.score for r in single),
+                sorted(r.score for r in batch[query])
+            )
+
+    def test_hybrid_batch_scores_match(self):
+        # Fetch the whole corpus so keyword ties cannot change which
+        # chunks make the cut in either code path
+        batch = self.engine.batch_search(self.queries, top_k=400)
+        for query in self.queries:
+            single = self.engine.hybrid_search(query, top_k=400)
+            self.assertEqual(len(single), len(batch[query]))
+            expected = sorted(r.score for r in single)
+            actual = sorted(r.score for r in batch[query])
+            for exp, act in zip(expected, actual):
+                self.assertAlmostEqual(exp, act, places=4)
+
+    def test_empty_and_duplicate_queries(self):
+        results = self.engine.batch_search(
+            ['', self.queries[0], self.queries[0]], search_type='vector'
+        )
+        self.assertEqual(results[''], [])
+        self.assertEqual(len(results), 2)
+
+
+class TestBatchSearchPerformance(unittest.TestCase):
+    """Queries per second for batch sizes 1-256"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = OptimizedVectorSearchEngine(
+            user_name=f"test_batch_perf_{uuid.uuid4().hex[:8]}",
+            embedding_generator=FakeEmbeddingGenerator(),
+            enable_caching=False
+        )
+        _populate(cls.engine, 50000 if FULL_BENCHMARKS else 4000)
+        # Load the corpus once so both paths start warm
+        cls.engine.batch_search(['warm up'], search_type='vector')
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.engine.db.db_manager.user_db_dir.parent,
+                      ignore_errors=True)
+
+    def test_queries_per_second(self):
+        sizes = [1, 4, 16, 64, 256] if FULL_BENCHMARKS else [1, 4, 16, 64]
+        print("\nbatch  per-query qps  batched qps")
+        for size in sizes:
+            queries = _queries(size)
+
+            start = time.perf_counter()
+            for query in queries:
+                self.engine.search(query, top_k=10)
+            single_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            results = self.engine.batch_search(
+                queries, top_k=10, search_type='vector'
+            )
+            batch_time = time.perf_counter() - start
+
+            self.assertEqual(len(results), size)
+            print(f"{size:5d}  {size / single_time:13.1f}  "
+                  f"{size / batch_time:11.1f}")
+
+
+if __name__ == '__main__':
+    unittest.main()
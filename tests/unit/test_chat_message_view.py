@@ -0,0 +1,277 @@
+"""
+Tests for the paged model/view chat display in EnhancedChatTabWidget
+"""
+
+import os
+import sys
+import time
+import threading
+import unittest
+from datetime import datetime, timedelta
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import psutil
+from PySide6.QtWidgets import QApplication, QStyleOptionViewItem
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))))
+
+from src.database.chat_history_db import ChatHistoryDatabase
+from src.models.chat_session import ChatSession, ChatMessage
+from src.gui.components.enhanced_chat_tab import EnhancedChatTabWidget
+from src.gui.components.chat_message_view import (
+    ChatMessageModel, ChatMessageWriter
+)
+from tests.unit.support import spin, temp_database, remove_database
+
+
+# Benchmarks run at a reduced size unless full-size runs are requested
+FULL_BENCHMARKS = os.environ.get('DINOAIR_FULL_BENCHMARKS') == '1'
+
+
+def _chat_db():
+    return ChatHistoryDatabase(temp_database("test_chat_view"))
+
+
+def _populate(chat_db, count, tied_every=0):
+    """Create a session with count messages, one second apart"""
+    session = ChatSession(title="History")
+    chat_db.create_session(session)
+    start = datetime(2026, 1, 1)
+    rows = []
+    for i in range(count):
+        # Optionally give runs of messages the same timestamp
+        offset = i - i % tied_every if tied_every else i
+        rows.append(ChatMessage(
+            session_id=session.id,
+            message=f"message {i} " + "lorem ipsum " * (i % 7),
+            is_user=i % 2 == 0,
+            timestamp=start + timedelta(seconds=offset)
+        ).to_dict())
+    with chat_db._get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO chat_messages "
+            "(id, session_id, message, is_user, timestamp, metadata) "
+            "VALUES (:id, :session_id, :message, :is_user, :timestamp, "
+            ":metadata)",
+            rows
+        )
+        conn.commit()
+    return session
+
+
+class TestMessagePages(unittest.TestCase):
+    """Keyset pages cover a session exactly once, in order"""
+
+    def setUp(self):
+        self.chat_db = _chat_db()
+
+    def tearDown(self):
+        remove_database(self.chat_db.db_manager)
+
+    def test_walk_back_through_pages(self):
+        session = _populate(self.chat_db, 230, tied_every=4)
+        expected = [m.id for m in
+                    self.chat_db.get_session_messages(session.id)]
+
+        page = self.chat_db.get_messages_page(session.id, limit=50)
+        seen = [m.id for m in page]
+        while page:
+            page = self.chat_db.get_messages_page(
+                session.id, before=page[0], limit=50
+            )
+            seen[:0] = [m.id for m in page]
+
+        self.assertEqual(sorted(seen), sorted(expected))
+        self.assertEqual(len(seen), len(set(seen)))
+        timestamps = [m.timestamp for m in
+                      self.chat_db.get_messages_page(session.id, limit=230)]
+        self.assertEqual(timestamps, sorted(timestamps))
+
+    def test_session_with_message_limit(self):
+        session = _populate(self.chat_db, 80)
+        loaded = self.chat_db.get_session(session.id, message_limit=30)
+        self.assertEqual(len(loaded.messages), 30)
+        self.assertTrue(loaded.messages[-1].message.startswith("message 79"))
+
+
+class TestEnhancedChatTab(unittest.TestCase):
+    """Opening, scrolling back and sending in the chat tab"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.chat_db = _chat_db()
+        self.tab = EnhancedChatTabWidget(self.chat_db)
+        self.tab.resize(800, 600)
+        self.tab.show()
+
+    def tearDown(self):
+        self.tab.shutdown()
+        self.tab.deleteLater()
+        self.app.processEvents()
+        remove_database(self.chat_db.db_manager)
+
+    def test_open_loads_newest_page(self):
+        session = _populate(self.chat_db, 500)
+        self.tab.load_session(session.id)
+        model = self.tab.message_model
+        self.assertEqual(model.rowCount(), self.tab.PAGE_SIZE)
+        self.assertTrue(
+            model.message_at(model.rowCount() - 1).message
+            .startswith("message 499")
+        )
+        self.assertTrue(self.tab.chat_view.has_older_messages)
+
+    def test_scrolling_up_fetches_older_pages(self):
+        session = _populate(self.chat_db, 120)
+        self.tab.load_session(session.id)
+        view = self.tab.chat_view
+        scroll_bar = view.verticalScrollBar()
+        # Wait for the deferred scroll to the bottom after loading
+        self.assertTrue(spin(self.app, lambda: scroll_bar.maximum() > 0
+                              and scroll_bar.value() == scroll_bar.maximum()))
+
+        first_visible = self.tab.message_model.message_at(0).id
+        view.verticalScrollBar().setValue(0)
+        self.app.processEvents()
+        self.assertEqual(self.tab.message_model.rowCount(), 100)
+        # The previously top message has not jumped back into view
+        self.assertGreater(view.verticalScrollBar().value(), 0)
+        self.assertEqual(self.tab.message_model.message_at(50).id,
+                         first_visible)
+
+        view.verticalScrollBar().setValue(0)
+        self.app.processEvents()
+        self.assertEqual(self.tab.message_model.rowCount(), 120)
+        self.assertFalse(view.has_older_messages)
+
+    def test_sent_messages_are_persisted(self):
+        session_id = self.tab.current_session.id
+        self.tab.add_message("hello there", is_user=True)
+        self.tab.add_message("general kenobi", is_user=False)
+        self.assertTrue(self.tab._message_writer.flush(timeout=5))
+
+        stored = self.chat_db.get_session_messages(session_id)
+        self.assertEqual([m.message for m in stored],
+                         ["hello there", "general kenobi"])
+        # Welcome message plus the two new ones
+        self.assertEqual(self.tab.message_model.rowCount(), 3)
+
+    def test_reloading_sees_queued_messages(self):
+        session_id = self.tab.current_session.id
+        self.tab.add_message("queued", is_user=True)
+        self.tab.load_session(session_id)
+        self.assertEqual(self.tab.message_model.message_at(0).message,
+                         "queued")
+
+    def test_delegate_renders_plain_text(self):
+        session = _populate(self.chat_db, 0)
+        self.tab.load_session(session.id)
+        for text in ("short", "<b>not bold</b> " * 40):
+            self.tab.add_message(text, is_user=False, save_to_db=False)
+
+        delegate = self.tab.chat_view.itemDelegate()
+        option = QStyleOptionViewItem()
+        option.widget = self.tab.chat_view
+        model = self.tab.message_model
+        short, long = model.index(0), model.index(1)
+        self.assertGreater(delegate.sizeHint(option, long).height(),
+                           delegate.sizeHint(option, short).height())
+
+        document = delegate.document(long, 300)
+        self.assertEqual(document.toPlainText(),
+                         long.data(ChatMessageModel.MessageRole))
+        # Cached layouts are reused
+        self.assertIs(delegate.document(long, 300), document)
+
+
+class _SlowChatDb:
+    """Records the messages it is given, taking a while for each"""
+
+    def __init__(self):
+        self.written = []
+
+    def add_message(self, session_id, message):
+        time.sleep(0.02)
+        self.written.append((message.message, threading.current_thread()))
+        return {"success": True}
+
+
+class TestChatMessageWriter(unittest.TestCase):
+    """Ordering across stopping and restarting the writer"""
+
+    def test_enqueue_during_stop_waits_for_the_old_writer(self):
+        chat_db = _SlowChatDb()
+        writer = ChatMessageWriter(chat_db)
+        for i in range(5):
+            writer.enqueue("s", ChatMessage(message=f"m{i}"))
+        # Gives up waiting while the old thread still drains the queue
+        writer.stop(timeout=0.01)
+        writer.enqueue("s", ChatMessage(message="m5"))
+        self.assertTrue(writer.flush(timeout=5))
+        writer.stop()
+
+        self.assertEqual([text for text, _ in chat_db.written],
+                         [f"m{i}" for i in range(6)])
+        old_thread = chat_db.written[0][1]
+        self.assertFalse(old_thread.is_alive())
+        self.assertTrue(all(thread is old_thread
+                            for _, thread in chat_db.written[:5]))
+
+
+class TestChatOpenPerformance(unittest.TestCase):
+    """Open time and memory for sessions of 100, 10k and 100k messages"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+        cls.chat_db = _chat_db()
+        cls.sessions = {
+            count: _populate(cls.chat_db, count)
+            for count in (100, 10_000, 100_000)
+        }
+
+    @classmethod
+    def tearDownClass(cls):
+        remove_database(cls.chat_db.db_manager)
+
+    def test_open_time_and_rss(self):
+        process = psutil.Process()
+        tab = EnhancedChatTabWidget(self.chat_db)
+        tab.resize(800, 600)
+        tab.show()
+        self.app.processEvents()
+        try:
+            print()
+            for count, session in self.sessions.items():
+                rss_before = process.memory_info().rss
+                start = time.perf_counter()
+                tab.load_session(session.id)
+                self.app.processEvents()
+                open_time = time.perf_counter() - start
+                rss_growth = process.memory_info().rss - rss_before
+
+                pages = 20 if FULL_BENCHMARKS else 5
+                start = time.perf_counter()
+                for _ in range(pages):
+                    tab._load_older_messages()
+                    self.app.processEvents()
+                page_time = (time.perf_counter() - start) / pages
+
+                print(f"{count:>7} messages: open {open_time * 1000:7.1f}ms, "
+                      f"RSS +{rss_growth / 1e6:5.1f}MB, "
+                      f"older page {page_time * 1000:5.1f}ms")
+                self.assertLessEqual(tab.message_model.rowCount(),
+                                     tab.PAGE_SIZE * (pages + 1))
+        finally:
+            tab.shutdown()
+            tab.deleteLater()
+
+
+if __name__ == '__main__':
+    unittest.main()
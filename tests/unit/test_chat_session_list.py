@@ -0,0 +1,381 @@
+"""
+Tests for keyset-paged chat sessions and the chat history list showing them
+"""
+
+import os
+import sys
+import time
+import statistics
+import unittest
+from datetime import date, datetime, timedelta
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QModelIndex
+from PySide6.QtWidgets import QApplication
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))))
+
+from src.database.chat_history_db import ChatHistoryDatabase
+from src.models.chat_session import ChatSession
+from src.gui.components.chat_session_list import (
+    ChatSessionListModel, bucket_label
+)
+from src.gui.components.enhanced_chat_history import EnhancedChatHistoryWidget
+from src.gui.components.refresh_scheduler import get_refresh_scheduler
+from tests.unit.support import (
+    spin, temp_database, remove_database, close_widgets, populate_sessions
+)
+
+
+# Benchmarks run at a reduced size unless full-size runs are requested
+FULL_BENCHMARKS = os.environ.get('DINOAIR_FULL_BENCHMARKS') == '1'
+
+
+def _walk(chat_db, limit, **filters):
+    """All sessions, read page by page"""
+    sessions, after = [], None
+    while True:
+        page = chat_db.get_sessions_page(limit=limit, after=after, **filters)
+        sessions.extend(session for _, session in page)
+        if len(page) < limit:
+            return sessions
+        after = page[-1][1]
+
+
+class TestSessionPages(unittest.TestCase):
+    """Keyset pages, date buckets and cancellation of session queries"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db_manager = temp_database("test_sessions")
+        populate_sessions(cls.db_manager, 500)
+        cls.chat_db = ChatHistoryDatabase(cls.db_manager)
+
+    @classmethod
+    def tearDownClass(cls):
+        remove_database(cls.db_manager)
+
+    def test_pages_cover_every_session_once_in_order(self):
+        sessions = _walk(self.chat_db, 37)
+        self.assertEqual([s.id for s in sessions],
+                         [f"chat-{i:06d}" for i in range(500)])
+
+    def test_equal_timestamps_are_ordered_by_id(self):
+        db_manager = temp_database("test_sessions")
+        try:
+            moment = datetime.now().isoformat()
+            with db_manager.get_chat_history_connection() as conn:
+                conn.executemany(
+                    "INSERT INTO chat_sessions (id, title, created_at, "
+                    "updated_at, tags) VALUES (?, 'Same', ?, ?, '')",
+                    [(f"s-{i:02d}", moment, moment) for i in range(25)]
+                )
+                conn.commit()
+            sessions = _walk(ChatHistoryDatabase(db_manager), 4)
+            self.assertEqual([s.id for s in sessions],
+                             [f"s-{i:02d}" for i in reversed(range(25))])
+        finally:
+            remove_database(db_manager)
+
+    def test_sessions_touched_with_current_timestamp(self):
+        db_manager = temp_database("test_sessions")
+        try:
+            chat_db = ChatHistoryDatabase(db_manager)
+            for i in range(6):
+                chat_db.create_session(ChatSession(id=f"s{i}", title="Chat"))
+            # Stored as 'YYYY-MM-DD HH:MM:SS' like update_session does
+            with db_manager.get_chat_history_connection() as conn:
+                conn.executemany(
+                    "UPDATE chat_sessions SET updated_at = "
+                    "datetime('now', ?) WHERE id = ?",
+                    [(f"-{i} minutes", f"s{i}") for i in range(5)]
+                )
+                conn.commit()
+            chat_db.update_session("s5", {"title": "Touched"})
+            sessions = _walk(chat_db, 2)
+            self.assertEqual([s.id for s in sessions],
+                             ["s5", "s0", "s1", "s2", "s3", "s4"])
+        finally:
+            remove_database(db_manager)
+
+    def test_filters_apply_to_every_page(self):
+        sessions = _walk(self.chat_db, 7, filter_status="archived")
+        self.assertEqual(len(sessions), 50)
+        self.assertTrue(all(s.status == "archived" for s in sessions))
+
+        sessions = _walk(self.chat_db, 3, search_query="Summary 12")
+        self.assertEqual({s.title for s in sessions},
+                         {"Chat 12"} | {f"Chat {i}" for i in range(120, 130)})
+
+    def test_date_buckets(self):
+        page = self.chat_db.get_sessions_page(limit=500)
+        today = date.today()
+        for bucket, session in page:
+            day = session.updated_at.date()
+            if day == today:
+                expected = "today"
+            elif day == today - timedelta(days=1):
+                expected = "yesterday"
+            elif day >= today - timedelta(days=6):
+                expected = "week"
+            else:
+                expected = day.strftime("%Y-%m")
+            self.assertEqual(bucket, expected, session.updated_at)
+        self.assertIn("today", {bucket for bucket, _ in page})
+        self.assertIn("week", {bucket for bucket, _ in page})
+
+    def test_bucket_labels(self):
+        self.assertEqual(bucket_label("today"), "Today")
+        self.assertEqual(bucket_label("yesterday"), "Yesterday")
+        self.assertEqual(bucket_label("2026-03"), "March 2026")
+
+    def test_pages_use_the_updated_index(self):
+        with self.db_manager.get_chat_history_connection() as conn:
+            plan = conn.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM chat_sessions WHERE 1=1 "
+                "AND (updated_at, id) < (?, ?) "
+                "ORDER BY updated_at DESC, id DESC LIMIT 50", ("x", "x")
+            ).fetchall()
+        detail = " ".join(row[-1] for row in plan)
+        self.assertIn("SEARCH chat_sessions USING INDEX idx_sessions_updated",
+                      detail)
+        self.assertNotIn("TEMP B-TREE", detail)
+
+    def test_cancelled_query_returns_nothing(self):
+        polls = []
+
+        def is_cancelled():
+            polls.append(True)
+            return True
+
+        # A search that matches nothing scans every session
+        page = self.chat_db.get_sessions_page(
+            search_query="no such chat", is_cancelled=is_cancelled
+        )
+        self.assertEqual(page, [])
+        self.assertTrue(polls)
+        # The connection is usable again afterwards
+        self.assertEqual(len(self.chat_db.get_sessions_page(limit=3)), 3)
+
+
+def _page(buckets):
+    return [(bucket, ChatSession(title=f"Chat {i}"))
+            for i, bucket in enumerate(buckets)]
+
+
+class TestChatSessionListModel(unittest.TestCase):
+    """Header rows and fetchMore of the session list model"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.model = ChatSessionListModel()
+        self.requested = []
+        self.model.more_requested.connect(lambda: self.requested.append(1))
+
+    def test_headers_start_each_bucket(self):
+        self.model.set_sessions(_page(["today", "today", "week"]), False)
+        self.assertEqual(self.model.rowCount(), 5)
+        self.assertEqual(self.model.index(0).data(), "Today")
+        self.assertTrue(
+            self.model.index(0).data(ChatSessionListModel.IsHeaderRole))
+        self.assertIsNone(self.model.session_at(0))
+        self.assertEqual(self.model.session_at(1).title, "Chat 0")
+        self.assertEqual(self.model.index(3).data(), "Previous 7 days")
+        self.assertEqual(self.model.session_count(), 3)
+
+    def test_appended_page_continues_its_bucket(self):
+        self.model.set_sessions(_page(["today", "week"]), True)
+        inserted = []
+        self.model.rowsInserted.connect(
+            lambda parent, first, last: inserted.append((first, last)))
+        self.model.append_sessions(_page(["week", "2026-01"]), False)
+        self.assertEqual(inserted, [(4, 6)])
+        self.assertEqual(self.model.rowCount(), 7)
+        self.assertEqual(self.model.index(5).data(), "January 2026")
+        self.assertEqual(self.model.last_session().title, "Chat 1")
+
+    def test_fetch_more_asks_once_per_page(self):
+        self.model.set_sessions(_page(["today"]), True)
+        self.assertTrue(self.model.canFetchMore(QModelIndex()))
+        self.model.fetchMore(QModelIndex())
+        self.model.fetchMore(QModelIndex())
+        self.assertEqual(self.requested, [1])
+        self.assertFalse(self.model.canFetchMore(QModelIndex()))
+
+        self.model.append_sessions(_page(["today"]), False)
+        self.assertFalse(self.model.canFetchMore(QModelIndex()))
+
+
+class _HistoryTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def _widget(self, db_manager):
+        widget = EnhancedChatHistoryWidget(ChatHistoryDatabase(db_manager))
+        # Show every date, not only today's chats
+        widget._clear_date_filter()
+        widget.resize(widget.width(), 700)
+        widget.show()
+        self.assertTrue(spin(self.app, self._idle))
+        return widget
+
+    def _idle(self):
+        return get_refresh_scheduler().is_idle()
+
+    def _close(self, widget):
+        close_widgets(self.app, [widget])
+
+    def _scroll_to_end(self, widget):
+        """Scroll to the end and wait for the page it loads"""
+        view = widget.session_view
+        view.executeDelayedItemsLayout()
+        scroll_bar = view.verticalScrollBar()
+        scroll_bar.setValue(scroll_bar.maximum())
+        spin(self.app, lambda: self._idle()
+              and not widget.session_model._fetching)
+
+
+class TestChatHistoryWidget(_HistoryTest):
+    """Paged loading, reloading and selection in the chat history"""
+
+    def setUp(self):
+        self.db_manager = temp_database("test_sessions")
+        populate_sessions(self.db_manager, 180)
+        self.widget = self._widget(self.db_manager)
+        self.model = self.widget.session_model
+
+    def tearDown(self):
+        self._close(self.widget)
+        remove_database(self.db_manager)
+
+    def test_first_page_is_shown(self):
+        self.assertEqual(self.model.session_count(),
+                         self.widget.PAGE_SIZE)
+        self.assertTrue(self.model.has_more())
+        self.assertEqual(self.model.index(0).data(), "Today")
+        self.assertFalse(self.widget.empty_label.isVisibleTo(self.widget))
+
+    def test_scrolling_loads_following_pages(self):
+        for _ in range(5):
+            self._scroll_to_end(self.widget)
+        self.assertEqual([s.id for s in self.model.sessions()],
+                         [f"chat-{i:06d}" for i in range(180)])
+        self.assertFalse(self.model.has_more())
+
+    def test_filter_change_replaces_superseded_loads(self):
+        for text in ("C", "Ch", "Chat", "Chat 1", "Chat 17"):
+            self.widget.search_input.setText(text)
+        self.assertTrue(spin(self.app, self._idle))
+        self.assertEqual({s.title for s in self.model.sessions()},
+                         {"Chat 17"} | {f"Chat {i}" for i in range(170, 180)})
+
+    def test_periodic_refresh_keeps_loaded_pages(self):
+        self._scroll_to_end(self.widget)
+        loaded = self.model.session_count()
+        self.assertGreater(loaded, self.widget.PAGE_SIZE)
+        self.widget.refresh_job.request()
+        self.assertTrue(spin(self.app, self._idle))
+        self.assertEqual(self.model.session_count(), loaded)
+
+    def test_no_matches_shows_empty_state(self):
+        self.widget.search_input.setText("no such chat")
+        self.assertTrue(spin(self.app, self._idle))
+        self.assertEqual(self.model.rowCount(), 0)
+        self.assertTrue(self.widget.empty_label.isVisibleTo(self.widget))
+
+    def test_clicking_a_session_selects_it(self):
+        selected = []
+        self.widget.session_selected.connect(selected.append)
+        self.widget._on_index_clicked(self.model.index(0))  # Header
+        self.widget._on_index_clicked(self.model.index(1))
+        self.assertEqual(selected, ["chat-000000"])
+
+
+class TestSessionListBenchmark(_HistoryTest):
+    """First paint and scroll latency of a large chat history"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.count = 200_000 if FULL_BENCHMARKS else 20_000
+        cls.db_manager = temp_database("test_sessions")
+        populate_sessions(cls.db_manager, cls.count, step=timedelta(minutes=7))
+        cls.chat_db = ChatHistoryDatabase(cls.db_manager)
+
+    @classmethod
+    def tearDownClass(cls):
+        remove_database(cls.db_manager)
+
+    def _offset_page(self, offset):
+        """A page read the OFFSET way, for comparison"""
+        with self.db_manager.get_chat_history_connection() as conn:
+            return conn.execute(
+                "SELECT * FROM chat_sessions ORDER BY updated_at DESC "
+                "LIMIT 50 OFFSET ?", (offset,)
+            ).fetchall()
+
+    def test_deep_pages_cost_the_same(self):
+        deep = self.count - 100
+        after = self.chat_db.get_sessions_page(limit=deep)[-1][1]
+
+        start = time.perf_counter()
+        self._offset_page(deep)
+        offset_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        page = self.chat_db.get_sessions_page(limit=50, after=after)
+        keyset_ms = (time.perf_counter() - start) * 1000
+
+        print(f"\n{self.count} sessions: page {deep // 50} by OFFSET "
+              f"{offset_ms:.1f} ms, by keyset {keyset_ms:.1f} ms")
+        self.assertEqual(len(page), 50)
+        self.assertLess(keyset_ms, offset_ms)
+
+    def test_first_paint_and_scroll_latency(self):
+        start = time.perf_counter()
+        widget = self._widget(self.db_manager)
+        try:
+            self.assertTrue(spin(
+                self.app, lambda: widget.session_model.session_count() > 0))
+            widget.session_view.viewport().repaint()
+            first_paint = (time.perf_counter() - start) * 1000
+
+            latencies = []
+            for _ in range(40):
+                loaded = widget.session_model.session_count()
+                start = time.perf_counter()
+                self._scroll_to_end(widget)
+                widget.session_view.viewport().repaint()
+                latencies.append((time.perf_counter() - start) * 1000)
+                self.assertGreater(widget.session_model.session_count(),
+                                   loaded)
+
+            # A new search abandons the one still running
+            start = time.perf_counter()
+            for text in ("C", "Ch", "Cha", "Chat", "Chat 1999"):
+                widget.search_input.setText(text)
+                self.app.processEvents()
+            self.assertTrue(spin(self.app, self._idle, timeout=60))
+            search = (time.perf_counter() - start) * 1000
+            self.assertTrue(all("Chat 1999" in s.title
+                                for s in widget.session_model.sessions()))
+
+            print(f"\n{self.count} sessions: first paint {first_paint:.0f} "
+                  f"ms, scroll to next page median "
+                  f"{statistics.median(latencies):.1f} ms, max "
+                  f"{max(latencies):.1f} ms over {len(latencies)} pages, "
+                  f"5-key search {search:.0f} ms")
+            self.assertLess(statistics.median(latencies), 250)
+        finally:
+            self._close(widget)
+
+
+if __name__ == '__main__':
+    unittest.main()
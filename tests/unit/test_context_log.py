@@ -0,0 +1,320 @@
+"""
+Tests for the append-only agent context log
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))))
+
+from src.agents import context_log
+from src.agents.context_log import ContextLog
+from src.agents.base_agent import AgentConfig, AgentContext, SimpleAgent
+
+FULL_BENCHMARKS = os.environ.get('DINOAIR_FULL_BENCHMARKS') == '1'
+
+
+def message(i):
+    return {"role": "user" if i % 2 == 0 else "assistant",
+            "content": f"Message {i} about dinosaurs and their habits"}
+
+
+def tool_event(i):
+    return {"tool_call": {"name": "search", "parameters": {"q": str(i)}},
+            "result": {"success": True}, "timestamp": "2026-10-18T12:00:00"}
+
+
+class TestContextLog(unittest.TestCase):
+    """Appending, windowed loading, crash recovery and compaction"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "context.log"
+        self.state = {"user_id": "u", "session_id": "s", "metadata": {},
+                      "timestamp": "2026-10-18T12:00:00"}
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _saved(self, messages, tools, **kwargs):
+        log = ContextLog(self.path, **kwargs)
+        log.save(self.state, messages, tools)
+        return log
+
+    def test_save_appends_only_new_entries(self):
+        messages = [message(i) for i in range(100)]
+        tools = [tool_event(0)]
+        log = self._saved(messages, tools)
+        before = self.path.read_bytes()
+
+        messages.append(message(100))
+        tools.append(tool_event(1))
+        log.save(self.state, messages, tools)
+        after = self.path.read_bytes()
+        self.assertTrue(after.startswith(before))
+        self.assertLess(len(after) - len(before), 500)
+
+        # Nothing new and the same state writes nothing
+        log.save(self.state, messages, tools)
+        self.assertEqual(self.path.read_bytes(), after)
+        log.close()
+
+        state, loaded, loaded_tools = ContextLog(self.path).load()
+        self.assertEqual(state, self.state)
+        self.assertEqual(loaded, messages)
+        self.assertEqual(loaded_tools, tools)
+
+    def test_recent_turns_and_paging(self):
+        messages = [message(i) for i in range(1000)]
+        tools = [tool_event(i) for i in range(30)]
+        self._saved(messages[:600], tools[:10]).save(
+            self.state, messages[:600] + [], tools[:10])
+        # Grow the history over several saves
+        log = ContextLog(self.path)
+        _, loaded, loaded_tools = log.load()
+        for i in range(600, 1000, 100):
+            loaded.extend(messages[i:i + 100])
+            loaded_tools.extend(tools[10 + i // 100 - 6:11 + i // 100 - 6])
+            log.save(self.state, loaded, loaded_tools)
+        log.close()
+        tools = loaded_tools[:]
+
+        log = ContextLog(self.path)
+        state, recent, recent_tools = log.load(recent_turns=100)
+        self.assertEqual(state, self.state)
+        self.assertEqual(recent, messages[-100:])
+        self.assertEqual(recent_tools, tools)
+        self.assertEqual(log.unloaded_messages, 900)
+
+        self.assertEqual(log.load_older(250), 250)
+        self.assertEqual(recent, messages[-350:])
+
+        # New turns append behind the window without losing older ones
+        recent.append(message(1000))
+        log.save(self.state, recent, recent_tools)
+        self.assertEqual(log.load_older(10_000), 650)
+        self.assertEqual(log.load_older(10), 0)
+        self.assertEqual(recent, messages + [message(1000)])
+        log.close()
+        self.assertEqual(ContextLog(self.path).load()[1], recent)
+
+    def test_recent_load_stops_at_the_saved_counts(self):
+        self._saved([message(i) for i in range(5000)], []).close()
+        scanned = []
+        lines_backwards = context_log._lines_backwards
+
+        def counting(f, end):
+            for item in lines_backwards(f, end):
+                scanned.append(item)
+                yield item
+
+        with mock.patch.object(context_log, '_lines_backwards', counting):
+            _, recent, tools = ContextLog(self.path).load(recent_turns=50)
+        self.assertEqual(recent, [message(i) for i in range(4950, 5000)])
+        self.assertEqual(tools, [])
+        # No search through the whole file for tool events never saved
+        self.assertLess(len(scanned), 100)
+
+    def test_unfinished_save_is_ignored_and_cut_off(self):
+        messages = [message(i) for i in range(10)]
+        self._saved(messages, []).close()
+        committed = self.path.read_bytes()
+        # A crash after writing records but before their commit finished
+        with open(self.path, 'ab') as f:
+            f.write(b'{"k":"m","d":{"role":"user","content":"lost"}}\n')
+            f.write(b'{"k":"c","m":11,"t":0,"s":{"us')
+
+        for recent_turns in (None, 5):
+            log = ContextLog(self.path)
+            state, loaded, loaded_tools = log.load(recent_turns)
+            self.assertEqual(loaded, messages[-(recent_turns or 10):])
+            self.assertEqual(state, self.state)
+
+        loaded.append(message(10))
+        log.save(self.state, loaded, loaded_tools)
+        log.close()
+        self.assertTrue(self.path.read_bytes().startswith(committed))
+        self.assertNotIn(b'lost', self.path.read_bytes())
+        self.assertEqual(ContextLog(self.path).load()[1],
+                         [message(i) for i in range(11)])
+
+    def test_replaced_lists_rewrite_the_log(self):
+        log = self._saved([message(i) for i in range(50)], [tool_event(0)])
+        log.save(self.state, [message(99)], [])
+        log.close()
+        self.assertEqual(ContextLog(self.path).load()[1:], ([message(99)], []))
+
+    def test_compaction_drops_old_commits(self):
+        messages = [message(i) for i in range(200)]
+        tools = []
+        log = self._saved(messages, tools)
+        log.COMPACT_MIN_BYTES = 1024
+        size = self.path.stat().st_size
+        for i in range(500):
+            self.state["metadata"] = {"saves": i}
+            log.save(self.state, messages, tools)
+        # Commits were compacted away rather than piling up
+        self.assertLess(self.path.stat().st_size, 2 * size + 2048)
+
+        state, loaded, tools = log.load(recent_turns=20)
+        self.assertEqual(state["metadata"], {"saves": 499})
+        for i in range(200, 260):
+            loaded.append(message(i))
+            self.state["metadata"] = {"saves": i}
+            log.save(self.state, loaded, tools)
+        self.assertEqual(log.load_older(1000), 180)
+        log.close()
+        self.assertEqual(ContextLog(self.path).load()[1],
+                         [message(i) for i in range(260)])
+
+    def test_fsync_is_batched(self):
+        messages, tools = [], []
+        log = self._saved(messages, tools, fsync_interval=0.2)
+        messages.append(message(0))
+        log.save(self.state, messages, tools)
+        self.assertTrue(log.sync_pending)
+        time.sleep(0.4)
+        self.assertFalse(log.sync_pending)
+
+        messages.append(message(1))
+        log.save(self.state, messages, tools)
+        log.close()
+        self.assertFalse(log.sync_pending)
+
+
+class TestAgentContextPersistence(unittest.TestCase):
+    """BaseAgent.save_context and load_context on top of the log"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "agent_context.json"
+        self.agent = SimpleAgent(AgentConfig(name="test", description="",
+                                             enable_tools=False))
+
+    def tearDown(self):
+        asyncio.run(self.agent.shutdown())
+        self.temp_dir.cleanup()
+
+    def test_round_trip_and_paging(self):
+        context = AgentContext(
+            user_id="user", session_id="session",
+            conversation_history=[message(i) for i in range(300)],
+            tool_history=[tool_event(i) for i in range(5)],
+            metadata={"topic": "dinosaurs"}
+        )
+        self.agent.set_context(context)
+
+        async def scenario():
+            await self.agent.save_context(self.path)
+            self.agent.get_context().conversation_history.append(message(300))
+            await self.agent.save_context(self.path)
+
+            other = SimpleAgent(AgentConfig(name="other", description="",
+                                            enable_tools=False))
+            await other.load_context(self.path, recent_turns=50)
+            loaded = other.get_context()
+            self.assertEqual(loaded.user_id, "user")
+            self.assertEqual(loaded.metadata, {"topic": "dinosaurs"})
+            self.assertEqual(loaded.timestamp, context.timestamp)
+            self.assertEqual(len(loaded.conversation_history), 50)
+            self.assertEqual(await other.load_older_context(1000), 251)
+            self.assertEqual(loaded.conversation_history,
+                             context.conversation_history)
+            self.assertEqual(loaded.tool_history, context.tool_history)
+            other.clear_context()
+            self.assertEqual(await other.load_older_context(10), 0)
+            await other.shutdown()
+
+        asyncio.run(scenario())
+
+    def test_loads_whole_context_json_files(self):
+        legacy = {
+            "user_id": "user", "session_id": "session",
+            "conversation_history": [message(i) for i in range(3)],
+            "tool_history": [], "metadata": {"a": 1},
+            "timestamp": "2026-10-18T12:00:00"
+        }
+        self.path.write_text(json.dumps(legacy, indent=2))
+
+        async def scenario():
+            await self.agent.load_context(self.path)
+            context = self.agent.get_context()
+            self.assertEqual(context.conversation_history,
+                             legacy["conversation_history"])
+            context.conversation_history.append(message(3))
+            await self.agent.save_context(self.path)
+
+        asyncio.run(scenario())
+        # Saving converted it to a log
+        self.assertTrue(self.path.read_bytes().startswith(b'{"k":"h"'))
+        self.assertEqual(ContextLog(self.path).load()[1],
+                         [message(i) for i in range(4)])
+
+
+class TestContextLogBenchmark(unittest.TestCase):
+    """Save and load latency for long conversations"""
+
+    turns = 100_000 if FULL_BENCHMARKS else 20_000
+
+    def test_save_and_load_latency(self):
+        messages = [message(i) for i in range(self.turns)]
+        tools = [tool_event(i) for i in range(self.turns // 10)]
+        state = {"user_id": "u", "session_id": "s", "metadata": {},
+                 "timestamp": "2026-10-18T12:00:00"}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            old_path = Path(temp_dir) / "whole.json"
+            path = Path(temp_dir) / "context.log"
+
+            # The whole-context JSON file saved before
+            start = time.perf_counter()
+            with open(old_path, 'w') as f:
+                json.dump({**state, "conversation_history": messages,
+                           "tool_history": tools}, f, indent=2)
+            old_save = time.perf_counter() - start
+            start = time.perf_counter()
+            with open(old_path) as f:
+                json.load(f)
+            old_load = time.perf_counter() - start
+
+            log = ContextLog(path)
+            start = time.perf_counter()
+            log.save(state, messages, tools)
+            first_save = time.perf_counter() - start
+            appends = []
+            for i in range(20):
+                messages.append(message(self.turns + i))
+                start = time.perf_counter()
+                log.save(state, messages, tools)
+                appends.append(time.perf_counter() - start)
+            log.close()
+            append_save = sorted(appends)[len(appends) // 2]
+
+            start = time.perf_counter()
+            _, recent, _ = ContextLog(path).load(recent_turns=50)
+            recent_load = time.perf_counter() - start
+            start = time.perf_counter()
+            _, everything, _ = ContextLog(path).load()
+            full_load = time.perf_counter() - start
+
+        self.assertEqual(recent, messages[-50:])
+        self.assertEqual(everything, messages)
+        print(f"\n{self.turns} turns: save {old_save * 1000:.0f} ms -> "
+              f"{append_save * 1000:.2f} ms per appended turn "
+              f"(first save {first_save * 1000:.0f} ms); load "
+              f"{old_load * 1000:.0f} ms -> {recent_load * 1000:.2f} ms "
+              f"for the last 50 turns ({full_load * 1000:.0f} ms for all)")
+        self.assertLess(append_save, old_save / 20)
+        self.assertLess(recent_load, old_load / 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,250 @@
+"""
+Tests for incremental optimization and vacuuming in FileSearchDB
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import shutil
+import sqlite3
+import threading
+import unittest
+from datetime import datetime
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))))
+
+from src.database.file_search_db import FileSearchDB
+
+
+# Benchmarks run at a reduced size unless full-size runs are requested
+FULL_BENCHMARKS = os.environ.get('DINOAIR_FULL_BENCHMARKS') == '1'
+
+
+def _populate(path, files, chunks_per_file=20):
+    """Bulk-insert an index, then delete every other file"""
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA foreign_keys = ON")
+    now = datetime.now().isoformat()
+    vector = json.dumps([0.1] * 64)
+    for f in range(files):
+        file_id = f"file_{f}"
+        conn.execute(
+            "INSERT INTO indexed_files (id, file_path, file_hash, size, "
+            "modified_date, file_type) VALUES (?, ?, ?, ?, ?, ?)",
+            (file_id, f"/docs/{f}.txt", "hash", 100, now, "txt")
+        )
+        conn.executemany(
+            "INSERT INTO file_chunks (id, file_id, chunk_index, content, "
+            "start_pos, end_pos) VALUES (?, ?, ?, ?, ?, ?)",
+            [(f"{file_id}_{c}", file_id, c, "lorem ipsum " * 40, 0, 480)
+             for c in range(chunks_per_file)]
+        )
+        conn.executemany(
+            "INSERT INTO file_embeddings (id, chunk_id, embedding_vector, "
+            "model_name) VALUES (?, ?, ?, ?)",
+            [(f"{file_id}_{c}_e", f"{file_id}_{c}", vector, "m")
+             for c in range(chunks_per_file)]
+        )
+    conn.commit()
+    conn.executemany("DELETE FROM indexed_files WHERE id = ?",
+                     [(f"file_{f}",) for f in range(0, files, 2)])
+    conn.commit()
+    conn.close()
+
+
+def _legacy_database(user_name):
+    """A database created before incremental auto-vacuum was enabled"""
+    db = FileSearchDB(user_name=user_name)
+    path = db.db_manager.file_search_db_path
+    os.remove(path)
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE legacy_marker (id INTEGER)")
+    conn.commit()
+    conn.close()
+    return FileSearchDB(user_name=user_name)
+
+
+class TestIncrementalMaintenance(unittest.TestCase):
+    """Statistics, vacuum steps and rebuild decisions"""
+
+    def setUp(self):
+        self.user_name = f"test_maintenance_{uuid.uuid4().hex[:8]}"
+        self.db = FileSearchDB(user_name=self.user_name)
+
+    def tearDown(self):
+        self.db.stop_background_maintenance()
+        shutil.rmtree(self.db.db_manager.user_db_dir.parent,
+                      ignore_errors=True)
+
+    def test_new_database_vacuums_incrementally(self):
+        _populate(self.db.db_manager.file_search_db_path, 100)
+        metrics = self.db.get_fragmentation_stats()
+        self.assertEqual(metrics["auto_vacuum"], 'incremental')
+        self.assertGreater(metrics["freelist_count"], 0)
+        self.assertFalse(metrics["needs_rebuild"])
+
+        result = self.db.incremental_vacuum(max_pages=10, step_pages=4)
+        self.assertEqual(result["pages_freed"], 10)
+        self.assertFalse(result["complete"])
+
+        result = self.db.incremental_vacuum()
+        self.assertTrue(result["complete"])
+        self.assertEqual(self.db.get_fragmentation_stats()["freelist_count"], 0)
+
+    def test_optimize_analyzes_without_rebuild(self):
+        _populate(self.db.db_manager.file_search_db_path, 100)
+        result = self.db.optimize_database(vacuum_time_budget=0)
+        self.assertTrue(result["success"])
+        self.assertFalse(result["rebuilt"])
+        self.assertTrue(result["maintenance_scheduled"])
+        self.assertEqual(result["table_stats"]["indexed_files"], 50)
+
+        conn = sqlite3.connect(self.db.db_manager.file_search_db_path)
+        analyzed = {row[0] for row in conn.execute(
+            "SELECT tbl FROM sqlite_stat1")}
+        conn.close()
+        self.assertIn("file_chunks", analyzed)
+
+    def test_background_maintenance_waits_for_idle(self):
+        _populate(self.db.db_manager.file_search_db_path, 100)
+        self.db.start_background_maintenance(
+            step_pages=16, pause_seconds=0.01, idle_seconds=0.3
+        )
+        # Keep the index busy; nothing may be reclaimed meanwhile
+        busy_until = time.monotonic() + 0.5
+        while time.monotonic() < busy_until:
+            self.db.get_file_by_path("/docs/1.txt")
+            time.sleep(0.02)
+        self.assertIsNone(self.db._maintenance_last_result)
+
+        self.db._maintenance_thread.join(timeout=30)
+        last = self.db.stop_background_maintenance()
+        self.assertTrue(last["complete"])
+        self.assertGreater(last["total_pages_freed"], 0)
+        self.assertEqual(self.db.get_fragmentation_stats()["freelist_count"], 0)
+
+    def test_legacy_database_is_rebuilt_once(self):
+        self.db = _legacy_database(self.user_name)
+        _populate(self.db.db_manager.file_search_db_path, 100)
+        metrics = self.db.get_fragmentation_stats()
+        self.assertEqual(metrics["auto_vacuum"], 'none')
+        self.assertTrue(metrics["needs_rebuild"])
+        self.assertFalse(self.db.incremental_vacuum()["success"])
+
+        self.assertFalse(
+            self.db.optimize_database(full_rebuild=False)["rebuilt"]
+        )
+        result = self.db.optimize_database()
+        self.assertTrue(result["rebuilt"])
+
+        metrics = self.db.get_fragmentation_stats()
+        self.assertEqual(metrics["auto_vacuum"], 'incremental')
+        self.assertEqual(metrics["freelist_count"], 0)
+        self.assertFalse(self.db.optimize_database()["rebuilt"])
+
+    def test_page_fill_metric(self):
+        _populate(self.db.db_manager.file_search_db_path, 40)
+        metrics = self.db.get_fragmentation_stats(include_page_fill=True)
+        self.assertGreater(metrics["page_fill"], 0)
+        self.assertLessEqual(metrics["page_fill"], 1)
+
+        self.db.REBUILD_MIN_FILL = 1.01
+        self.assertTrue(
+            self.db.optimize_database(check_page_fill=True)["rebuilt"]
+        )
+
+
+class TestSearchAvailability(unittest.TestCase):
+    """Read latency while the database is optimized"""
+
+    def _build(self, tag, legacy=False):
+        user_name = f"test_avail_{tag}_{uuid.uuid4().hex[:8]}"
+        db = (_legacy_database(user_name) if legacy
+              else FileSearchDB(user_name=user_name))
+        _populate(db.db_manager.file_search_db_path,
+                  5000 if FULL_BENCHMARKS else 1000)
+        return db
+
+    def _measure(self, db, optimize):
+        """Run lookups on another thread while optimize() runs"""
+        latencies, errors = [], []
+        done = threading.Event()
+
+        def reader():
+            conn = sqlite3.connect(db.db_manager.file_search_db_path,
+                                   timeout=30)
+            i = 1
+            while not done.is_set():
+                start = time.perf_counter()
+                try:
+                    conn.execute(
+                        "SELECT c.content FROM file_chunks c "
+                        "JOIN indexed_files f ON c.file_id = f.id "
+                        "WHERE f.file_path = ?", (f"/docs/{i}.txt",)
+                    ).fetchall()
+                except sqlite3.Error as e:
+                    errors.append(str(e))
+                latencies.append(time.perf_counter() - start)
+                i = (i + 2) % 1000
+            conn.close()
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        time.sleep(0.1)
+        start = time.perf_counter()
+        optimize()
+        elapsed = time.perf_counter() - start
+        time.sleep(0.1)
+        done.set()
+        thread.join()
+        latencies.sort()
+        return elapsed, latencies, errors
+
+    def test_availability_during_optimization(self):
+        legacy_db = self._build("legacy", legacy=True)
+        db = self._build("incremental")
+        try:
+            def legacy_optimize():
+                conn = sqlite3.connect(
+                    legacy_db.db_manager.file_search_db_path
+                )
+                for table in ("indexed_files", "file_chunks",
+                              "file_embeddings"):
+                    conn.execute(f"ANALYZE {table}")
+                conn.execute("VACUUM")
+                conn.close()
+
+            def incremental_optimize():
+                db.optimize_database(vacuum_time_budget=0.05)
+                db.start_background_maintenance(
+                    step_pages=64, pause_seconds=0.01, idle_seconds=0
+                )
+                db._maintenance_thread.join()
+
+            print()
+            for label, target, optimize in (
+                    ("ANALYZE + VACUUM", legacy_db, legacy_optimize),
+                    ("optimize + steps", db, incremental_optimize)):
+                elapsed, latencies, errors = self._measure(target, optimize)
+                p99 = latencies[int(len(latencies) * 0.99)] * 1000
+                stalled = sum(1 for latency in latencies if latency > 0.05)
+                print(f"{label}: {elapsed:5.2f}s, {len(latencies)} reads, "
+                      f"p99 {p99:6.2f}ms, max {latencies[-1] * 1000:7.2f}ms, "
+                      f"{stalled} over 50ms, {len(errors)} errors")
+                self.assertEqual(errors, [])
+            self.assertEqual(
+                db.get_fragmentation_stats()["freelist_count"], 0
+            )
+        finally:
+            for target in (legacy_db, db):
+                target.stop_background_maintenance()
+                shutil.rmtree(target.db_manager.user_db_dir.parent,
+                              ignore_errors=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,187 @@
+"""
+Tests for trie-based path rules in DirectoryValidator
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))))
+
+from src.rag.directory_validator import DirectoryValidator
+
+
+# Benchmarks run at a reduced size unless full-size runs are requested
+FULL_BENCHMARKS = os.environ.get('DINOAIR_FULL_BENCHMARKS') == '1'
+
+
+def _legacy_is_allowed(validator, path):
+    """The previous resolve-and-scan implementation, for comparison"""
+    abs_path = os.path.normpath(str(Path(path).resolve()))
+    for excluded in validator._excluded_dirs:
+        if abs_path.lower().startswith(excluded.lower()):
+            return False
+    if validator._allowed_dirs:
+        for allowed in validator._allowed_dirs:
+            if abs_path.lower().startswith(allowed.lower()):
+                return True
+        return False
+    return True
+
+
+class TestDirectoryValidatorRules(unittest.TestCase):
+    """Functional tests for rule matching"""
+
+    def setUp(self):
+        self.test_dir = os.path.realpath(
+            tempfile.mkdtemp(prefix="test_dir_validator_")
+        )
+        self.docs = os.path.join(self.test_dir, "docs")
+        os.makedirs(os.path.join(self.docs, "private"))
+        self.validator = DirectoryValidator(
+            allowed_dirs=[self.docs],
+            excluded_dirs=[os.path.join(self.docs, "private")],
+            case_sensitive=True
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_allowed_and_excluded(self):
+        self.assertTrue(self.validator.is_path_allowed(
+            os.path.join(self.docs, "a", "b.txt")
+        ))
+        self.assertTrue(self.validator.is_path_allowed(self.docs))
+        self.assertFalse(self.validator.is_path_allowed(
+            os.path.join(self.docs, "private", "secret.txt")
+        ))
+        self.assertFalse(self.validator.is_path_allowed(
+            os.path.join(self.test_dir, "other.txt")
+        ))
+
+    def test_component_boundaries(self):
+        # A shared string prefix is not a shared directory
+        self.assertFalse(self.validator.is_path_allowed(
+            os.path.join(self.test_dir, "docs2", "file.txt")
+        ))
+        self.assertTrue(self.validator.is_path_allowed(
+            os.path.join(self.docs, "private_notes.txt")
+        ))
+
+    def test_case_policy(self):
+        upper = os.path.join(self.test_dir, "DOCS", "file.txt")
+        self.assertFalse(self.validator.is_path_allowed(upper))
+
+        insensitive = DirectoryValidator(
+            allowed_dirs=[self.docs], case_sensitive=False
+        )
+        self.assertTrue(insensitive.is_path_allowed(upper))
+
+    def test_excluded_file_rule(self):
+        target = os.path.join(self.docs, "skip.txt")
+        self.validator.set_excluded_directories([target])
+        self.assertFalse(self.validator.is_path_allowed(target))
+        self.assertTrue(self.validator.is_path_allowed(
+            os.path.join(self.docs, "keep.txt")
+        ))
+
+    def test_parent_traversal_is_resolved(self):
+        escaped = os.path.join(self.docs, "..", "outside.txt")
+        self.assertFalse(self.validator.is_path_allowed(escaped))
+
+    @unittest.skipIf(not hasattr(os, 'symlink'), "symlinks unavailable")
+    def test_symlink_to_excluded_file(self):
+        secret = os.path.join(self.docs, "private", "secret.txt")
+        with open(secret, 'w') as f:
+            f.write('x')
+        link = os.path.join(self.docs, "link.txt")
+        os.symlink(secret, link)
+        self.assertFalse(self.validator.is_path_allowed(link))
+
+    def test_rule_changes_invalidate_cache(self):
+        path = os.path.join(self.docs, "a", "b.txt")
+        self.assertTrue(self.validator.is_path_allowed(path))
+        self.validator.set_excluded_directories([
+            os.path.join(self.docs, "a")
+        ])
+        self.assertFalse(self.validator.is_path_allowed(path))
+
+    def test_directory_verdicts_are_cached(self):
+        self.validator.clear_cache()
+        for i in range(10):
+            self.validator.is_path_allowed(
+                os.path.join(self.docs, f"file_{i}.txt")
+            )
+        stats = self.validator.get_statistics()
+        self.assertEqual(stats["directory_cache_misses"], 1)
+        self.assertEqual(stats["directory_cache_hits"], 9)
+
+    def test_critical_files(self):
+        self.assertFalse(self.validator.is_path_allowed(
+            os.path.join(self.docs, "pagefile.sys")
+        ))
+
+
+class TestDirectoryValidatorPerformance(unittest.TestCase):
+    """Path checks against 1,000 rules (1M paths in full mode)"""
+
+    def setUp(self):
+        self.root = os.path.realpath(
+            tempfile.mkdtemp(prefix="test_dir_validator_perf_")
+        )
+        allowed = [os.path.join(self.root, f"project_{i:04d}")
+                   for i in range(500)]
+        excluded = [os.path.join(path, "build") for path in allowed]
+        self.validator = DirectoryValidator(
+            allowed_dirs=allowed, excluded_dirs=excluded
+        )
+        count = 1_000_000 if FULL_BENCHMARKS else 50_000
+        # Paths arrive grouped by folder, as they do from a directory walk
+        directories = [
+            os.path.join(self.root, f"project_{p:04d}", sub)
+            for p in range(600)
+            for sub in ["build"] + [f"src_{s}" for s in range(12)]
+        ]
+        per_dir = count // len(directories) + 1
+        self.paths = [
+            os.path.join(directory, f"file_{i}.txt")
+            for directory in directories
+            for i in range(per_dir)
+        ][:count]
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_throughput_versus_linear_scan(self):
+        sample = self.paths[::max(1, len(self.paths) // 5000)]
+        for path in sample:
+            self.assertEqual(self.validator.is_path_allowed(path),
+                             _legacy_is_allowed(self.validator, path))
+
+        start = time.perf_counter()
+        for path in sample:
+            _legacy_is_allowed(self.validator, path)
+        legacy_per_path = (time.perf_counter() - start) / len(sample)
+
+        self.validator.clear_cache()
+        start = time.perf_counter()
+        allowed = sum(
+            1 for path in self.paths if self.validator.is_path_allowed(path)
+        )
+        trie_time = time.perf_counter() - start
+
+        print(f"\n{len(self.paths)} paths, 1000 rules, {allowed} allowed")
+        print(f"linear scan:  {legacy_per_path * 1e6:.1f}us/path "
+              f"(~{legacy_per_path * len(self.paths):.1f}s extrapolated)")
+        print(f"trie + LRU:   {trie_time / len(self.paths) * 1e6:.1f}us/path "
+              f"({trie_time:.2f}s total)")
+
+
+if __name__ == '__main__':
+    unittest.main()
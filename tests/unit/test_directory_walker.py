@@ -0,0 +1,199 @@
+"""
+Tests for the scandir-based directory walker used by the file tools
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))))
+
+from src.utils.directory_walker import walk_directory, list_walk
+from src.tools.examples.file_tool import FileTool
+
+
+# Benchmarks run at a reduced size unless full-size runs are requested
+FULL_BENCHMARKS = os.environ.get('DINOAIR_FULL_BENCHMARKS') == '1'
+
+
+def _build_tree(root, dirs, files_per_dir, depth=1):
+    """Create dirs^depth leaf directories holding files_per_dir files."""
+    paths = [root]
+    for _ in range(depth):
+        next_paths = []
+        for parent in paths:
+            for i in range(dirs):
+                child = os.path.join(parent, f"dir_{i}")
+                os.mkdir(child)
+                next_paths.append(child)
+        paths = next_paths
+    for leaf in paths:
+        for i in range(files_per_dir):
+            ext = 'py' if i % 2 else 'txt'
+            with open(os.path.join(leaf, f"file_{i}.{ext}"), 'w') as f:
+                f.write('x')
+    return len(paths) * files_per_dir
+
+
+class TestWalkDirectory(unittest.TestCase):
+    """Functional tests for walk_directory"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp(prefix="test_walker_")
+        os.makedirs(os.path.join(self.test_dir, 'a', 'b', 'c'))
+        os.makedirs(os.path.join(self.test_dir, 'node_modules', 'pkg'))
+        for rel in ('top.txt', 'top.py', os.path.join('a', 'one.txt'),
+                    os.path.join('a', 'b', 'two.txt'),
+                    os.path.join('a', 'b', 'c', 'three.txt'),
+                    os.path.join('node_modules', 'pkg', 'index.txt')):
+            with open(os.path.join(self.test_dir, rel), 'w') as f:
+                f.write('content')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _rel_files(self, **kwargs):
+        return sorted(
+            e.rel_path for e in walk_directory(
+                self.test_dir, include_dirs=False, **kwargs
+            )
+        )
+
+    def test_matches_rglob(self):
+        from pathlib import Path
+        expected = sorted(
+            str(p.relative_to(self.test_dir))
+            for p in Path(self.test_dir).rglob('*.txt')
+        )
+        self.assertEqual(self._rel_files(pattern='*.txt'), expected)
+
+    def test_non_recursive(self):
+        self.assertEqual(
+            self._rel_files(recursive=False), ['top.py', 'top.txt']
+        )
+
+    def test_max_depth(self):
+        files = self._rel_files(pattern='*.txt', max_depth=1)
+        self.assertIn(os.path.join('a', 'one.txt'), files)
+        self.assertNotIn(os.path.join('a', 'b', 'two.txt'), files)
+
+    def test_ignore_patterns_prune_directories(self):
+        files = self._rel_files(ignore_patterns=['node_modules', '*.py'])
+        self.assertNotIn('top.py', files)
+        self.assertFalse(any(f.startswith('node_modules') for f in files))
+
+    def test_stat_data_populated(self):
+        entries = list(walk_directory(self.test_dir, pattern='top.txt'))
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0].size, len('content'))
+        self.assertIsNotNone(entries[0].modified)
+
+    def test_max_results_truncates(self):
+        entries, truncated = list_walk(
+            self.test_dir, include_dirs=False, max_results=2
+        )
+        self.assertEqual(len(entries), 2)
+        self.assertTrue(truncated)
+
+        entries, truncated = list_walk(
+            self.test_dir, include_dirs=False, max_results=100
+        )
+        self.assertEqual(len(entries), 6)
+        self.assertFalse(truncated)
+
+    def test_file_tool_reports_truncation(self):
+        tool = FileTool()
+        result = tool._find_files(Path(self.test_dir),
+                                  {'pattern': '*.txt', 'max_results': 2})
+        self.assertTrue(result.metadata['truncated'])
+        self.assertEqual(len(result.warnings), 1)
+        result = tool._find_files(Path(self.test_dir), {'pattern': '*.py'})
+        self.assertFalse(result.metadata['truncated'])
+        self.assertEqual(result.warnings, [])
+
+    def test_parallel_matches_serial(self):
+        serial = self._rel_files()
+        parallel = self._rel_files(parallel=True, max_workers=4)
+        self.assertEqual(serial, parallel)
+
+    def test_parallel_respects_max_results(self):
+        entries = list(walk_directory(
+            self.test_dir, parallel=True, max_results=3
+        ))
+        self.assertEqual(len(entries), 3)
+
+    def test_missing_directory_yields_nothing(self):
+        missing = os.path.join(self.test_dir, 'missing')
+        self.assertEqual(list(walk_directory(missing)), [])
+
+
+class TestWalkDirectoryPerformance(unittest.TestCase):
+    """
+    Synthetic-tree benchmark against Path.rglob plus per-match stat().
+
+    The full run (DINOAIR_FULL_BENCHMARKS=1) builds 1,000 directories of
+    1,000 files each, i.e. 1M files.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.test_dir = tempfile.mkdtemp(prefix="test_walker_perf_")
+        if FULL_BENCHMARKS:
+            cls.total = _build_tree(cls.test_dir, 1000, 1000)
+        else:
+            cls.total = _build_tree(cls.test_dir, 20, 50, depth=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.test_dir, ignore_errors=True)
+
+    def test_full_walk_versus_rglob(self):
+        from pathlib import Path
+
+        start = time.perf_counter()
+        baseline = []
+        for f in Path(self.test_dir).rglob('*.py'):
+            if f.is_file():
+                baseline.append((f.stat().st_size, f.stat().st_mtime))
+        rglob_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        walked = list(walk_directory(
+            self.test_dir, pattern='*.py', include_dirs=False
+        ))
+        walk_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        parallel = list(walk_directory(
+            self.test_dir, pattern='*.py', include_dirs=False,
+            parallel=True
+        ))
+        parallel_time = time.perf_counter() - start
+
+        self.assertEqual(len(walked), len(baseline))
+        self.assertEqual(len(parallel), len(baseline))
+
+        print(f"\nTree with {self.total} files")
+        print(f"rglob + stat:      {rglob_time:.3f}s")
+        print(f"walk_directory:    {walk_time:.3f}s")
+        print(f"parallel walk:     {parallel_time:.3f}s")
+
+    def test_early_termination(self):
+        start = time.perf_counter()
+        entries = list(walk_directory(
+            self.test_dir, include_dirs=False, max_results=100
+        ))
+        limited_time = time.perf_counter() - start
+
+        self.assertEqual(len(entries), 100)
+        print(f"\nFirst 100 of {self.total} files: {limited_time * 1000:.2f}ms")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,207 @@
+"""
+Tests for orphan detection and collection in FileSearchDB
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import shutil
+import sqlite3
+import unittest
+from datetime import datetime
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))))
+
+from src.database.file_search_db import FileSearchDB
+
+
+# Benchmarks run at a reduced size unless full-size runs are requested
+FULL_BENCHMARKS = os.environ.get('DINOAIR_FULL_BENCHMARKS') == '1'
+
+
+def _raw_connection(db):
+    """Open a connection without foreign key enforcement, like legacy code"""
+    return sqlite3.connect(db.db_manager.file_search_db_path)
+
+
+def _populate(db, files, chunks_per_file, orphan_ratio=0.0):
+    """Bulk-insert an index, then drop a share of file rows behind FKs"""
+    conn = _raw_connection(db)
+    now = datetime.now().isoformat()
+    vector = json.dumps([0.1] * 8)
+    for f in range(files):
+        file_id = f"file_{f}"
+        conn.execute(
+            "INSERT INTO indexed_files (id, file_path, file_hash, size, "
+            "modified_date, file_type) VALUES (?, ?, ?, ?, ?, ?)",
+            (file_id, f"/docs/{f}.txt", "hash", 100, now, "txt")
+        )
+        conn.executemany(
+            "INSERT INTO file_chunks (id, file_id, chunk_index, content, "
+            "start_pos, end_pos) VALUES (?, ?, ?, ?, ?, ?)",
+            [(f"{file_id}_chunk_{c}", file_id, c,
+              f"alpha beta gamma document {f} chunk {c}", 0, 40)
+             for c in range(chunks_per_file)]
+        )
+        conn.executemany(
+            "INSERT INTO file_embeddings (id, chunk_id, embedding_vector, "
+            "model_name) VALUES (?, ?, ?, ?)",
+            [(f"{file_id}_chunk_{c}_embedding", f"{file_id}_chunk_{c}",
+              vector, "test-model") for c in range(chunks_per_file)]
+        )
+    orphaned_files = int(files * orphan_ratio)
+    conn.executemany(
+        "DELETE FROM indexed_files WHERE id = ?",
+        [(f"file_{f}",) for f in range(orphaned_files)]
+    )
+    conn.commit()
+    conn.close()
+    return orphaned_files * chunks_per_file
+
+
+class TestFileSearchGC(unittest.TestCase):
+    """Functional tests for orphan reporting and collection"""
+
+    def setUp(self):
+        self.db = FileSearchDB(user_name=f"test_gc_user_{uuid.uuid4().hex[:8]}")
+
+    def tearDown(self):
+        self.db.stop_background_gc()
+        shutil.rmtree(self.db.db_manager.user_db_dir.parent,
+                      ignore_errors=True)
+
+    def test_foreign_keys_enabled_on_new_connections(self):
+        conn = self.db._get_connection()
+        try:
+            self.assertEqual(
+                conn.execute("PRAGMA foreign_keys").fetchone()[0], 1
+            )
+        finally:
+            conn.close()
+
+    def test_remove_file_removes_chunks_and_embeddings(self):
+        result = self.db.add_indexed_file(
+            "/docs/a.txt", "hash", 10, datetime.now(), "txt"
+        )
+        chunk = self.db.add_chunk(result["file_id"], 0, "hello", 0, 5)
+        self.db.add_embedding(chunk["chunk_id"], [0.1, 0.2], "test-model")
+
+        removed = self.db.remove_file_from_index("/docs/a.txt")
+        self.assertTrue(removed["success"])
+        self.assertEqual(removed["chunks_removed"], 1)
+        self.assertEqual(removed["embeddings_removed"], 1)
+        self.assertEqual(
+            self.db.find_dangling_references()["total_orphans"], 0
+        )
+
+    def test_reindex_replaces_old_chunks(self):
+        first = self.db.add_indexed_file(
+            "/docs/a.txt", "hash1", 10, datetime.now(), "txt"
+        )
+        self.db.add_chunk(first["file_id"], 0, "old", 0, 3)
+        time.sleep(0.001)
+        second = self.db.add_indexed_file(
+            "/docs/a.txt", "hash2", 10, datetime.now(), "txt"
+        )
+        self.assertNotEqual(first["file_id"], second["file_id"])
+        self.assertEqual(
+            self.db.find_dangling_references()["orphaned_chunks"], 0
+        )
+
+    def test_dangling_reference_report(self):
+        expected = _populate(self.db, 10, 3, orphan_ratio=0.3)
+        conn = _raw_connection(self.db)
+        conn.execute("DELETE FROM file_chunks WHERE id = 'file_9_chunk_0'")
+        conn.commit()
+        conn.close()
+
+        report = self.db.find_dangling_references(sample_size=2)
+        self.assertTrue(report["success"])
+        self.assertEqual(report["orphaned_chunks"], expected)
+        self.assertEqual(report["orphaned_embeddings"], 1)
+        self.assertEqual(len(report["orphaned_chunks_sample"]), 2)
+        self.assertEqual(report["orphaned_embeddings_sample"],
+                         ["file_9_chunk_0_embedding"])
+
+    def test_collect_orphans_in_batches(self):
+        expected = _populate(self.db, 10, 5, orphan_ratio=0.3)
+
+        result = self.db.collect_orphans(batch_size=4)
+        self.assertTrue(result["success"])
+        self.assertTrue(result["complete"])
+        self.assertEqual(result["chunks_removed"], expected)
+        self.assertEqual(result["embeddings_removed"], expected)
+        self.assertGreater(result["batches"], 1)
+
+        report = self.db.find_dangling_references()
+        self.assertEqual(report["total_orphans"], 0)
+        self.assertEqual(
+            self.db.get_indexed_files_stats()["total_chunks"], 35
+        )
+
+    def test_time_budget_stops_early(self):
+        _populate(self.db, 10, 5, orphan_ratio=0.5)
+
+        result = self.db.collect_orphans(batch_size=1, time_budget=0)
+        self.assertFalse(result["complete"])
+        self.assertEqual(result["batches"], 1)
+
+    def test_background_gc(self):
+        expected = _populate(self.db, 10, 5, orphan_ratio=0.3)
+
+        self.assertTrue(self.db.start_background_gc(
+            batch_size=3, slice_seconds=0, pause_seconds=0.01
+        ))
+        self.db._gc_thread.join(10)
+        self.assertFalse(self.db.is_background_gc_running())
+
+        result = self.db.stop_background_gc()
+        self.assertTrue(result["complete"])
+        self.assertEqual(result["chunks_removed"], expected)
+        self.assertEqual(
+            self.db.find_dangling_references()["total_orphans"], 0
+        )
+
+
+class TestFileSearchGCPerformance(unittest.TestCase):
+    """Search latency before and after collecting 30% orphans"""
+
+    def setUp(self):
+        self.db = FileSearchDB(
+            user_name=f"test_gc_perf_{uuid.uuid4().hex[:8]}"
+        )
+        files = 2000 if FULL_BENCHMARKS else 200
+        self.orphans = _populate(self.db, files, 50, orphan_ratio=0.3)
+
+    def tearDown(self):
+        shutil.rmtree(self.db.db_manager.user_db_dir.parent,
+                      ignore_errors=True)
+
+    def _time_searches(self, rounds=5):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            self.db.search_by_keywords(["gamma", "chunk"], limit=20)
+            self.db.get_all_embeddings()
+        return (time.perf_counter() - start) / rounds
+
+    def test_search_latency_after_gc(self):
+        before = self._time_searches()
+
+        start = time.perf_counter()
+        result = self.db.collect_orphans(batch_size=1000)
+        gc_time = time.perf_counter() - start
+        self.assertEqual(result["chunks_removed"], self.orphans)
+
+        after = self._time_searches()
+
+        print(f"\nRemoved {self.orphans} orphaned chunks in {gc_time:.3f}s")
+        print(f"Search round before GC: {before * 1000:.1f}ms")
+        print(f"Search round after GC:  {after * 1000:.1f}ms")
+
+
+if __name__ == '__main__':
+    unittest.main()
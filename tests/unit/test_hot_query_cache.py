@@ -0,0 +1,273 @@
+"""
+Tests for the persistent hot-query cache in OptimizedVectorSearchEngine
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import shutil
+import sqlite3
+import unittest
+from datetime import datetime
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))))
+
+from src.rag.optimized_vector_search import OptimizedVectorSearchEngine
+from tests.unit.test_batch_vector_search import (
+    FakeEmbeddingGenerator, _populate, _queries
+)
+
+
+# Benchmarks run at a reduced size unless full-size runs are requested
+FULL_BENCHMARKS = os.environ.get('DINOAIR_FULL_BENCHMARKS') == '1'
+
+
+# Engines created by the tests, shut down before their files are removed
+_engines = []
+
+
+def _engine(user_name, **kwargs):
+    engine = OptimizedVectorSearchEngine(
+        user_name=user_name,
+        embedding_generator=FakeEmbeddingGenerator(),
+        **kwargs
+    )
+    # Always re-read the generation so tests see reindexes immediately
+    engine.GENERATION_POLL_SECONDS = 0
+    _engines.append(engine)
+    return engine
+
+
+def _remove(db_root):
+    """Stop every engine's refresh thread, then delete the databases"""
+    while _engines:
+        _engines.pop().shutdown()
+    shutil.rmtree(db_root, ignore_errors=True)
+
+
+def _add_file(engine, file_id, content):
+    """Index a one-chunk file the way an incremental reindex would"""
+    conn = sqlite3.connect(engine.db.db_manager.file_search_db_path)
+    conn.execute(
+        "INSERT INTO indexed_files (id, file_path, file_hash, size, "
+        "modified_date, file_type) VALUES (?, ?, ?, ?, ?, ?)",
+        (file_id, f"/docs/{file_id}.txt", "hash", 100,
+         datetime.now().isoformat(), 'txt')
+    )
+    conn.execute(
+        "INSERT INTO file_chunks (id, file_id, chunk_index, content, "
+        "start_pos, end_pos) VALUES (?, ?, ?, ?, ?, ?)",
+        (f"{file_id}_chunk_0", file_id, 0, content, 0, len(content))
+    )
+    conn.execute(
+        "INSERT INTO file_embeddings (id, chunk_id, embedding_vector, "
+        "model_name) VALUES (?, ?, ?, ?)",
+        (f"{file_id}_embedding", f"{file_id}_chunk_0",
+         json.dumps(FakeEmbeddingGenerator()._embed(content).tolist()),
+         "fake")
+    )
+    conn.commit()
+    conn.close()
+
+
+def _touch_file(engine, file_path):
+    conn = sqlite3.connect(engine.db.db_manager.file_search_db_path)
+    conn.execute(
+        "UPDATE indexed_files SET modified_date = ? WHERE file_path = ?",
+        (datetime.now().isoformat(), file_path)
+    )
+    conn.commit()
+    conn.close()
+
+
+class TestHotQueryCache(unittest.TestCase):
+    """Persistence and generation-aware refresh"""
+
+    QUERY = "python database vector"
+
+    def setUp(self):
+        self.user_name = f"test_hot_cache_{uuid.uuid4().hex[:8]}"
+        self.engine = _engine(self.user_name)
+        _populate(self.engine, 200)
+
+    def tearDown(self):
+        _remove(self.engine.db.db_manager.user_db_dir.parent)
+
+    def _make_hot(self, engine, **params):
+        for _ in range(engine.hot_cache.hot_threshold):
+            results = engine.search(self.QUERY, **params)
+        return results
+
+    def test_generation_advances_on_index_changes(self):
+        generation = self.engine.db.get_index_generation()
+        _add_file(self.engine, "extra", "network server client")
+        self.assertGreater(self.engine.db.get_index_generation(), generation)
+
+        changed = self.engine.db.get_changed_files(generation)
+        self.assertEqual(list(changed["files"]), ["/docs/extra.txt"])
+
+    def test_cold_queries_are_not_persisted(self):
+        self.engine.search(self.QUERY, top_k=5)
+        self.assertEqual(self.engine.db.get_hot_queries()["entries"], [])
+
+    def test_results_survive_restart(self):
+        expected = self._make_hot(self.engine, top_k=5)
+        self.engine.hot_cache.flush()
+
+        restarted = _engine(self.user_name)
+        restarted.embedding_generator.single_calls = 0
+        results = restarted.search(self.QUERY, top_k=5)
+        self.assertEqual(restarted.embedding_generator.single_calls, 0)
+        self.assertEqual([r.chunk_id for r in results],
+                         [r.chunk_id for r in expected])
+        self.assertEqual(restarted.hot_cache.get_stats()["hits"], 1)
+
+    def test_unrelated_reindex_carries_entries_forward(self):
+        self._make_hot(self.engine, top_k=5, similarity_threshold=0.3)
+        _add_file(self.engine, "unrelated", "widget layout theme")
+
+        refresh = self.engine.refresh_hot_queries()
+        self.assertEqual(refresh["recomputed"], 0)
+        self.assertEqual(refresh["carried_forward"], 1)
+
+        self.engine.embedding_generator.single_calls = 0
+        self.engine.search(self.QUERY, top_k=5, similarity_threshold=0.3)
+        self.assertEqual(self.engine.embedding_generator.single_calls, 0)
+
+    def test_changed_result_file_is_recomputed(self):
+        results = self._make_hot(self.engine, top_k=5)
+        _touch_file(self.engine, results[0].file_path)
+
+        refresh = self.engine.refresh_hot_queries()
+        self.assertEqual(refresh["recomputed"], 1)
+        entry = self.engine.db.get_hot_queries()["entries"][0]
+        self.assertEqual(entry["generation"],
+                         self.engine.db.get_index_generation())
+
+    def test_new_matching_file_is_recomputed(self):
+        self._make_hot(self.engine, top_k=5)
+        _add_file(self.engine, "match", self.QUERY)
+
+        refresh = self.engine.refresh_hot_queries()
+        self.assertEqual(refresh["recomputed"], 1)
+        results = self.engine.search(self.QUERY, top_k=5)
+        self.assertEqual(results[0].chunk_id, "match_chunk_0")
+
+    def test_hybrid_entry_recomputed_for_keyword_match(self):
+        for _ in range(2):
+            self.engine.hybrid_search(self.QUERY, top_k=5)
+        # Shares a keyword but not enough of the vector to pass the bar
+        _add_file(self.engine, "keyword", "python " + "theme " * 30)
+
+        refresh = self.engine.refresh_hot_queries()
+        self.assertEqual(refresh["recomputed"], 1)
+
+    def test_stale_entries_are_not_served(self):
+        self._make_hot(self.engine, top_k=5)
+        _add_file(self.engine, "match", self.QUERY)
+        # Without a refresh the stale entry must not be served
+        results = self.engine.search(self.QUERY, top_k=5)
+        self.assertEqual(results[0].chunk_id, "match_chunk_0")
+
+    def test_generation_change_schedules_refresh(self):
+        self._make_hot(self.engine, top_k=5)
+        _add_file(self.engine, "unrelated", "widget layout theme")
+        self.engine.search("anything else", top_k=5)
+        self.engine._refresh_thread.join(timeout=10)
+
+        entry = self.engine.db.get_hot_queries()["entries"][0]
+        self.assertEqual(entry["generation"],
+                         self.engine.db.get_index_generation())
+
+    def test_eviction_keeps_hottest(self):
+        engine = _engine(f"{self.user_name}_small", hot_cache_size=2)
+        try:
+            _populate(engine, 40)
+            for query, uses in (("alpha", 5), ("beta", 3), ("gamma", 2),
+                                ("delta", 4)):
+                for _ in range(uses):
+                    engine.search(query, top_k=3)
+            stored = {e["query"] for e in
+                      engine.db.get_hot_queries()["entries"]}
+            self.assertEqual(stored, {"alpha", "delta"})
+        finally:
+            engine.shutdown()
+            shutil.rmtree(engine.db.db_manager.user_db_dir.parent,
+                          ignore_errors=True)
+
+    def test_query_counts_stay_bounded(self):
+        cache = self.engine.hot_cache
+        cache.max_entries = 2
+        generation = self.engine.db.get_index_generation()
+        limit = cache.max_entries * cache.COUNTED_PER_ENTRY
+        for i in range(10 * limit):
+            cache.get("frequent", {}, generation)
+            cache.get(f"rare {i}", {}, generation)
+            self.assertLessEqual(len(cache.frequency), limit)
+        self.assertEqual(cache.frequency[cache.make_key("frequent", {})],
+                         10 * limit)
+
+
+class TestHotQueryCachePerformance(unittest.TestCase):
+    """Zipf-distributed query latency across restarts"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.user_name = f"test_hot_perf_{uuid.uuid4().hex[:8]}"
+        engine = _engine(cls.user_name)
+        _populate(engine, 20000 if FULL_BENCHMARKS else 2000)
+        cls.db_root = engine.db.db_manager.user_db_dir.parent
+
+        rng = np.random.default_rng(11)
+        distinct = _queries(1000)
+        ranks = rng.zipf(1.2, size=20000 if FULL_BENCHMARKS else 1500)
+        cls.workload = [distinct[(rank - 1) % len(distinct)]
+                        for rank in ranks]
+
+    @classmethod
+    def tearDownClass(cls):
+        _remove(cls.db_root)
+
+    def _run(self, engine):
+        latencies = []
+        for query in self.workload:
+            start = time.perf_counter()
+            engine.search(query, top_k=10)
+            latencies.append(time.perf_counter() - start)
+        latencies.sort()
+        return latencies
+
+    def test_zipf_latency_across_restarts(self):
+        def summary(latencies):
+            p50 = latencies[len(latencies) // 2] * 1000
+            p99 = latencies[int(len(latencies) * 0.99)] * 1000
+            return f"p50 {p50:.3f}ms  p99 {p99:.3f}ms"
+
+        first = _engine(self.user_name)
+        first_run = self._run(first)
+        first.hot_cache.flush()
+        stored = first.hot_cache.get_stats()["size"]
+
+        restarted = _engine(self.user_name)
+        restarted_run = self._run(restarted)
+        hit_rate = restarted.hot_cache.get_stats()["hit_rate"]
+
+        uncached = _engine(self.user_name, enable_hot_cache=False)
+        uncached_run = self._run(uncached)
+
+        print(f"\n{len(self.workload)} Zipf queries, {stored} hot queries "
+              f"persisted, {hit_rate:.0%} served after restart")
+        print(f"first run:             {summary(first_run)}")
+        print(f"restart, hot cache:    {summary(restarted_run)}")
+        print(f"restart, memory only:  {summary(uncached_run)}")
+        self.assertGreater(hit_rate, 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
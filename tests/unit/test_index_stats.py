@@ -0,0 +1,237 @@
+"""
+Tests for trigger-maintained index statistics in FileSearchDB
+"""
+
+import os
+import sys
+import time
+import uuid
+import shutil
+import sqlite3
+import unittest
+from datetime import datetime
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))))
+
+from src.database.file_search_db import FileSearchDB
+
+
+# Benchmarks run at a reduced size unless full-size runs are requested
+FULL_BENCHMARKS = os.environ.get('DINOAIR_FULL_BENCHMARKS') == '1'
+
+
+def _legacy_stats(db):
+    """The previous aggregate queries, used as ground truth"""
+    conn = sqlite3.connect(db.db_manager.file_search_db_path)
+    try:
+        def scalar(sql):
+            return conn.execute(sql).fetchone()[0]
+        return {
+            'total_files': scalar(
+                "SELECT COUNT(*) FROM indexed_files WHERE status = 'active'"),
+            'files_by_type': {
+                row[0] or 'unknown': row[1] for row in conn.execute(
+                    "SELECT file_type, COUNT(*) FROM indexed_files "
+                    "WHERE status = 'active' GROUP BY file_type")
+            },
+            'total_size_bytes': scalar(
+                "SELECT SUM(size) FROM indexed_files "
+                "WHERE status = 'active'") or 0,
+            'total_chunks': scalar(
+                "SELECT COUNT(*) FROM file_chunks c JOIN indexed_files f "
+                "ON c.file_id = f.id WHERE f.status = 'active'"),
+            'total_embeddings': scalar(
+                "SELECT COUNT(*) FROM file_embeddings e "
+                "JOIN file_chunks c ON e.chunk_id = c.id "
+                "JOIN indexed_files f ON c.file_id = f.id "
+                "WHERE f.status = 'active'"),
+            'last_indexed_date': scalar(
+                "SELECT MAX(indexed_date) FROM indexed_files"),
+        }
+    finally:
+        conn.close()
+
+
+class TestIndexStatsCounters(unittest.TestCase):
+    """Counters must match a full recount after every kind of write"""
+
+    def setUp(self):
+        self.db = FileSearchDB(user_name=f"test_stats_{uuid.uuid4().hex[:8]}")
+
+    def tearDown(self):
+        shutil.rmtree(self.db.db_manager.user_db_dir.parent,
+                      ignore_errors=True)
+
+    def _assert_consistent(self):
+        stats = self.db.get_indexed_files_stats()
+        expected = _legacy_stats(self.db)
+        for key, value in expected.items():
+            self.assertEqual(stats[key], value, key)
+        self.assertTrue(self.db.verify_index_stats()["consistent"])
+        return stats
+
+    def _index_file(self, name, file_type, chunks, embed=True):
+        file_id = self.db.add_indexed_file(
+            f"/docs/{name}", "hash", 100 * chunks, datetime.now(), file_type
+        )["file_id"]
+        for c in range(chunks):
+            chunk_id = self.db.add_chunk(
+                file_id, c, f"{name} chunk {c}", 0, 10
+            )["chunk_id"]
+            if embed:
+                self.db.add_embedding(chunk_id, [0.1, 0.2], "test-model")
+        return file_id
+
+    def test_add_paths_and_breakdown(self):
+        self._index_file("a.txt", "txt", 3)
+        self._index_file("b.txt", "txt", 2, embed=False)
+        self._index_file("c.md", "md", 4)
+        self._index_file("d", None, 1)
+
+        stats = self._assert_consistent()
+        self.assertEqual(stats['by_type']['txt'], {
+            'files': 2, 'size_bytes': 500, 'chunks': 5, 'embeddings': 3
+        })
+        self.assertEqual(stats['by_type']['unknown']['chunks'], 1)
+
+    def test_reindex_replaces_rows(self):
+        self._index_file("a.txt", "txt", 3)
+        # Re-adding the same path replaces the file row and cascades
+        self._index_file("a.txt", "txt", 5)
+        self._index_file("a.txt", "md", 2)
+        stats = self._assert_consistent()
+        self.assertEqual(stats['total_chunks'], 2)
+        self.assertEqual(stats['files_by_type'], {'md': 1})
+
+    def test_remove_and_clear_paths(self):
+        self._index_file("a.txt", "txt", 3)
+        self._index_file("b.txt", "txt", 4)
+        self.db.clear_embeddings_for_file("/docs/a.txt")
+        self._assert_consistent()
+        self.db.remove_file_from_index("/docs/b.txt")
+        stats = self._assert_consistent()
+        self.assertEqual(stats['total_chunks'], 3)
+        self.assertEqual(stats['total_embeddings'], 0)
+
+    def test_raw_deletes_status_changes_and_gc(self):
+        for i in range(4):
+            self._index_file(f"{i}.txt", "txt", 3)
+        conn = sqlite3.connect(self.db.db_manager.file_search_db_path)
+        # No foreign keys on this connection: leaves orphans behind
+        conn.execute("DELETE FROM indexed_files WHERE file_path = '/docs/0.txt'")
+        conn.execute("UPDATE indexed_files SET status = 'archived' "
+                     "WHERE file_path = '/docs/1.txt'")
+        conn.execute("UPDATE indexed_files SET file_type = 'log' "
+                     "WHERE file_path = '/docs/2.txt'")
+        conn.commit()
+        conn.close()
+        self._assert_consistent()
+
+        self.db.collect_orphans()
+        stats = self._assert_consistent()
+        self.assertEqual(stats['files_by_type'], {'txt': 1, 'log': 1})
+
+    def test_verify_and_repair(self):
+        self._index_file("a.txt", "txt", 3)
+        conn = sqlite3.connect(self.db.db_manager.file_search_db_path)
+        conn.execute("UPDATE index_stats SET chunks = 99")
+        conn.execute("INSERT INTO index_stats (file_type, files) "
+                     "VALUES ('ghost', 1)")
+        conn.commit()
+        conn.close()
+
+        result = self.db.verify_index_stats()
+        self.assertFalse(result["consistent"])
+        self.assertEqual(result["discrepancies"]["txt"]["chunks"],
+                         {'stored': 99, 'actual': 3})
+        self.assertIn("ghost", result["discrepancies"])
+        self.assertFalse(result["repaired"])
+
+        self.assertTrue(self.db.verify_index_stats(repair=True)["repaired"])
+        self._assert_consistent()
+
+    def test_existing_index_is_seeded(self):
+        self._index_file("a.txt", "txt", 3)
+        conn = sqlite3.connect(self.db.db_manager.file_search_db_path)
+        conn.execute("DROP TABLE index_stats")
+        conn.commit()
+        conn.close()
+        # A fresh handle recreates and seeds the counters
+        reopened = FileSearchDB(user_name=self.db.user_name)
+        self.assertEqual(reopened.get_indexed_files_stats()['total_chunks'], 3)
+
+
+class TestIndexStatsPerformance(unittest.TestCase):
+    """Stats reads on an index with 5M chunks (500k by default)"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = FileSearchDB(
+            user_name=f"test_stats_perf_{uuid.uuid4().hex[:8]}"
+        )
+        chunks = 5_000_000 if FULL_BENCHMARKS else 500_000
+        chunks_per_file = 50
+        types = ['txt', 'md', 'py', 'pdf', 'docx']
+        now = datetime.now().isoformat()
+
+        conn = sqlite3.connect(cls.db.db_manager.file_search_db_path)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = OFF")
+        start = time.perf_counter()
+        for f in range(chunks // chunks_per_file):
+            file_id = f"file_{f}"
+            conn.execute(
+                "INSERT INTO indexed_files (id, file_path, file_hash, size, "
+                "modified_date, file_type) VALUES (?, ?, ?, ?, ?, ?)",
+                (file_id, f"/docs/{f}", "hash", 4096, now,
+                 types[f % len(types)])
+            )
+            conn.executemany(
+                "INSERT INTO file_chunks (id, file_id, chunk_index, content, "
+                "start_pos, end_pos) VALUES (?, ?, ?, ?, ?, ?)",
+                [(f"{file_id}_{c}", file_id, c, "x", 0, 1)
+                 for c in range(chunks_per_file)]
+            )
+            conn.executemany(
+                "INSERT INTO file_embeddings (id, chunk_id, embedding_vector, "
+                "model_name) VALUES (?, ?, ?, ?)",
+                [(f"{file_id}_{c}_e", f"{file_id}_{c}", "[]", "m")
+                 for c in range(chunks_per_file)]
+            )
+        conn.commit()
+        conn.close()
+        cls.build_time = time.perf_counter() - start
+        cls.chunks = chunks
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.db.db_manager.user_db_dir.parent,
+                      ignore_errors=True)
+
+    def test_stats_read_latency(self):
+        def timed(read, runs):
+            start = time.perf_counter()
+            for _ in range(runs):
+                result = read()
+            return (time.perf_counter() - start) / runs * 1000, result
+
+        counters_ms, stats = timed(self.db.get_indexed_files_stats, 20)
+        legacy_ms, expected = timed(lambda: _legacy_stats(self.db), 2)
+        for key, value in expected.items():
+            self.assertEqual(stats[key], value, key)
+
+        start = time.perf_counter()
+        self.assertTrue(self.db.verify_index_stats()["consistent"])
+        verify_time = time.perf_counter() - start
+
+        print(f"\n{self.chunks} chunks indexed in {self.build_time:.1f}s "
+              f"(counters maintained by triggers)")
+        print(f"aggregate queries: {legacy_ms:9.2f}ms per read")
+        print(f"counters:          {counters_ms:9.2f}ms per read")
+        print(f"verify recount:    {verify_time * 1000:9.2f}ms")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,197 @@
+"""
+Tests for keyed row diffing and delegate painting in NoteListWidget
+"""
+
+import os
+import sys
+import time
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))))
+
+from src.models.note import Note
+from src.gui.components.note_list_widget import (
+    NOTE_ROLE, NoteListWidget, _longest_increasing_run
+)
+
+
+# Benchmarks run at a reduced size unless full-size runs are requested
+FULL_BENCHMARKS = os.environ.get('DINOAIR_FULL_BENCHMARKS') == '1'
+
+
+def _note(note_id, title, updated_at="2026-01-01T12:00:00", number=0):
+    note = Note(id=note_id, title=title,
+                content=f"Body of note {number}\nsecond line",
+                tags=["a", "b"])
+    note.created_at = "2026-01-01T12:00:00"
+    note.updated_at = updated_at
+    return note
+
+
+def _notes(count, start=0):
+    return [_note(f"note-{i}", f"Note {i}", number=i)
+            for i in range(start, start + count)]
+
+
+def _edited(note, title, updated_at):
+    """Copy of a note with a new title, as loaded after an edit"""
+    edited = _note(note.id, title, updated_at)
+    edited.content = note.content
+    return edited
+
+
+def _row_ids(widget):
+    return [widget.item(i).data(NOTE_ROLE).id for i in range(widget.count())]
+
+
+class TestLongestIncreasingRun(unittest.TestCase):
+
+    def test_runs(self):
+        self.assertEqual(_longest_increasing_run([]), set())
+        self.assertEqual(_longest_increasing_run([0, 1, 2]), {0, 1, 2})
+        # Last element moved to the front: everything else stays
+        self.assertEqual(_longest_increasing_run([1, 2, 3, 0]), {0, 1, 2})
+        self.assertEqual(len(_longest_increasing_run([3, 0, 1, 2, 4])), 4)
+
+
+class TestNoteListDiff(unittest.TestCase):
+    """Reloads patch rows in place rather than rebuilding them"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.widget = NoteListWidget()
+        self.notes = _notes(20)
+        self.widget.load_notes(self.notes)
+        self.items = [self.widget.item(i) for i in range(20)]
+
+    def tearDown(self):
+        self.widget.deleteLater()
+
+    def test_edit_updates_row_in_place(self):
+        notes = list(self.notes)
+        notes[5] = _edited(notes[5], title="Renamed",
+                           updated_at="2026-01-02T12:00:00")
+        self.widget.load_notes(notes)
+        self.assertIs(self.widget.item(5), self.items[5])
+        self.assertEqual(self.widget.item(5).text(), "Renamed")
+        self.assertEqual(self.widget.item(5).data(NOTE_ROLE).title, "Renamed")
+
+    def test_moved_note_keeps_its_item(self):
+        notes = [self.notes[19]] + self.notes[:19]
+        self.widget.load_notes(notes)
+        self.assertEqual(_row_ids(self.widget), [n.id for n in notes])
+        self.assertIs(self.widget.item(0), self.items[19])
+        self.assertIs(self.widget.item(1), self.items[0])
+
+    def test_insert_and_remove(self):
+        notes = self.notes[:3] + _notes(2, start=100) + self.notes[4:]
+        self.widget.load_notes(notes)
+        self.assertEqual(_row_ids(self.widget), [n.id for n in notes])
+        self.assertIs(self.widget.item(5), self.items[4])
+
+    def test_shuffle_matches_order(self):
+        notes = self.notes[::2] + self.notes[1::2]
+        self.widget.load_notes(notes)
+        self.assertEqual(_row_ids(self.widget), [n.id for n in notes])
+        self.assertEqual(set(map(id, (self.widget.item(i)
+                                      for i in range(20)))),
+                         set(map(id, self.items)))
+
+    def test_selection_survives_move_without_signal(self):
+        selected = []
+        self.widget.setCurrentRow(3)
+        self.widget.note_selected.connect(selected.append)
+        notes = [self.notes[10]] + self.notes[:10] + self.notes[11:]
+        self.widget.refresh_notes(notes)
+        self.assertEqual(self.widget.get_selected_note().id, "note-3")
+        self.assertEqual(self.widget.currentRow(), 4)
+        self.assertEqual(selected, [])
+
+    def test_large_change_rebuilds(self):
+        notes = _notes(200, start=1000)
+        self.widget.load_notes(notes)
+        self.assertEqual(_row_ids(self.widget), [n.id for n in notes])
+
+    def test_highlight_spans_are_lazy(self):
+        delegate = self.widget.delegate
+        self.widget.search_input.setText("note")
+        self.assertEqual(delegate._highlight_cache, {})
+        preview = delegate._display_text(self.notes[0])[0]
+        self.assertEqual(preview, "Body of note 0")
+        self.assertEqual(delegate._highlight_spans(self.notes[0], preview),
+                         [(8, 12)])
+        self.widget.search_input.setText("")
+        self.assertEqual(delegate._highlight_cache, {})
+
+    def test_rows_paint(self):
+        self.widget.resize(300, 400)
+        self.widget.filter_notes(self.notes[:4], "note")
+        self.widget.show()
+        self.app.processEvents()
+        pixmap = self.widget.list_widget.viewport().grab()
+        self.assertFalse(pixmap.isNull())
+        self.assertIn("note-0", self.widget.delegate._highlight_cache)
+
+
+class TestNoteListPerformance(unittest.TestCase):
+    """Single edit, filter change and reload times for a large list"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def test_50k_notes(self):
+        count = 50_000 if FULL_BENCHMARKS else 10_000
+        notes = _notes(count)
+        widget = NoteListWidget()
+        widget.resize(400, 800)
+        widget.show()
+        try:
+            def timed(action):
+                start = time.perf_counter()
+                action()
+                self.app.processEvents()
+                return (time.perf_counter() - start) * 1000
+
+            cold = timed(lambda: widget.load_notes(notes))
+
+            edited = list(notes)
+            edited[count // 2] = _edited(edited[count // 2], title="Edited",
+                                         updated_at="2026-01-02T12:00:00")
+            edit = timed(lambda: widget.load_notes(edited))
+            # Edited note moves to the top, as when sorted by update time
+            bumped = [edited[count // 2]] + edited[:count // 2] + \
+                edited[count // 2 + 1:]
+            bump = timed(lambda: widget.load_notes(bumped))
+            # Fresh objects for the same notes, as after a database reload
+            fresh = _notes(count)
+            reload = timed(lambda: widget.load_notes(fresh))
+            search = timed(lambda: widget.search_input.setText("note 123"))
+            visible = sum(not widget.item(i).isHidden()
+                          for i in range(widget.count()))
+            clear = timed(lambda: widget.search_input.setText(""))
+
+            print(f"\n{count} notes: cold load {cold:7.1f}ms, "
+                  f"single edit {edit:6.1f}ms, edit to top {bump:6.1f}ms, "
+                  f"full reload {reload:7.1f}ms, filter {search:6.1f}ms, "
+                  f"clear filter {clear:6.1f}ms")
+
+            self.assertEqual(widget.count(), count)
+            self.assertEqual(visible, sum("note 123" in f"note {i}"
+                                          for i in range(count)))
+            self.assertEqual(widget.item(0).text(), "Note 0")
+        finally:
+            widget.deleteLater()
+
+
+if __name__ == '__main__':
+    unittest.main()
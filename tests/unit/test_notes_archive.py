@@ -0,0 +1,278 @@
+"""
+Tests for the resumable, parallel notes ZIP export
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import zipfile
+import tempfile
+import unittest
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))))
+
+from src.models.note import Note
+from src.utils.note_export import NoteRenderer, NotesArchiveWriter
+from src.gui.components.notes_exporter import (
+    NotesExporter, NotesExportWorker
+)
+
+
+# Benchmarks run at a reduced size unless full-size runs are requested
+FULL_BENCHMARKS = os.environ.get('DINOAIR_FULL_BENCHMARKS') == '1'
+
+
+def _notes(count):
+    notes = []
+    for i in range(count):
+        note = Note(id=f"note-{i}", title=f"Note {count - i:05d}",
+                    content=f"Body of note {i}.\n\n" +
+                    "Some longer paragraph text. " * 30,
+                    tags=["work", "idea"])
+        note.created_at = "2026-01-01T12:00:00"
+        note.updated_at = "2026-01-02T12:00:00"
+        notes.append(note)
+    return notes
+
+
+class TestNotesArchiveWriter(unittest.TestCase):
+    """Archive contents, cancellation and resuming"""
+
+    def setUp(self):
+        self.out_dir = tempfile.mkdtemp(prefix="test_notes_archive_")
+        self.path = os.path.join(self.out_dir, "notes.zip")
+        self.writer = NotesArchiveWriter(processes=1)
+        self.writer.PROGRESS_INTERVAL = 10
+
+    def tearDown(self):
+        shutil.rmtree(self.out_dir, ignore_errors=True)
+
+    def _names(self, path=None):
+        with zipfile.ZipFile(path or self.path) as archive:
+            return archive.namelist()
+
+    def test_archive_contents(self):
+        notes = _notes(25)
+        reported = []
+        result = self.writer.write(
+            notes, self.path, "export",
+            progress_callback=lambda done, total: reported.append(done)
+        )
+        self.assertTrue(result['success'])
+        self.assertEqual(reported, [10, 20, 25])
+        self.assertFalse(os.path.exists(self.path + ".partial"))
+        self.assertFalse(os.path.exists(self.path + ".partial.json"))
+
+        with zipfile.ZipFile(self.path) as archive:
+            self.assertEqual(len(archive.namelist()), 52)
+            manifest = json.loads(archive.read("export/manifest.json"))
+            html = archive.read("export/html/Note 00025.html").decode()
+            text = archive.read("export/txt/Note 00025.txt").decode()
+            index = archive.read("export/index.html").decode()
+
+        self.assertEqual(manifest['total_notes'], 25)
+        self.assertEqual(manifest['notes'][0]['filename'], "Note 00025")
+        exporter = NotesExporter()
+        self.assertEqual(html, exporter._generate_html_content(notes[0]))
+        self.assertEqual(text, exporter._generate_text_content(notes[0]))
+        # Index lists notes by title
+        self.assertLess(index.index("Note 00001.html"),
+                        index.index("Note 00025.html"))
+        self.assertIn('<span class="tag">work</span>', index)
+
+    def test_parallel_render_matches_inline(self):
+        notes = _notes(60)
+        inline_path = os.path.join(self.out_dir, "inline.zip")
+        self.writer.write(notes, inline_path, "export")
+
+        parallel = NotesArchiveWriter(processes=2)
+        parallel.PARALLEL_THRESHOLD = 10
+        parallel.RENDER_CHUNK_SIZE = 7
+        self.assertTrue(parallel.write(notes, self.path, "export")['success'])
+
+        with zipfile.ZipFile(inline_path) as a, \
+                zipfile.ZipFile(self.path) as b:
+            self.assertEqual(a.namelist(), b.namelist())
+            for name in a.namelist():
+                if not name.endswith(("manifest.json", "index.html")):
+                    self.assertEqual(a.read(name), b.read(name))
+
+    def test_cancel_and_resume(self):
+        notes = _notes(45)
+        result = self.writer.write(notes, self.path, "first",
+                                   should_cancel=lambda: True)
+        self.assertTrue(result['cancelled'])
+        self.assertEqual(result['exported'], 10)
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(len(self._names(self.path + ".partial")), 20)
+
+        result = self.writer.write(notes, self.path, "second")
+        self.assertTrue(result['success'])
+        self.assertEqual(result['resumed_from'], 10)
+        names = self._names()
+        # The resumed export keeps its folder and writes each note once
+        self.assertEqual(len(names), len(set(names)))
+        self.assertEqual(len(names), 92)
+        self.assertTrue(all(name.startswith("first/") for name in names))
+        with zipfile.ZipFile(self.path) as archive:
+            index = archive.read("first/index.html").decode()
+        self.assertEqual(index.count("<li>"), 45)
+
+    def test_checkpoints_keep_partial_archive_valid(self):
+        self.writer.CHECKPOINT_SECONDS = 0
+        notes = _notes(30)
+        calls = []
+
+        def cancel_late():
+            calls.append(1)
+            return len(calls) == 2
+
+        self.writer.write(notes, self.path, "export",
+                          should_cancel=cancel_late)
+        with open(self.path + ".partial.json") as f:
+            self.assertEqual(json.load(f)['done'], 20)
+        self.assertEqual(len(self._names(self.path + ".partial")), 40)
+
+    def test_changed_notes_start_over(self):
+        notes = _notes(30)
+        self.writer.write(notes, self.path, "first",
+                          should_cancel=lambda: True)
+        notes[3].updated_at = "2026-02-01T12:00:00"
+        result = self.writer.write(notes, self.path, "second")
+        self.assertEqual(result['resumed_from'], 0)
+        self.assertTrue(self._names()[0].startswith("second/"))
+
+    def test_unreadable_partial_starts_over(self):
+        notes = _notes(30)
+        self.writer.write(notes, self.path, "first",
+                          should_cancel=lambda: True)
+        # An export killed while writing leaves no central directory
+        with open(self.path + ".partial", 'r+b') as f:
+            f.truncate(os.path.getsize(self.path + ".partial") // 2)
+        result = self.writer.write(notes, self.path, "second")
+        self.assertTrue(result['success'])
+        self.assertEqual(result['resumed_from'], 0)
+        self.assertEqual(len(self._names()), 62)
+
+
+class TestNotesExportWorker(unittest.TestCase):
+    """The GUI runs the export on a worker thread"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.out_dir = tempfile.mkdtemp(prefix="test_notes_worker_")
+
+    def tearDown(self):
+        shutil.rmtree(self.out_dir, ignore_errors=True)
+
+    def test_worker_reports_progress_and_result(self):
+        path = os.path.join(self.out_dir, "notes.zip")
+        worker = NotesExportWorker(_notes(120), path, "export")
+        progress, results = [], []
+        worker.progress_update.connect(
+            lambda done, total: progress.append(done))
+        worker.export_complete.connect(results.append)
+        worker.start()
+        self.assertTrue(worker.wait(30000))
+        self.app.processEvents()
+
+        self.assertEqual(progress[-1], 120)
+        self.assertTrue(results[0]['success'])
+        self.assertTrue(os.path.exists(path))
+
+    def test_worker_cancel(self):
+        path = os.path.join(self.out_dir, "notes.zip")
+        worker = NotesExportWorker(_notes(120), path, "export")
+        results = []
+        worker.export_complete.connect(results.append)
+        worker.cancel()
+        worker.start()
+        self.assertTrue(worker.wait(30000))
+        self.app.processEvents()
+        self.assertTrue(results[0]['cancelled'])
+        self.assertFalse(os.path.exists(path))
+
+
+class TestNotesArchivePerformance(unittest.TestCase):
+    """Export time and peak memory for 20k notes (5k by default)"""
+
+    def setUp(self):
+        self.out_dir = tempfile.mkdtemp(prefix="test_notes_archive_perf_")
+
+    def tearDown(self):
+        shutil.rmtree(self.out_dir, ignore_errors=True)
+
+    def _measure(self, export):
+        start = time.perf_counter()
+        export()
+        elapsed = time.perf_counter() - start
+        tracemalloc.start()
+        export()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return elapsed, peak / 2 ** 20
+
+    def test_export_20k_notes(self):
+        count = 20_000 if FULL_BENCHMARKS else 5_000
+        notes = _notes(count)
+        path = os.path.join(self.out_dir, "notes.zip")
+        renderer = NoteRenderer()
+
+        def legacy():
+            # The previous export: whole documents built in memory,
+            # titles sanitized again for the index
+            with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+                manifest = {"notes": [
+                    {"id": n.id, "title": n.title, "tags": n.tags}
+                    for n in notes
+                ]}
+                zipf.writestr("export/manifest.json",
+                              json.dumps(manifest, indent=2))
+                head, tail = renderer.index_html_parts(count)
+                zipf.writestr("export/index.html", head + "".join(
+                    renderer.index_item(n) for n in
+                    sorted(notes, key=lambda n: n.title.lower())
+                ) + tail)
+                for note in notes:
+                    rendered = renderer.render(note)
+                    zipf.writestr(f"export/html/{rendered.filename}.html",
+                                  rendered.html)
+                    zipf.writestr(f"export/txt/{rendered.filename}.txt",
+                                  rendered.text)
+
+        def streaming(processes):
+            def export():
+                writer = NotesArchiveWriter(renderer, processes=processes)
+                result = writer.write(notes, path, "export")
+                self.assertTrue(result['success'])
+            return export
+
+        variants = [("previous", legacy),
+                    ("streaming, 1 process", streaming(1))]
+        processes = min(4, os.cpu_count() or 1)
+        if processes > 1:
+            variants.append((f"streaming, {processes} processes",
+                             streaming(processes)))
+        print(f"\nexporting {count} notes")
+        for label, export in variants:
+            elapsed, peak = self._measure(export)
+            print(f"{label:24s} {elapsed:6.2f}s  peak {peak:6.1f}MB")
+
+        with zipfile.ZipFile(path) as archive:
+            self.assertEqual(len(archive.namelist()), count * 2 + 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+"""
+Tests for the cached model list of OllamaWrapper against a local
+Ollama API that counts /api/tags requests
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))))
+
+from src.agents.ollama_wrapper import OllamaWrapper
+
+
+class _FakeOllama(BaseHTTPRequestHandler):
+    """Ollama model management API over an in-memory model list"""
+
+    def log_message(self, *args):
+        pass
+
+    def _json(self, body, status=200):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _body(self):
+        return json.loads(self.rfile.read(
+            int(self.headers.get("Content-Length", 0))) or b"{}")
+
+    def do_GET(self):
+        state = self.server.state
+        if self.path != "/api/tags":
+            self.send_error(404)
+            return
+        with state["lock"]:
+            state["tags_requests"] += 1
+            names = list(state["models"])
+        time.sleep(state["delay"])
+        self._json({"models": [{
+            "name": name, "model": name,
+            "modified_at": "2026-01-01T00:00:00Z", "size": 1,
+            "digest": name, "details": {}
+        } for name in names]})
+
+    def do_POST(self):
+        state = self.server.state
+        if self.path != "/api/pull":
+            self.send_error(404)
+            return
+        name = self._body()["model"]
+        if ":" not in name:
+            name += ":latest"
+        with state["lock"]:
+            state["models"].append(name)
+        self._json({"status": "success"})
+
+    def do_DELETE(self):
+        state = self.server.state
+        name = self._body()["model"]
+        with state["lock"]:
+            if name in state["models"]:
+                state["models"].remove(name)
+        self._json({})
+
+
+class TestModelListCache(unittest.TestCase):
+    """TTL, refresh, single flight, lookups and change events"""
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeOllama)
+        self.server.daemon_threads = True
+        self.server.state = {
+            "lock": threading.Lock(), "tags_requests": 0, "delay": 0.0,
+            "models": ["llama3.2:latest", "mistral:7b"]
+        }
+        threading.Thread(target=self.server.serve_forever,
+                         daemon=True).start()
+        self.wrapper = OllamaWrapper(
+            host=f"http://127.0.0.1:{self.server.server_address[1]}",
+            timeout=10)
+        self.assertTrue(self.wrapper.is_ready)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    @property
+    def requests(self):
+        return self.server.state["tags_requests"]
+
+    def test_lookups_are_served_from_the_cache(self):
+        # The health check's list also answered the default model check
+        self.assertEqual(self.requests, 1)
+        for _ in range(100):
+            self.assertTrue(self.wrapper.model_exists("llama3.2"))
+            self.assertTrue(self.wrapper.model_exists("mistral:7b"))
+            self.assertTrue(self.wrapper.model_exists("mistral:latest"))
+            self.assertFalse(self.wrapper.model_exists("phi3"))
+            self.wrapper.get_status()
+        self.assertEqual(self.wrapper.get_model_info("mistral").tag, "7b")
+        self.assertEqual(self.wrapper.get_model_info("llama3.2:latest").name,
+                         "llama3.2")
+        self.assertIsNone(self.wrapper.get_model_info("phi3"))
+        self.assertEqual(self.requests, 1)
+
+    def test_ttl_and_refresh(self):
+        self.wrapper.update_config({"model_list_ttl": 0.1})
+        self.wrapper.list_models()
+        self.assertEqual(self.requests, 1)
+        time.sleep(0.15)
+        self.wrapper.list_models()
+        self.assertEqual(self.requests, 2)
+        self.wrapper.list_models(refresh=True)
+        self.assertEqual(self.requests, 3)
+        self.wrapper.invalidate_models()
+        self.wrapper.list_models()
+        self.assertEqual(self.requests, 4)
+
+    def test_concurrent_callers_share_one_request(self):
+        self.server.state["delay"] = 0.2
+        self.wrapper.invalidate_models()
+        results = []
+        threads = [threading.Thread(
+            target=lambda: results.append(self.wrapper.list_models()))
+            for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.requests, 2)
+        self.assertEqual(len(results), 20)
+        for models in results:
+            self.assertEqual([f"{m.name}:{m.tag}" for m in models],
+                             ["llama3.2:latest", "mistral:7b"])
+
+    def test_pull_and_remove_report_changes(self):
+        changes = []
+        self.wrapper.add_models_changed_callback(
+            lambda added, removed: changes.append((added, removed)))
+
+        self.assertTrue(self.wrapper.pull_model("phi3"))
+        self.assertTrue(self.wrapper.model_exists("phi3"))
+        self.assertTrue(self.wrapper.remove_model("mistral:7b"))
+        self.assertFalse(self.wrapper.model_exists("mistral"))
+        self.assertEqual(changes, [(["phi3:latest"], []),
+                                   ([], ["mistral:7b"])])
+
+        # Models changed outside the wrapper show up on refresh
+        self.server.state["models"].append("qwen:1b")
+        self.wrapper.list_models(refresh=True)
+        self.wrapper.list_models(refresh=True)
+        self.assertEqual(changes[-1], (["qwen:1b"], []))
+        self.assertEqual(len(changes), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,511 @@
+"""
+Tests for the lazily expanded projects tree and the background details
+loader
+"""
+
+import os
+import sys
+import time
+import uuid
+import shutil
+import threading
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import Qt, QModelIndex, QPersistentModelIndex
+from PySide6.QtWidgets import QApplication, QTreeWidget, QTreeWidgetItem
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))))
+
+from src.database.initialize_db import DatabaseManager
+from src.database.projects_db import ProjectsDatabase
+from src.gui.components.project_tree_model import ProjectTreeModel
+from src.gui.components.project_details_loader import ProjectDetailsLoader
+from src.gui.components.signal_coordinator import SignalCoordinator
+from src.gui.pages.tasks_page import ProjectsPage
+
+
+# Benchmarks run at a reduced size unless full-size runs are requested
+FULL_BENCHMARKS = os.environ.get('DINOAIR_FULL_BENCHMARKS') == '1'
+
+
+class _Source:
+    """In-memory stand-in for ProjectsDatabase.get_project_tree_rows"""
+
+    def __init__(self, projects):
+        # id -> [name, status, color, icon, parent, created_at]
+        self.projects = {p[0]: list(p[1:]) for p in projects}
+        self.fetches = []
+
+    def _row(self, project_id):
+        name, status, color, icon, parent, created = self.projects[project_id]
+        children = sum(1 for p in self.projects.values() if p[4] == project_id)
+        return (project_id, name, status, color, icon, parent, created,
+                children)
+
+    def fetch(self, parent_id, project_ids):
+        self.fetches.append((parent_id, project_ids))
+        if project_ids is not None:
+            return [self._row(key) for key in project_ids
+                    if key in self.projects]
+        keys = [key for key, p in self.projects.items() if p[4] == parent_id]
+        keys.sort(key=lambda key: self.projects[key][5], reverse=True)
+        keys.sort(key=lambda key: self.projects[key][0])
+        return [self._row(key) for key in keys]
+
+
+def _project(project_id, name, parent=None, status='active', color=None,
+             icon=None, created="2026-01-01T00:00:00"):
+    return (project_id, name, status, color, icon, parent, created)
+
+
+def _children(model, parent=QModelIndex()):
+    return [model.index(i, 0, parent).data()
+            for i in range(model.rowCount(parent))]
+
+
+class TestProjectTreeModel(unittest.TestCase):
+    """Lazy expansion and in-place updates of the model"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.source = _Source([
+            _project("a", "Alpha", color="#ff0000"),
+            _project("b", "Beta", status='archived', icon="🚀"),
+            _project("c", "Gamma"),
+            _project("a1", "Alpha One", parent="a"),
+            _project("a2", "Alpha Two", parent="a"),
+            _project("a11", "Deep", parent="a1"),
+        ])
+        self.model = ProjectTreeModel(self.source.fetch)
+        self.model.load()
+
+    def tearDown(self):
+        # Every fetched row maps back to its parent
+        pending = [QModelIndex()]
+        while pending:
+            parent = pending.pop()
+            for row in range(self.model.rowCount(parent)):
+                index = self.model.index(row, 0, parent)
+                self.assertEqual(self.model.parent(index), parent)
+                self.assertEqual(index.row(), row)
+                pending.append(index)
+
+    def _index(self, project_id):
+        return self.model.index_for_project(project_id)
+
+    def test_load_fetches_roots_only(self):
+        self.assertEqual(_children(self.model),
+                         ["📁 Alpha", "🚀 Beta (Archived)", "📁 Gamma"])
+        alpha = self.model.index(0, 0)
+        self.assertEqual(alpha.data(Qt.ItemDataRole.UserRole), "a")
+        self.assertEqual(
+            alpha.data(Qt.ItemDataRole.ForegroundRole).color().name(),
+            "#ff0000"
+        )
+        self.assertTrue(self.model.hasChildren(alpha))
+        self.assertFalse(self.model.hasChildren(self.model.index(2, 0)))
+        self.assertIsNone(self.model.loaded_children("a"))
+        self.assertEqual(self.source.fetches[-1], (None, None))
+
+    def test_fetch_more_loads_children(self):
+        alpha = self.model.index(0, 0)
+        self.assertTrue(self.model.canFetchMore(alpha))
+        self.model.fetchMore(alpha)
+        self.assertFalse(self.model.canFetchMore(alpha))
+        self.assertEqual(_children(self.model, alpha),
+                         ["📁 Alpha One", "📁 Alpha Two"])
+        self.assertEqual(self.model.loaded_children("a"), ["a1", "a2"])
+        self.assertEqual(self.model.parent(self.model.index(1, 0, alpha)),
+                         alpha)
+
+    def test_index_for_project_fetches_ancestors(self):
+        index = self._index("a11")
+        self.assertEqual(index.data(), "📁 Deep")
+        self.assertEqual(index.parent().data(), "📁 Alpha One")
+        self.assertEqual(self.model.loaded_children("a"), ["a1", "a2"])
+        self.assertFalse(self._index("missing").isValid())
+
+    def test_updates_keep_name_order(self):
+        self.source.projects["c"][0] = "Aardvark"
+        self.source.projects["b"][1] = 'active'
+        self.model.apply_updates(["c", "b"])
+        self.assertEqual(_children(self.model),
+                         ["📁 Aardvark", "📁 Alpha", "🚀 Beta"])
+
+        alpha = QPersistentModelIndex(self.model.index(1, 0))
+        self.source.projects["c"][0] = "Zulu"
+        self.model.apply_updates(["c"])
+        self.assertEqual(_children(self.model)[-1], "📁 Zulu")
+        self.assertEqual(alpha.row(), 0)
+
+    def test_created_and_deleted_projects(self):
+        self.source.projects["n"] = ["Beta", 'active', None, None, None,
+                                     "2026-02-01T00:00:00"]
+        del self.source.projects["c"]
+        self.model.apply_updates(["n", "c"])
+        # Same name: newest first
+        self.assertEqual(_children(self.model),
+                         ["📁 Alpha", "📁 Beta", "🚀 Beta (Archived)"])
+        self.assertFalse(self._index("c").isValid())
+
+    def test_child_of_collapsed_project_only_updates_its_parent(self):
+        gamma = self.model.index(2, 0)
+        self.source.projects["c1"] = ["Child", 'active', None, None, "c",
+                                      "2026-01-01"]
+        self.model.apply_updates(["c1"])
+        # Fetched later, when the project is expanded
+        self.assertIsNone(self.model.loaded_children("c"))
+        self.assertTrue(self.model.hasChildren(gamma))
+        self.model.fetchMore(gamma)
+        self.assertEqual(_children(self.model, gamma), ["📁 Child"])
+
+    def test_moving_and_deleting_subtrees(self):
+        self._index("a11")
+        alpha_two = QPersistentModelIndex(self._index("a2"))
+        self.source.projects["a1"][4] = "c"
+        self.model.apply_updates(["a1"])
+        self.assertEqual(alpha_two.row(), 0)
+        alpha, gamma = self.model.index(0, 0), self.model.index(2, 0)
+        self.assertEqual(_children(self.model, alpha), ["📁 Alpha Two"])
+        # Gamma was never expanded; its arrow now shows
+        self.assertTrue(self.model.hasChildren(gamma))
+        self.assertEqual(self._index("a11").parent().parent(), gamma)
+
+        del self.source.projects["a2"]
+        self.model.apply_updates(["a2"])
+        self.assertFalse(self.model.hasChildren(alpha))
+
+    def test_filter_shows_matches_with_ancestors(self):
+        self.model.set_filter(["a11", "c"])
+        self.assertTrue(self.model.is_filtered())
+        self.assertEqual(_children(self.model), ["📁 Alpha", "📁 Gamma"])
+        alpha_one = self._index("a1")
+        self.assertEqual(_children(self.model, alpha_one), ["📁 Deep"])
+        self.assertEqual(_children(self.model, alpha_one.parent()),
+                         ["📁 Alpha One"])
+        self.assertFalse(self._index("b").isValid())
+
+        self.model.set_filter(None)
+        self.assertFalse(self.model.is_filtered())
+        self.assertEqual(len(_children(self.model)), 3)
+
+
+class TestProjectDetailsLoader(unittest.TestCase):
+    """Details are fetched on a worker and stale selections dropped"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.projects_db = Mock()
+        self.projects_db.get_project_child_count.return_value = 2
+        self.notes_db = Mock()
+        self.notes_db.get_notes_by_project.side_effect = \
+            lambda pid: [f"note of {pid}"]
+        self.artifacts_db = Mock()
+        self.artifacts_db.get_artifacts_by_project.return_value = []
+        self.appointments_db = Mock()
+        self.appointments_db.get_events_by_project.return_value = []
+        self.loader = ProjectDetailsLoader(
+            self.projects_db, self.notes_db, self.artifacts_db,
+            self.appointments_db
+        )
+        self.results = []
+        self.loader.details_loaded.connect(self.results.append)
+
+    def tearDown(self):
+        self.loader.wait()
+
+    def _wait_idle(self):
+        deadline = time.monotonic() + 10
+        while self.loader.is_loading() and time.monotonic() < deadline:
+            self.app.processEvents()
+            time.sleep(0.001)
+        self.app.processEvents()
+
+    def test_result_holds_items_and_counts(self):
+        self.loader.load("p1")
+        self._wait_idle()
+        self.assertEqual(self.results, [{
+            "success": True, "project_id": "p1", "notes": ["note of p1"],
+            "artifacts": [], "events": [], "child_count": 2
+        }])
+
+    def test_stale_selection_is_cancelled(self):
+        started, release = threading.Event(), threading.Event()
+
+        def slow_notes(pid):
+            if pid == "p1":
+                started.set()
+                release.wait(10)
+            return [pid]
+
+        self.notes_db.get_notes_by_project.side_effect = slow_notes
+        self.loader.load("p1")
+        self.assertTrue(started.wait(10))
+        self.loader.load("p2")
+        self.loader.load("p3")
+        release.set()
+        self._wait_idle()
+
+        self.assertEqual([r["project_id"] for r in self.results], ["p3"])
+        # p1 stopped after its first query; p2 was never fetched
+        self.artifacts_db.get_artifacts_by_project.assert_called_once_with(
+            "p3")
+        self.assertNotIn(
+            "p2", [c.args[0] for c in
+                   self.notes_db.get_notes_by_project.call_args_list]
+        )
+
+    def test_cancel_drops_result(self):
+        self.loader.load("p1")
+        self.loader.cancel()
+        self._wait_idle()
+        self.assertEqual(self.results, [])
+
+    def test_shutdown_stops_and_waits_for_the_fetch(self):
+        started = threading.Event()
+
+        def slow_notes(pid):
+            started.set()
+            time.sleep(0.2)
+            return [pid]
+
+        self.notes_db.get_notes_by_project.side_effect = slow_notes
+        self.loader.load("p1")
+        self.assertTrue(started.wait(10))
+        self.assertTrue(self.loader.shutdown())
+        # Stopped at its next query rather than running them all
+        self.artifacts_db.get_artifacts_by_project.assert_not_called()
+        self.app.processEvents()
+        self.assertFalse(self.loader.is_loading())
+        self.assertEqual(self.results, [])
+
+    def test_errors_are_reported(self):
+        self.artifacts_db.get_artifacts_by_project.side_effect = \
+            RuntimeError("locked")
+        self.loader.load("p1")
+        self._wait_idle()
+        self.assertFalse(self.results[0]["success"])
+        self.assertEqual(self.results[0]["error"], "locked")
+
+
+def _database():
+    return DatabaseManager(f"test_project_tree_{uuid.uuid4().hex[:8]}")
+
+
+def _populate(db_manager, roots, children_per_root):
+    """Insert root projects, each with subprojects"""
+    start = datetime(2026, 1, 1)
+    rows = []
+    for r in range(roots):
+        rows.append((f"p-{r}", f"Project {r:05d}", None,
+                     (start + timedelta(seconds=r)).isoformat()))
+        for c in range(children_per_root):
+            rows.append((f"p-{r}-{c}", f"Sub {c:03d}", f"p-{r}",
+                         (start + timedelta(seconds=c)).isoformat()))
+    with db_manager.get_projects_connection() as conn:
+        conn.executemany(
+            "INSERT INTO projects (id, name, parent_project_id, created_at, "
+            "updated_at, tags, metadata) VALUES (?, ?, ?, ?, ?, '[]', '{}')",
+            [row + (row[3],) for row in rows]
+        )
+        conn.commit()
+
+
+def _page(db_manager):
+    with patch('src.database.initialize_db.DatabaseManager',
+               return_value=db_manager):
+        return ProjectsPage()
+
+
+def _wait_for_details(app, page):
+    deadline = time.monotonic() + 10
+    while page.details_loader.is_loading() and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.001)
+    app.processEvents()
+
+
+def _close(app, page):
+    page.cleanup()
+    page.deleteLater()
+    app.processEvents()
+
+
+class TestProjectsPageTree(unittest.TestCase):
+    """The page expands projects lazily and patches the tree in place"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.db_manager = _database()
+        _populate(self.db_manager, 20, 3)
+        self.page = _page(self.db_manager)
+        self.model = self.page.project_model
+        self.db = ProjectsDatabase(self.db_manager)
+
+    def tearDown(self):
+        _close(self.app, self.page)
+        shutil.rmtree(self.db_manager.user_db_dir.parent, ignore_errors=True)
+
+    def test_tree_shows_root_projects(self):
+        self.assertEqual(self.model.rowCount(), 20)
+        self.assertEqual(self.model.index(0, 0).data(), "📁 Project 00000")
+        self.assertIsNone(self.model.loaded_children("p-0"))
+        self.assertEqual(self.page.count_label.text(), "80 projects")
+
+    def test_selection_loads_details_in_background(self):
+        with self.db_manager.get_artifacts_connection() as conn:
+            conn.execute(
+                "INSERT INTO artifacts (id, name, content_type, status, "
+                "content, project_id) "
+                "VALUES ('art-1', 'Spec', 'text', 'active', 'x', 'p-4')"
+            )
+            conn.commit()
+
+        self.page.navigate_to_project("p-4")
+        self.assertEqual(self.page._current_project.id, "p-4")
+        # The panel is filled once the worker reports back
+        self.assertEqual(self.page.stats_widgets['artifacts'].text(), "-")
+        _wait_for_details(self.app, self.page)
+        self.assertEqual(self.page.stats_widgets['artifacts'].text(), "1")
+        self.assertEqual(self.page.stats_widgets['subprojects'].text(), "3")
+        self.assertEqual(self.page.artifacts_list.item(0).text(), "🎨 Spec")
+
+    def test_navigate_to_subproject_expands_its_parent(self):
+        self.page.navigate_to_project("p-7-2")
+        current = self.page.project_tree.currentIndex()
+        self.assertEqual(current.data(Qt.ItemDataRole.UserRole), "p-7-2")
+        self.assertTrue(self.page.project_tree.isExpanded(current.parent()))
+        self.assertEqual(self.model.loaded_children("p-7"),
+                         ["p-7-0", "p-7-1", "p-7-2"])
+        _wait_for_details(self.app, self.page)
+
+    def test_batch_update_signal_patches_tree(self):
+        coordinator = SignalCoordinator(Mock())
+        coordinator.register_page('projects', self.page)
+        self.page.navigate_to_project("p-3")
+        self.db.update_project("p-3", {"name": "Renamed"})
+        self.db.delete_project("p-5")
+
+        with patch.object(self.model, 'load') as reload:
+            coordinator.projects_batch_updated.emit(["p-3", "p-5"])
+            reload.assert_not_called()
+
+        names = _children(self.model)
+        self.assertEqual(len(names), 19)
+        self.assertEqual(names[-1], "📁 Renamed")
+        self.assertNotIn("📁 Project 00005", names)
+        # The selection follows the moved row and its details refresh
+        self.assertEqual(self.page.info_labels['name'].text(), "Renamed")
+        self.assertEqual(self.page._current_project.id, "p-3")
+        _wait_for_details(self.app, self.page)
+
+    def test_refresh_keeps_expanded_projects_and_selection(self):
+        self.page.navigate_to_project("p-2-1")
+        _wait_for_details(self.app, self.page)
+        self.page._refresh_projects()
+        current = self.page.project_tree.currentIndex()
+        self.assertEqual(current.data(Qt.ItemDataRole.UserRole), "p-2-1")
+        self.assertTrue(self.page.project_tree.isExpanded(current.parent()))
+        self.assertIsNone(self.model.loaded_children("p-3"))
+        _wait_for_details(self.app, self.page)
+
+    def test_search_shows_matches_under_parents(self):
+        self.db.update_project("p-9-1", {"description": "needle"})
+        self.page.search_input.setText("needle")
+        self.assertEqual(_children(self.model), ["📁 Project 00009"])
+        self.assertEqual(_children(self.model, self.model.index(0, 0)),
+                         ["📁 Sub 001"])
+        self.page.search_input.setText("")
+        self.assertEqual(self.model.rowCount(), 20)
+
+
+class TestProjectTreePerformance(unittest.TestCase):
+    """Tree load and selection latency with 10k projects"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+        cls.roots = 1_000 if FULL_BENCHMARKS else 400
+        cls.db_manager = _database()
+        _populate(cls.db_manager, cls.roots, 9)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.db_manager.user_db_dir.parent, ignore_errors=True)
+
+    def _legacy_load(self, db):
+        """The previous tree: every project, children found by a scan
+        of all projects, everything expanded"""
+        tree = QTreeWidget()
+        projects = db.get_all_projects()
+
+        def add(project, parent):
+            item = QTreeWidgetItem(parent, [project.name])
+            item.setData(0, Qt.ItemDataRole.UserRole, project.id)
+            for child in [p for p in projects
+                          if p.parent_project_id == project.id]:
+                add(child, item)
+
+        for project in projects:
+            if not project.parent_project_id:
+                add(project, tree.invisibleRootItem())
+        tree.expandAll()
+        return tree
+
+    def test_load_and_selection_latency(self):
+        def timed(action):
+            start = time.perf_counter()
+            action()
+            self.app.processEvents()
+            return (time.perf_counter() - start) * 1000
+
+        count = self.roots * 10
+        db = ProjectsDatabase(self.db_manager)
+        legacy_load = timed(lambda: self._legacy_load(db))
+
+        def legacy_select():
+            # Statistics and items were read on the UI thread
+            db.get_project_statistics("p-300-4")
+            page.notes_db.get_notes_by_project("p-300-4")
+            page.artifacts_db.get_artifacts_by_project("p-300-4")
+            page.appointments_db.get_events_by_project("p-300-4")
+
+        page = _page(self.db_manager)
+        page.resize(900, 700)
+        page.show()
+        try:
+            load = timed(page._refresh_projects)
+            legacy = timed(legacy_select)
+            select = timed(lambda: page.navigate_to_project("p-300-4"))
+            ready = select + timed(
+                lambda: _wait_for_details(self.app, page))
+            self.assertEqual(page.stats_widgets['subprojects'].text(), "0")
+
+            print(f"\n{count} projects: tree load {legacy_load:7.1f}ms -> "
+                  f"{load:6.1f}ms, selection blocks UI "
+                  f"{legacy:6.1f}ms -> {select:5.1f}ms "
+                  f"(details shown after {ready:5.1f}ms)")
+
+            self.assertEqual(page.count_label.text(), f"{count} projects")
+            self.assertEqual(page.project_model.rowCount(), self.roots)
+        finally:
+            _close(self.app, page)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,187 @@
+"""
+Tests for RateLimiter state: one value per key, expiry and the memory cap
+"""
+
+import os
+import sys
+import time
+import unittest
+import tracemalloc
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))))
+
+from src.input_processing.stages.rate_limiter import (
+    RateLimiter, RateLimitConfig, RateLimitStrategy
+)
+
+
+# Benchmarks run at a reduced size unless full-size runs are requested
+FULL_BENCHMARKS = os.environ.get('DINOAIR_FULL_BENCHMARKS') == '1'
+
+
+class _Clock:
+    """Stands in for the time module"""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = _Clock()
+        patcher = patch(
+            'src.input_processing.stages.rate_limiter.time', self.clock
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _limiter(self, strategy=RateLimitStrategy.SLIDING_WINDOW, **kwargs):
+        return RateLimiter(RateLimitConfig(strategy=strategy, **kwargs))
+
+    def test_sliding_window_burst_then_spacing(self):
+        limiter = self._limiter()
+        # 'code' allows 20 requests per 60 seconds
+        remaining = [limiter.check_rate_limit("u", "code").remaining_requests
+                     for _ in range(20)]
+        self.assertEqual(remaining, list(range(19, -1, -1)))
+        self.assertFalse(limiter.check_rate_limit("u", "code").allowed)
+        self.assertIsInstance(limiter.sliding_windows["u"], float)
+
+        # One request frees up every 3 seconds
+        self.clock.now += 3
+        self.assertTrue(limiter.check_rate_limit("u", "code").allowed)
+        self.assertFalse(limiter.check_rate_limit("u", "code").allowed)
+
+    def test_idle_key_expires(self):
+        limiter = self._limiter()
+        for _ in range(5):
+            limiter.check_rate_limit("u", "code")
+        self.clock.now += 60
+        status = limiter.check_rate_limit("u", "code")
+        self.assertEqual(status.remaining_requests, 19)
+
+        self.clock.now += 60
+        limiter._sweep()
+        self.assertEqual(limiter.sliding_windows, {})
+
+    def test_fixed_window(self):
+        limiter = self._limiter(RateLimitStrategy.FIXED_WINDOW)
+        for _ in range(10):
+            self.assertTrue(
+                limiter.check_rate_limit("u", "file_operation").allowed)
+        self.assertFalse(
+            limiter.check_rate_limit("u", "file_operation").allowed)
+        self.clock.now += 60
+        status = limiter.check_rate_limit("u", "file_operation")
+        self.assertEqual(status.remaining_requests, 9)
+        self.assertEqual(len(limiter.fixed_windows["u"]), 2)
+
+    def test_token_bucket(self):
+        limiter = self._limiter(RateLimitStrategy.TOKEN_BUCKET, burst_size=3)
+        self.assertEqual(
+            [limiter.check_rate_limit("u", "command").allowed
+             for _ in range(4)],
+            [True, True, True, False]
+        )
+        # 'command' refills 30 tokens per minute
+        self.clock.now += 2
+        self.assertTrue(limiter.check_rate_limit("u", "command").allowed)
+
+        self.clock.now += 60
+        limiter._sweep()
+        self.assertEqual(limiter.token_buckets, {})
+
+    def test_violations_and_penalty(self):
+        limiter = self._limiter(RateLimitStrategy.FIXED_WINDOW,
+                                penalty_threshold=3)
+        for _ in range(10):
+            limiter.check_rate_limit("u", "file_operation")
+        statuses = [limiter.check_rate_limit("u", "file_operation")
+                    for _ in range(3)]
+        self.assertEqual([s.violations for s in statuses], [1, 2, 3])
+        self.assertIsNotNone(statuses[-1].penalty_until)
+        self.assertIn("u", limiter.penalties)
+        self.assertEqual(len(limiter.violations["u"].times), 3)
+
+        status = limiter.check_rate_limit("u", "file_operation")
+        self.assertEqual(status.violations, 3)
+        self.assertIn("penalty", status.message)
+
+        limiter.reset_user("u")
+        self.assertNotIn("u", limiter.violations)
+        self.assertNotIn("u", limiter.penalties)
+
+    def test_old_violations_expire(self):
+        limiter = self._limiter(RateLimitStrategy.FIXED_WINDOW,
+                                penalty_threshold=3, penalty_duration=30)
+        for _ in range(2):
+            for _ in range(11):
+                status = limiter.check_rate_limit("u", "file_operation")
+            self.assertEqual(status.violations, 1)
+            self.clock.now += 60
+
+    def test_memory_cap_evicts_oldest_keys(self):
+        limiter = self._limiter(max_tracked_keys=100)
+        for i in range(1000):
+            limiter.check_rate_limit(f"user-{i}")
+        self.assertLessEqual(len(limiter.sliding_windows), 100)
+        self.assertIn("user-999", limiter.sliding_windows)
+        self.assertNotIn("user-0", limiter.sliding_windows)
+        stats = limiter.get_stats()
+        self.assertEqual(stats['unique_users'], 1000)
+        self.assertLess(stats['sweeps'], 50)
+
+    def test_periodic_sweep(self):
+        limiter = self._limiter(sweep_interval=10)
+        for i in range(50):
+            limiter.check_rate_limit(f"user-{i}")
+        self.clock.now += 120
+        limiter.check_rate_limit("late")
+        self.assertEqual(list(limiter.sliding_windows), ["late"])
+
+
+class TestRateLimiterLoad(unittest.TestCase):
+    """Memory and per-check latency for 1M distinct keys (200k by
+    default)"""
+
+    def test_distinct_keys(self):
+        count = 1_000_000 if FULL_BENCHMARKS else 200_000
+        keys = [f"user-{i}" for i in range(count)]
+
+        print(f"\n{count} distinct keys")
+        for strategy in RateLimitStrategy:
+            config = RateLimitConfig(strategy=strategy)
+
+            limiter = RateLimiter(config)
+            check = limiter.check_rate_limit
+            start = time.perf_counter()
+            for key in keys:
+                check(key)
+            latency = (time.perf_counter() - start) / count * 1e6
+
+            limiter = RateLimiter(config)
+            tracemalloc.start()
+            for key in keys:
+                limiter.check_rate_limit(key)
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            tracked = limiter.get_stats()['tracked_keys']
+            print(f"{strategy.value:15s} {latency:5.1f}us/check, "
+                  f"{tracked} keys tracked, memory {current / 2 ** 20:5.1f}MB"
+                  f" (peak {peak / 2 ** 20:5.1f}MB)")
+            self.assertLessEqual(tracked, config.max_tracked_keys)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,478 @@
+"""
+Tests for the shared refresh scheduler and the pages refreshed through it
+"""
+
+import os
+import sys
+import time
+import threading
+import unittest
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QObject, QTimer
+from PySide6.QtWidgets import QApplication, QWidget
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))))
+
+from src.database.chat_history_db import ChatHistoryDatabase
+from src.gui.components.refresh_scheduler import (
+    RefreshScheduler, RefreshPriority, RefreshJob, get_refresh_scheduler
+)
+from src.gui.components.enhanced_chat_history import EnhancedChatHistoryWidget
+from src.gui.pages.tasks_page import ProjectsPage
+from src.gui.pages.artifacts_page import ArtifactsPage
+from src.gui.pages.appointments_page import AppointmentsPage
+from tests.unit.support import (
+    spin, temp_database, remove_database, close_widgets, populate_sessions
+)
+
+
+# Benchmarks run at a reduced size unless full-size runs are requested
+FULL_BENCHMARKS = os.environ.get('DINOAIR_FULL_BENCHMARKS') == '1'
+
+
+class TestRefreshScheduler(unittest.TestCase):
+    """Ordering, coalescing, deferral and slicing of refreshes"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.scheduler = RefreshScheduler()
+        self.ran = []
+
+    def tearDown(self):
+        self.scheduler.wait_for_workers()
+        self.app.processEvents()
+        self.scheduler.deleteLater()
+        self.app.processEvents()
+
+    def _record(self, name):
+        return lambda: self.ran.append(name)
+
+    def test_due_refreshes_run_by_priority(self):
+        jobs = [
+            self.scheduler.register("low", self._record("low"),
+                                    priority=RefreshPriority.LOW),
+            self.scheduler.register("high", self._record("high"),
+                                    priority=RefreshPriority.HIGH),
+            self.scheduler.register("normal", self._record("normal"))
+        ]
+        for job in jobs:
+            job.request()
+        self.assertTrue(spin(self.app, self.scheduler.is_idle))
+        self.assertEqual(self.ran, ["high", "normal", "low"])
+
+    def test_repeated_requests_run_once(self):
+        job = self.scheduler.register("job", self._record("job"))
+        for _ in range(5):
+            job.request()
+        spin(self.app, self.scheduler.is_idle)
+        self.assertEqual(self.ran, ["job"])
+        self.assertEqual(job.runs, 1)
+
+    def test_request_while_running_runs_again(self):
+        def refresh():
+            self.ran.append("start")
+            if job.runs == 0:
+                job.request()
+                job.request()
+            yield
+            self.ran.append("end")
+
+        job = self.scheduler.register("job", refresh)
+        job.request()
+        self.assertTrue(spin(self.app, lambda: job.runs == 2))
+        self.assertTrue(spin(self.app, self.scheduler.is_idle))
+        self.assertEqual(self.ran, ["start", "end", "start", "end"])
+
+    def test_fetch_runs_on_worker(self):
+        main = threading.get_ident()
+        seen = {}
+
+        def refresh():
+            seen['fetch'] = yield threading.get_ident
+            seen['resume'] = threading.get_ident()
+
+        job = self.scheduler.register("job", refresh)
+        job.request()
+        self.assertTrue(spin(self.app, lambda: job.runs == 1))
+        self.assertNotEqual(seen['fetch'], main)
+        self.assertEqual(seen['resume'], main)
+
+    def test_other_refreshes_run_during_fetch(self):
+        release = threading.Event()
+
+        def slow():
+            yield lambda: release.wait(5)
+            self.ran.append("slow")
+
+        slow_job = self.scheduler.register("slow", slow,
+                                           priority=RefreshPriority.HIGH)
+        fast_job = self.scheduler.register("fast", self._record("fast"),
+                                           priority=RefreshPriority.LOW)
+        slow_job.request()
+        fast_job.request()
+        self.assertTrue(spin(self.app, lambda: "fast" in self.ran))
+        self.assertEqual(slow_job.state, RefreshJob.FETCHING)
+        release.set()
+        spin(self.app, self.scheduler.is_idle)
+        self.assertEqual(self.ran, ["fast", "slow"])
+
+    def test_fetch_error_is_raised_in_refresh(self):
+        def refresh():
+            try:
+                yield lambda: 1 / 0
+            except ZeroDivisionError:
+                self.ran.append("caught")
+
+        job = self.scheduler.register("job", refresh)
+        job.request()
+        spin(self.app, lambda: job.runs == 1)
+        self.assertEqual(self.ran, ["caught"])
+
+    def test_failing_refresh_finishes(self):
+        def refresh():
+            raise RuntimeError("broken")
+
+        finished = []
+        self.scheduler.job_finished.connect(finished.append)
+        job = self.scheduler.register("job", refresh)
+        job.request()
+        self.assertTrue(spin(self.app, lambda: finished == ["job"]))
+        self.assertTrue(self.scheduler.is_idle())
+
+        # It still runs when requested again
+        job.request()
+        self.assertTrue(spin(self.app, lambda: job.runs == 2))
+
+    def test_main_thread_work_is_sliced(self):
+        turns = []
+        heartbeat = QTimer()
+        heartbeat.timeout.connect(lambda: turns.append(1))
+        heartbeat.start(0)
+        at_step = []
+
+        def refresh():
+            for _ in range(12):
+                time.sleep(0.003)
+                at_step.append(len(turns))
+                yield
+
+        job = self.scheduler.register("job", refresh)
+        job.request()
+        spin(self.app, lambda: job.runs == 1)
+        heartbeat.stop()
+        # 36 ms of work in 8 ms slices lets the event loop in between
+        self.assertGreaterEqual(len(set(at_step)), 4)
+
+    def test_due_refreshes_coalesce(self):
+        soon = self.scheduler.register("soon", self._record("soon"), 40)
+        later = self.scheduler.register("later", self._record("later"), 1000)
+        started = time.monotonic()
+        self.assertTrue(spin(self.app, lambda: later.runs == 1))
+        # Due within COALESCE_MS of the first, so it ran with it
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(soon.runs, 1)
+
+    def test_periodic_refresh_runs_again(self):
+        job = self.scheduler.register("job", self._record("job"), 20)
+        self.scheduler.COALESCE_MS = 0
+        self.assertTrue(spin(self.app, lambda: job.runs >= 3))
+
+    def test_hidden_owner_defers_until_shown(self):
+        owner = QWidget()
+        job = self.scheduler.register("job", self._record("job"), 20,
+                                      owner=owner)
+        spin(self.app, lambda: False, timeout=0.2)
+        self.assertEqual(job.runs, 0)
+        self.assertTrue(job.stale)
+        self.assertIsNone(job.next_due)
+
+        owner.show()
+        self.assertTrue(spin(self.app, lambda: job.runs == 1))
+        self.assertFalse(job.stale)
+        self.assertIsNotNone(job.next_due)
+        owner.deleteLater()
+
+    def test_requests_of_hidden_owner_wait(self):
+        owner = QWidget()
+        job = self.scheduler.register("job", self._record("job"), owner=owner)
+        job.request()
+        spin(self.app, lambda: False, timeout=0.05)
+        self.assertEqual(self.ran, [])
+        owner.show()
+        self.assertTrue(spin(self.app, lambda: self.ran == ["job"]))
+        owner.deleteLater()
+
+    def test_run_hidden_refresh_runs_while_hidden(self):
+        owner = QWidget()
+        job = self.scheduler.register("job", self._record("job"), 20,
+                                      owner=owner, run_hidden=True)
+        self.assertTrue(spin(self.app, lambda: job.runs == 1))
+        owner.deleteLater()
+
+    def test_destroyed_owner_unregisters(self):
+        owner = QObject()
+        closed = []
+
+        def refresh():
+            try:
+                yield lambda: time.sleep(0.05)
+            finally:
+                closed.append(True)
+
+        job = self.scheduler.register("job", refresh, owner=owner)
+        job.request()
+        spin(self.app, lambda: job.state == RefreshJob.FETCHING)
+        # The job holds no reference keeping its owner alive
+        del owner
+        self.assertNotIn(job, self.scheduler.jobs())
+        self.assertEqual(closed, [True])
+
+        # The late fetch result is dropped
+        self.scheduler.wait_for_workers()
+        self.app.processEvents()
+        self.assertTrue(self.scheduler.is_idle())
+        self.assertEqual(job.runs, 0)
+
+    def test_global_instance(self):
+        self.assertIs(get_refresh_scheduler(), get_refresh_scheduler())
+
+
+def _populate(db_manager, projects, artifacts, sessions):
+    """Insert root projects with subprojects, artifacts and chats"""
+    start = datetime(2026, 1, 1)
+    with db_manager.get_projects_connection() as conn:
+        rows = []
+        for r in range(projects):
+            created = (start + timedelta(seconds=r)).isoformat()
+            rows.append((f"p-{r}", f"Project {r:05d}", None, created))
+            for c in range(5):
+                rows.append((f"p-{r}-{c}", f"Sub {c}", f"p-{r}", created))
+        conn.executemany(
+            "INSERT INTO projects (id, name, parent_project_id, created_at, "
+            "updated_at, tags, metadata) VALUES (?, ?, ?, ?, ?, '[]', '{}')",
+            [row + (row[3],) for row in rows]
+        )
+        conn.commit()
+    with db_manager.get_artifacts_connection() as conn:
+        conn.executemany(
+            "INSERT INTO artifact_collections (id, name) VALUES (?, ?)",
+            [(f"col-{c}", f"Collection {c}") for c in range(20)]
+        )
+        conn.executemany(
+            "INSERT INTO artifacts (id, name, content_type, status, content, "
+            "collection_id, size_bytes, encrypted_fields, updated_at) "
+            "VALUES (?, ?, 'text', 'active', 'body', ?, 4, '', ?)",
+            [(f"art-{i}", f"Artifact {i}", f"col-{i % 20}",
+              (start + timedelta(seconds=i)).isoformat())
+             for i in range(artifacts)]
+        )
+        conn.commit()
+    # Chats from today, which the history shows by default
+    today = datetime.combine(date.today(), datetime.min.time())
+    populate_sessions(db_manager, sessions,
+                      newest=today + timedelta(seconds=sessions - 1),
+                      step=timedelta(seconds=1))
+
+
+def _pages(db_manager):
+    with patch('src.database.initialize_db.DatabaseManager',
+               return_value=db_manager):
+        projects = ProjectsPage()
+        artifacts = ArtifactsPage()
+        appointments = AppointmentsPage()
+    chats = EnhancedChatHistoryWidget(ChatHistoryDatabase(db_manager))
+    return projects, artifacts, appointments, chats
+
+
+class TestScheduledPageRefreshes(unittest.TestCase):
+    """Pages refresh through the scheduler and pick up changes"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.db_manager = temp_database("test_refresh")
+        _populate(self.db_manager, 20, 40, 30)
+        self.pages = _pages(self.db_manager)
+        self.projects, self.artifacts, self.appointments, self.chats = \
+            self.pages
+        for page in self.pages:
+            page.show()
+        # Let the first loads finish
+        spin(self.app, get_refresh_scheduler().is_idle)
+
+    def tearDown(self):
+        close_widgets(self.app, self.pages)
+        remove_database(self.db_manager)
+
+    def _run(self, job):
+        runs = job.runs
+        job.request()
+        self.assertTrue(spin(self.app, lambda: job.runs > runs))
+
+    def test_pages_register_refreshes(self):
+        names = {job.name for job in get_refresh_scheduler().jobs()}
+        self.assertTrue({"projects", "artifacts", "calendar", "reminders",
+                         "chat_history"} <= names)
+
+    def test_projects_refresh_keeps_expanded_projects(self):
+        page = self.projects
+        model = page.project_model
+        page.project_tree.expand(model.index_for_project("p-3"))
+        with self.db_manager.get_projects_connection() as conn:
+            conn.execute(
+                "INSERT INTO projects (id, name, created_at, updated_at, "
+                "tags, metadata) VALUES ('p-new', 'Aaa', '2026-02-01', "
+                "'2026-02-01', '[]', '{}')"
+            )
+            conn.commit()
+        self._run(page._refresh_job)
+        self.assertTrue(model.index_for_project("p-new").isValid())
+        self.assertTrue(
+            page.project_tree.isExpanded(model.index_for_project("p-3")))
+        self.assertEqual(page.count_label.text(), "121 projects")
+
+    def test_artifacts_refresh_updates_stats(self):
+        with self.db_manager.get_artifacts_connection() as conn:
+            conn.execute("DELETE FROM artifacts WHERE collection_id = 'col-0'")
+            conn.commit()
+        self._run(self.artifacts._refresh_job)
+        self.assertTrue(self.artifacts.stats_label.text().startswith(
+            "38 artifacts"))
+
+    def test_chat_refresh_shows_new_sessions(self):
+        newest = datetime.combine(date.today(), datetime.max.time())
+        with self.db_manager.get_chat_history_connection() as conn:
+            conn.execute(
+                "INSERT INTO chat_sessions (id, title, created_at, "
+                "updated_at, tags, status) VALUES ('chat-new', 'Newest', "
+                "?, ?, '', 'active')", (newest.isoformat(),) * 2
+            )
+            conn.commit()
+        self._run(self.chats.refresh_job)
+        model = self.chats.session_model
+        self.assertEqual(model.sessions()[0].id, "chat-new")
+        self.assertEqual(model.session_count(), 31)
+
+    def test_direct_reload_supersedes_scheduled_refresh(self):
+        job = self.chats.refresh_job
+        runs = job.runs
+        job.request()
+        spin(self.app, lambda: job.state == RefreshJob.FETCHING)
+        # Reloads for the new search as soon as the refresh stops
+        self.chats.search_input.setText("Chat 1")
+        self.assertTrue(spin(self.app, lambda: job.runs > runs + 1
+                              and job.state == RefreshJob.IDLE))
+        titles = [s.title for s in self.chats.session_model.sessions()]
+        self.assertEqual(len(titles), 11)
+        self.assertTrue(all(title.startswith("Chat 1") for title in titles))
+
+    def test_hidden_page_waits(self):
+        job = self.artifacts._refresh_job
+        runs = job.runs
+        self.artifacts.hide()
+        job.request()
+        spin(self.app, lambda: False, timeout=0.1)
+        self.assertEqual(job.runs, runs)
+        self.artifacts.show()
+        self.assertTrue(spin(self.app, lambda: job.runs > runs))
+
+
+class TestRefreshJank(unittest.TestCase):
+    """Longest event loop stall while all pages refresh at once"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+        cls.projects = 2_000 if FULL_BENCHMARKS else 500
+        cls.artifacts = 200_000 if FULL_BENCHMARKS else 40_000
+        cls.sessions = 5_000 if FULL_BENCHMARKS else 1_000
+        cls.expanded = 100 if FULL_BENCHMARKS else 40
+        cls.db_manager = temp_database("test_refresh")
+        _populate(cls.db_manager, cls.projects, cls.artifacts, cls.sessions)
+
+    @classmethod
+    def tearDownClass(cls):
+        remove_database(cls.db_manager)
+
+    def setUp(self):
+        self.pages = _pages(self.db_manager)
+        for page in self.pages:
+            page.show()
+        projects = self.pages[0]
+        for r in range(self.expanded):
+            projects.project_tree.expand(
+                projects.project_model.index_for_project(f"p-{r * 7}"))
+        self.app.processEvents()
+
+    def tearDown(self):
+        close_widgets(self.app, self.pages)
+
+    def _longest_stall(self, refresh, done):
+        """Run refresh() from the event loop and return the longest gap
+        between event loop turns, in ms, until done()"""
+        gaps = []
+        last = [time.perf_counter()]
+
+        def beat():
+            now = time.perf_counter()
+            gaps.append(now - last[0])
+            last[0] = now
+
+        heartbeat = QTimer()
+        heartbeat.timeout.connect(beat)
+        heartbeat.start(0)
+        QTimer.singleShot(0, refresh)
+        started = time.perf_counter()
+        self.assertTrue(spin(self.app, lambda: len(gaps) > 2 and done(),
+                              timeout=60))
+        total = time.perf_counter() - started
+        heartbeat.stop()
+        return max(gaps) * 1000, total * 1000
+
+    def test_refresh_jank(self):
+        projects, artifacts, appointments, chats = self.pages
+
+        def legacy():
+            # What the separate timers did when they fired together
+            projects._refresh_projects()
+            artifacts._refresh_artifacts()
+            appointments._refresh_calendar()
+            appointments._check_reminders()
+            chats._load_recent_sessions()
+
+        legacy_stall, legacy_total = self._longest_stall(legacy, lambda: True)
+
+        jobs = [projects._refresh_job, artifacts._refresh_job,
+                appointments._refresh_job, appointments._reminder_job,
+                chats.refresh_job]
+        runs = [job.runs for job in jobs]
+
+        def scheduled():
+            for job in jobs:
+                job.request()
+
+        stall, total = self._longest_stall(
+            scheduled,
+            lambda: all(job.runs > ran for job, ran in zip(jobs, runs)))
+
+        print(f"\nAll pages refreshing ({self.projects} projects, "
+              f"{self.expanded} expanded, {self.artifacts} artifacts, "
+              f"{self.sessions} chats): longest stall "
+              f"{legacy_stall:.1f} ms -> {stall:.1f} ms, "
+              f"done after {legacy_total:.1f} ms -> {total:.1f} ms")
+        self.assertLess(stall, legacy_stall)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,275 @@
+"""
+Tests for the shared render cache and the chat message delegate using it
+"""
+
+import os
+import sys
+import time
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtGui import QColor, QPalette, QTextDocument
+from PySide6.QtWidgets import QApplication, QStyleOptionViewItem
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))))
+
+from src.models.chat_session import ChatMessage
+from src.utils.scaling import get_scaling_helper
+from src.gui.components.render_cache import RenderCache, get_render_cache
+from src.gui.components.chat_message_view import (
+    ChatMessageModel, ChatMessageDelegate, ChatMessageView
+)
+
+
+# Benchmarks run at a reduced size unless full-size runs are requested
+FULL_BENCHMARKS = os.environ.get('DINOAIR_FULL_BENCHMARKS') == '1'
+
+
+class _Builder:
+    """Counts the documents a cache asks for"""
+
+    def __init__(self):
+        self.built = []
+
+    def __call__(self, text, width):
+        self.built.append((text, width))
+        document = QTextDocument()
+        document.setPlainText(text)
+        document.setTextWidth(width)
+        return document
+
+
+class TestRenderCache(unittest.TestCase):
+    """Keys, budgets and invalidation of the render cache"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.cache = RenderCache()
+        self.build = _Builder()
+        self.scaling = get_scaling_helper()
+
+    def tearDown(self):
+        self.scaling.set_zoom_level(self.scaling.DEFAULT_ZOOM)
+        self.cache.deleteLater()
+
+    def test_same_text_and_width_reuses_document(self):
+        first = self.cache.document("text", "hello world", 300, self.build)
+        self.assertIs(self.cache.document("text", "hello world", 300,
+                                          self.build), first)
+        self.assertEqual(len(self.build.built), 1)
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_widths_share_a_bucket(self):
+        step = self.cache.WIDTH_STEP
+        self.cache.document("text", "hello", 20 * step, self.build)
+        self.cache.document("text", "hello", 21 * step - 1, self.build)
+        self.assertEqual(len(self.build.built), 1)
+        # Laid out at the bucket, never wider than the available width
+        self.assertEqual(self.build.built[0][1], 20 * step)
+        self.assertEqual(self.cache.width_bucket(20 * step + 5), 20 * step)
+
+        self.cache.document("text", "hello", 21 * step, self.build)
+        self.assertEqual(len(self.build.built), 2)
+
+    def test_narrow_widths(self):
+        self.assertEqual(self.cache.width_bucket(5), 5)
+        self.assertEqual(self.cache.width_bucket(0), 1)
+
+    def test_kind_and_text_are_part_of_the_key(self):
+        self.cache.document("a", "hello", 300, self.build)
+        self.cache.document("b", "hello", 300, self.build)
+        self.cache.document("a", "hello!", 300, self.build)
+        self.assertEqual(len(self.build.built), 3)
+
+    def test_zoom_levels_are_kept_apart(self):
+        self.cache.document("text", "hello", 300, self.build)
+        self.scaling.set_zoom_level(1.5)
+        self.cache.document("text", "hello", 300, self.build)
+        self.assertEqual(len(self.build.built), 2)
+
+        # Zooming back finds the earlier layout
+        self.scaling.set_zoom_level(self.scaling.DEFAULT_ZOOM)
+        self.cache.document("text", "hello", 300, self.build)
+        self.assertEqual(len(self.build.built), 2)
+
+    def test_documents_stay_within_budget(self):
+        self.cache.DOCUMENT_BUDGET = 20 * self.cache.DOCUMENT_BASE_COST
+        for i in range(100):
+            self.cache.document("text", f"message {i}", 300, self.build)
+        self.assertLessEqual(self.cache._document_bytes,
+                             self.cache.DOCUMENT_BUDGET)
+        self.assertLess(self.cache.stats()["documents"], 20)
+
+        # Sizes outlive evicted documents
+        built = len(self.build.built)
+        size = self.cache.size("text", "message 0", 300, self.build)
+        self.assertEqual(len(self.build.built), built)
+        self.assertGreater(size.height(), 0)
+
+        # Evicted documents are built again when painted
+        self.cache.document("text", "message 0", 300, self.build)
+        self.assertEqual(len(self.build.built), built + 1)
+
+    def test_sizes_stay_within_budget(self):
+        self.cache.SIZE_BUDGET = 10 * self.cache.SIZE_ENTRY_COST
+        for i in range(50):
+            self.cache.size("text", f"message {i}", 300, self.build)
+        self.assertEqual(self.cache.stats()["sizes"], 10)
+        self.assertLessEqual(self.cache.memory_used(),
+                             self.cache.DOCUMENT_BUDGET
+                             + self.cache.SIZE_BUDGET)
+
+    def test_invalidate_drops_everything(self):
+        emitted = []
+        self.cache.invalidated.connect(lambda: emitted.append(True))
+        self.cache.document("text", "hello", 300, self.build)
+        self.cache.invalidate()
+        self.assertEqual(self.cache.memory_used(), 0)
+        self.assertEqual(emitted, [True])
+        self.cache.document("text", "hello", 300, self.build)
+        self.assertEqual(len(self.build.built), 2)
+
+    def test_palette_change_invalidates(self):
+        self.cache.document("text", "hello", 300, self.build)
+        palette = self.app.palette()
+        try:
+            changed = QPalette(palette)
+            changed.setColor(QPalette.ColorRole.Window, QColor("#123456"))
+            self.app.setPalette(changed)
+            self.assertEqual(self.cache.stats()["documents"], 0)
+        finally:
+            self.app.setPalette(palette)
+
+    def test_global_instance(self):
+        self.assertIs(get_render_cache(), get_render_cache())
+
+
+def _messages(count):
+    return [
+        ChatMessage(session_id="s", is_user=i % 2 == 0,
+                    message=f"message {i} " + "lorem ipsum dolor " * (i % 23))
+        for i in range(count)
+    ]
+
+
+class TestChatMessageDelegate(unittest.TestCase):
+    """Message layouts come from the render cache"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.model = ChatMessageModel()
+        self.delegate = ChatMessageDelegate()
+        self.delegate._render_cache = RenderCache()
+
+    def tearDown(self):
+        get_scaling_helper().set_zoom_level(1.0)
+
+    def test_equal_messages_share_a_layout(self):
+        self.model.set_messages([
+            ChatMessage(session_id="s", message="same text"),
+            ChatMessage(session_id="s", message="same text", is_user=False)
+        ])
+        first = self.delegate.document(self.model.index(0), 300)
+        self.assertIs(self.delegate.document(self.model.index(1), 300), first)
+
+    def test_size_hint_matches_painted_document(self):
+        self.model.set_messages(_messages(30))
+        option = QStyleOptionViewItem()
+        option.rect.setWidth(517)
+        for row in range(30):
+            index = self.model.index(row)
+            text_width = self.delegate._text_width(517)
+            size = self.delegate.document_size(index, text_width)
+            document = self.delegate.document(index, text_width)
+            self.assertEqual(size, document.size())
+            self.assertLessEqual(document.size().width(), text_width)
+
+
+class TestZoomAndResizeCost(unittest.TestCase):
+    """Cost of zooming and resizing a view of many rendered messages"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+        cls.count = 5_000 if FULL_BENCHMARKS else 1_000
+
+    def tearDown(self):
+        get_scaling_helper().set_zoom_level(1.0)
+
+    def _view(self, cache):
+        model = ChatMessageModel()
+        model.set_messages(_messages(self.count))
+        view = ChatMessageView()
+        delegate = ChatMessageDelegate(view)
+        delegate._render_cache = cache
+        view.setItemDelegate(delegate)
+        view.setModel(model)
+        # Narrow enough that the width of every bubble follows the view
+        view.resize(560, 600)
+        view.show()
+        view.executeDelayedItemsLayout()
+        self.app.processEvents()
+        return view, model
+
+    def _relayout(self, view):
+        start = time.perf_counter()
+        view.refresh_layout()
+        view.executeDelayedItemsLayout()
+        self.app.processEvents()
+        return (time.perf_counter() - start) * 1000
+
+    def _measure(self, cache, legacy):
+        view, model = self._view(cache)
+        scaling = get_scaling_helper()
+        try:
+            zoom = []
+            for level in (1.1, 1.0, 1.1, 1.0):
+                scaling.set_zoom_level(level)
+                if legacy:
+                    # The view used to drop its layouts on every zoom
+                    cache.invalidate()
+                zoom.append(self._relayout(view))
+
+            start = time.perf_counter()
+            for step in range(1, 21):
+                view.resize(560 - 2 * step, 600)
+                self.app.processEvents()
+                view.executeDelayedItemsLayout()
+            resize = (time.perf_counter() - start) * 1000
+            return zoom, resize
+        finally:
+            view.deleteLater()
+            self.app.processEvents()
+
+    def test_zoom_and_resize_cost(self):
+        # Exact widths and nothing kept across zoom levels, as before
+        legacy_cache = RenderCache()
+        legacy_cache.WIDTH_STEP = 1
+        legacy_zoom, legacy_resize = self._measure(legacy_cache, True)
+
+        cache = RenderCache()
+        zoom, resize = self._measure(cache, False)
+
+        print(f"\n{self.count} messages: zoom in/out "
+              f"{' '.join(f'{t:.0f}' for t in legacy_zoom)} ms -> "
+              f"{' '.join(f'{t:.0f}' for t in zoom)} ms, "
+              f"20-step resize {legacy_resize:.0f} ms -> {resize:.0f} ms, "
+              f"cache {cache.memory_used() / 1e6:.1f} MB")
+        # Returning to a zoom level reuses its layouts
+        self.assertLess(zoom[2] + zoom[3], legacy_zoom[2] + legacy_zoom[3])
+        self.assertLess(resize, legacy_resize)
+        self.assertLessEqual(cache.memory_used(),
+                             cache.DOCUMENT_BUDGET + cache.SIZE_BUDGET)
+
+
+if __name__ == '__main__':
+    unittest.main()
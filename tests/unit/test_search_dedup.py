@@ -0,0 +1,175 @@
+"""
+Tests for signature-based result deduplication in SearchOptimizer
+"""
+
+import os
+import sys
+import time
+import random
+import unittest
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))))
+
+from src.rag.vector_search import SearchResult
+from src.rag.optimized_vector_search import SearchOptimizer
+from src.rag.text_signatures import (
+    SIGNATURE_KEY, NUM_PERMUTATIONS, tokenize, jaccard, minhash_signature,
+    encode_signature, decode_signature, lsh_band_layout
+)
+
+
+# Benchmarks run at a reduced size unless full-size runs are requested
+FULL_BENCHMARKS = os.environ.get('DINOAIR_FULL_BENCHMARKS') == '1'
+
+WORDS = [f"word{i}" for i in range(3000)]
+
+
+def _result(i, content, file_id=None, chunk_index=0, signed=True):
+    metadata = None
+    if signed:
+        metadata = {
+            SIGNATURE_KEY: encode_signature(minhash_signature(content))
+        }
+    return SearchResult(
+        chunk_id=f"chunk_{i}",
+        file_id=file_id or f"file_{i}",
+        file_path=f"/docs/{i}.txt",
+        content=content,
+        score=1.0,
+        chunk_index=chunk_index,
+        start_pos=0,
+        end_pos=len(content),
+        metadata=metadata
+    )
+
+
+def _corpus(count, seed=1, words_per_chunk=60, duplicate_ratio=0.35):
+    """Random chunks where a share are edited copies of earlier ones"""
+    rng = random.Random(seed)
+    results = []
+    for i in range(count):
+        if results and rng.random() < duplicate_ratio:
+            words = rng.choice(results).content.split()
+            for _ in range(rng.randint(0, 8)):
+                words[rng.randrange(len(words))] = rng.choice(WORDS)
+        else:
+            words = rng.sample(WORDS, words_per_chunk)
+        results.append(_result(i, ' '.join(words)))
+    return results
+
+
+def _exact_deduplicate(results, threshold):
+    """The original pairwise implementation, used as ground truth"""
+    kept = [results[0]]
+    for result in results[1:]:
+        if not any(
+            (result.file_id == other.file_id and
+             abs(result.chunk_index - other.chunk_index) <= 1) or
+            jaccard(tokenize(result.content),
+                    tokenize(other.content)) > threshold
+            for other in kept
+        ):
+            kept.append(result)
+    return kept
+
+
+class TestTextSignatures(unittest.TestCase):
+    """Signature helpers"""
+
+    def test_encode_round_trip(self):
+        signature = minhash_signature("alpha beta gamma")
+        self.assertEqual(signature.shape, (NUM_PERMUTATIONS,))
+        decoded = decode_signature(encode_signature(signature))
+        self.assertTrue((decoded == signature).all())
+        self.assertIsNone(decode_signature("not hex"))
+        self.assertIsNone(decode_signature(None))
+
+    def test_signature_is_case_insensitive(self):
+        self.assertTrue(
+            (minhash_signature("Alpha BETA") ==
+             minhash_signature("beta alpha")).all()
+        )
+
+    def test_band_layout_recall(self):
+        for threshold in (0.5, 0.8, 0.9, 0.95):
+            bands, rows = lsh_band_layout(threshold)
+            self.assertEqual(bands * rows, NUM_PERMUTATIONS)
+            recall = 1 - (1 - threshold ** rows) ** bands
+            self.assertGreaterEqual(recall, 0.995)
+
+
+class TestDeduplicateResults(unittest.TestCase):
+    """Decisions must match the exact pairwise Jaccard implementation"""
+
+    def setUp(self):
+        self.optimizer = SearchOptimizer()
+
+    def test_adjacent_chunks_of_same_file(self):
+        results = [
+            _result(0, "alpha one", file_id="f", chunk_index=3),
+            _result(1, "beta two", file_id="f", chunk_index=4),
+            _result(2, "gamma three", file_id="f", chunk_index=6),
+            _result(3, "delta four", file_id="g", chunk_index=4),
+        ]
+        kept = self.optimizer.deduplicate_results(results)
+        self.assertEqual([r.chunk_id for r in kept],
+                         ["chunk_0", "chunk_2", "chunk_3"])
+
+    def test_identical_and_empty_content(self):
+        results = [
+            _result(0, "same words here"),
+            _result(1, "SAME words HERE"),
+            _result(2, ""),
+            _result(3, "   "),
+            _result(4, "different text entirely"),
+        ]
+        kept = self.optimizer.deduplicate_results(results)
+        self.assertEqual([r.chunk_id for r in kept],
+                         ["chunk_0", "chunk_2", "chunk_3", "chunk_4"])
+
+    def test_unsigned_results_fall_back_to_content(self):
+        results = [_result(0, "one two three four", signed=False),
+                   _result(1, "one two three four", signed=False)]
+        self.assertEqual(
+            len(self.optimizer.deduplicate_results(results)), 1
+        )
+
+    def test_quality_against_exact_jaccard(self):
+        for threshold in (0.5, 0.7, 0.8, 0.9):
+            results = _corpus(800, seed=int(threshold * 10))
+            expected = {r.chunk_id for r in
+                        _exact_deduplicate(results, threshold)}
+            actual = {r.chunk_id for r in
+                      self.optimizer.deduplicate_results(results, threshold)}
+            disagreements = len(expected ^ actual)
+            print(f"\nthreshold {threshold}: kept {len(actual)}/"
+                  f"{len(results)}, {disagreements} decisions differ")
+            self.assertLessEqual(disagreements, len(results) * 0.005)
+
+
+class TestDeduplicatePerformance(unittest.TestCase):
+    """Deduplicating 10k candidates"""
+
+    def test_dedupe_throughput(self):
+        optimizer = SearchOptimizer()
+        results = _corpus(10000, seed=3, duplicate_ratio=0.1)
+
+        start = time.perf_counter()
+        kept = optimizer.deduplicate_results(results)
+        lsh_time = time.perf_counter() - start
+
+        sample = results[:10000 if FULL_BENCHMARKS else 1000]
+        start = time.perf_counter()
+        _exact_deduplicate(sample, 0.9)
+        exact_time = time.perf_counter() - start
+
+        print(f"\nLSH dedupe of {len(results)} results: "
+              f"{lsh_time * 1000:.1f}ms ({len(kept)} kept)")
+        print(f"Pairwise Jaccard on {len(sample)} results: "
+              f"{exact_time * 1000:.1f}ms")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,205 @@
+"""
+Tests for prefix-indexed search history suggestions
+"""
+
+import os
+import sys
+import time
+import uuid
+import random
+import shutil
+import unittest
+from collections import Counter
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))))
+
+from src.rag.enhanced_context_provider import (
+    PrefixCompletionIndex, SearchHistory
+)
+from src.database.file_search_db import FileSearchDB
+
+
+# Benchmarks run at a reduced size unless full-size runs are requested
+FULL_BENCHMARKS = os.environ.get('DINOAIR_FULL_BENCHMARKS') == '1'
+
+DAY = 86400
+
+
+class TestPrefixCompletionIndex(unittest.TestCase):
+    """Ranking and incremental updates"""
+
+    def test_prefix_boundaries(self):
+        index = PrefixCompletionIndex()
+        for key in ("python", "pythonic", "pytest", "java"):
+            index.add(key)
+        self.assertEqual(sorted(index.complete("pyth")),
+                         ["python", "pythonic"])
+        self.assertEqual(index.complete("z"), [])
+
+    def test_frequency_ranking(self):
+        index = PrefixCompletionIndex()
+        now = time.time()
+        for _ in range(3):
+            index.add("search engine", now)
+        index.add("search history", now)
+        self.assertEqual(index.complete("search", 2),
+                         ["search engine", "search history"])
+
+    def test_time_decay(self):
+        index = PrefixCompletionIndex(half_life_days=7)
+        now = time.time()
+        # Four uses a month ago lose to two uses today
+        for _ in range(4):
+            index.add("old favourite", now - 28 * DAY)
+        index.add("new favourite", now)
+        index.add("new favourite", now)
+        self.assertEqual(index.complete("", 1), ["new favourite"])
+        self.assertAlmostEqual(
+            index.decayed_score("old favourite", now), 4 / 16, places=6
+        )
+
+    def test_memoized_prefix_stays_current(self):
+        index = PrefixCompletionIndex(top_k=3)
+        index.MEMO_RANGE = 2
+        now = time.time()
+        index.load([(f"query {i}", 1.0, now) for i in range(10)])
+        index.complete("query", 3)
+        self.assertIn("query", index._memo)
+
+        for _ in range(5):
+            index.add("query 7", now)
+        index.add("query new", now)
+        index.add("query new", now)
+        self.assertEqual(index.complete("query", 2), ["query 7", "query new"])
+
+    def test_load_sums_repeated_keys(self):
+        index = PrefixCompletionIndex()
+        now = time.time()
+        index.load([("a", 1.0, now), ("a", 2.0, now), ("b", 2.5, now)])
+        self.assertEqual(index.complete("", 2), ["a", "b"])
+        self.assertEqual(len(index), 2)
+
+
+class TestSearchHistoryPersistence(unittest.TestCase):
+    """Suggestions survive a restart through the per-user database"""
+
+    def setUp(self):
+        self.db = FileSearchDB(
+            user_name=f"test_history_{uuid.uuid4().hex[:8]}"
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.db.db_manager.user_db_dir.parent,
+                      ignore_errors=True)
+
+    def test_round_trip(self):
+        history = SearchHistory(db=self.db)
+        history.add_query("Machine Learning basics", 4)
+        history.add_query("machine   learning basics", 6)
+        history.add_query("database indexing", 2)
+
+        restored = SearchHistory(db=self.db)
+        self.assertEqual(restored.get_suggestions("mach", limit=1),
+                         ["machine   learning basics"])
+        self.assertIn("indexing", restored.get_suggestions("ind"))
+        self.assertEqual(restored.term_frequency["machine"], 2)
+        self.assertEqual(
+            restored.get_recent_queries(1)[0]['query'], "database indexing"
+        )
+
+        entries = self.db.get_search_history()["entries"]
+        counts = {e["query_key"]: e["use_count"] for e in entries}
+        self.assertEqual(counts["machine learning basics"], 2)
+
+    def test_clear_removes_persisted_entries(self):
+        history = SearchHistory(db=self.db)
+        history.add_query("something", 1)
+        history.clear()
+        self.assertEqual(history.get_suggestions("some"), [])
+        self.assertEqual(SearchHistory(db=self.db).get_suggestions("some"),
+                         [])
+
+
+class TestSuggestionLatency(unittest.TestCase):
+    """Keystroke latency with 1M historical queries (100k by default)"""
+
+    WORDS = [
+        'python', 'pandas', 'parser', 'database', 'debug', 'deploy',
+        'machine', 'learning', 'model', 'memory', 'search', 'server',
+        'index', 'vector', 'embedding', 'thread', 'test', 'token',
+        'config', 'cache', 'client', 'cluster', 'query', 'queue'
+    ]
+
+    @classmethod
+    def setUpClass(cls):
+        rng = random.Random(5)
+        count = 1_000_000 if FULL_BENCHMARKS else 100_000
+        now = time.time()
+        cls.entries = []
+        for i in range(count):
+            words = rng.sample(cls.WORDS, rng.randint(2, 4))
+            query = ' '.join(words) + f" {i % 5000}"
+            cls.entries.append({
+                'query_key': query,
+                'query': query,
+                'weight': rng.random() * 5,
+                'use_count': 1,
+                'result_count': 3,
+                'last_used': now - rng.random() * 90 * DAY
+            })
+        cls.typed = ["machine learning model", "python parser",
+                     "database index", "search server cache"]
+
+    def _keystrokes(self, suggest):
+        latencies = []
+        for query in self.typed:
+            for end in range(1, len(query) + 1):
+                start = time.perf_counter()
+                suggest(query[:end])
+                latencies.append(time.perf_counter() - start)
+        latencies.sort()
+        return latencies
+
+    def test_keystroke_latency(self):
+        start = time.perf_counter()
+        history = SearchHistory()
+        history.load_entries(self.entries)
+        load_time = time.perf_counter() - start
+
+        cold = self._keystrokes(history.get_suggestions)
+        warm = self._keystrokes(history.get_suggestions)
+
+        # The previous approach: scan recent entries, then every term
+        terms = Counter()
+        for entry in self.entries:
+            terms.update(entry['query'].split())
+        recent = [e['query'] for e in self.entries[:100]]
+
+        def legacy(partial):
+            partial = partial.lower()
+            suggestions = [q for q in recent if q.startswith(partial)][:5]
+            for term, _ in terms.most_common():
+                if len(suggestions) >= 5:
+                    break
+                if term.startswith(partial) and term not in suggestions:
+                    suggestions.append(term)
+            return suggestions
+
+        baseline = self._keystrokes(legacy)
+
+        def summary(latencies):
+            p50 = latencies[len(latencies) // 2] * 1000
+            p99 = latencies[int(len(latencies) * 0.99)] * 1000
+            return f"p50 {p50:.3f}ms  p99 {p99:.3f}ms"
+
+        print(f"\n{len(self.entries)} queries loaded in {load_time:.2f}s")
+        print(f"prefix index (cold): {summary(cold)}")
+        print(f"prefix index (warm): {summary(warm)}")
+        print(f"linear scan:         {summary(baseline)}")
+        self.assertTrue(history.get_suggestions("machine learning"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,272 @@
+"""
+Tests for streaming result exports in EnhancedContextProvider
+"""
+
+import os
+import csv
+import sys
+import gzip
+import json
+import time
+import uuid
+import shutil
+import tempfile
+import unittest
+import tracemalloc
+from datetime import datetime
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))))
+
+from src.rag.enhanced_context_provider import EnhancedContextProvider
+
+
+# Benchmarks run at a reduced size unless full-size runs are requested
+FULL_BENCHMARKS = os.environ.get('DINOAIR_FULL_BENCHMARKS') == '1'
+
+
+def _rows(count):
+    """Synthetic context items, generated lazily"""
+    for i in range(count):
+        content = f"chunk {i} " + "lorem ipsum dolor sit amet " * 20
+        yield {
+            'file_path': f"/docs/file_{i // 50}.txt",
+            'file_name': f"file_{i // 50}.txt",
+            'content': content,
+            'chunk_index': i % 50,
+            'score': 0.75,
+            'match_type': 'keyword',
+            'relevance_level': 'Good',
+            'file_type': 'txt',
+            'file_size': 1000,
+            'preview': content[:200] + "..."
+        }
+
+
+class TestStreamingExport(unittest.TestCase):
+    """Output formats, compression and hooks"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.provider = EnhancedContextProvider(
+            user_name=f"test_export_{uuid.uuid4().hex[:8]}"
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.provider.file_search_db.db_manager.user_db_dir.parent,
+                      ignore_errors=True)
+
+    def setUp(self):
+        self.out_dir = tempfile.mkdtemp(prefix="test_export_")
+
+    def tearDown(self):
+        shutil.rmtree(self.out_dir, ignore_errors=True)
+
+    def _path(self, name):
+        return os.path.join(self.out_dir, name)
+
+    def test_json_round_trip(self):
+        result = self.provider.export_results(
+            _rows(25), 'json', self._path("out.json")
+        )
+        self.assertTrue(result['success'])
+        self.assertEqual(result['result_count'], 25)
+        with open(result['file_path'], encoding='utf-8') as f:
+            data = json.load(f)
+        self.assertEqual(data['result_count'], 25)
+        self.assertEqual(data['results'], list(_rows(25)))
+
+    def test_gzip_csv_round_trip(self):
+        result = self.provider.export_results(
+            _rows(10), 'csv', self._path("out.csv"), compress=True
+        )
+        self.assertTrue(result['file_path'].endswith('.csv.gz'))
+        with gzip.open(result['file_path'], 'rt', encoding='utf-8',
+                       newline='') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), 10)
+        self.assertEqual(rows[3]['content'], next(
+            r for i, r in enumerate(_rows(10)) if i == 3
+        )['content'])
+
+    def test_csv_has_columns_of_every_row(self):
+        rows = [{'file_path': '/a.txt', 'score': 0.5},
+                {'file_path': '/b.txt', 'score': 0.4, 'tags': 'x, "y"'},
+                {'file_path': '/c.txt', 'note': 'two\nlines',
+                 'score': None}]
+        result = self.provider.export_results(
+            iter(rows), 'csv', self._path("mixed.csv")
+        )
+        with open(result['file_path'], encoding='utf-8', newline='') as f:
+            reader = csv.DictReader(f)
+            self.assertEqual(reader.fieldnames,
+                             ['file_path', 'note', 'score', 'tags'])
+            exported = list(reader)
+        self.assertEqual(exported, [
+            {'file_path': '/a.txt', 'note': '', 'score': '0.5', 'tags': ''},
+            {'file_path': '/b.txt', 'note': '', 'score': '0.4',
+             'tags': 'x, "y"'},
+            {'file_path': '/c.txt', 'note': 'two\nlines', 'score': '',
+             'tags': ''}
+        ])
+
+    def test_failed_export_keeps_the_previous_file(self):
+        path = self._path("failed.csv")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("previous export\n")
+
+        def failing():
+            yield from _rows(5)
+            raise RuntimeError("cursor closed")
+
+        for format in ('csv', 'json'):
+            result = self.provider.export_results(failing(), format, path)
+            self.assertFalse(result['success'])
+            self.assertIn("cursor closed", result['error'])
+            with open(path, encoding='utf-8') as f:
+                self.assertEqual(f.read(), "previous export\n")
+        # No temporary files left beside it
+        self.assertEqual(os.listdir(self.out_dir), ["failed.csv"])
+
+    def test_markdown_snippet_only(self):
+        result = self.provider.export_results(
+            _rows(3), 'markdown', self._path("out.md"), snippet_only=True
+        )
+        with open(result['file_path'], encoding='utf-8') as f:
+            text = f.read()
+        self.assertIn("## Result 3", text)
+        self.assertIn("**Total Results:** 3", text)
+        self.assertNotIn("lorem ipsum dolor sit amet " * 20, text)
+
+    def test_snippet_only_drops_content(self):
+        result = self.provider.export_results(
+            [{'file_path': '/a.txt', 'content': 'x' * 500}], 'json',
+            self._path("snippet.json"), snippet_only=True
+        )
+        with open(result['file_path'], encoding='utf-8') as f:
+            exported = json.load(f)['results'][0]
+        self.assertNotIn('content', exported)
+        self.assertEqual(exported['preview'], 'x' * 200 + "...")
+
+    def test_progress_and_cancel(self):
+        self.provider.EXPORT_PROGRESS_INTERVAL = 10
+        try:
+            reported = []
+            result = self.provider.export_results(
+                _rows(35), 'json', self._path("progress.json"),
+                progress_callback=reported.append
+            )
+            self.assertEqual(reported, [10, 20, 30, 35])
+            self.assertTrue(result['success'])
+
+            path = self._path("cancelled.json")
+            result = self.provider.export_results(
+                _rows(1000), 'json', path,
+                should_cancel=lambda: True
+            )
+            self.assertTrue(result['cancelled'])
+            self.assertEqual(result['result_count'], 10)
+            self.assertFalse(os.path.exists(path))
+        finally:
+            del self.provider.EXPORT_PROGRESS_INTERVAL
+
+    def test_empty_and_unsupported(self):
+        self.assertFalse(self.provider.export_results(
+            iter([]), 'json', self._path("empty.json"))['success'])
+        self.assertFalse(os.path.exists(self._path("empty.json")))
+        self.assertFalse(self.provider.export_results(
+            _rows(1), 'xml')['success'])
+
+    def test_export_from_search_cursor(self):
+        db = self.provider.file_search_db
+        for f in range(3):
+            file_id = db.add_indexed_file(
+                f"/docs/cursor_{f}.md", "hash", 100, datetime.now(), 'md'
+            )['file_id']
+            for c in range(4):
+                content = f"streaming export chunk {c}" if c % 2 else "other"
+                db.add_chunk(file_id, c, content, 0, len(content))
+
+        results = self.provider.iter_search_results("streaming export")
+        self.assertFalse(isinstance(results, list))
+        result = self.provider.export_results(
+            results, 'csv', self._path("cursor.csv"), compress=True
+        )
+        self.assertEqual(result['result_count'], 6)
+        with gzip.open(result['file_path'], 'rt', encoding='utf-8',
+                       newline='') as f:
+            rows = list(csv.DictReader(f))
+        self.assertTrue(all(r['relevance_level'] == 'Excellent'
+                            for r in rows))
+
+        with self.assertRaises(ValueError):
+            list(self.provider.iter_search_results("   "))
+
+
+class TestStreamingExportPerformance(unittest.TestCase):
+    """Peak memory exporting 1M rows (100k by default)"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.provider = EnhancedContextProvider(
+            user_name=f"test_export_perf_{uuid.uuid4().hex[:8]}"
+        )
+        cls.out_dir = tempfile.mkdtemp(prefix="test_export_perf_")
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.provider.file_search_db.db_manager.user_db_dir.parent,
+                      ignore_errors=True)
+        shutil.rmtree(cls.out_dir, ignore_errors=True)
+
+    def _peak_mb(self, export):
+        tracemalloc.start()
+        export()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak / 2 ** 20
+
+    def test_constant_memory(self):
+        count = 1_000_000 if FULL_BENCHMARKS else 100_000
+        print(f"\nexporting {count} rows")
+
+        for format, compress in (('json', False), ('csv', False),
+                                 ('markdown', False), ('json', True)):
+            path = os.path.join(self.out_dir, f"out.{format}")
+
+            def export(rows):
+                return lambda: self.provider.export_results(
+                    _rows(rows), format, path, compress=compress
+                )
+
+            start = time.perf_counter()
+            export(count)()
+            elapsed = time.perf_counter() - start
+            # Peak memory must not grow with the number of rows
+            small_peak = self._peak_mb(export(count // 100))
+            peak = self._peak_mb(export(count // 10))
+
+            label = format + (' + gzip' if compress else '')
+            print(f"streaming {label:14s} {elapsed:6.2f}s  peak "
+                  f"{small_peak:5.2f}MB at {count // 100} rows, "
+                  f"{peak:5.2f}MB at {count // 10} rows")
+            self.assertLess(peak, small_peak + 1)
+
+        # The previous approach materialized the rows and the document
+        legacy_count = count // 10
+        path = os.path.join(self.out_dir, "legacy.json")
+
+        def legacy():
+            results = list(_rows(legacy_count))
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'result_count': len(results), 'results': results},
+                          f, indent=2, ensure_ascii=False)
+
+        print(f"in-memory json peak {self._peak_mb(legacy):7.2f}MB "
+              f"at {legacy_count} rows")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,283 @@
+"""
+Tests for compressed file text frames and offset-referenced chunks
+"""
+
+import os
+import sys
+import time
+import uuid
+import random
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))))
+
+from src.database.file_search_db import FileSearchDB
+from src.database.text_frames import (
+    FrameCache, compress_frames, decompress_frame, frame_range, read_span
+)
+from src.rag.file_processor import FileProcessor
+
+
+# Benchmarks run at a reduced size unless full-size runs are requested
+FULL_BENCHMARKS = os.environ.get('DINOAIR_FULL_BENCHMARKS') == '1'
+
+WORDS = [
+    'python', 'database', 'vector', 'search', 'index', 'chunk', 'frame',
+    'server', 'client', 'thread', 'memory', 'cache', 'query', 'token',
+    'model', 'embedding', 'layout', 'widget', 'theme', 'parser'
+]
+
+
+def _text(rng, chars):
+    words = []
+    length = 0
+    while length < chars:
+        word = rng.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return ' '.join(words)[:chars]
+
+
+def _chunks(text, size=1000, overlap=200):
+    """(start, end) spans with the same overlap FileChunker produces"""
+    spans = []
+    start = 0
+    while start < len(text):
+        end = min(start + size, len(text))
+        spans.append((start, end))
+        if end == len(text):
+            break
+        start = end - overlap
+    return spans
+
+
+def _index_file(db, name, text, stored_text=True):
+    file_id = db.add_indexed_file(
+        f"/docs/{name}", "hash", len(text), datetime.now(), "txt"
+    )["file_id"]
+    if stored_text:
+        db.add_file_text(file_id, text)
+    for index, (start, end) in enumerate(_chunks(text)):
+        db.add_chunk(file_id, index, text[start:end], start, end,
+                     stored_text=stored_text)
+    return file_id
+
+
+class TestFrameHelpers(unittest.TestCase):
+    """Framing, slicing and the frame cache"""
+
+    def test_read_span_across_frames(self):
+        text = _text(random.Random(1), 5000) + " naïve café ✓ " * 50
+        frames = compress_frames(text, frame_chars=512)
+        self.assertEqual(''.join(decompress_frame(f) for f in frames), text)
+
+        cache = FrameCache()
+
+        def load(first, last):
+            return [(i, frames[i]) for i in range(first, last + 1)]
+
+        for start, end in ((0, 10), (500, 530), (1000, 2100),
+                           (len(text) - 40, len(text)), (7, 7)):
+            self.assertEqual(
+                read_span("f", start, end, cache, load, frame_chars=512),
+                text[start:end]
+            )
+        self.assertEqual(frame_range(511, 513, 512), (0, 1))
+        self.assertIsNone(
+            read_span("missing", 0, 10, FrameCache(), lambda a, b: [])
+        )
+
+    def test_cache_eviction_and_invalidation(self):
+        cache = FrameCache(max_frames=2)
+        cache.put("a", 0, "zero")
+        cache.put("a", 1, "one")
+        cache.get("a", 0)
+        cache.put("b", 0, "other")
+        self.assertIsNone(cache.get("a", 1))
+        self.assertEqual(cache.get("a", 0), "zero")
+
+        cache.invalidate("a")
+        self.assertIsNone(cache.get("a", 0))
+        self.assertEqual(cache.get("b", 0), "other")
+
+
+class TestFramedChunks(unittest.TestCase):
+    """Chunks stored as offsets read back exactly like inline chunks"""
+
+    def setUp(self):
+        self.db = FileSearchDB(
+            user_name=f"test_frames_{uuid.uuid4().hex[:8]}"
+        )
+        self.text = _text(random.Random(2), 30000) + " needle at the end"
+        self.file_id = _index_file(self.db, "a.txt", self.text)
+        FileSearchDB._frame_cache.clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.db.db_manager.user_db_dir.parent,
+                      ignore_errors=True)
+
+    def _raw_content(self):
+        with self.db._get_connection() as conn:
+            return [row[0] for row in conn.execute(
+                "SELECT content FROM file_chunks ORDER BY chunk_index"
+            )]
+
+    def test_chunk_text_is_not_duplicated(self):
+        self.assertEqual(set(self._raw_content()), {''})
+        spans = _chunks(self.text)
+        chunk_ids = [f"{self.file_id}_chunk_{i}" for i in range(len(spans))]
+        contents = self.db.get_chunk_content(chunk_ids)
+        for chunk_id, (start, end) in zip(chunk_ids, spans):
+            self.assertEqual(contents[chunk_id], self.text[start:end])
+
+    def test_keyword_search_reads_framed_text(self):
+        results = self.db.search_by_keywords(["needle"])
+        self.assertEqual(len(results), 1)
+        self.assertTrue(results[0]['content'].endswith("needle at the end"))
+        streamed = list(self.db.iter_keyword_matches(["needle"]))
+        self.assertEqual(streamed[0]['content'], results[0]['content'])
+
+    def test_embeddings_carry_content(self):
+        chunk_id = f"{self.file_id}_chunk_3"
+        self.db.add_embedding(chunk_id, [0.1, 0.2], "test-model")
+        start, end = _chunks(self.text)[3]
+        for rows in (self.db.get_all_embeddings(),
+                     self.db.get_embeddings_by_file("/docs/a.txt")):
+            self.assertEqual(rows[0]['content'], self.text[start:end])
+
+    def test_inline_chunks_still_work(self):
+        _index_file(self.db, "b.txt", "inline haystack text",
+                    stored_text=False)
+        results = self.db.search_by_keywords(["haystack"])
+        self.assertEqual(results[0]['content'], "inline haystack text")
+
+    def test_replaced_text_invalidates_cache(self):
+        chunk_id = f"{self.file_id}_chunk_0"
+        self.db.get_chunk_content([chunk_id])
+        self.db.add_file_text(self.file_id, "replacement " * 100)
+        self.assertEqual(self.db.get_chunk_content([chunk_id])[chunk_id],
+                         ("replacement " * 100)[:1000])
+
+    def test_remove_file_drops_frames(self):
+        self.db.remove_file_from_index("/docs/a.txt")
+        with self.db._get_connection() as conn:
+            count = conn.execute(
+                "SELECT COUNT(*) FROM file_text_frames"
+            ).fetchone()[0]
+        self.assertEqual(count, 0)
+
+
+class TestFileProcessorStoresText(unittest.TestCase):
+    """Indexing a file stores its text once and chunks by reference"""
+
+    def setUp(self):
+        self.user_name = f"test_frames_proc_{uuid.uuid4().hex[:8]}"
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "notes.txt")
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(_text(random.Random(3), 20000))
+        self.processor = FileProcessor(user_name=self.user_name,
+                                       generate_embeddings=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+        shutil.rmtree(self.processor.db.db_manager.user_db_dir.parent,
+                      ignore_errors=True)
+
+    def test_process_file(self):
+        result = self.processor.process_file(self.path)
+        self.assertTrue(result['success'], result.get('error'))
+
+        db = self.processor.db
+        with db._get_connection() as conn:
+            rows = conn.execute(
+                "SELECT id, content, start_pos, end_pos FROM file_chunks"
+            ).fetchall()
+        self.assertTrue(rows)
+        self.assertTrue(all(content == '' for _, content, _, _ in rows))
+
+        with open(self.path, encoding='utf-8') as f:
+            text = f.read()
+        contents = db.get_chunk_content([row[0] for row in rows])
+        for chunk_id, _, start, end in rows:
+            self.assertEqual(contents[chunk_id], text[start:end])
+
+
+class TestFramedStoragePerformance(unittest.TestCase):
+    """Database size, cold keyword queries and snippet fetches"""
+
+    @classmethod
+    def setUpClass(cls):
+        rng = random.Random(4)
+        files = 2000 if FULL_BENCHMARKS else 150
+        cls.texts = [_text(rng, rng.randint(10000, 40000))
+                     for _ in range(files)]
+        cls.corpus_chars = sum(len(text) for text in cls.texts)
+        cls.dbs = {}
+        for layout, stored_text in (("inline", False), ("framed", True)):
+            db = FileSearchDB(
+                user_name=f"test_frames_perf_{uuid.uuid4().hex[:8]}"
+            )
+            for i, text in enumerate(cls.texts):
+                _index_file(db, f"{i}.txt", text, stored_text=stored_text)
+            cls.dbs[layout] = db
+
+        cls.chunk_ids = {}
+        for layout, db in cls.dbs.items():
+            with db._get_connection() as conn:
+                cls.chunk_ids[layout] = [row[0] for row in conn.execute(
+                    "SELECT id FROM file_chunks ORDER BY file_id, chunk_index"
+                )]
+
+    @classmethod
+    def tearDownClass(cls):
+        for db in cls.dbs.values():
+            shutil.rmtree(db.db_manager.user_db_dir.parent,
+                          ignore_errors=True)
+
+    def _size(self, db):
+        with db._get_connection() as conn:
+            conn.execute("VACUUM")
+        return os.path.getsize(db.db_manager.file_search_db_path)
+
+    def test_size_and_latency(self):
+        rng = random.Random(5)
+        chunk_count = len(self.chunk_ids["inline"])
+        samples = [rng.sample(range(chunk_count), 10) for _ in range(50)]
+        print(f"\n{len(self.texts)} files, "
+              f"{self.corpus_chars / 1e6:.1f}M characters, "
+              f"{chunk_count} chunks")
+
+        sizes = {}
+        for layout, db in self.dbs.items():
+            sizes[layout] = self._size(db)
+
+            FileSearchDB._frame_cache.clear()
+            start = time.perf_counter()
+            results = db.search_by_keywords(["python", "needle"], limit=20)
+            cold_query = time.perf_counter() - start
+
+            FileSearchDB._frame_cache.clear()
+            start = time.perf_counter()
+            for sample in samples:
+                contents = db.get_chunk_content(
+                    [self.chunk_ids[layout][i] for i in sample]
+                )
+            snippet = (time.perf_counter() - start) / len(samples)
+
+            print(f"{layout:7s} size {sizes[layout] / 1e6:7.1f}MB  "
+                  f"cold keyword query {cold_query * 1000:7.1f}ms  "
+                  f"10-snippet fetch {snippet * 1000:.2f}ms")
+            self.assertEqual(len(results), 20)
+            self.assertEqual(len(contents), 10)
+
+        self.assertLess(sizes["framed"], sizes["inline"] / 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,187 @@
+"""
+Tests for the incremental tool call parser and dispatching tool calls
+from OllamaModelAdapter while the model is still streaming
+"""
+
+import os
+import sys
+import time
+import asyncio
+import unittest
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))))
+
+from src.agents.tool_call_parser import (
+    ToolCallStreamParser, parse_tool_calls, tool_call_from_json
+)
+from src.agents.ollama_model_adapter import OllamaModelAdapter
+from src.tools.abstraction.model_interface import ModelRequest
+
+FULL_BENCHMARKS = os.environ.get('DINOAIR_FULL_BENCHMARKS') == '1'
+
+SEARCH_CALL = ('{"tool_call": {"name": "search", "parameters": '
+               '{"query": "dinosaurs"}}}')
+CODE_CALL = ('{"tool": "run_code", "parameters": {"code": '
+             '"if x:\\n    print(\\"}{\\\\\\"\\")\\nd = {}"}}')
+RESPONSE = (f'Let me look that up. {SEARCH_CALL} Now some code: '
+            f'{CODE_CALL} and {{"not": "a tool"}} done }} then {{"tool": ""}}')
+
+
+def feed_in_pieces(text, size):
+    parser = ToolCallStreamParser()
+    for i in range(0, len(text), size):
+        parser.feed(text[i:i + size])
+    return parser.tool_calls
+
+
+class TestToolCallStreamParser(unittest.TestCase):
+    """Incremental, string and escape aware parsing"""
+
+    expected = [
+        {"name": "search", "parameters": {"query": "dinosaurs"}},
+        {"name": "run_code",
+         "parameters": {"code": 'if x:\n    print("}{\\"")\nd = {}'}}
+    ]
+
+    def test_whole_response(self):
+        self.assertEqual(parse_tool_calls(RESPONSE), self.expected)
+
+    def test_any_chunking_gives_the_same_calls(self):
+        for size in range(1, 12):
+            self.assertEqual(feed_in_pieces(RESPONSE, size), self.expected,
+                             f"chunks of {size}")
+
+    def test_call_is_emitted_when_its_object_closes(self):
+        parser = ToolCallStreamParser()
+        cut = RESPONSE.index(SEARCH_CALL) + len(SEARCH_CALL)
+        self.assertEqual(parser.feed(RESPONSE[:cut - 1]), [])
+        self.assertEqual(parser.feed(RESPONSE[cut - 1:cut]),
+                         [self.expected[0]])
+        self.assertEqual(parser.feed(RESPONSE[cut:]), [self.expected[1]])
+
+    def test_braces_and_quotes_in_strings_are_ignored(self):
+        text = '{"tool": "echo", "parameters": {"text": "a } \\" { b"}}'
+        self.assertEqual(feed_in_pieces(text, 1), [
+            {"name": "echo", "parameters": {"text": 'a } " { b'}}
+        ])
+
+    def test_stray_closing_brace_does_not_hide_later_calls(self):
+        self.assertEqual(parse_tool_calls(f'oops }} {SEARCH_CALL}'),
+                         [self.expected[0]])
+
+    def test_no_calls(self):
+        self.assertIsNone(parse_tool_calls(""))
+        self.assertIsNone(parse_tool_calls('plain text {"a": 1}'))
+        self.assertIsNone(parse_tool_calls('{"tool_call": {"name": "x"'))
+
+    def test_tool_call_from_json(self):
+        self.assertEqual(
+            tool_call_from_json({"tool": "a", "parameters": [1]}),
+            {"name": "a", "parameters": {}}
+        )
+        self.assertIsNone(tool_call_from_json({"tool_call": {"args": {}}}))
+        self.assertIsNone(tool_call_from_json(["tool"]))
+
+    def test_reset(self):
+        parser = ToolCallStreamParser()
+        parser.feed('{"tool": "a", "parameters": {"x": "}')
+        parser.reset()
+        self.assertEqual(parser.feed(SEARCH_CALL), [self.expected[0]])
+
+
+class _SlowBackend:
+    """Stands in for OllamaWrapper, streaming a reply at a fixed pace"""
+
+    def __init__(self, chunks, delay):
+        self.chunks = chunks
+        self.delay = delay
+
+    def stream_chat(self, messages, **kwargs):
+        for chunk in self.chunks:
+            time.sleep(self.delay)
+            yield chunk
+
+    def get_current_model(self):
+        return "fake"
+
+
+class TestAdapterToolDispatch(unittest.TestCase):
+    """Tools can start before the model finishes its reply"""
+
+    chunk_delay = 0.01
+    tool_time = 0.3 if FULL_BENCHMARKS else 0.15
+    trailing_chunks = 100 if FULL_BENCHMARKS else 30
+
+    def _adapter(self):
+        # A tool call near the start, then more explanation streamed after
+        chunks = ["I'll search. "] + [SEARCH_CALL[i:i + 7]
+                                      for i in range(0, len(SEARCH_CALL), 7)]
+        chunks += ["More words. "] * self.trailing_chunks
+        adapter = OllamaModelAdapter(
+            ollama_wrapper=_SlowBackend(chunks, self.chunk_delay))
+        adapter._is_initialized = True
+        return adapter
+
+    def _request(self):
+        return ModelRequest(prompt="", stream=True,
+                            messages=[{"role": "user", "content": "find"}])
+
+    async def _tool(self, tool_call):
+        await asyncio.sleep(self.tool_time)
+        return tool_call["name"]
+
+    def test_tool_call_dispatched_while_streaming(self):
+        async def main():
+            dispatched = []
+            chunks = []
+
+            def on_tool_call(tool_call):
+                dispatched.append((len(chunks), tool_call))
+
+            response = await self._adapter().stream_generate(
+                self._request(), chunks.append, on_tool_call)
+            return response, dispatched, chunks
+
+        response, dispatched, chunks = asyncio.run(main())
+        self.assertTrue(response.success, response.error)
+        self.assertEqual(response.tool_calls, [dispatched[0][1]])
+        self.assertEqual(dispatched[0][1]["name"], "search")
+        # Seen long before the stream ended
+        self.assertLessEqual(dispatched[0][0],
+                             len(chunks) - self.trailing_chunks)
+
+    def test_end_to_end_latency(self):
+        async def after_stream():
+            start = time.perf_counter()
+            response = await self._adapter().stream_generate(
+                self._request(), lambda chunk: None)
+            results = [await self._tool(call) for call in response.tool_calls]
+            return time.perf_counter() - start, results
+
+        async def while_streaming():
+            start = time.perf_counter()
+            tasks = []
+            response = await self._adapter().stream_generate(
+                self._request(), lambda chunk: None,
+                lambda call: tasks.append(
+                    asyncio.ensure_future(self._tool(call))))
+            results = await asyncio.gather(*tasks)
+            return time.perf_counter() - start, list(results), response
+
+        baseline, expected = asyncio.run(after_stream())
+        early, results, response = asyncio.run(while_streaming())
+        self.assertEqual(results, expected)
+        self.assertEqual(len(response.tool_calls), 1)
+        print(f"\nTool of {self.tool_time * 1000:.0f} ms after a "
+              f"{baseline * 1000 - self.tool_time * 1000:.0f} ms stream: "
+              f"{baseline * 1000:.0f} ms dispatched after the stream, "
+              f"{early * 1000:.0f} ms dispatched while streaming, "
+              f"{(baseline - early) * 1000:.0f} ms saved")
+        # The tool ran in the shadow of the rest of the stream
+        self.assertLess(early, baseline - self.tool_time / 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
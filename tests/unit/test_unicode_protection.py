@@ -0,0 +1,190 @@
+"""
+Tests for UnicodeProtection: results match the previous per-character
+implementation, plus a throughput benchmark
+"""
+
+import os
+import sys
+import time
+import random
+import unittest
+import unicodedata
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))))
+
+from src.input_processing.stages.unicode_protection import UnicodeProtection
+
+
+# Benchmarks run at a reduced size unless full-size runs are requested
+FULL_BENCHMARKS = os.environ.get('DINOAIR_FULL_BENCHMARKS') == '1'
+
+UP = UnicodeProtection
+
+
+def _reference_normalize(text):
+    """The previous normalize_unicode"""
+    if not text:
+        return text
+    text = unicodedata.normalize('NFD', text)
+    text = ''.join(c for c in text if c not in UP.DANGEROUS_CHARS)
+    text = ''.join(c for c in text
+                   if unicodedata.category(c) not in UP.DANGEROUS_CATEGORIES)
+    text = ''.join(UP.HOMOGRAPH_MAP.get(c, c) for c in text)
+    text = unicodedata.normalize('NFC', text)
+    result = []
+    combining_count = 0
+    for char in text:
+        if unicodedata.category(char).startswith('M'):
+            combining_count += 1
+            if combining_count <= 2:
+                result.append(char)
+        else:
+            combining_count = 0
+            result.append(char)
+    return ''.join(result)
+
+
+def _reference_detect(text):
+    """The previous detect_unicode_attack"""
+    if not text:
+        return False
+    if any(char in UP.DANGEROUS_CHARS for char in text):
+        return True
+    scripts = set()
+    for char in text:
+        if char.isalpha():
+            char_name = unicodedata.name(char, '')
+            for script in UP.SCRIPT_NAMES:
+                if script in char_name:
+                    scripts.add(script)
+                    break
+    if len(scripts) > 1:
+        non_latin_scripts = scripts - {'LATIN'}
+        if len(non_latin_scripts) > 1:
+            return True
+        if non_latin_scripts and 'LATIN' in scripts:
+            if non_latin_scripts & {'CYRILLIC', 'GREEK'}:
+                return True
+    combining_count = sum(1 for c in text
+                          if unicodedata.category(c).startswith('M'))
+    if combining_count > len(text) * 0.3:
+        return True
+    if any(char in text for char in ('\u202e', '\u202b', '\u200f')):
+        return True
+    return any(unicodedata.category(c) in {'Cf', 'Cc'} for c in text)
+
+
+def _reference_sanitize(text, allow_unicode=True, max_length=None):
+    """The previous sanitize"""
+    if not text:
+        return text
+    text = _reference_normalize(text)
+    text = ''.join(c for c in text if c not in UP.BIDI_CONTROLS)
+    if not allow_unicode:
+        text = _reference_normalize(text).encode(
+            'ascii', 'ignore').decode('ascii')
+    if max_length and len(text) > max_length:
+        text = text[:max_length]
+    return text.strip()
+
+
+# Character pools for the fuzz corpus
+_POOLS = [
+    [chr(c) for c in range(0x20, 0x7f)] + ['\n', '\t', '\x00', '\x7f'],
+    [chr(c) for c in range(0xa0, 0x180)],
+    [chr(c) for c in range(0x400, 0x460)],
+    [chr(c) for c in range(0x370, 0x3d0)],
+    [chr(c) for c in range(0x300, 0x370)] + ['\u20dd', '\u0e49'],
+    sorted(UP.DANGEROUS_CHARS) + ['\u00ad', '\u061c', '\U000e0001'],
+    sorted(UP.HOMOGRAPH_MAP),
+    ['א', 'ا', 'क', 'ก', 'ກ', 'ა', '가',
+     'ᄀ', '一', 'あ', '\U0001f600', '\U0001d400'],
+    ['\ue000', '\U000f0000', '\u0378', '\U0003fffe', '\ufdd0', '\ud800'],
+]
+
+
+def _corpus(count, seed=1234):
+    rng = random.Random(seed)
+    texts = ['', 'plain ascii', 'line\nbreak', 'café', 'Аpple',
+             'e\u0301\u0302\u0303\u0304', '\u0301\u0301\u0301x',
+             # More distinct replacements than str.replace passes
+             ''.join(sorted(UP.HOMOGRAPH_MAP))]
+    for _ in range(count):
+        pools = rng.sample(_POOLS, rng.randint(1, 3))
+        length = rng.randint(1, 40)
+        texts.append(''.join(rng.choice(rng.choice(pools))
+                             for _ in range(length)))
+    return texts
+
+
+class TestUnicodeProtection(unittest.TestCase):
+    """Same results as the previous implementation"""
+
+    def test_ascii_fast_path(self):
+        self.assertEqual(UP.normalize_unicode("Hello, world!"),
+                         "Hello, world!")
+        self.assertFalse(UP.detect_unicode_attack("Hello, world!"))
+        self.assertTrue(UP.detect_unicode_attack("two\nlines"))
+        self.assertTrue(UP.detect_unicode_attack("del\x7f"))
+        self.assertEqual(UP.sanitize("  padded  "), "padded")
+
+    def test_known_attacks(self):
+        self.assertTrue(UP.detect_unicode_attack("pаypal"))
+        self.assertTrue(UP.detect_unicode_attack("abc\u202edef"))
+        self.assertTrue(UP.detect_unicode_attack("a\u0301\u0302\u0303"))
+        self.assertFalse(UP.detect_unicode_attack("café naïve"))
+        self.assertEqual(UP.normalize_unicode("pаy\u200bpal"), "paypal")
+        self.assertEqual(UP.normalize_unicode("ﬁle"), "file")
+        self.assertEqual(UP.normalize_unicode("e\u0301\u0302\u0303\u0304"),
+                         "é\u0302\u0303")
+        self.assertEqual(UP.remove_bidi_controls("a\u202eb\u2066c"), "abc")
+
+    def test_fuzz_matches_reference(self):
+        for text in _corpus(5000):
+            with self.subTest(text=ascii(text)):
+                self.assertEqual(UP.normalize_unicode(text),
+                                 _reference_normalize(text))
+                self.assertEqual(UP.detect_unicode_attack(text),
+                                 _reference_detect(text))
+                self.assertEqual(UP.sanitize(text), _reference_sanitize(text))
+                self.assertEqual(UP.sanitize(text, False, 20),
+                                 _reference_sanitize(text, False, 20))
+
+
+class TestUnicodeProtectionPerformance(unittest.TestCase):
+    """sanitize and detect_unicode_attack throughput by input kind"""
+
+    def test_throughput(self):
+        size = 1_000_000 if FULL_BENCHMARKS else 100_000
+        rng = random.Random(7)
+        words = "the quick brown fox jumps over a lazy dog".split()
+        inputs = {
+            "ascii": " ".join(rng.choice(words) for _ in range(size // 4)),
+            "latin-1": " ".join(rng.choice(words) + rng.choice("éüñçàø")
+                                for _ in range(size // 5)),
+            "mixed script": " ".join(
+                rng.choice(words) + rng.choice("бгдλπ中é\u0301")
+                for _ in range(size // 5)),
+        }
+
+        def rate(func, text):
+            start = time.perf_counter()
+            func(text)
+            return len(text) / (time.perf_counter() - start) / 2 ** 20
+
+        print()
+        for label, text in inputs.items():
+            text = text[:size]
+            self.assertEqual(UP.sanitize(text), _reference_sanitize(text))
+            self.assertEqual(UP.detect_unicode_attack(text),
+                             _reference_detect(text))
+            print(f"{label:12s} sanitize {rate(_reference_sanitize, text):7.1f}"
+                  f" -> {rate(UP.sanitize, text):8.1f} MB/s, detect "
+                  f"{rate(_reference_detect, text):7.1f} -> "
+                  f"{rate(UP.detect_unicode_attack, text):8.1f} MB/s")
+
+
+if __name__ == '__main__':
+    unittest.main()